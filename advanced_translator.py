@@ -5,10 +5,17 @@ Advanced comprehensive translator for family.json
 Complete translation coverage for family planning application
 """
 
+import argparse
 import json
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+
+from i18n_io import write_json  # noqa: E402
+from i18n_trace import add_profile_arguments, profiling, span  # noqa: E402
+
 # Comprehensive translation database for all family planning terms
 COMPLETE_FAMILY_TRANSLATIONS = {
     'cs': {
@@ -657,12 +664,12 @@ def create_comprehensive_family_translation(source_data, language_code):
     """Create the most comprehensive translation possible"""
     return translate_nested_object(source_data, language_code)
 
-def main():
+def run():
     print("🎯 Advanced comprehensive family.json translator")
     
     # Load English source
     en_file = Path('src/i18n/locales/en/family.json')
-    with open(en_file, 'r', encoding='utf-8') as f:
+    with span("load", file=str(en_file)), open(en_file, 'r', encoding='utf-8') as f:
         en_data = json.load(f)
     
     print(f"📚 English source loaded")
@@ -675,15 +682,16 @@ def main():
         
         try:
             # Create translation with maximum coverage
-            translated_data = create_comprehensive_family_translation(en_data, lang)
+            with span("translate", lang=lang):
+                translated_data = create_comprehensive_family_translation(en_data, lang)
             
             # Save translation
             lang_dir = Path(f'src/i18n/locales/{lang}')
             lang_dir.mkdir(exist_ok=True)
             
             lang_file = lang_dir / 'family.json'
-            with open(lang_file, 'w', encoding='utf-8') as f:
-                json.dump(translated_data, f, ensure_ascii=False, indent=2)
+            with span("write", file=str(lang_file)):
+                write_json(lang_file, translated_data)
             
             print(f"✅ {lang.upper()} - Advanced translation completed")
             
@@ -692,5 +700,12 @@ def main():
     
     print("\\n🚀 Advanced translation process completed!")
 
+def main():
+    parser = argparse.ArgumentParser(description="Dictionary-based translation of family.json")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiling(args, "advanced_translator"):
+        run()
+
 if __name__ == '__main__':
     main()
@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
+import argparse
 import json
 import os
+import sys
+from pathlib import Path
 from typing import Dict, Any
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+
+from i18n_trace import add_profile_arguments, profiling, span  # noqa: E402
+
 def count_translatable_values(obj: Dict[str, Any], path: str = '') -> tuple[int, int, list]:
     """Count total values and those marked with [TRANSLATE]."""
     total = 0
@@ -24,7 +31,7 @@ def count_translatable_values(obj: Dict[str, Any], path: str = '') -> tuple[int,
     
     return total, needs_translation, untranslated_keys
 
-def main():
+def run():
     base_path = "./src/i18n/locales"
     
     # Get all language directories
@@ -37,10 +44,12 @@ def main():
     for lang in languages:
         lang_path = os.path.join(base_path, f"{lang}/common.json")
         if os.path.exists(lang_path):
-            with open(lang_path, 'r', encoding='utf-8') as f:
-                lang_data = json.load(f)
+            with span("load", lang=lang):
+                with open(lang_path, 'r', encoding='utf-8') as f:
+                    lang_data = json.load(f)
             
-            total, needs_translation, untranslated_keys = count_translatable_values(lang_data)
+            with span("classify", lang=lang):
+                total, needs_translation, untranslated_keys = count_translatable_values(lang_data)
             translated = total - needs_translation
             percentage = (translated / total * 100) if total > 0 else 0
             
@@ -94,5 +103,12 @@ def main():
     else:
         print("\n✅ All languages are fully translated!")
 
+def main():
+    parser = argparse.ArgumentParser(description="Report [TRANSLATE] marker progress for common.json in every language")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiling(args, "check_translation_status"):
+        run()
+
 if __name__ == "__main__":
     main()
@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
+import argparse
 import json
 import sys
+from pathlib import Path
 from typing import Dict, Any, Set, List, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+
+from i18n_trace import add_profile_arguments, profiling, span  # noqa: E402
+
 def load_json_file(file_path: str) -> Dict[str, Any]:
     """Load and parse a JSON file."""
     try:
@@ -47,23 +53,25 @@ def find_untranslated_values(en_data: Dict[str, Any], et_data: Dict[str, Any]) -
     
     return untranslated
 
-def main():
+def run():
     # Load the locale files
     en_file = "src/i18n/locales/en/common.json"
     et_file = "src/i18n/locales/et/common.json"
     
-    en_data = load_json_file(en_file)
-    et_data = load_json_file(et_file)
+    with span("load"):
+        en_data = load_json_file(en_file)
+        et_data = load_json_file(et_file)
     
     if not en_data or not et_data:
         print("Failed to load one or both locale files")
         sys.exit(1)
     
-    # Find missing keys
-    missing_keys = find_missing_keys(en_data, et_data)
-    
-    # Find untranslated values
-    untranslated_values = find_untranslated_values(en_data, et_data)
+    with span("classify"):
+        # Find missing keys
+        missing_keys = find_missing_keys(en_data, et_data)
+        
+        # Find untranslated values
+        untranslated_values = find_untranslated_values(en_data, et_data)
     
     # Print results
     print("=== MISSING KEYS IN ESTONIAN ===")
@@ -79,5 +87,12 @@ def main():
         print(f"    ET: {et_value}")
         print()
 
+def main():
+    parser = argparse.ArgumentParser(description="Compare the Estonian common.json with English")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiling(args, "compare_locales"):
+        run()
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
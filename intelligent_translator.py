@@ -5,10 +5,17 @@ Intelligent Translation System for family.json
 Uses comprehensive rule-based translation with contextual awareness
 """
 
+import argparse
 import json
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+
+from i18n_io import write_json  # noqa: E402
+from i18n_trace import add_profile_arguments, profiling, span  # noqa: E402
+
 # Comprehensive translation patterns for family planning domain
 FAMILY_TRANSLATIONS = {
     # Czech translations
@@ -338,12 +345,12 @@ def create_comprehensive_translation(source_data, language_code):
     """Create comprehensive translation for a specific language"""
     return translate_object_recursively(source_data, language_code)
 
-def main():
+def run():
     print("🚀 Starting comprehensive family.json translation...")
     
     # Load English source
     en_file = Path('src/i18n/locales/en/family.json')
-    with open(en_file, 'r', encoding='utf-8') as f:
+    with span("load", file=str(en_file)), open(en_file, 'r', encoding='utf-8') as f:
         en_data = json.load(f)
     
     print(f"📖 Loaded English source")
@@ -356,15 +363,16 @@ def main():
         
         try:
             # Create comprehensive translation
-            translated_data = create_comprehensive_translation(en_data, lang)
+            with span("translate", lang=lang):
+                translated_data = create_comprehensive_translation(en_data, lang)
             
             # Save to file
             lang_dir = Path(f'src/i18n/locales/{lang}')
             lang_dir.mkdir(exist_ok=True)
             
             lang_file = lang_dir / 'family.json'
-            with open(lang_file, 'w', encoding='utf-8') as f:
-                json.dump(translated_data, f, ensure_ascii=False, indent=2)
+            with span("write", file=str(lang_file)):
+                write_json(lang_file, translated_data)
             
             print(f"✅ {lang.upper()} - Comprehensive translation completed")
             
@@ -373,5 +381,12 @@ def main():
     
     print("\\n🎉 Translation completed successfully!")
 
+def main():
+    parser = argparse.ArgumentParser(description="Rule-based translation of family.json")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiling(args, "intelligent_translator"):
+        run()
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env node
+// Client for the resident i18n daemon (scripts/i18n_daemon.py).
+//
+// Instead of re-reading every locale file, Node scripts can import this and
+// ask the daemon, which keeps the parsed tree in memory:
+//
+//   import { status, missing, lookup, translate, setValues } from './i18n-daemon-client.mjs';
+//   const { languages } = await status();
+//
+// The daemon is found through I18N_DAEMON_SOCKET (a Unix socket path) or
+// I18N_DAEMON_URL (default http://127.0.0.1:8765).  As a script:
+//
+//   node scripts/i18n-daemon-client.mjs status [de,cs]
+//   node scripts/i18n-daemon-client.mjs missing de [common]
+//   node scripts/i18n-daemon-client.mjs get de common:nav.home
+//   node scripts/i18n-daemon-client.mjs translate de "Save" "Cancel"
+//   node scripts/i18n-daemon-client.mjs set de common:nav.home "Startseite"
+import http from 'http';
+import { fileURLToPath } from 'url';
+
+const DEFAULT_URL = 'http://127.0.0.1:8765';
+
+function target(){
+  if(process.env.I18N_DAEMON_SOCKET) return { socketPath: process.env.I18N_DAEMON_SOCKET };
+  const url = new URL(process.env.I18N_DAEMON_URL || DEFAULT_URL);
+  return { hostname: url.hostname, port: url.port || 80 };
+}
+
+export function request(method, path, body){
+  return new Promise((resolve, reject) => {
+    const data = body === undefined ? null : Buffer.from(JSON.stringify(body));
+    const headers = data ? { 'Content-Type': 'application/json', 'Content-Length': data.length } : {};
+    const req = http.request({ ...target(), method, path, headers }, res => {
+      const chunks = [];
+      res.on('data', c => chunks.push(c));
+      res.on('end', () => {
+        let payload;
+        try { payload = JSON.parse(Buffer.concat(chunks).toString('utf8')); }
+        catch(e){ return reject(new Error(`Invalid response from i18n daemon: ${e.message}`)); }
+        if(res.statusCode >= 400) return reject(new Error(`i18n daemon ${res.statusCode}: ${payload.error}`));
+        payload.elapsedMs = Number(res.headers['x-elapsed-ms']);
+        resolve(payload);
+      });
+    });
+    req.on('error', e => reject(new Error(`i18n daemon not reachable (${e.code || e.message}); start it with python3 scripts/i18n_daemon.py`)));
+    if(data) req.write(data);
+    req.end();
+  });
+}
+
+function query(params){
+  const q = new URLSearchParams(Object.entries(params).filter(([, v]) => v !== undefined && v !== null));
+  const s = q.toString();
+  return s ? `?${s}` : '';
+}
+
+export const health = () => request('GET', '/health');
+export const status = (langs) => request('GET', `/status${query({ langs: Array.isArray(langs) ? langs.join(',') : langs })}`);
+export const missing = (lang, ns) => request('GET', `/missing${query({ lang, ns })}`);
+export const get = (lang, key) => request('GET', `/get${query({ lang, key })}`);
+export const lookup = (lang, keys) => request('POST', '/lookup', { lang, keys });
+export const usage = (key) => request('GET', `/usage${query({ key })}`);
+export const unused = (ns) => request('GET', `/unused${query({ ns })}`);
+export const translate = (lang, strings) => request('POST', '/translate', { lang, strings });
+export const setValues = (lang, values) => request('POST', '/set', { lang, values });
+export const deleteKeys = (lang, keys) => request('POST', '/delete', { lang, keys });
+export const reload = () => request('POST', '/reload', {});
+
+async function cli(argv){
+  const [cmd, ...rest] = argv;
+  const commands = {
+    health: () => health(),
+    status: () => status(rest[0]),
+    missing: () => missing(rest[0], rest[1]),
+    get: () => get(rest[0], rest[1]),
+    lookup: () => lookup(rest[0], rest.slice(1)),
+    usage: () => usage(rest[0]),
+    unused: () => unused(rest[0]),
+    translate: () => translate(rest[0], rest.slice(1)),
+    set: () => setValues(rest[0], { [rest[1]]: rest[2] }),
+    delete: () => deleteKeys(rest[0], rest.slice(1)),
+    reload: () => reload(),
+  };
+  if(!commands[cmd]){
+    console.error(`Usage: i18n-daemon-client.mjs <${Object.keys(commands).join('|')}> [args]`);
+    process.exit(2);
+  }
+  const result = await commands[cmd]();
+  console.log(JSON.stringify(result, null, 2));
+}
+
+if(process.argv[1] === fileURLToPath(import.meta.url)){
+  cli(process.argv.slice(2)).catch(e => { console.error(`❌ ${e.message}`); process.exit(1); });
+}
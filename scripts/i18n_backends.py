@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""Translation backends and a fallback chain with hedged requests.
+
+By default translate_locales.py sends every batch to Cloud Translation v3 and
+retries transient errors in place with 2s/4s backoff.  One slow call holds
+back every unit in its batch, and a batch that keeps failing fails its units
+(or the whole run).  ``BackendChain`` instead tries an ordered list of
+backends, e.g. ``--backends google,deep-translator,cache``:
+
+* Each batch goes to the first backend.  If no answer arrives within the
+  ``hedge_percentile`` of that backend's recent latencies, the same request
+  is sent again and the first answer wins.  A failed attempt is re-sent at
+  once while hedges remain.  The other attempts are cancelled: queued ones
+  never start, stand-ins stop waiting, and gRPC calls end at their timeout.
+* All attempts of one request share a ``timeout`` deadline.  Once the
+  deadline passes, or every attempt has failed, the batch moves on to the
+  next backend.
+* ``cache`` answers from the translation memory and returns ``[TRANSLATE]``
+  markers for everything else.  It always succeeds, so it is only accepted
+  as the last backend.  The pipeline keeps a target's existing translation
+  rather than overwrite it with a marker, and the next ``--missing-only``
+  run picks up the markers.
+
+A backend is a callable ``(strings, lang, timeout=None, cancel=None)``.
+i18n_synth.StandInTranslator is one, with injectable latency, tail latency
+and failures.  ``simulate`` runs it with and without hedging:
+
+    python3 scripts/i18n_backends.py simulate --tail-rate 0.02 --tail-latency 0.5
+"""
+import argparse
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from i18n_locales import TRANSLATE_MARKER
+from i18n_metrics import latency_summary, percentile
+from i18n_tm import TranslationMemory
+from translate_locales import SOURCE_LANG, normalize_lang, protect_placeholders, translate_batch
+
+BACKEND_NAMES = ("google", "deep-translator", "cache")
+# Latencies per backend used for the hedge threshold, and how many are needed first
+LATENCY_WINDOW = 200
+MIN_SAMPLES = 20
+
+
+class GoogleV3Backend:
+    name = "google"
+
+    def __init__(self, project_id: str, location: str = "global"):
+        self.project_id = project_id
+        self.location = location
+
+    def __call__(self, strings: List[str], lang: str, timeout: Optional[float] = None,
+                 cancel: Optional[threading.Event] = None) -> List[str]:
+        # The chain hedges and falls back, so no in-place backoff here
+        return translate_batch(strings, lang, self.project_id, self.location, timeout=timeout, attempts=1)
+
+
+class DeepTranslatorBackend:
+    """The unofficial Google web endpoint via deep-translator, as used by translate_common.py."""
+
+    name = "deep-translator"
+
+    def __init__(self):
+        # Fails at construction, not mid-run, when the package is missing
+        from deep_translator import GoogleTranslator
+        self._translator_cls = GoogleTranslator
+
+    def __call__(self, strings: List[str], lang: str, timeout: Optional[float] = None,
+                 cancel: Optional[threading.Event] = None) -> List[str]:
+        translator = self._translator_cls(source=SOURCE_LANG, target=normalize_lang(lang))
+        return [t if t is not None else s for s, t in zip(strings, translator.translate_batch(strings))]
+
+
+class CacheOnlyBackend:
+    """Translation-memory answers; ``[TRANSLATE]`` markers for everything else.
+
+    Callers send masked text (``Hello __PH_0__``) while the memory stores the
+    restored source (``Hello {{name}}``).  Memory sources are masked the same
+    way to find a match, and the stored translation is masked back with the
+    source's tokens, so the caller's own placeholders are restored into it.
+    """
+
+    name = "cache"
+
+    def __init__(self, tm: Optional[TranslationMemory] = None, token_format: str = "__PH_{}__"):
+        self.tm = tm
+        self.token_format = token_format
+        # lang -> (memory size when built, masked source -> (source, translation))
+        self._masked: Dict[str, Tuple[int, Dict[str, Tuple[str, str]]]] = {}
+        self._lock = threading.Lock()
+
+    def _masked_index(self, lang: str) -> Dict[str, Tuple[str, str]]:
+        assert self.tm is not None
+        count = self.tm.count(lang)
+        with self._lock:
+            cached = self._masked.get(lang)
+            if cached is None or cached[0] != count:
+                index = {}
+                for _lang, source, target, _origin in self.tm.entries(lang):
+                    masked, repls = protect_placeholders(source, self.token_format)
+                    if repls:
+                        index[masked] = (source, target)
+                cached = self._masked[lang] = (count, index)
+            return cached[1]
+
+    def _remask(self, source: str, target: str) -> Optional[str]:
+        """``target`` with the source's placeholders turned back into tokens; None if ambiguous."""
+        _masked, repls = protect_placeholders(source, self.token_format)
+        if len(set(repls.values())) != len(repls):
+            return None  # a repeated placeholder cannot be mapped back to one token
+        for token, original in repls.items():
+            if target.count(original) != 1:
+                return None
+            target = target.replace(original, token)
+        return target
+
+    def __call__(self, strings: List[str], lang: str, timeout: Optional[float] = None,
+                 cancel: Optional[threading.Event] = None) -> List[str]:
+        known = self.tm.lookup(lang, strings) if self.tm is not None else {}
+        marker = self.token_format.format(0)
+        index = None
+        out = []
+        for s in strings:
+            text = known.get(s)
+            if text is None and self.tm is not None and marker in s:
+                if index is None:
+                    index = self._masked_index(lang)
+                hit = index.get(s)
+                if hit is not None:
+                    text = self._remask(*hit)
+            out.append(text or f"{TRANSLATE_MARKER} {s}")
+        return out
+
+
+class FunctionBackend:
+    """Adapts a plain ``translate_fn(strings, lang)``."""
+
+    def __init__(self, fn: Callable[[List[str], str], List[str]], name: str = "function"):
+        self.fn = fn
+        self.name = name
+
+    def __call__(self, strings: List[str], lang: str, timeout: Optional[float] = None,
+                 cancel: Optional[threading.Event] = None) -> List[str]:
+        return self.fn(strings, lang)
+
+
+class BackendStats:
+    FIELDS = ("requests", "attempts", "hedges", "hedge_wins", "errors", "timeouts", "cancelled", "fallbacks")
+
+    def __init__(self):
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def to_json(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {name: getattr(self, name) for name in self.FIELDS}
+        out["latency_ms"] = latency_summary(list(self.latencies))
+        return out
+
+
+class BackendChain:
+    """``translate_fn`` that hedges slow requests and falls back through ``backends``."""
+
+    def __init__(self, backends: List[Any], timeout: Optional[float] = None,
+                 hedge_percentile: Optional[float] = None, max_hedges: int = 1, workers: int = 4):
+        if not backends:
+            raise ValueError("BackendChain needs at least one backend")
+        self.backends = list(backends)
+        self.timeout = timeout
+        self.hedge_percentile = hedge_percentile
+        self.max_hedges = max_hedges if hedge_percentile is not None else 0
+        self.stats = {self._name(b): BackendStats() for b in self.backends}
+        # Abandoned attempts hold their thread until they return, so leave headroom
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers) * (self.max_hedges + 1) * 2,
+                                        thread_name_prefix="backend")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _name(backend: Any) -> str:
+        return getattr(backend, "name", type(backend).__name__)
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def __call__(self, strings: List[str], lang: str) -> List[str]:
+        last_error: Optional[BaseException] = None
+        for tier, backend in enumerate(self.backends):
+            name = self._name(backend)
+            try:
+                return self._request(backend, self.stats[name], strings, lang)
+            except Exception as e:
+                last_error = e
+                if tier + 1 < len(self.backends):
+                    with self._lock:
+                        self.stats[name].fallbacks += 1
+                    print(f"[warn] {name} failed for {lang} ({e}); falling back to "
+                          f"{self._name(self.backends[tier + 1])}", file=sys.stderr)
+        assert last_error is not None
+        raise last_error
+
+    def _hedge_delay(self, stats: BackendStats) -> Optional[float]:
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            samples = list(stats.latencies)
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return percentile(samples, self.hedge_percentile)
+
+    def _attempt(self, backend: Any, stats: BackendStats, strings: List[str], lang: str,
+                 timeout: Optional[float], cancel: threading.Event) -> List[str]:
+        start = time.perf_counter()
+        result = backend(strings, lang, timeout=timeout, cancel=cancel)
+        if len(result) != len(strings):
+            raise RuntimeError(f"{self._name(backend)} returned {len(result)} translations for {len(strings)} strings")
+        with self._lock:
+            stats.latencies.append(time.perf_counter() - start)
+        return result
+
+    def _request(self, backend: Any, stats: BackendStats, strings: List[str], lang: str) -> List[str]:
+        start = time.perf_counter()
+        deadline = start + self.timeout if self.timeout else None
+        cancel = threading.Event()
+        attempts: List[Future] = []
+
+        def submit():
+            remaining = deadline - time.perf_counter() if deadline is not None else None
+            with self._lock:
+                stats.attempts += 1
+                if attempts:
+                    stats.hedges += 1
+            attempts.append(self._pool.submit(self._attempt, backend, stats, strings, lang, remaining, cancel))
+
+        with self._lock:
+            stats.requests += 1
+        submit()
+        pending = set(attempts)
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                hedges_left = len(attempts) - 1 < self.max_hedges
+                if not pending:
+                    if not hedges_left:
+                        raise error  # type: ignore[misc]
+                    submit()
+                    pending.add(attempts[-1])
+                    continue
+                hedge_at = None
+                delay = self._hedge_delay(stats) if hedges_left else None
+                if delay is not None:
+                    hedge_at = start + delay * len(attempts)
+                wake = min((t for t in (hedge_at, deadline) if t is not None), default=None)
+                done, pending = wait(pending, return_when=FIRST_COMPLETED,
+                                     timeout=None if wake is None else max(0.0, wake - time.perf_counter()))
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        error = e
+                        with self._lock:
+                            stats.errors += 1
+                        continue
+                    if future is not attempts[0]:
+                        with self._lock:
+                            stats.hedge_wins += 1
+                    return result
+                now = time.perf_counter()
+                if deadline is not None and now >= deadline:
+                    with self._lock:
+                        stats.timeouts += 1
+                    raise TimeoutError(f"{self._name(backend)}: no answer within {self.timeout:g}s")
+                if pending and hedge_at is not None and now >= hedge_at:
+                    submit()
+                    pending.add(attempts[-1])
+        finally:
+            # Losers: queued attempts never start, running ones see the event
+            cancel.set()
+            losers = sum(1 for f in attempts if not f.done() and (f.cancel() or f.running()))
+            with self._lock:
+                stats.cancelled += losers
+
+    def to_json(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: st.to_json() for name, st in self.stats.items()}
+
+    def print_summary(self):
+        print("\nBackends:")
+        print(f"  {'backend':<16} {'requests':>8} {'hedges':>7} {'won':>5} {'errors':>7} {'timeouts':>9} "
+              f"{'fallback':>9} {'p50 ms':>7} {'p99 ms':>7}")
+        for name, row in self.to_json().items():
+            lat = row["latency_ms"]
+            print(f"  {name:<16} {row['requests']:>8} {row['hedges']:>7} {row['hedge_wins']:>5} {row['errors']:>7} "
+                  f"{row['timeouts']:>9} {row['fallbacks']:>9} {lat['p50']:>7.0f} {lat['p99']:>7.0f}")
+
+
+def parse_backends(spec: str) -> List[str]:
+    names = [n.strip() for n in spec.split(",") if n.strip()]
+    unknown = [n for n in names if n not in BACKEND_NAMES]
+    if unknown or not names:
+        raise ValueError(f"Invalid backends {spec!r}; choose from {', '.join(BACKEND_NAMES)}")
+    # cache answers every string (with markers), so nothing after it would ever be called
+    if "cache" in names[:-1]:
+        raise ValueError(f"Invalid backends {spec!r}: cache always answers, so it must be the last backend")
+    return names
+
+
+def build_chain(names: List[str], project_id: Optional[str], location: str = "global",
+                tm: Optional[TranslationMemory] = None, timeout: Optional[float] = None,
+                hedge_percentile: Optional[float] = None, max_hedges: int = 1, workers: int = 4) -> BackendChain:
+    backends: List[Any] = []
+    for name in names:
+        if name == "google":
+            backends.append(GoogleV3Backend(project_id or "", location))
+        elif name == "deep-translator":
+            backends.append(DeepTranslatorBackend())
+        else:
+            backends.append(CacheOnlyBackend(tm))
+    return BackendChain(backends, timeout=timeout, hedge_percentile=hedge_percentile,
+                        max_hedges=max_hedges, workers=workers)
+
+
+def simulate(args):
+    from i18n_synth import StandInTranslator
+
+    strings = [f"Sample string number {i}" for i in range(args.batch_size)]
+
+    def run_once(hedge_percentile: Optional[float]) -> Dict[str, Any]:
+        primary = StandInTranslator(latency=args.latency, tail_rate=args.tail_rate,
+                                    tail_latency=args.tail_latency, fail_rate=args.fail_rate, seed=args.seed)
+        primary.name = "primary"
+        secondary = StandInTranslator(latency=args.latency * 2, seed=args.seed + 1)
+        secondary.name = "secondary"
+        chain = BackendChain([primary, secondary, CacheOnlyBackend()], timeout=args.timeout,
+                             hedge_percentile=hedge_percentile, max_hedges=args.max_hedges, workers=args.workers)
+        latencies: List[float] = []
+        lock = threading.Lock()
+
+        def worker(count: int):
+            for _ in range(count):
+                start = time.perf_counter()
+                chain(strings, "de")
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+
+        per_worker = [args.requests // args.workers + (1 if i < args.requests % args.workers else 0)
+                      for i in range(args.workers)]
+        threads = [threading.Thread(target=worker, args=(n,)) for n in per_worker]
+        wall = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - wall
+        chain.close()
+        return {"wall_s": wall, "latency_ms": latency_summary(latencies), "chain": chain}
+
+    print(f"{args.requests} requests, {args.workers} workers, {args.latency * 1000:.0f} ms base latency, "
+          f"{args.tail_rate:.0%} tail at +{args.tail_latency * 1000:.0f} ms, {args.fail_rate:.0%} failures")
+    print("=" * 60)
+    for label, pct in (("no hedging", None), (f"hedge at p{args.hedge_percentile:g}", args.hedge_percentile)):
+        result = run_once(pct)
+        lat = result["latency_ms"]
+        print(f"{label:<16} p50 {lat['p50']:>7.1f}  p95 {lat['p95']:>7.1f}  p99 {lat['p99']:>7.1f}  "
+              f"max {lat['max']:>7.1f} ms  wall {result['wall_s']:.2f}s")
+        result["chain"].print_summary()
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translation backend fallback chain with hedged requests")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_sim = sub.add_parser("simulate", help="Compare tail latency with and without hedging on stand-in backends")
+    p_sim.add_argument("--requests", type=int, default=400, help="Batches to send (default: 400)")
+    p_sim.add_argument("--workers", type=int, default=4, help="Concurrent callers (default: 4)")
+    p_sim.add_argument("--batch-size", type=int, default=20, help="Strings per batch (default: 20)")
+    p_sim.add_argument("--latency", type=float, default=0.02, help="Base latency in seconds (default: 0.02)")
+    p_sim.add_argument("--tail-rate", type=float, default=0.02, help="Fraction of slow requests (default: 0.02)")
+    p_sim.add_argument("--tail-latency", type=float, default=0.3, help="Extra seconds for slow requests (default: 0.3)")
+    p_sim.add_argument("--fail-rate", type=float, default=0.01, help="Fraction of failing requests (default: 0.01)")
+    p_sim.add_argument("--timeout", type=float, default=1.0, help="Per-request deadline in seconds (default: 1)")
+    p_sim.add_argument("--hedge-percentile", type=float, default=95.0, help="Hedge after this latency percentile (default: 95)")
+    p_sim.add_argument("--max-hedges", type=int, default=1, help="Extra attempts per request (default: 1)")
+    p_sim.add_argument("--seed", type=int, default=1234, help="Random seed for the injected tail and failures")
+    p_sim.set_defaults(func=simulate)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""Per-domain locale bundles built from the domain language matrix.
+
+Each country domain (legacyguard.de, .cz, ...) serves the 4-6 languages the
+matrix lists for it (i18n_markets.py), so its deploy only needs those.  For
+every domain this writes
+
+    <out>/<domain>/<lang>/<namespace>.<hash>.json   minified, content-hashed
+    <out>/<domain>/manifest.json                    namespace -> bundle file
+
+plus ``<out>/index.json`` listing the domains (a ``--domains`` build updates
+its own entries and keeps the others).  The hash is the start of the
+SHA-256 of the minified bytes, so a bundle URL can be cached forever and only
+changes when its content does.  ``[TRANSLATE]`` markers are dropped, so the
+runtime falls back to English for those keys instead of showing the marker
+(``--keep-markers`` keeps them).  The source language is added as the
+fallback to every domain that does not already list it.  Files left over
+from earlier builds are pruned, and unchanged bundles are not rewritten.
+Variant locales registered in src/i18n/variants (i18n_variants.py) are
+resolved from their base and override delta before bundling.
+
+``--compress`` adds precompressed ``.json.gz`` and ``.json.br`` siblings for
+servers and CDNs that serve them directly.  ``--sizes``, ``--report``,
+``--html`` and ``--budget``/``--budgets`` measure every (language, namespace)
+payload raw, gzip and brotli, broken down by language, namespace and
+top-level key (i18n_sizes.py), and exit 1 when a namespace is over budget.
+
+    python3 scripts/i18n_bundles.py                          # all domains -> dist/locales
+    python3 scripts/i18n_bundles.py --domains legacyguard.de legacyguard.cz --dry-run
+    python3 scripts/i18n_bundles.py --compress --html dist/locale-stats.html --budget 20000
+"""
+import argparse
+import hashlib
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from i18n_io import DEFAULT_WRITER, write_json
+from i18n_locales import LocaleTree, delete_path, flatten, is_marker
+from i18n_markets import DEFAULT_MATRIX_PATH, Market, parse_matrix
+from i18n_sizes import (
+    METRICS,
+    Budgets,
+    Sizes,
+    brotli,
+    brotli_bytes,
+    check_budgets,
+    gzip_bytes,
+    minify,
+    print_size_report,
+    size_report,
+    write_html,
+)
+from i18n_trace import add_profile_arguments, profiling, span
+from i18n_variants import DEFAULT_VARIANTS_DIR, materialize_tree
+from translate_locales import DEFAULT_LOCALES_DIR, SOURCE_LANG
+
+DEFAULT_OUT_DIR = Path("dist/locales")
+MANIFEST_NAME = "manifest.json"
+INDEX_NAME = "index.json"
+MANIFEST_VERSION = 1
+HASH_LENGTH = 10
+
+
+def content_hash(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+
+
+def strip_markers(data: Any) -> Tuple[Any, int]:
+    """Copy of ``data`` without ``[TRANSLATE]`` leaves, and how many were dropped."""
+    markers = [path for path, value in flatten(data).items() if is_marker(value)]
+    if not markers:
+        return data, 0
+    data = json.loads(json.dumps(data))
+    for path in markers:
+        delete_path(data, path)
+    return data, len(markers)
+
+
+class Bundle:
+    """One minified (language, namespace) document."""
+
+    def __init__(self, lang: str, namespace: str, payload: bytes, markers: int):
+        self.lang = lang
+        self.namespace = namespace
+        self.payload = payload
+        self.markers = markers
+        self.hash = content_hash(payload)
+        self._gzip: Optional[bytes] = None
+        self._br: Optional[bytes] = None
+        self._sizes: Optional[Sizes] = None
+
+    @property
+    def gzip(self) -> bytes:
+        if self._gzip is None:
+            self._gzip = gzip_bytes(self.payload)
+        return self._gzip
+
+    @property
+    def br(self) -> Optional[bytes]:
+        if self._br is None:
+            self._br = brotli_bytes(self.payload)
+        return self._br
+
+    @property
+    def sizes(self) -> Sizes:
+        if self._sizes is None:
+            self._sizes = Sizes.measure(self.payload, self.gzip, self.br)
+        return self._sizes
+
+    @property
+    def filename(self) -> str:
+        return f"{self.lang}/{self.namespace}.{self.hash}.json"
+
+
+class BundleBuilder:
+    """Builds each (language, namespace) bundle once and lays them out per domain."""
+
+    def __init__(self, tree: LocaleTree, out_dir: Path = DEFAULT_OUT_DIR, namespaces: Optional[List[str]] = None,
+                 fallback: bool = True, keep_markers: bool = False, compress: bool = False, dry_run: bool = False):
+        self.tree = tree
+        self.out_dir = Path(out_dir)
+        self.namespaces = namespaces or tree.namespaces
+        self.fallback = fallback
+        self.keep_markers = keep_markers
+        self.compress = compress
+        self.dry_run = dry_run
+        self._bundles: Dict[Tuple[str, str], Optional[Bundle]] = {}
+        self.written: List[Path] = []
+        self.pruned: List[Path] = []
+
+    def bundle(self, lang: str, namespace: str) -> Optional[Bundle]:
+        key = (lang, namespace)
+        if key not in self._bundles:
+            data = self.tree.get(lang, namespace)
+            if data is None:
+                self._bundles[key] = None
+            else:
+                markers = 0
+                if not self.keep_markers:
+                    data, markers = strip_markers(data)
+                self._bundles[key] = Bundle(lang, namespace, minify(data), markers)
+        return self._bundles[key]
+
+    def languages_for(self, market: Market) -> List[str]:
+        langs = list(dict.fromkeys(market.languages))
+        if self.fallback and self.tree.source_lang not in langs:
+            langs.append(self.tree.source_lang)
+        return langs
+
+    def build(self, market: Market) -> Dict[str, Any]:
+        domain_dir = self.out_dir / market.domain
+        bundles: Dict[str, Dict[str, str]] = {}
+        sizes: Dict[str, Dict[str, Optional[int]]] = {}
+        missing_langs: List[str] = []
+        missing_files: List[str] = []
+        markers = 0
+        keep = set()
+        with span("bundle domain", domain=market.domain):
+            for lang in self.languages_for(market):
+                if lang not in self.tree.languages:
+                    missing_langs.append(lang)
+                    continue
+                bundles[lang] = {}
+                sizes[lang] = {metric: 0 for metric in METRICS} if self.compress else {"raw": 0}
+                for ns in self.namespaces:
+                    bundle = self.bundle(lang, ns)
+                    if bundle is None:
+                        missing_files.append(f"{lang}/{ns}.json")
+                        continue
+                    bundles[lang][ns] = bundle.filename
+                    markers += bundle.markers
+                    path = domain_dir / bundle.filename
+                    variants = [(path, bundle.payload)]
+                    if self.compress:
+                        for metric in METRICS:
+                            value = bundle.sizes.get(metric)
+                            current = sizes[lang][metric]
+                            sizes[lang][metric] = None if value is None or current is None else current + value
+                        variants.append((path.with_name(path.name + ".gz"), bundle.gzip))
+                        if bundle.br is not None:
+                            variants.append((path.with_name(path.name + ".br"), bundle.br))
+                    else:
+                        sizes[lang]["raw"] += len(bundle.payload)
+                    for variant, payload in variants:
+                        keep.add(variant)
+                        if not self.dry_run and DEFAULT_WRITER.write_bytes(variant, payload):
+                            self.written.append(variant)
+        languages = [lang for lang in market.languages if lang in bundles]
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "domain": market.domain,
+            "country": market.country,
+            "tier": market.tier,
+            "languages": languages,
+            "default_language": languages[0] if languages else None,
+            "fallback_language": self.tree.source_lang if self.fallback else None,
+            "namespaces": self.namespaces,
+            "bundles": bundles,
+            "bytes": sizes,
+            "total_bytes": sum(s["raw"] for s in sizes.values()),
+            **({f"total_{m}_bytes": _sum_or_none(s[m] for s in sizes.values()) for m in METRICS[1:]}
+               if self.compress else {}),
+            "markers_dropped": markers,
+            "missing_languages": missing_langs,
+            "missing_files": missing_files,
+        }
+        if not self.dry_run:
+            write_json(domain_dir / MANIFEST_NAME, manifest)
+            self._prune(domain_dir, keep)
+        return manifest
+
+    def _prune(self, domain_dir: Path, keep: set):
+        """Remove bundles of earlier builds that this manifest no longer references."""
+        for path in sorted(domain_dir.glob("*/*.json*")):
+            if path not in keep:
+                path.unlink()
+                self.pruned.append(path)
+
+    def full_tree_bytes(self) -> int:
+        """Minified size of every language, i.e. what one undivided deploy ships."""
+        return sum(len(b.payload) for b in (self.bundle(lang, ns) for lang in self.tree.languages
+                                            for ns in self.namespaces) if b is not None)
+
+    def tree_files(self) -> Dict[Tuple[str, str], Tuple[bytes, Sizes]]:
+        """Every (language, namespace) bundle with its sizes, for the size report."""
+        files = {}
+        for lang in self.tree.languages:
+            for ns in self.namespaces:
+                bundle = self.bundle(lang, ns)
+                if bundle is not None:
+                    files[(lang, ns)] = (bundle.payload, bundle.sizes)
+        return files
+
+
+def _sum_or_none(values) -> Optional[int]:
+    values = list(values)
+    return None if any(v is None for v in values) else sum(values)
+
+
+def write_index(out_dir: Path, manifests: List[Dict[str, Any]], keep: Optional[set] = None):
+    """Write index.json, carrying over existing entries for the domains in ``keep``.
+
+    ``--domains`` rebuilds a subset, and the other domains' bundles are still
+    on disk, so their entries must stay listed.
+    """
+    path = Path(out_dir) / INDEX_NAME
+    domains: Dict[str, Any] = {}
+    if keep and path.exists():
+        try:
+            existing = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[warn] Could not read {path}, rewriting it: {e}", file=sys.stderr)
+            existing = {}
+        if existing.get("version") == MANIFEST_VERSION:
+            domains = {d: entry for d, entry in existing.get("domains", {}).items() if d in keep}
+    for m in manifests:
+        domains[m["domain"]] = {"manifest": f"{m['domain']}/{MANIFEST_NAME}", "languages": m["languages"],
+                                "total_bytes": m["total_bytes"]}
+    index = {
+        "version": MANIFEST_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "domains": domains,
+    }
+    write_json(path, index)
+
+
+def print_report(manifests: List[Dict[str, Any]], full_bytes: int, builder: BundleBuilder):
+    print("\n" + "=" * 60)
+    print("LOCALE BUNDLES PER DOMAIN" + (" (dry run)" if builder.dry_run else ""))
+    print("=" * 60)
+    print(f"{'Domain':<22} {'Languages':<22} {'Files':>6} {'KB':>9} {'Share':>6}")
+    for m in manifests:
+        files = sum(len(per_ns) for per_ns in m["bundles"].values())
+        langs = ",".join(m["bundles"])
+        share = m["total_bytes"] / full_bytes if full_bytes else 0.0
+        print(f"{m['domain']:<22} {langs[:22]:<22} {files:>6} {m['total_bytes'] / 1024:>9,.1f} {share:>6.1%}")
+    print("-" * 60)
+    average = sum(m["total_bytes"] for m in manifests) / len(manifests) if manifests else 0
+    print(f"Full tree: {full_bytes / 1024:,.1f} KB minified; average domain ships {average / 1024:,.1f} KB")
+    missing = sorted({lang for m in manifests for lang in m["missing_languages"]})
+    if missing:
+        print(f"⚠️  Languages in the matrix without locale files: {', '.join(missing)}")
+    dropped = sum(m["markers_dropped"] for m in manifests)
+    if dropped:
+        print(f"  {dropped:,} [TRANSLATE] leaves dropped (English fallback at runtime)")
+    if not builder.dry_run:
+        print(f"✅ {len(builder.written)} files written, {len(builder.pruned)} stale files pruned")
+
+
+def run(args):
+    markets = parse_matrix(Path(args.matrix))
+    # A --domains subset updates its entries in the existing index; the rest stay listed
+    keep = {m.domain for m in markets} if args.domains else None
+    if args.domains:
+        wanted = set(args.domains)
+        unknown = wanted - {m.domain for m in markets}
+        if unknown:
+            print(f"Unknown domain(s): {', '.join(sorted(unknown))}", file=sys.stderr)
+            sys.exit(2)
+        markets = [m for m in markets if m.domain in wanted]
+    if not markets:
+        print(f"No domains found in {args.matrix}", file=sys.stderr)
+        sys.exit(1)
+
+    budgets = None
+    if args.budgets:
+        budgets = Budgets.load(Path(args.budgets), args.budget, args.budget_metric)
+    elif args.budget is not None:
+        budgets = Budgets(args.budget, metric=args.budget_metric or "gzip")
+    if budgets and budgets.metric == "br" and brotli is None:
+        # Without brotli every br size is unknown and the budgets would pass unchecked
+        print("Brotli budgets need the brotli package (pip install brotli)", file=sys.stderr)
+        sys.exit(2)
+
+    languages = sorted({lang for m in markets for lang in m.languages} | {args.source_lang})
+    tree = LocaleTree.load(Path(args.locales_dir), args.source_lang, namespaces=args.namespaces)
+    materialized = materialize_tree(tree, Path(args.variants_dir))
+    if materialized:
+        print(f"Materialized variant locale(s): {', '.join(materialized)}")
+    builder = BundleBuilder(tree, Path(args.out), namespaces=args.namespaces, fallback=not args.no_fallback,
+                            keep_markers=args.keep_markers, compress=args.compress, dry_run=args.dry_run)
+    manifests = [builder.build(market) for market in markets]
+    if not args.dry_run:
+        write_index(Path(args.out), manifests, keep=keep)
+    print_report(manifests, builder.full_tree_bytes(), builder)
+    unused = [lang for lang in tree.languages if lang not in languages]
+    if unused:
+        print(f"  Not served by any selected domain: {', '.join(unused)}")
+
+    if not (args.report or args.html or budgets or args.sizes):
+        return
+    with span("size report"):
+        report = size_report(builder.tree_files())
+    over = check_budgets(report, budgets) if budgets else []
+    print_size_report(report, budgets, over)
+    if budgets:
+        report["budgets"] = budgets.to_json()
+        report["over_budget"] = over
+    if args.report:
+        write_json(Path(args.report), report)
+        print(f"Size report: {args.report}")
+    if args.html:
+        write_html(report, Path(args.html), over)
+        print(f"Size report: {args.html}")
+    if over:
+        sys.exit(1)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Build minified, content-hashed locale bundles per country domain")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source / fallback language code (default: en)")
+    parser.add_argument("--variants-dir", default=str(DEFAULT_VARIANTS_DIR), help="Variant registry and deltas resolved into full locales (see i18n_variants.py)")
+    parser.add_argument("--matrix", default=str(DEFAULT_MATRIX_PATH), help="Domain language matrix markdown file")
+    parser.add_argument("--out", default=str(DEFAULT_OUT_DIR), help="Output directory (default: dist/locales)")
+    parser.add_argument("--domains", nargs="*", help="Only build these domains (e.g. legacyguard.de)")
+    parser.add_argument("--namespaces", nargs="*", help="Only bundle these namespaces")
+    parser.add_argument("--no-fallback", action="store_true", help="Do not add the source language to every domain")
+    parser.add_argument("--keep-markers", action="store_true", help="Ship [TRANSLATE] leaves instead of dropping them")
+    parser.add_argument("--dry-run", action="store_true", help="Report bundle sizes without writing anything")
+    parser.add_argument("--compress", action="store_true", help="Also write .gz and .br (with the brotli package) variants of every bundle")
+    parser.add_argument("--sizes", action="store_true", help="Print raw/gzip/brotli sizes per namespace, language and top-level key")
+    parser.add_argument("--report", help="Write the size report as JSON to this path")
+    parser.add_argument("--html", help="Write the size report as a static HTML page to this path")
+    parser.add_argument("--budget", type=int, help="Byte budget for every namespace's largest file; exit 1 when exceeded")
+    parser.add_argument("--budgets", help="JSON budgets file: {\"metric\": \"gzip\", \"default\": N, \"namespaces\": {ns: N}}")
+    parser.add_argument("--budget-metric", choices=METRICS, help="Size the budgets apply to (default: gzip)")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "i18n_bundles"):
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""Fast structure, marker and placeholder checks for a pre-commit hook.
+
+check_translation_status.py, compare_locales.py and i18n_sync.py all load
+the whole tree, which is too slow for a commit hook.  ``--changed`` takes
+the staged files from ``git diff --cached --name-only`` and loads only the
+namespaces they touch.  A staged target file loads itself plus its English
+source.  A staged English file loads that namespace in every language,
+because a change to English can break any of them.  Each loaded target
+document is checked against English for:
+
+* structure: keys missing from or extra to English, and leaves whose type
+  differs (a string where English has an object, ...);
+* placeholders: the ``{{var}}`` signature differs (i18n_validate.py);
+* markers: ``[TRANSLATE]`` leaves are counted as warnings (errors with
+  ``--strict``); a marker in English is always an error.
+
+With ``--changed`` the documents are read from the git index (one ``git
+cat-file --batch`` call), so the check sees what the commit will contain:
+unstaged edits neither hide nor cause errors.  File arguments and
+whole-tree checks read the working tree.
+
+Timing per phase is printed against a 200 ms budget.  Exceeding the budget
+only warns; the exit status is 1 only for errors.  Without ``--changed`` or
+file arguments, the whole tree is checked.
+
+    python3 scripts/i18n_check.py --changed               # .git/hooks/pre-commit
+    python3 scripts/i18n_check.py src/i18n/locales/de/common.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from i18n_locales import TRANSLATE_MARKER, KeyPath, dotted, flatten, is_marker
+from i18n_trace import add_profile_arguments, profiling, span
+from i18n_validate import placeholder_diff, placeholder_signature
+from translate_locales import DEFAULT_LOCALES_DIR, SOURCE_LANG, load_json
+
+DEFAULT_BUDGET_MS = 200.0
+DEFAULT_SHOW = 5
+
+
+def staged_files() -> List[str]:
+    """Paths staged for commit, relative to the current directory (added, copied, modified, renamed, deleted)."""
+    out = subprocess.run(
+        ["git", "diff", "--cached", "--name-only", "--relative", "--diff-filter=ACMRD", "-z"],
+        capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        print(f"[warn] git diff --cached failed: {out.stderr.strip()}", file=sys.stderr)
+        return []
+    return [p for p in out.stdout.split("\0") if p]
+
+
+def affected_files(paths: List[str], locales_dir: Path, source_lang: str) -> Dict[str, Set[str]]:
+    """``{namespace: languages to check}`` for the given changed paths; ``"*"`` means every language."""
+    root = Path(locales_dir).as_posix().rstrip("/") + "/"
+    affected: Dict[str, Set[str]] = {}
+    for p in paths:
+        p = Path(p).as_posix()
+        if not p.startswith(root) or not p.endswith(".json"):
+            continue
+        parts = p[len(root):].split("/")
+        if len(parts) != 2:
+            continue
+        lang, ns = parts[0], parts[1][:-len(".json")]
+        affected.setdefault(ns, set()).add("*" if lang == source_lang else lang)
+    return affected
+
+
+class WorkingTree:
+    """Locale documents as they are on disk."""
+
+    def __init__(self, locales_dir: Path):
+        self.root = Path(locales_dir)
+
+    def languages(self) -> List[str]:
+        return sorted(d.name for d in self.root.iterdir() if d.is_dir())
+
+    def exists(self, lang: str, ns: str) -> bool:
+        return (self.root / lang / f"{ns}.json").exists()
+
+    def load(self, lang: str, ns: str) -> Any:
+        return load_json(self.root / lang / f"{ns}.json")
+
+
+class StagedTree:
+    """Locale documents of ``namespaces`` as staged in the git index, i.e. what the commit contains."""
+
+    def __init__(self, locales_dir: Path, namespaces: List[str]):
+        self.root = Path(locales_dir)
+        listing = subprocess.run(["git", "ls-files", "--stage", "-z", "--", self.root.as_posix()], capture_output=True)
+        if listing.returncode != 0:
+            raise RuntimeError(f"git ls-files failed: {listing.stderr.decode(errors='replace').strip()}")
+        root = os.path.abspath(self.root)
+        wanted = set(namespaces)
+        shas: Dict[Tuple[str, str], str] = {}
+        for entry in listing.stdout.decode("utf-8").split("\0"):
+            if not entry:
+                continue
+            info, path = entry.split("\t", 1)
+            _mode, sha, stage = info.split()
+            parts = os.path.relpath(os.path.abspath(path), root).split(os.sep)
+            if stage != "0" or len(parts) != 2 or not parts[1].endswith(".json"):
+                continue
+            shas[(parts[0], parts[1][:-len(".json")])] = sha
+        self.staged = set(shas)
+        # Every staged language of the affected namespaces, read in one git call
+        keys = sorted(k for k in shas if k[1] in wanted)
+        self.blobs: Dict[Tuple[str, str], bytes] = {}
+        if keys:
+            batch = subprocess.run(["git", "cat-file", "--batch"], capture_output=True, check=True,
+                                   input="".join(f"{shas[k]}\n" for k in keys).encode())
+            out, pos = batch.stdout, 0
+            for key in keys:
+                header_end = out.index(b"\n", pos)
+                size = int(out[pos:header_end].split()[2])
+                self.blobs[key] = out[header_end + 1:header_end + 1 + size]
+                pos = header_end + 1 + size + 1
+
+    def languages(self) -> List[str]:
+        return sorted({lang for lang, _ns in self.staged})
+
+    def exists(self, lang: str, ns: str) -> bool:
+        return (lang, ns) in self.staged
+
+    def load(self, lang: str, ns: str) -> Any:
+        try:
+            return json.loads(self.blobs[(lang, ns)].decode("utf-8"))
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Invalid JSON in staged {self.root / lang / ns}.json: {e}")
+
+
+class FileCheck:
+    def __init__(self, lang: str, namespace: str):
+        self.lang = lang
+        self.namespace = namespace
+        self.missing: List[KeyPath] = []
+        self.extra: List[KeyPath] = []
+        self.types: List[KeyPath] = []
+        self.placeholders: List[Tuple[KeyPath, List[str], List[str]]] = []
+        self.markers: List[KeyPath] = []
+        self.error: Optional[str] = None
+
+    def errors(self, strict: bool = False, source_lang: str = SOURCE_LANG) -> int:
+        count = len(self.missing) + len(self.extra) + len(self.types) + len(self.placeholders)
+        # Markers are expected in targets between sync and translation, never in English
+        markers = strict or self.lang == source_lang
+        return count + (1 if self.error else 0) + (len(self.markers) if markers else 0)
+
+
+def _leaves(value: Any, path: KeyPath) -> List[KeyPath]:
+    return [path + p for p in flatten(value)] if isinstance(value, dict) else [path]
+
+
+def _compare(en: Dict[str, Any], target: Dict[str, Any], path: KeyPath, result: FileCheck,
+             signatures: Dict[str, Tuple[str, ...]]):
+    """Walk both documents at once; key paths are only built for problems."""
+    for key, value in target.items():
+        if key not in en:
+            result.extra.extend(_leaves(value, path + (key,)))
+            continue
+        src = en[key]
+        if isinstance(src, dict) and isinstance(value, dict):
+            _compare(src, value, path + (key,), result, signatures)
+        elif isinstance(src, dict) or isinstance(value, dict) or isinstance(src, str) != isinstance(value, str):
+            result.types.append(path + (key,))
+        elif src == value or not isinstance(value, str):
+            continue
+        elif value.startswith(TRANSLATE_MARKER):
+            result.markers.append(path + (key,))
+        elif "{" in value or "%(" in value or "{" in src or "%(" in src:
+            # Most leaves have no placeholders on either side and never get here
+            expected = signatures.get(src)
+            if expected is None:
+                expected = signatures[src] = placeholder_signature(src)
+            actual = placeholder_signature(value)
+            if actual != expected:
+                result.placeholders.append((path + (key,), *placeholder_diff(expected, actual)))
+    for key, src in en.items():
+        if key not in target:
+            result.missing.extend(_leaves(src, path + (key,)))
+
+
+def check_document(lang: str, ns: str, source: Dict[str, Any], data: Any,
+                   signatures: Optional[Dict[str, Tuple[str, ...]]] = None) -> FileCheck:
+    """Compare one target document with its English source; ``signatures`` caches English tokenization."""
+    result = FileCheck(lang, ns)
+    if not isinstance(data, dict):
+        result.error = "not a JSON object"
+        return result
+    _compare(source, data, (), result, signatures if signatures is not None else {})
+    return result
+
+
+def _load(files, lang: str, ns: str) -> Tuple[Any, Optional[str]]:
+    try:
+        return files.load(lang, ns), None
+    except Exception as e:
+        return None, str(e)
+
+
+def check_files(files, source_lang: str,
+                affected: Dict[str, Set[str]]) -> Tuple[List[FileCheck], int]:
+    """Check the affected documents of ``files`` (a WorkingTree or StagedTree).
+
+    Returns the results and the number of files loaded.
+    """
+    results: List[FileCheck] = []
+    loaded = 0
+    all_langs: Optional[List[str]] = None
+    for ns, langs in sorted(affected.items()):
+        if not files.exists(source_lang, ns):
+            # English namespace deleted: whatever is left in other languages is orphaned
+            for lang in files.languages():
+                if files.exists(lang, ns):
+                    r = FileCheck(lang, ns)
+                    r.error = f"no English source {files.root / source_lang / ns}.json"
+                    results.append(r)
+            continue
+        en, error = _load(files, source_lang, ns)
+        loaded += 1
+        source = FileCheck(source_lang, ns)
+        if error is not None:
+            source.error = error
+            results.append(source)
+            continue
+        source.markers = [p for p, v in flatten(en).items() if is_marker(v)]
+        results.append(source)
+        # English placeholders are tokenized once per string, shared by every language
+        signatures: Dict[str, Tuple[str, ...]] = {}
+
+        if "*" in langs:
+            if all_langs is None:
+                all_langs = [lang for lang in files.languages() if lang != source_lang]
+            targets = all_langs
+        else:
+            targets = sorted(langs)
+        for lang in targets:
+            if not files.exists(lang, ns):
+                if "*" not in langs:
+                    continue  # the staged change deleted this file
+                r = FileCheck(lang, ns)
+                r.error = "file missing"
+                results.append(r)
+                continue
+            data, error = _load(files, lang, ns)
+            loaded += 1
+            if error is not None:
+                r = FileCheck(lang, ns)
+                r.error = error
+                results.append(r)
+                continue
+            with span("check", file=f"{lang}/{ns}.json"):
+                results.append(check_document(lang, ns, en, data, signatures))
+    return results, loaded
+
+
+def _keys(paths: List[KeyPath], show: int) -> str:
+    shown = ", ".join(dotted(p) for p in paths[:show])
+    return shown + (f" (+{len(paths) - show})" if len(paths) > show else "")
+
+
+def print_results(results: List[FileCheck], source_lang: str, strict: bool, show: int = DEFAULT_SHOW):
+    for r in results:
+        name = f"{r.lang}/{r.namespace}.json"
+        if r.error:
+            print(f"❌ {name}: {r.error}")
+            continue
+        if r.lang == source_lang:
+            if r.markers:
+                print(f"❌ {name}: [TRANSLATE] markers in English: {_keys(r.markers, show)}")
+            continue
+        errors = r.errors(strict, source_lang)
+        if not errors and not r.markers:
+            continue
+        icon = "❌" if errors else "⚠️ "
+        parts = [f"{len(v)} {label}" for label, v in (("missing", r.missing), ("extra", r.extra),
+                 ("type", r.types), ("placeholder", r.placeholders), ("marker", r.markers)) if v]
+        print(f"{icon} {name}: {', '.join(parts)}")
+        if r.missing:
+            print(f"     missing: {_keys(r.missing, show)}")
+        if r.extra:
+            print(f"     extra: {_keys(r.extra, show)}")
+        if r.types:
+            print(f"     type differs from English: {_keys(r.types, show)}")
+        for path, missing, extra in r.placeholders[:show]:
+            detail = ", ".join([f"missing {t}" for t in missing] + [f"extra {t}" for t in extra])
+            print(f"     {dotted(path)}: {detail}")
+
+
+def run(args) -> int:
+    start = time.perf_counter()
+    locales_dir = Path(args.locales_dir)
+    timings: Dict[str, float] = {}
+
+    if args.changed or args.files:
+        t = time.perf_counter()
+        paths = list(args.files or []) + (staged_files() if args.changed else [])
+        timings["git"] = time.perf_counter() - t
+        affected = affected_files(paths, locales_dir, args.source_lang)
+        scope = f"{len(paths)} changed files -> {len(affected)} namespaces"
+    else:
+        affected = {p.stem: {"*"} for p in sorted((locales_dir / args.source_lang).glob("*.json"))}
+        scope = f"all {len(affected)} namespaces"
+    if not affected:
+        print(f"i18n check: no locale files changed ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        return 0
+
+    t = time.perf_counter()
+    files = WorkingTree(locales_dir)
+    if args.changed:
+        try:
+            files = StagedTree(locales_dir, sorted(affected))
+        except (OSError, RuntimeError, subprocess.CalledProcessError) as e:
+            print(f"[warn] Cannot read the git index, checking the working tree: {e}", file=sys.stderr)
+    results, loaded = check_files(files, args.source_lang, affected)
+    timings["load+check"] = time.perf_counter() - t
+
+    print_results(results, args.source_lang, args.strict, args.show)
+    errors = sum(r.errors(args.strict, args.source_lang) for r in results)
+    markers = sum(len(r.markers) for r in results if r.lang != args.source_lang)
+    total_ms = (time.perf_counter() - start) * 1000
+    phases = ", ".join(f"{name} {sec * 1000:.0f} ms" for name, sec in timings.items())
+    budget = "✅" if total_ms <= args.budget_ms else "⚠️  over budget"
+    print("-" * 60)
+    print(f"i18n check ({scope}, {loaded} files loaded): {errors} errors, {markers} [TRANSLATE] markers")
+    print(f"Timing: {phases}, total {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms) {budget}")
+    return 1 if errors else 0
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Check changed locale files against English (pre-commit)")
+    parser.add_argument("files", nargs="*", help="Changed files to check (e.g. passed by a hook runner)")
+    parser.add_argument("--changed", action="store_true", help="Check the files staged for commit, as staged (git diff --cached)")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    parser.add_argument("--strict", action="store_true", help="Treat [TRANSLATE] markers as errors")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help=f"Time budget to report against (default: {DEFAULT_BUDGET_MS:.0f})")
+    parser.add_argument("--show", type=int, default=DEFAULT_SHOW, help=f"Keys listed per problem (default: {DEFAULT_SHOW})")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "i18n_check"):
+        status = run(args)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""Resident i18n service keeping the locale tree, memory and usage index hot.
+
+Every Python tool, scripts/i18n-sync/*.mjs and the .cjs scripts parse the
+whole locale tree (35 languages x the namespaces) on each invocation, which
+costs seconds before any work starts.  This daemon loads it once, together
+with the translation memory and the key usage index (i18n_usage.py), and
+answers JSON requests over localhost HTTP (``--port``) or a Unix socket
+(``--socket``).  Before each request the locale files are stat'ed and only
+those whose mtime or size changed are reparsed, so edits by an editor,
+i18n_watch.py or the other tools are always seen.  Mutations write through
+to disk with the atomic writer.
+
+    GET  /health
+    GET  /status[?langs=de,cs]                    leaves, missing, extra, markers per language
+    GET  /missing?lang=de[&ns=common]             missing keys and [TRANSLATE] markers
+    GET  /get?lang=de&key=common:nav.home         one value
+    POST /lookup     {"lang": "de", "keys": ["common:nav.home", ...]}
+    GET  /usage?key=common:nav.home               is the key referenced from src/?
+    GET  /unused[?ns=common]                      English keys no source file references
+    POST /translate  {"lang": "de", "strings": ["Save", ...]}   memory first, then --backends
+    POST /set        {"lang": "de", "values": {"common:nav.home": "Startseite"}}
+    POST /delete     {"lang": "de", "keys": ["common:old.key"]}
+    POST /reload
+
+Only local clients are served: the Host header (and Origin, when a browser
+sends one) must name localhost, and POST bodies must be
+``application/json``, which a web page cannot send cross-site without a
+preflight.  ``lang`` must be an existing language directory or look like a
+language code, and every write is checked to stay under ``--locales-dir``.
+``/set`` only replaces keys that are strings in English, with values that
+pass the validator (i18n_validate.py); otherwise nothing is written.
+
+Keys are ``namespace:dotted.path`` as in i18next.  Responses carry the
+handling time in ``X-Elapsed-Ms``.  scripts/i18n-daemon-client.mjs is the
+Node client.
+
+    python3 scripts/i18n_daemon.py                             # http://127.0.0.1:8765
+    python3 scripts/i18n_daemon.py --socket .i18n-cache/daemon.sock --backends google,cache
+"""
+import argparse
+import json
+import os
+import re
+import signal
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from i18n_io import write_json
+from i18n_locales import KeyPath, LocaleTree, delete_path, dotted, flatten, is_marker, leaf_at, set_path
+from i18n_tm import DEFAULT_TM_PATH, TranslationMemory
+from i18n_trace import add_profile_arguments, profiling
+from i18n_usage import DEFAULT_INDEX_PATH, DEFAULT_SRC_DIR, UsageIndex
+from i18n_validate import MASK_STYLES, Validator, retry_strings
+from translate_locales import DEFAULT_LOCALES_DIR, SOURCE_LANG, find_project_id_from_credentials, load_json
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Largest request body accepted, in bytes
+MAX_BODY = 16 * 1024 * 1024
+# Language directory names a request may create (de, pt-BR, sr-Latn, ...)
+LANG_CODE = re.compile(r"^[a-z]{2,3}(?:-[A-Za-z0-9]{2,8})*$")
+# Host / Origin names accepted; anything else may be a web page reaching the port (DNS rebinding)
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+# (lang, namespace) -> (mtime_ns, size)
+Stamps = Dict[Tuple[str, str], Tuple[int, int]]
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_key(key: str) -> Tuple[str, KeyPath]:
+    """``"common:nav.home"`` -> ``("common", ("nav", "home"))``."""
+    ns, sep, path = key.partition(":")
+    if not sep or not ns or not path:
+        raise RequestError(400, f"Key {key!r} is not namespace:dotted.path")
+    return ns, tuple(path.split("."))
+
+
+def locale_stamps(root: Path) -> Stamps:
+    stamps: Stamps = {}
+    for lang_entry in os.scandir(root):
+        if not lang_entry.is_dir():
+            continue
+        for entry in os.scandir(lang_entry.path):
+            if entry.name.endswith(".json") and entry.is_file():
+                st = entry.stat()
+                stamps[(lang_entry.name, entry.name[:-len(".json")])] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+class LocaleStore:
+    """A LocaleTree kept in step with the files, with cached flat views and counts."""
+
+    def __init__(self, root: Path = DEFAULT_LOCALES_DIR, source_lang: str = SOURCE_LANG):
+        self.tree = LocaleTree(root, source_lang)
+        self.stamps: Stamps = {}
+        self._flat: Dict[Tuple[str, str], Dict[KeyPath, Any]] = {}
+        self._counts: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.reloads = 0
+
+    @property
+    def source_lang(self) -> str:
+        return self.tree.source_lang
+
+    def _forget(self, lang: str, ns: str):
+        self._flat.pop((lang, ns), None)
+        # Counts compare against English, so an English change invalidates every language
+        if lang == self.source_lang:
+            self._counts = {k: v for k, v in self._counts.items() if k[1] != ns}
+        else:
+            self._counts.pop((lang, ns), None)
+
+    def refresh(self) -> int:
+        """Reparse the files changed on disk since the last call; returns how many."""
+        stamps = locale_stamps(self.tree.root)
+        changed = 0
+        for doc in set(self.stamps) - set(stamps):
+            self.tree.docs.pop(doc, None)
+            self._forget(*doc)
+            changed += 1
+        for doc, stamp in stamps.items():
+            if self.stamps.get(doc) == stamp:
+                continue
+            try:
+                self.tree.docs[doc] = load_json(self.tree.path_for(*doc))
+            except ValueError as e:
+                # Probably caught mid-save; keep the last good copy and retry on the next request
+                print(f"[warn] Cannot parse {self.tree.path_for(*doc)}: {e}", file=sys.stderr)
+                stamps[doc] = self.stamps.get(doc, (0, 0))
+                continue
+            self._forget(*doc)
+            changed += 1
+        self.stamps = stamps
+        self.reloads += changed
+        return changed
+
+    def clear(self):
+        self.stamps = {}
+        self.tree.docs.clear()
+        self._flat.clear()
+        self._counts.clear()
+
+    def flat(self, lang: str, ns: str) -> Dict[KeyPath, Any]:
+        flat = self._flat.get((lang, ns))
+        if flat is None:
+            doc = self.tree.get(lang, ns)
+            flat = self._flat[(lang, ns)] = flatten(doc) if isinstance(doc, dict) else {}
+        return flat
+
+    def counts(self, lang: str, ns: str) -> Dict[str, Any]:
+        counts = self._counts.get((lang, ns))
+        if counts is None:
+            source = self.flat(self.source_lang, ns)
+            target = self.flat(lang, ns)
+            missing = [p for p in source if p not in target]
+            markers = [p for p, v in target.items() if is_marker(v)]
+            counts = self._counts[(lang, ns)] = {
+                "exists": self.tree.get(lang, ns) is not None,
+                "leaves": len(source),
+                "missing": missing,
+                "extra": [p for p in target if p not in source],
+                "markers": markers,
+                "translated": len(source) - len(missing) - len(markers),
+            }
+        return counts
+
+    def path_for(self, lang: str, ns: str) -> Path:
+        """The document path, refused unless it stays under the locales root."""
+        path = self.tree.path_for(lang, ns)
+        root = self.tree.root.resolve()
+        if path.resolve().parent.parent != root:
+            raise RequestError(400, f"{lang}/{ns}.json is outside {self.tree.root}")
+        return path
+
+    def write(self, lang: str, ns: str):
+        path = self.path_for(lang, ns)
+        write_json(path, self.tree.get(lang, ns))
+        st = path.stat()
+        self.stamps[(lang, ns)] = (st.st_mtime_ns, st.st_size)
+        self._forget(lang, ns)
+
+
+class Daemon:
+    def __init__(self, store: LocaleStore, tm: Optional[TranslationMemory] = None, translate_fn: Any = None,
+                 src_dir: Path = DEFAULT_SRC_DIR, usage_index: Path = DEFAULT_INDEX_PATH):
+        self.store = store
+        self.tm = tm
+        self.translate_fn = translate_fn
+        self.validator = Validator()
+        self.src_dir = Path(src_dir)
+        self.usage_path = Path(usage_index)
+        self.usage: Optional[UsageIndex] = None
+        self.started = time.time()
+        self.requests = 0
+        # One request at a time touches the tree; /translate runs outside it
+        self.lock = threading.Lock()
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/status"): self.status,
+            ("GET", "/missing"): self.missing,
+            ("GET", "/get"): self.get,
+            ("POST", "/lookup"): self.lookup,
+            ("GET", "/usage"): self.key_usage,
+            ("GET", "/unused"): self.unused,
+            ("POST", "/set"): self.set_values,
+            ("POST", "/delete"): self.delete_keys,
+            ("POST", "/reload"): self.reload,
+        }
+
+    def handle(self, method: str, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests += 1
+        if (method, path) == ("POST", "/translate"):
+            return self.translate(params)
+        handler = self.routes.get((method, path))
+        if handler is None:
+            raise RequestError(404, f"No route {method} {path}")
+        with self.lock:
+            self.store.refresh()
+            return handler(params)
+
+    def _lang(self, params: Dict[str, Any], must_exist: bool = True) -> str:
+        lang = params.get("lang")
+        if not lang or not isinstance(lang, str):
+            raise RequestError(400, "lang is required")
+        # Existing directories are fine whatever their name; new ones must look like a language code
+        if not LANG_CODE.match(lang) and lang not in self.store.tree.languages:
+            raise RequestError(400, f"Invalid language code {lang!r}")
+        if must_exist and lang not in self.store.tree.languages:
+            raise RequestError(404, f"Unknown language {lang!r}")
+        return lang
+
+    def _usage(self) -> UsageIndex:
+        if self.usage is None:
+            self.usage = UsageIndex.load(self.usage_path)
+        # Rescans only the source files changed since the last query
+        self.usage.update(self.src_dir)
+        if self.usage.rescanned or self.usage.removed:
+            self.usage.save(self.usage_path)
+        return self.usage
+
+    def health(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        tree = self.store.tree
+        return {
+            "ok": True,
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "reloads": self.store.reloads,
+            "languages": len(tree.languages),
+            "namespaces": len(tree.namespaces),
+            "documents": len(tree.docs),
+        }
+
+    def status(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        tree = self.store.tree
+        langs = params["langs"].split(",") if params.get("langs") else tree.target_languages
+        languages = {}
+        for lang in langs:
+            row = {"leaves": 0, "translated": 0, "missing": 0, "extra": 0, "markers": 0, "missing_files": []}
+            for ns in tree.namespaces:
+                c = self.store.counts(lang, ns)
+                if not c["exists"]:
+                    row["missing_files"].append(ns)
+                row["leaves"] += c["leaves"]
+                row["translated"] += c["translated"]
+                for name in ("missing", "extra", "markers"):
+                    row[name] += len(c[name])
+            row["percent"] = round(100.0 * row["translated"] / row["leaves"], 1) if row["leaves"] else 100.0
+            languages[lang] = row
+        return {"source": tree.source_lang, "namespaces": tree.namespaces, "languages": languages}
+
+    def missing(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        lang = self._lang(params, must_exist=False)
+        namespaces = [params["ns"]] if params.get("ns") else self.store.tree.namespaces
+        out = {}
+        for ns in namespaces:
+            if self.store.tree.get(self.store.source_lang, ns) is None:
+                raise RequestError(404, f"Unknown namespace {ns!r}")
+            c = self.store.counts(lang, ns)
+            if c["missing"] or c["markers"]:
+                out[ns] = {"missing": [dotted(p) for p in c["missing"]], "markers": [dotted(p) for p in c["markers"]]}
+        return {"lang": lang, "namespaces": out}
+
+    def get(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        lang = self._lang(params)
+        key = params.get("key")
+        if not key:
+            raise RequestError(400, "key is required")
+        ns, path = parse_key(key if ":" in key or not params.get("ns") else f"{params['ns']}:{key}")
+        value = leaf_at(self.store.tree.get(lang, ns), path)
+        return {"lang": lang, "key": f"{ns}:{dotted(path)}", "value": value, "found": value is not None}
+
+    def lookup(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        lang = self._lang(params)
+        values = {}
+        for key in params.get("keys") or []:
+            ns, path = parse_key(key)
+            values[key] = leaf_at(self.store.tree.get(lang, ns), path)
+        return {"lang": lang, "values": values}
+
+    def key_usage(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        ns, path = parse_key(params.get("key") or "")
+        return {"key": f"{ns}:{dotted(path)}", "used": self._usage().scope().is_used(ns, path)}
+
+    def unused(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        scope = self._usage().scope()
+        namespaces = [params["ns"]] if params.get("ns") else self.store.tree.namespaces
+        out = {}
+        for ns in namespaces:
+            keys = [dotted(p) for p in self.store.flat(self.store.source_lang, ns) if not scope.is_used(ns, p)]
+            if keys:
+                out[ns] = keys
+        return {"unused": out, "count": sum(len(v) for v in out.values())}
+
+    def translate(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        lang = self._lang(params, must_exist=False)
+        strings = params.get("strings")
+        if not isinstance(strings, list) or not all(isinstance(s, str) for s in strings):
+            raise RequestError(400, "strings must be a list of strings")
+        unique = list(dict.fromkeys(strings))
+        known = self.tm.lookup(lang, unique) if self.tm is not None else {}
+        todo = [s for s in unique if s not in known]
+        issues: Dict[str, List[str]] = {}
+        if todo:
+            if self.translate_fn is None:
+                raise RequestError(503, f"{len(todo)} strings are not in the memory and no backend is configured")
+            texts, found = retry_strings(todo, self.translate_fn, lang, self.validator, styles=MASK_STYLES)
+            learned = []
+            for source, text, problems in zip(todo, texts, found):
+                if text is None:
+                    issues[source] = problems
+                else:
+                    known[source] = text
+                    learned.append((source, text))
+            if self.tm is not None and learned:
+                self.tm.store(lang, learned)
+        return {
+            "lang": lang,
+            "translations": [known.get(s) for s in strings],
+            "from_memory": len(unique) - len(todo),
+            "failed": issues,
+        }
+
+    def set_values(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        lang = self._lang(params, must_exist=False)
+        values = params.get("values")
+        if not isinstance(values, dict) or not values:
+            raise RequestError(400, "values must be an object of namespace:key -> value")
+        tree = self.store.tree
+        # Check every value before touching anything, so a bad one leaves the files as they were
+        updates = []
+        for key, value in values.items():
+            ns, path = parse_key(key)
+            source = tree.get(tree.source_lang, ns)
+            if source is None:
+                raise RequestError(404, f"Unknown namespace {ns!r}")
+            english = leaf_at(source, path)
+            # set_path walks objects only; a path through a list would replace the list
+            if not isinstance(english, str) or not all(isinstance(leaf_at(source, path[:i]), dict)
+                                                       for i in range(len(path))):
+                raise RequestError(400, f"{key} is not a string in {tree.source_lang}/{ns}.json")
+            if not isinstance(value, str):
+                raise RequestError(400, f"{key}: value must be a string")
+            issues = self.validator.check(english, value)
+            if issues:
+                raise RequestError(422, f"{key}: {value!r} fails the {', '.join(issues)} check against {english!r}")
+            self.store.path_for(lang, ns)
+            updates.append((ns, path, value))
+
+        touched = set()
+        for ns, path, value in updates:
+            doc = tree.get(lang, ns)
+            if doc is None:
+                doc = {}
+                tree.docs[(lang, ns)] = doc
+            set_path(doc, path, value)
+            touched.add(ns)
+        for ns in sorted(touched):
+            self.store.write(lang, ns)
+        return {"lang": lang, "updated": len(updates), "files": sorted(touched)}
+
+    def delete_keys(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        lang = self._lang(params)
+        touched = set()
+        deleted = 0
+        for key in params.get("keys") or []:
+            ns, path = parse_key(key)
+            doc = self.store.tree.get(lang, ns)
+            if isinstance(doc, dict) and delete_path(doc, path):
+                deleted += 1
+                touched.add(ns)
+        for ns in sorted(touched):
+            self.store.write(lang, ns)
+        return {"lang": lang, "deleted": deleted, "files": sorted(touched)}
+
+    def reload(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.store.clear()
+        return {"reloaded": self.store.refresh()}
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    server_version = "i18n-daemon/1"
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self, method: str):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        params: Dict[str, Any] = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            self._check_origin()
+            if method == "POST":
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_BODY:
+                    self.close_connection = True
+                    raise RequestError(413, f"Body over {MAX_BODY} bytes")
+                content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+                if content_type != "application/json":
+                    # A page can only send text/plain or form bodies cross-site without a preflight
+                    self.close_connection = True
+                    raise RequestError(415, "Content-Type must be application/json")
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                if not isinstance(body, dict):
+                    raise RequestError(400, "Body must be a JSON object")
+                params.update(body)
+            status, payload = 200, self.server.daemon.handle(method, url.path, params)
+        except RequestError as e:
+            status, payload = e.status, {"error": str(e)}
+        except json.JSONDecodeError as e:
+            status, payload = 400, {"error": f"Invalid JSON: {e}"}
+        except Exception as e:
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("X-Elapsed-Ms", f"{(time.perf_counter() - start) * 1000:.1f}")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _check_origin(self):
+        """Refuse requests a browser sends on behalf of a non-local page."""
+        host = urlsplit(f"//{self.headers.get('Host') or ''}").hostname
+        if host not in LOCAL_HOSTS:
+            self.close_connection = True
+            raise RequestError(403, f"Host {self.headers.get('Host')!r} is not local")
+        origin = self.headers.get("Origin")
+        if origin is not None and urlsplit(origin).hostname not in LOCAL_HOSTS:
+            self.close_connection = True
+            raise RequestError(403, f"Origin {origin!r} is not allowed")
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(daemon: Daemon, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                socket_path: Optional[Path] = None, verbose: bool = False):
+    if socket_path is not None:
+        socket_path = Path(socket_path)
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if socket_path.exists():
+            socket_path.unlink()  # left behind by a daemon that did not shut down cleanly
+        server = UnixHTTPServer(str(socket_path), DaemonHandler)
+        os.chmod(socket_path, 0o600)
+    else:
+        server = ThreadingHTTPServer((host, port), DaemonHandler)
+        server.daemon_threads = True
+    server.daemon = daemon
+    server.verbose = verbose
+    return server
+
+
+def run(args):
+    locales_dir = Path(args.locales_dir)
+    if not (locales_dir / args.source_lang).is_dir():
+        print(f"Source locale directory not found: {locales_dir / args.source_lang}", file=sys.stderr)
+        sys.exit(1)
+
+    from i18n_backends import build_chain, parse_backends
+
+    try:
+        names = parse_backends(args.backends)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(2)
+    project_id = None
+    if "google" in names:
+        creds = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+        if not creds:
+            print("GOOGLE_APPLICATION_CREDENTIALS is not set. Please export it to your JSON key path.", file=sys.stderr)
+            sys.exit(1)
+        project_id = find_project_id_from_credentials(Path(creds))
+
+    start = time.perf_counter()
+    store = LocaleStore(locales_dir, args.source_lang)
+    store.refresh()
+    tm = None if args.no_cache else TranslationMemory(Path(args.tm))
+    chain = build_chain(names, project_id, location=args.location, tm=tm, timeout=args.request_timeout)
+    daemon = Daemon(store, tm, chain, Path(args.src_dir), Path(args.usage_index))
+    server = make_server(daemon, args.host, args.port, Path(args.socket) if args.socket else None, args.verbose)
+    where = args.socket or f"http://{args.host}:{args.port}"
+    print(f"i18n daemon: {len(store.tree.docs)} documents loaded in {time.perf_counter() - start:.2f}s, "
+          f"listening on {where}")
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    # A service manager stops the daemon with SIGTERM; shut down as for Ctrl-C
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        server.server_close()
+        if args.socket:
+            Path(args.socket).unlink(missing_ok=True)
+        chain.close()
+        if tm is not None:
+            tm.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Serve the locale tree, memory and usage index from memory")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--socket", help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--backends", default="cache", help="Chain for /translate misses, e.g. google,cache (default: cache)")
+    parser.add_argument("--location", default="global", help="Translation location (e.g., global or us-central1)")
+    parser.add_argument("--request-timeout", type=float, help="Seconds per request before falling back to the next backend")
+    parser.add_argument("--tm", default=str(DEFAULT_TM_PATH), help="Translation memory consulted and updated")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or update the translation memory")
+    parser.add_argument("--src-dir", default=str(DEFAULT_SRC_DIR), help="Source root scanned for key usage (default: src)")
+    parser.add_argument("--usage-index", default=str(DEFAULT_INDEX_PATH), help="Cached usage index (see i18n_usage.py)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "i18n_daemon"):
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
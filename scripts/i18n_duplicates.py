@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Index of identical English strings stored under different keys.
+
+"Cancel", "Save" and many error messages are stored under dozens of keys
+across namespaces, and every copy is stored, shipped and translated into
+every language.  This builds a reverse index over the English tree,
+``normalized text -> [(namespace, key path), ...]``.  Text is normalized
+with Unicode NFC and collapsed whitespace; ``--ignore-case`` also folds
+case.  Candidates are ranked by what consolidating them into one shared
+key would save:
+
+* bytes: the minified ``"key":"value",`` of every copy but one, summed over
+  all languages that have it;
+* API characters: the English text of every copy but one, times the number
+  of target languages.  This is what a full retranslation bills.
+  Incremental runs already pay less, because the pipeline deduplicates
+  strings within a run and the translation memory answers repeats.
+
+Every target language is indexed through the same groups.  A group whose
+copies are translated differently in one language is reported as
+inconsistent, with each variant and its keys, so the duplicates can be
+reviewed before they are merged.
+
+    python3 scripts/i18n_duplicates.py
+    python3 scripts/i18n_duplicates.py --min-copies 3 --top 50 --output duplicates.json
+"""
+import argparse
+import re
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from i18n_io import write_json
+from i18n_locales import KeyPath, LocaleTree, dotted, is_marker, leaf_at
+from i18n_sizes import minify
+from i18n_trace import add_profile_arguments, profiling, span
+from translate_locales import DEFAULT_LOCALES_DIR, SOURCE_LANG
+
+DEFAULT_MIN_COPIES = 2
+DEFAULT_MIN_LENGTH = 2
+DEFAULT_TOP = 25
+# Namespace a shared key would live in; preferred as the copy to keep
+SHARED_NAMESPACE = "common"
+
+WHITESPACE = re.compile(r"\s+")
+
+Location = Tuple[str, KeyPath]
+
+
+def normalize(text: str, ignore_case: bool = False) -> str:
+    text = WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+    return text.casefold() if ignore_case else text
+
+
+def _leaf_bytes(path: KeyPath, value: Any) -> int:
+    """Minified ``"key":value,`` one copy adds to its file."""
+    return len(minify({path[-1]: value})) - 1
+
+
+class DuplicateGroup:
+    """One English text and every key that stores it."""
+
+    def __init__(self, text: str, locations: List[Location]):
+        self.text = text
+        self.locations = locations
+        self.bytes_saved = 0
+        self.api_chars_saved = 0
+        # lang -> {translation: [locations]} for languages with more than one variant
+        self.inconsistent: Dict[str, Dict[str, List[Location]]] = {}
+
+    @property
+    def copies(self) -> int:
+        return len(self.locations)
+
+    @property
+    def namespaces(self) -> List[str]:
+        return sorted({ns for ns, _path in self.locations})
+
+    @property
+    def keep(self) -> Location:
+        """The copy consolidation would keep: one in the shared namespace, else the first."""
+        for loc in self.locations:
+            if loc[0] == SHARED_NAMESPACE:
+                return loc
+        return self.locations[0]
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "text": self.text,
+            "copies": self.copies,
+            "namespaces": self.namespaces,
+            "keep": f"{self.keep[0]}:{dotted(self.keep[1])}",
+            "keys": [f"{ns}:{dotted(path)}" for ns, path in self.locations],
+            "bytes_saved": self.bytes_saved,
+            "api_chars_saved": self.api_chars_saved,
+            "inconsistent": {
+                lang: {text: [f"{ns}:{dotted(path)}" for ns, path in locs] for text, locs in variants.items()}
+                for lang, variants in sorted(self.inconsistent.items())
+            },
+        }
+
+
+def build_index(tree: LocaleTree, ignore_case: bool = False,
+                min_length: int = DEFAULT_MIN_LENGTH) -> Dict[str, List[Location]]:
+    """``normalized English text -> locations``, in namespace/key order."""
+    index: Dict[str, List[Location]] = {}
+    for ns, path, value in tree.iter_strings(tree.source_lang):
+        if is_marker(value):
+            continue
+        key = normalize(value, ignore_case)
+        if len(key) >= min_length:
+            index.setdefault(key, []).append((ns, path))
+    return index
+
+
+def find_duplicates(tree: LocaleTree, languages: Optional[List[str]] = None, ignore_case: bool = False,
+                    min_copies: int = DEFAULT_MIN_COPIES,
+                    min_length: int = DEFAULT_MIN_LENGTH) -> List[DuplicateGroup]:
+    """Groups with at least ``min_copies`` keys, most bytes saved first."""
+    with span("index", lang=tree.source_lang):
+        index = build_index(tree, ignore_case, min_length)
+    langs = languages or tree.target_languages
+    groups = []
+    for _key, locations in index.items():
+        if len(locations) < min_copies:
+            continue
+        ns, path = locations[0]
+        groups.append(DuplicateGroup(leaf_at(tree.get(tree.source_lang, ns), path), locations))
+
+    for lang in [tree.source_lang] + langs:
+        with span("check", lang=lang):
+            for group in groups:
+                keep = group.keep
+                variants: Dict[str, List[Location]] = {}
+                for ns, path in group.locations:
+                    value = leaf_at(tree.get(lang, ns), path)
+                    if not isinstance(value, str):
+                        continue
+                    if (ns, path) != keep:
+                        group.bytes_saved += _leaf_bytes(path, value)
+                    if lang != tree.source_lang and value.strip() and not is_marker(value):
+                        variants.setdefault(normalize(value), []).append((ns, path))
+                if len(variants) > 1:
+                    group.inconsistent[lang] = variants
+    for group in groups:
+        group.api_chars_saved = len(group.text) * (group.copies - 1) * len(langs)
+    groups.sort(key=lambda g: (-g.bytes_saved, -g.copies, g.text))
+    return groups
+
+
+def summarize(groups: List[DuplicateGroup], languages: List[str]) -> Dict[str, Any]:
+    per_lang = {lang: sum(1 for g in groups if lang in g.inconsistent) for lang in languages}
+    return {
+        "groups": len(groups),
+        "redundant_keys": sum(g.copies - 1 for g in groups),
+        "bytes_saved": sum(g.bytes_saved for g in groups),
+        "api_chars_saved": sum(g.api_chars_saved for g in groups),
+        "inconsistent_groups": sum(1 for g in groups if g.inconsistent),
+        "inconsistent_by_language": {lang: n for lang, n in sorted(per_lang.items()) if n},
+    }
+
+
+def print_report(groups: List[DuplicateGroup], summary: Dict[str, Any], top: int = DEFAULT_TOP,
+                 show_variants: int = 3):
+    print("\n" + "=" * 60)
+    print("DUPLICATE ENGLISH STRINGS")
+    print("=" * 60)
+    print(f"{'Text':<30} {'Copies':>6} {'NS':>3} {'KB saved':>9} {'API chars':>10} {'Incons.':>7}")
+    for g in groups[:top]:
+        text = g.text.replace("\n", " ")
+        text = text if len(text) <= 30 else text[:29] + "…"
+        print(f"{text:<30} {g.copies:>6} {len(g.namespaces):>3} {g.bytes_saved / 1024:>9,.1f} "
+              f"{g.api_chars_saved:>10,} {len(g.inconsistent):>7}")
+    print("-" * 60)
+    print(f"{summary['groups']:,} duplicated strings, {summary['redundant_keys']:,} redundant keys: "
+          f"{summary['bytes_saved'] / 1024:,.1f} KB across all languages, "
+          f"{summary['api_chars_saved']:,} API characters per full retranslation")
+
+    if not summary["inconsistent_groups"]:
+        print("\n✅ Every duplicated string is translated consistently")
+        return
+    print(f"\n⚠️  {summary['inconsistent_groups']:,} duplicated strings are translated inconsistently")
+    print("   " + ", ".join(f"{lang}: {n}" for lang, n in summary["inconsistent_by_language"].items()))
+    shown = [g for g in groups if g.inconsistent][:show_variants]
+    for g in shown:
+        lang, variants = max(g.inconsistent.items(), key=lambda kv: len(kv[1]))
+        print(f"   {g.text[:40]!r} in {lang}:")
+        for text, locs in variants.items():
+            keys = ", ".join(f"{ns}:{dotted(path)}" for ns, path in locs[:3])
+            more = f" (+{len(locs) - 3})" if len(locs) > 3 else ""
+            print(f"      {text[:40]!r} <- {keys}{more}")
+
+
+def run(args):
+    tree = LocaleTree.load(Path(args.locales_dir), args.source_lang)
+    langs = args.langs or tree.target_languages
+    groups = find_duplicates(tree, langs, args.ignore_case, args.min_copies, args.min_length)
+    summary = summarize(groups, langs)
+    print_report(groups, summary, args.top)
+    if args.output:
+        write_json(Path(args.output), {"summary": summary, "groups": [g.to_json() for g in groups]})
+        print(f"\nIndex: {args.output}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Find identical English strings stored under several keys")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    parser.add_argument("--langs", nargs="*", help="Target languages to check (default: all)")
+    parser.add_argument("--ignore-case", action="store_true", help="Treat strings differing only in case as duplicates")
+    parser.add_argument("--min-copies", type=int, default=DEFAULT_MIN_COPIES,
+                        help=f"Only report strings stored under at least this many keys (default: {DEFAULT_MIN_COPIES})")
+    parser.add_argument("--min-length", type=int, default=DEFAULT_MIN_LENGTH,
+                        help=f"Ignore strings shorter than this (default: {DEFAULT_MIN_LENGTH})")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"Candidates to print (default: {DEFAULT_TOP})")
+    parser.add_argument("--output", help="Write the full index and per-language inconsistencies as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "i18n_duplicates"):
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Seed the translation memory with the translations already in the locale tree.
+
+Every target leaf is aligned with the English leaf at the same key path of
+the same namespace.  A pair is kept only if the target is a non-empty string,
+not a ``[TRANSLATE]`` marker, different from the English text, and carries
+the same placeholders.  When one English string is translated differently
+under different keys, the most frequent translation wins; ties go to the
+first in namespace/key order.
+
+Harvested pairs (origin ``harvest``) replace machine translations and earlier
+harvests, never TMX imports.  After harvesting, translate_locales.py answers
+every English string the tree already translates from the memory, so new keys
+reusing known text never reach the API.
+
+    python3 scripts/i18n_harvest.py harvest                # into .i18n-cache/tm.sqlite
+    python3 scripts/i18n_harvest.py harvest --dry-run --langs de cs
+    python3 scripts/i18n_harvest.py export-tmx memory.tmx  # for CAT tools / vendors
+    python3 scripts/i18n_harvest.py import-tmx vendor.tmx
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from i18n_locales import LocaleTree, is_marker, leaf_at
+from i18n_tm import DEFAULT_TM_PATH, TranslationMemory, export_tmx, read_tmx
+from i18n_trace import add_profile_arguments, profiling, span
+from translate_locales import DEFAULT_LOCALES_DIR, SOURCE_LANG, iter_json_leaves, protect_placeholders
+
+HARVEST_ORIGIN = "harvest"
+TMX_ORIGIN = "tmx"
+
+
+class LanguageHarvest:
+    """Aligned pairs and skip counts for one target language."""
+
+    def __init__(self, lang: str):
+        self.lang = lang
+        # English source -> {translation: occurrences}, in first-seen order
+        self.candidates: Dict[str, Dict[str, int]] = {}
+        self.leaves = 0
+        self.missing = 0
+        self.markers = 0
+        self.identical = 0
+        self.placeholders = 0
+
+    def add(self, source: str, target: str):
+        counts = self.candidates.setdefault(source, {})
+        counts[target] = counts.get(target, 0) + 1
+
+    @property
+    def conflicts(self) -> int:
+        return sum(1 for counts in self.candidates.values() if len(counts) > 1)
+
+    def pairs(self) -> List[Tuple[str, str]]:
+        # max() keeps the first of equally frequent translations
+        return [(source, max(counts.items(), key=lambda kv: kv[1])[0])
+                for source, counts in self.candidates.items()]
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "leaves": self.leaves,
+            "pairs": len(self.candidates),
+            "conflicts": self.conflicts,
+            "missing": self.missing,
+            "markers": self.markers,
+            "identical": self.identical,
+            "placeholder_mismatch": self.placeholders,
+        }
+
+
+def _placeholders(text: str) -> List[str]:
+    return sorted(protect_placeholders(text)[1].values())
+
+
+def harvest_tree(tree: LocaleTree, languages: Optional[List[str]] = None) -> Dict[str, LanguageHarvest]:
+    langs = languages or tree.target_languages
+    results = {lang: LanguageHarvest(lang) for lang in langs}
+    for ns in tree.namespaces:
+        en_data = tree.get(tree.source_lang, ns)
+        sources = [(path, text, _placeholders(text)) for path, text in iter_json_leaves(en_data) if text.strip()]
+        for lang in langs:
+            result = results[lang]
+            data = tree.get(lang, ns)
+            with span("align", file=f"{lang}/{ns}.json"):
+                for path, text, placeholders in sources:
+                    result.leaves += 1
+                    target = leaf_at(data, path)
+                    if not isinstance(target, str) or not target.strip():
+                        result.missing += 1
+                    elif is_marker(target):
+                        result.markers += 1
+                    elif target == text:
+                        result.identical += 1
+                    elif _placeholders(target) != placeholders:
+                        result.placeholders += 1
+                    else:
+                        result.add(text, target)
+    return results
+
+
+def print_harvest(results: Dict[str, LanguageHarvest], stored: Dict[str, int], dry_run: bool):
+    print("\n" + "=" * 60)
+    print("TRANSLATION MEMORY HARVEST" + (" (dry run)" if dry_run else ""))
+    print("=" * 60)
+    print(f"{'Lang':<6} {'Pairs':>7} {'Stored':>7} {'Conflict':>9} {'Marker':>7} {'Same':>6} {'Placeh.':>8} {'Missing':>8}")
+    totals = {"pairs": 0, "stored": 0}
+    for lang, result in sorted(results.items()):
+        row = result.to_json()
+        totals["pairs"] += row["pairs"]
+        totals["stored"] += stored.get(lang, 0)
+        print(f"{lang:<6} {row['pairs']:>7,} {stored.get(lang, 0):>7,} {row['conflicts']:>9,} {row['markers']:>7,} "
+              f"{row['identical']:>6,} {row['placeholder_mismatch']:>8,} {row['missing']:>8,}")
+    print("-" * 60)
+    verb = "would be offered to" if dry_run else "added to or updated in"
+    print(f"✅ {totals['pairs']:,} pairs harvested, {totals['stored']:,} {verb} the translation memory")
+
+
+def harvest(args):
+    tree = LocaleTree.load(Path(args.locales_dir), args.source_lang)
+    results = harvest_tree(tree, args.langs)
+    stored: Dict[str, int] = {}
+    if args.dry_run:
+        stored = {lang: len(r.candidates) for lang, r in results.items()}
+    else:
+        replace = None if args.overwrite else ("mt", HARVEST_ORIGIN)
+        with TranslationMemory(Path(args.tm)) as tm:
+            for lang, result in results.items():
+                stored[lang] = tm.store(lang, result.pairs(), origin=HARVEST_ORIGIN, replace_origins=replace)
+    print_harvest(results, stored, args.dry_run)
+
+
+def export_cmd(args):
+    with TranslationMemory(Path(args.tm)) as tm:
+        count = export_tmx(tm, Path(args.output), args.source_lang, args.langs)
+    print(f"✅ Exported {count:,} translation units to {args.output}")
+
+
+def import_cmd(args):
+    pairs = read_tmx(Path(args.input), args.source_lang)
+    if args.langs:
+        pairs = {lang: p for lang, p in pairs.items() if lang in set(args.langs)}
+    replace = None if args.overwrite else ("mt", TMX_ORIGIN)
+    total = stored = 0
+    with TranslationMemory(Path(args.tm)) as tm:
+        for lang, lang_pairs in sorted(pairs.items()):
+            changed = tm.store(lang, lang_pairs, origin=TMX_ORIGIN, replace_origins=replace)
+            total += len(lang_pairs)
+            stored += changed
+            print(f"  {lang:<6} {len(lang_pairs):>7,} pairs, {changed:>7,} added or updated")
+    if not pairs:
+        print(f"No {args.source_lang} -> target pairs found in {args.input}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✅ Imported {total:,} pairs from {args.input} ({stored:,} added or updated)")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Seed and exchange the translation memory")
+    parser.add_argument("--tm", default=str(DEFAULT_TM_PATH), help="Translation memory database")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_harvest = sub.add_parser("harvest", help="Align existing translations with English and load them")
+    p_harvest.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    p_harvest.add_argument("--langs", nargs="*", help="Only harvest these target languages")
+    p_harvest.add_argument("--dry-run", action="store_true", help="Report the pairs without touching the memory")
+    p_harvest.add_argument("--overwrite", action="store_true", help="Also replace entries imported from TMX")
+    p_harvest.set_defaults(func=harvest)
+
+    p_export = sub.add_parser("export-tmx", help="Write the translation memory as TMX 1.4")
+    p_export.add_argument("output", help="TMX file to write")
+    p_export.add_argument("--langs", nargs="*", help="Only export these target languages")
+    p_export.set_defaults(func=export_cmd)
+
+    p_import = sub.add_parser("import-tmx", help="Load a TMX file into the translation memory")
+    p_import.add_argument("input", help="TMX file to read")
+    p_import.add_argument("--langs", nargs="*", help="Only import these target languages")
+    p_import.add_argument("--overwrite", action="store_true", help="Also replace harvested entries")
+    p_import.set_defaults(func=import_cmd)
+
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "i18n_harvest"):
+        args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Atomic, write-only-if-changed JSON output shared by the i18n tools.
+
+Every file is serialized to a buffer first and compared (size, then SHA-256)
+with what is already on disk; identical output is skipped so mtimes stay put
+and Vite HMR / downstream builds are not invalidated.  Real writes go to a
+temp file in the same directory followed by ``os.replace``, so a crashed or
+killed process never leaves a truncated locale file behind.
+
+Surviving a power loss or kernel crash depends on the fsync policy
+(``JsonWriter(fsync=...)`` or the ``I18N_FSYNC`` environment variable for the
+shared writer):
+
+* ``each``  - fsync the temp file before the rename and the directory after
+  it: every returned write is durable, old or new content, never empty.
+* ``batch`` - fsync everything written so far on ``flush()`` / at exit
+  (default).  The rename happens before the data is synced, so until the
+  flush a power loss can leave a file empty or truncated, as with a plain
+  write; after it the files are durable.
+* ``none``  - rely on the OS to flush (fastest, same risk as ``batch``
+  without the final sync).
+"""
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, List, Set
+
+FSYNC_MODES = ("none", "each", "batch")
+
+
+def dumps_json(data: Any) -> bytes:
+    # Do not sort keys to avoid issues when mixed numeric-like keys appear
+    return (json.dumps(data, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+def _fsync_path(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class JsonWriter:
+    def __init__(self, fsync: str = "batch"):
+        if fsync not in FSYNC_MODES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_MODES)}, got {fsync!r}")
+        self.fsync = fsync
+        self.written: List[Path] = []
+        self.skipped: List[Path] = []
+        self.bytes_written = 0
+        self._unsynced: Set[Path] = set()
+
+    def __enter__(self) -> "JsonWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def write(self, path: Path, data: Any) -> bool:
+        return self.write_bytes(path, dumps_json(data))
+
+    def write_bytes(self, path: Path, payload: bytes) -> bool:
+        """Write ``payload`` unless the file already holds it. Returns True if written."""
+        path = Path(path)
+        if self.unchanged(path, payload):
+            self.skipped.append(path)
+            return False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+                if self.fsync == "each":
+                    f.flush()
+                    os.fsync(f.fileno())
+            # mkstemp creates 0600; keep the existing mode or fall back to the umask default
+            try:
+                mode = path.stat().st_mode & 0o777
+            except FileNotFoundError:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+            os.chmod(tmp, mode)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+        if self.fsync == "each":
+            _fsync_path(path.parent)
+        elif self.fsync == "batch":
+            self._unsynced.add(path)
+        self.written.append(path)
+        self.bytes_written += len(payload)
+        return True
+
+    @staticmethod
+    def unchanged(path: Path, payload: bytes) -> bool:
+        try:
+            if path.stat().st_size != len(payload):
+                return False
+            existing = path.read_bytes()
+        except FileNotFoundError:
+            return False
+        return hashlib.sha256(existing).digest() == hashlib.sha256(payload).digest()
+
+    def flush(self):
+        """fsync files written in batch mode, then their directories (once each).
+
+        Files deleted since they were written (e.g. pruned stale bundles) are
+        skipped; their directories are still synced so the deletion is durable.
+        """
+        if not self._unsynced:
+            return
+        dirs = set()
+        for path in sorted(self._unsynced):
+            try:
+                _fsync_path(path)
+            except FileNotFoundError:
+                pass
+            dirs.add(path.parent)
+        for d in sorted(dirs):
+            try:
+                _fsync_path(d)
+            except FileNotFoundError:
+                pass
+        self._unsynced.clear()
+
+
+DEFAULT_WRITER = JsonWriter(fsync=os.environ.get("I18N_FSYNC", "batch"))
+atexit.register(DEFAULT_WRITER.flush)
+
+
+def write_json(path: Path, data: Any) -> bool:
+    """Write ``data`` through the shared writer. Returns False if the file was already identical."""
+    return DEFAULT_WRITER.write(path, data)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Offline character n-gram language identification for locale leaves.
+
+compare_locales.py only flags values that are identical to English.  This
+tool trains a compact n-gram profile per language from the locale files
+themselves and scores every string leaf of every target language against
+its own profile and the English one.  Leaves that look more English than
+their own language are ranked first; ``--mark`` re-queues them by turning
+them back into ``[TRANSLATE] <English>`` markers, which translate_common.py
+and the other tools already pick up.
+
+    python3 scripts/i18n_langid.py --top 50
+    python3 scripts/i18n_langid.py --mark --threshold 0.5
+"""
+import argparse
+import json
+import math
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from i18n_locales import LocaleTree, TRANSLATE_MARKER, dotted, is_marker, set_path
+from i18n_trace import add_profile_arguments, profiling, span
+from translate_locales import DEFAULT_LOCALES_DIR, PLACEHOLDER_PATTERNS, SOURCE_LANG
+
+NGRAM_SIZES = (1, 2, 3)
+PROFILE_SIZE = 400  # n-grams kept per language
+MIN_LETTERS = 4  # shorter values carry too little signal to score
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+NON_LETTERS = re.compile(r"[^\w']+|[\d_]+")
+
+
+def normalize(text: str) -> str:
+    for pattern in PLACEHOLDER_PATTERNS:
+        text = pattern.sub(" ", text)
+    text = TAG_PATTERN.sub(" ", text)
+    text = NON_LETTERS.sub(" ", text.lower()).strip()
+    return f" {text} " if text else ""
+
+
+def ngrams(text: str) -> Iterable[str]:
+    for n in NGRAM_SIZES:
+        for i in range(len(text) - n + 1):
+            gram = text[i:i + n]
+            if not gram.isspace():
+                yield gram
+
+
+class Profile:
+    """Log-probabilities of the most frequent n-grams of one language."""
+
+    def __init__(self, lang: str, logprobs: Dict[str, float], floor: float):
+        self.lang = lang
+        self.logprobs = logprobs
+        self.floor = floor
+
+    @classmethod
+    def train(cls, lang: str, texts: Iterable[str], size: int = PROFILE_SIZE) -> "Profile":
+        counts: Counter = Counter()
+        for text in texts:
+            counts.update(ngrams(normalize(text)))
+        top = counts.most_common(size)
+        total = sum(c for _g, c in top) or 1
+        logprobs = {g: round(math.log(c / total), 3) for g, c in top}
+        return cls(lang, logprobs, round(math.log(0.5 / total), 3))
+
+    def score(self, grams: List[str]) -> float:
+        """Mean log-probability per n-gram."""
+        if not grams:
+            return self.floor
+        get = self.logprobs.get
+        return sum(get(g, self.floor) for g in grams) / len(grams)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"floor": self.floor, "ngrams": self.logprobs}
+
+    @classmethod
+    def from_json(cls, lang: str, data: Dict[str, Any]) -> "Profile":
+        return cls(lang, data["ngrams"], data["floor"])
+
+
+def letter_count(text: str) -> int:
+    return len(normalize(text).replace(" ", ""))
+
+
+def train_profiles(tree: LocaleTree, size: int = PROFILE_SIZE) -> Dict[str, Profile]:
+    source = {(ns, path): value for ns, path, value in tree.iter_strings(tree.source_lang)}
+    profiles: Dict[str, Profile] = {}
+    for lang in tree.languages:
+        with span("flatten", lang=lang):
+            texts = []
+            for ns, path, value in tree.iter_strings(lang):
+                if is_marker(value) or letter_count(value) < MIN_LETTERS:
+                    continue
+                # Leftover English would teach the target profile to look English
+                if lang != tree.source_lang and value == source.get((ns, path)):
+                    continue
+                texts.append(value)
+        profiles[lang] = Profile.train(lang, texts, size)
+    return profiles
+
+
+def load_profiles(path: Path) -> Dict[str, Profile]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {lang: Profile.from_json(lang, p) for lang, p in data.items()}
+
+
+def save_profiles(path: Path, profiles: Dict[str, Profile]):
+    data = {lang: p.to_json() for lang, p in sorted(profiles.items())}
+    path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+
+
+def english_margin(text: str, own: Profile, english: Profile) -> float:
+    """How much more English than ``own`` the text looks (nats per n-gram)."""
+    grams = list(ngrams(normalize(text)))
+    return english.score(grams) - own.score(grams)
+
+
+def rank_english_leftovers(
+    tree: LocaleTree,
+    profiles: Dict[str, Profile],
+    languages: Optional[List[str]] = None,
+    threshold: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """Score every string leaf of the target languages, most English-looking first."""
+    english = profiles[tree.source_lang]
+    source = {(ns, path): value for ns, path, value in tree.iter_strings(tree.source_lang)}
+    findings = []
+    for lang in languages or tree.target_languages:
+        own = profiles.get(lang)
+        if own is None:
+            continue
+        for ns, path, value in tree.iter_strings(lang):
+            if is_marker(value):
+                continue
+            en_value = source.get((ns, path))
+            if en_value is not None and value.strip().lower() == en_value.strip().lower():
+                if letter_count(value) < MIN_LETTERS:
+                    continue  # "OK", "Email", ... legitimately shared
+                margin, reason = math.inf, "identical"
+            else:
+                letters = letter_count(value)
+                if letters < MIN_LETTERS:
+                    continue
+                # Damp short strings: a handful of n-grams is weak evidence
+                margin = english_margin(value, own, english) * min(1.0, letters / 20)
+                reason = "ngram"
+            if margin > threshold:
+                findings.append({
+                    "lang": lang,
+                    "namespace": ns,
+                    "key": dotted(path),
+                    "path": path,
+                    "value": value,
+                    "en": en_value,
+                    "margin": margin,
+                    "reason": reason,
+                })
+    findings.sort(key=lambda f: (-f["margin"], f["lang"], f["namespace"], f["key"]))
+    return findings
+
+
+def mark_for_retranslation(tree: LocaleTree, findings: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Replace flagged leaves with ``[TRANSLATE] <English>`` markers and save the touched files."""
+    touched: Dict[tuple, int] = {}
+    for f in findings:
+        if f["en"] is None:
+            continue
+        set_path(tree.get(f["lang"], f["namespace"]), f["path"], f"{TRANSLATE_MARKER} {f['en']}")
+        key = (f["lang"], f["namespace"])
+        touched[key] = touched.get(key, 0) + 1
+        tree.mark_dirty(*key)
+    tree.save()
+    return {f"{lang}/{ns}.json": n for (lang, ns), n in sorted(touched.items())}
+
+
+def run(args):
+    locales_dir = Path(args.locales_dir)
+    if not locales_dir.exists():
+        print(f"Locales directory not found: {locales_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    tree = LocaleTree.load(locales_dir, args.source_lang)
+    if not tree.namespaces:
+        print(f"No source files found in {locales_dir / args.source_lang}", file=sys.stderr)
+        sys.exit(1)
+
+    profiles_path = Path(args.profiles) if args.profiles else None
+    if profiles_path and profiles_path.exists() and not args.retrain:
+        profiles = load_profiles(profiles_path)
+    else:
+        profiles = train_profiles(tree)
+        if profiles_path:
+            save_profiles(profiles_path, profiles)
+            print(f"Saved {len(profiles)} language profiles to {profiles_path}")
+
+    with span("classify"):
+        findings = rank_english_leftovers(tree, profiles, args.langs, args.threshold)
+
+    per_lang = Counter(f["lang"] for f in findings)
+    print(f"Likely English leftovers: {len(findings)}")
+    for lang, n in sorted(per_lang.items()):
+        print(f"  {lang.upper()}: {n}")
+    if findings:
+        print(f"\nTop {min(args.top, len(findings))}:")
+    for f in findings[:args.top]:
+        margin = "identical" if f["reason"] == "identical" else f"{f['margin']:.2f}"
+        print(f"  [{margin}] {f['lang']}/{f['namespace']}:{f['key']}: {f['value'][:80]}")
+
+    if args.output:
+        out = [{k: v for k, v in f.items() if k != "path"} for f in findings]
+        for f in out:
+            if f["margin"] == math.inf:
+                f["margin"] = None
+        Path(args.output).write_text(json.dumps(out, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+    if args.mark:
+        touched = mark_for_retranslation(tree, findings)
+        print(f"\nRe-queued {sum(touched.values())} values in {len(touched)} files")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank locale values that are most likely still English")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    parser.add_argument("--langs", nargs="*", help="Only score these target languages")
+    parser.add_argument("--profiles", help="Profile cache (JSON); trained from the tree and written here if missing")
+    parser.add_argument("--retrain", action="store_true", help="Retrain profiles even if --profiles exists")
+    parser.add_argument("--threshold", type=float, default=0.0, help="Minimum English margin to report (default: 0)")
+    parser.add_argument("--top", type=int, default=30, help="How many findings to print")
+    parser.add_argument("--output", help="Write all findings as JSON to this path")
+    parser.add_argument("--mark", action="store_true", help="Re-queue findings as [TRANSLATE] markers in the locale files")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling(args, "i18n_langid"):
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Shared in-memory view of the locale tree (``<root>/<lang>/<namespace>.json``).
+
+The i18n tools used to re-read the same files independently; ``LocaleTree``
+loads every (language, namespace) document once and gives the tools flat
+leaf views to work on.
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from i18n_trace import span
+from translate_locales import DEFAULT_LOCALES_DIR, SOURCE_LANG, load_json, save_json
+
+TRANSLATE_MARKER = "[TRANSLATE]"
+
+KeyPath = Tuple[str, ...]
+
+
+def flatten(obj: Any, path: KeyPath = ()) -> Dict[KeyPath, Any]:
+    """Flatten nested dicts into ``{key path: leaf}``. Lists are treated as leaves."""
+    out: Dict[KeyPath, Any] = {}
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if isinstance(v, dict):
+                out.update(flatten(v, path + (k,)))
+            else:
+                out[path + (k,)] = v
+    return out
+
+
+def dotted(path: KeyPath) -> str:
+    return ".".join(path)
+
+
+def set_path(obj: Dict[str, Any], path: KeyPath, value: Any) -> None:
+    """Set a leaf, creating intermediate dicts (and replacing non-dict parents)."""
+    cur = obj
+    for key in path[:-1]:
+        if not isinstance(cur.get(key), dict):
+            cur[key] = {}
+        cur = cur[key]
+    cur[path[-1]] = value
+
+
+def delete_path(obj: Dict[str, Any], path: KeyPath) -> bool:
+    """Delete a leaf and any parent dicts left empty by the removal."""
+    parents = []
+    cur: Any = obj
+    for key in path[:-1]:
+        if not isinstance(cur, dict) or key not in cur:
+            return False
+        parents.append((cur, key))
+        cur = cur[key]
+    if not isinstance(cur, dict) or path[-1] not in cur:
+        return False
+    del cur[path[-1]]
+    for parent, key in reversed(parents):
+        if parent[key]:
+            break
+        del parent[key]
+    return True
+
+
+def leaf_at(data: Any, path: KeyPath) -> Any:
+    """Value at a key path (list indices as strings, as iter_json_leaves yields them), or None."""
+    cur = data
+    for key in path:
+        if isinstance(cur, dict):
+            cur = cur.get(key)
+        elif isinstance(cur, list) and key.isdigit() and int(key) < len(cur):
+            cur = cur[int(key)]
+        else:
+            return None
+    return cur
+
+
+def is_marker(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(TRANSLATE_MARKER)
+
+
+def list_languages(locales_dir: Path) -> List[str]:
+    return sorted(
+        entry.name for entry in locales_dir.iterdir()
+        if entry.is_dir() and not entry.name.startswith(".")
+    )
+
+
+class LocaleTree:
+    """All locale documents under ``root``, keyed by (language, namespace)."""
+
+    def __init__(self, root: Path = DEFAULT_LOCALES_DIR, source_lang: str = SOURCE_LANG):
+        self.root = Path(root)
+        self.source_lang = source_lang
+        self.docs: Dict[Tuple[str, str], Any] = {}
+        self.dirty: Set[Tuple[str, str]] = set()
+
+    @classmethod
+    def load(
+        cls,
+        root: Path = DEFAULT_LOCALES_DIR,
+        source_lang: str = SOURCE_LANG,
+        languages: Optional[List[str]] = None,
+        namespaces: Optional[List[str]] = None,
+    ) -> "LocaleTree":
+        tree = cls(root, source_lang)
+        langs = languages if languages is not None else list_languages(tree.root)
+        if source_lang not in langs:
+            langs = [source_lang] + list(langs)
+        ns_filter = set(namespaces) if namespaces else None
+        for lang in langs:
+            lang_dir = tree.root / lang
+            if not lang_dir.is_dir():
+                continue
+            for path in sorted(lang_dir.glob("*.json")):
+                if ns_filter is not None and path.stem not in ns_filter:
+                    continue
+                with span("load", file=f"{lang}/{path.name}"):
+                    tree.docs[(lang, path.stem)] = load_json(path)
+        return tree
+
+    @property
+    def languages(self) -> List[str]:
+        return sorted({lang for lang, _ns in self.docs})
+
+    @property
+    def target_languages(self) -> List[str]:
+        return [lang for lang in self.languages if lang != self.source_lang]
+
+    @property
+    def namespaces(self) -> List[str]:
+        """Namespaces defined by the source language."""
+        return sorted(ns for lang, ns in self.docs if lang == self.source_lang)
+
+    def path_for(self, lang: str, namespace: str) -> Path:
+        return self.root / lang / f"{namespace}.json"
+
+    def get(self, lang: str, namespace: str) -> Optional[Any]:
+        return self.docs.get((lang, namespace))
+
+    def set(self, lang: str, namespace: str, data: Any):
+        self.docs[(lang, namespace)] = data
+        self.dirty.add((lang, namespace))
+
+    def mark_dirty(self, lang: str, namespace: str):
+        self.dirty.add((lang, namespace))
+
+    def save(self) -> List[Path]:
+        """Write every modified document at most once; returns the files actually rewritten."""
+        written = []
+        for lang, ns in sorted(self.dirty):
+            path = self.path_for(lang, ns)
+            with span("write", file=f"{lang}/{ns}.json"):
+                if save_json(path, self.docs[(lang, ns)]):
+                    written.append(path)
+        self.dirty.clear()
+        return written
+
+    def iter_strings(self, lang: str) -> Iterator[Tuple[str, KeyPath, str]]:
+        """Yield ``(namespace, key path, value)`` for every string leaf of ``lang``."""
+        for (doc_lang, ns), data in sorted(self.docs.items()):
+            if doc_lang != lang:
+                continue
+            for path, value in flatten(data).items():
+                if isinstance(value, str):
+                    yield ns, path, value
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Market weights per language from the domain language matrix.
+
+Parses "docs/LANGUAGE MATRIX PER DOMAIN (39 COUNTRIES, 33+ LANGUAGES).md":
+one block per country domain, grouped under ``## TIER n`` headings, listing
+the languages offered on that domain in order of importance.  A language's
+market weight sums, over every domain offering it, the tier weight times the
+weight of its position in that domain's list (primary language first).
+
+    python3 scripts/i18n_markets.py            # print the weights
+"""
+import argparse
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_MATRIX_PATH = Path("docs/LANGUAGE MATRIX PER DOMAIN (39 COUNTRIES, 33+ LANGUAGES).md")
+
+TIER_WEIGHTS = {1: 1.0, 2: 0.6}
+# Weight of the 1st, 2nd, ... language listed for a domain
+RANK_WEIGHTS = [1.0, 0.5, 0.35, 0.25, 0.2]
+
+TIER_HEADING = re.compile(r"^##\s+TIER\s+(\d+)", re.I)
+SECTION_HEADING = re.compile(r"^#{1,2}\s")
+DOMAIN_LINE = re.compile(r"\*\*(?P<country>[^*]+)\*\*\s*\((?P<domain>[\w.-]+)\)")
+LANGUAGE_LINE = re.compile(r"^-\s+[^(]+\((?P<code>[A-Z]{2,3})\)")
+
+
+class Market:
+    def __init__(self, country: str, domain: str, tier: int):
+        self.country = country
+        self.domain = domain
+        self.tier = tier
+        self.languages: List[str] = []
+
+    def to_json(self):
+        return {"country": self.country, "domain": self.domain, "tier": self.tier, "languages": self.languages}
+
+
+def parse_matrix(path: Path = DEFAULT_MATRIX_PATH) -> List[Market]:
+    markets: List[Market] = []
+    tier: Optional[int] = None
+    current: Optional[Market] = None
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        m = TIER_HEADING.match(line)
+        if m:
+            tier, current = int(m.group(1)), None
+            continue
+        if SECTION_HEADING.match(line):
+            # Any other heading ends the tier lists (the rest of the file is prose)
+            tier, current = None, None
+            continue
+        if tier is None:
+            continue
+        m = DOMAIN_LINE.search(line)
+        if m:
+            current = Market(m.group("country").strip().title(), m.group("domain"), tier)
+            markets.append(current)
+            continue
+        m = LANGUAGE_LINE.match(line)
+        if m and current is not None:
+            current.languages.append(m.group("code").lower())
+    return markets
+
+
+def language_weights(markets: List[Market], tier_weights: Optional[Dict[int, float]] = None,
+                     rank_weights: Optional[List[float]] = None) -> Dict[str, float]:
+    tiers = tier_weights or TIER_WEIGHTS
+    ranks = rank_weights or RANK_WEIGHTS
+    weights: Dict[str, float] = {}
+    for market in markets:
+        tier = tiers.get(market.tier, min(tiers.values()))
+        for i, lang in enumerate(market.languages):
+            rank = ranks[i] if i < len(ranks) else ranks[-1]
+            weights[lang] = weights.get(lang, 0.0) + tier * rank
+    return dict(sorted(weights.items(), key=lambda kv: -kv[1]))
+
+
+def load_language_weights(path: Path = DEFAULT_MATRIX_PATH) -> Dict[str, float]:
+    """Weights from the matrix, or {} when the document is not available."""
+    try:
+        return language_weights(parse_matrix(path))
+    except OSError:
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print per-language market weights from the domain language matrix")
+    parser.add_argument("--matrix", default=str(DEFAULT_MATRIX_PATH), help="Language matrix markdown file")
+    args = parser.parse_args()
+
+    markets = parse_matrix(Path(args.matrix))
+    weights = language_weights(markets)
+    print(f"{len(markets)} domains, {len(weights)} languages")
+    print("=" * 60)
+    for lang, weight in weights.items():
+        domains = [m.domain for m in markets if lang in m.languages]
+        print(f"  {lang:<4} {weight:>6.2f}  {len(domains):>2} domains")
+
+
+if __name__ == "__main__":
+    main()
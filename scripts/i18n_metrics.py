@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Per-run translation metrics: latency, characters, retries, cache and dedup.
+
+Each translation run records its backend requests here and writes one
+machine-readable JSON file (by default under ``.i18n-cache/metrics/``) plus
+a compact console summary, so throughput and cost can be compared between
+runs.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from i18n_io import write_json
+
+DEFAULT_METRICS_DIR = Path(".i18n-cache/metrics")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile; 0.0 for no samples."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    ms = [v * 1000 for v in latencies]
+    return {
+        "count": len(ms),
+        "p50": round(percentile(ms, 50), 1),
+        "p95": round(percentile(ms, 95), 1),
+        "p99": round(percentile(ms, 99), 1),
+        "max": round(max(ms), 1) if ms else 0.0,
+        "mean": round(sum(ms) / len(ms), 1) if ms else 0.0,
+    }
+
+
+def default_metrics_path(tool: str) -> Path:
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return DEFAULT_METRICS_DIR / f"{tool}-{stamp}.json"
+
+
+class _Counters:
+    FIELDS = ("requests", "strings", "chars_billed", "retries", "errors",
+              "cache_hits", "cache_misses", "dedup_strings", "dedup_chars")
+
+    def __init__(self):
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+        self.latencies: List[float] = []
+
+    def to_json(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {name: getattr(self, name) for name in self.FIELDS}
+        lookups = self.cache_hits + self.cache_misses
+        out["cache_hit_rate"] = round(self.cache_hits / lookups, 4) if lookups else None
+        out["latency_ms"] = latency_summary(self.latencies)
+        return out
+
+
+class RunMetrics:
+    """Thread-safe collector for one translation run."""
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.wall = 0.0
+        self.total = _Counters()
+        self.languages: Dict[str, _Counters] = {}
+        self.files: Dict[str, Dict[str, int]] = {}
+        self.bytes_written = 0
+        self.files_written = 0
+        self.files_unchanged = 0
+        self.extra: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _lang(self, lang: str) -> _Counters:
+        if lang not in self.languages:
+            self.languages[lang] = _Counters()
+        return self.languages[lang]
+
+    def _bump(self, lang: str, **counts: int):
+        for counters in (self.total, self._lang(lang)):
+            for name, n in counts.items():
+                setattr(counters, name, getattr(counters, name) + n)
+
+    def record_request(self, lang: str, strings: List[str], latency: float,
+                       files: Optional[Iterable[str]] = None, error: bool = False):
+        """One backend call. ``files`` lists the source file of each string, if known."""
+        chars = sum(len(s) for s in strings)
+        with self._lock:
+            self._bump(lang, requests=1, strings=len(strings), chars_billed=chars, errors=int(error))
+            self.total.latencies.append(latency)
+            self._lang(lang).latencies.append(latency)
+            if files is not None:
+                files = list(files)
+                for name in set(files):
+                    entry = self.files.setdefault(name, {"requests": 0, "strings": 0, "chars_billed": 0})
+                    entry["requests"] += 1
+                for name, s in zip(files, strings):
+                    entry = self.files[name]
+                    entry["strings"] += 1
+                    entry["chars_billed"] += len(s)
+
+    def record_retry(self, lang: str):
+        with self._lock:
+            self._bump(lang, retries=1)
+
+    def record_cache(self, lang: str, hits: int, misses: int):
+        with self._lock:
+            self._bump(lang, cache_hits=hits, cache_misses=misses)
+
+    def record_dedup(self, lang: str, strings: int, chars: int):
+        with self._lock:
+            self._bump(lang, dedup_strings=strings, dedup_chars=chars)
+
+    def record_write(self, nbytes: int, written: bool):
+        with self._lock:
+            if written:
+                self.files_written += 1
+                self.bytes_written += nbytes
+            else:
+                self.files_unchanged += 1
+
+    def finish(self):
+        self.wall = time.perf_counter() - self._start
+
+    def to_json(self) -> Dict[str, Any]:
+        totals = self.total.to_json()
+        latency = totals.pop("latency_ms")
+        totals.update({
+            "bytes_written": self.bytes_written,
+            "files_written": self.files_written,
+            "files_unchanged": self.files_unchanged,
+        })
+        return {
+            "tool": self.tool,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall_s": round(self.wall, 3),
+            "totals": totals,
+            "latency_ms": latency,
+            "languages": {lang: c.to_json() for lang, c in sorted(self.languages.items())},
+            "files": dict(sorted(self.files.items())),
+            **self.extra,
+        }
+
+    def write(self, path: Path) -> Path:
+        path = Path(path)
+        write_json(path, self.to_json())
+        return path
+
+    def print_summary(self):
+        t = self.total.to_json()
+        lat = t["latency_ms"]
+        hit_rate = f"{t['cache_hit_rate']:.0%}" if t["cache_hit_rate"] is not None else "n/a"
+        chars_per_s = t["chars_billed"] / self.wall if self.wall > 0 else 0.0
+        print(f"\nRun metrics ({self.tool}): {self.wall:.1f}s wall, {len(self.languages)} languages")
+        print(f"  requests {t['requests']} ({t['retries']} retries, {t['errors']} errors), "
+              f"latency p50/p95/p99 {lat['p50']:.0f}/{lat['p95']:.0f}/{lat['p99']:.0f} ms")
+        print(f"  chars billed {t['chars_billed']:,} ({chars_per_s:,.0f}/s), "
+              f"cache hits {t['cache_hits']:,} ({hit_rate}), dedup saved {t['dedup_chars']:,} chars")
+        print(f"  files written {self.files_written} ({self.bytes_written:,} bytes), unchanged {self.files_unchanged}")
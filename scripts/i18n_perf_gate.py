@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""Performance regression gate for the Python i18n tools.
+
+Runs each benchmark scenario (the same workloads as tests/i18n_bench) on a
+synthetic locale tree, each in its own subprocess so peak RSS is measured
+per scenario, and records
+
+* ``time_ms``               best wall time of ``--repeat`` runs, after one
+                            untimed warm-up run
+* ``peak_rss_mb``           maximum resident set size of the process
+* ``api_calls_per_1k_keys`` backend requests per 1,000 translated keys
+                            (translate scenario only)
+
+Every run is appended to a versioned history file.  The current run is
+compared with a rolling baseline (median of the last ``--window`` passing
+runs with the same tree configuration); any metric worse than its threshold
+fails the gate with a readable diff and exit code 1.  The default threshold
+is 10%, but wall time is noisier than the other metrics, so it defaults to
+25% unless ``--threshold`` or ``--time-threshold`` is given.  Separately,
+slowdowns of at most ``--min-time-delta`` milliseconds (20) never fail,
+whatever their percentage.
+
+The history defaults to .i18n-cache/perf-history.json, which is local to
+the checkout.  Baselines only match runs with the same Python version and
+machine type, so CI keeps its own history: restore it from a cache or
+artifact, pass its path as ``--history`` together with
+``--require-baseline`` (a missing or mismatched baseline then fails instead
+of silently starting over), and save it again after the run.
+
+    python3 scripts/i18n_perf_gate.py                    # run, compare, record
+    python3 scripts/i18n_perf_gate.py --threshold 15 --rss-threshold 25
+    python3 scripts/i18n_perf_gate.py --history ci-cache/perf-history.json --require-baseline
+"""
+import argparse
+import json
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from i18n_io import write_json
+from translate_locales import SOURCE_LANG
+
+# compare_locales.py and check_translation_status.py live in the repo root
+sys.path.insert(1, str(Path(__file__).resolve().parent.parent))
+
+DEFAULT_HISTORY_PATH = Path(".i18n-cache/perf-history.json")
+HISTORY_VERSION = 1
+
+# Default allowed regression in percent
+DEFAULT_THRESHOLD = 10.0
+# Default for wall time when no threshold is given; timings of the small
+# scenarios move by more than 10% between identical runs
+DEFAULT_TIME_THRESHOLD = 25.0
+
+# Metric -> the option whose threshold applies to it
+METRICS = {
+    "time_ms": "time",
+    "peak_rss_mb": "rss",
+    "api_calls_per_1k_keys": "calls",
+}
+
+# Languages the translate scenarios pseudo-translate into
+TRANSLATE_LANGS = ["de", "cs", "ru", "el", "pl"]
+
+
+# -- scenarios (shared with tests/i18n_bench) -------------------------------
+
+class Scenario:
+    """A timed workload: ``run(*setup())``, with ``setup`` untimed and fresh for every round.
+
+    ``run`` returns facts about the work done; the ones named in ``METRICS``
+    are recorded by the gate, the benchmarks assert on the rest.
+    """
+
+    def __init__(self, run: Callable[..., Dict[str, Any]], setup: Optional[Callable[[], tuple]] = None):
+        self.run = run
+        self.setup = setup
+
+
+def _scenario_load(locales_dir: Path, work_dir: Path) -> Scenario:
+    from i18n_locales import LocaleTree
+
+    return Scenario(lambda: {"languages": len(LocaleTree.load(locales_dir).languages)})
+
+
+def _scenario_flatten(locales_dir: Path, work_dir: Path) -> Scenario:
+    from i18n_locales import LocaleTree, flatten
+    tree = LocaleTree.load(locales_dir)
+
+    return Scenario(lambda: {"leaves": sum(len(flatten(doc)) for doc in tree.docs.values())})
+
+
+def _scenario_compare(locales_dir: Path, work_dir: Path) -> Scenario:
+    import compare_locales
+    from i18n_locales import LocaleTree
+    tree = LocaleTree.load(locales_dir)
+
+    def run():
+        missing = untranslated = 0
+        for lang in tree.target_languages:
+            for ns in tree.namespaces:
+                en_data, data = tree.get(SOURCE_LANG, ns), tree.get(lang, ns) or {}
+                missing += len(compare_locales.find_missing_keys(en_data, data))
+                untranslated += len(compare_locales.find_untranslated_values(en_data, data))
+        return {"missing": missing, "untranslated": untranslated}
+    return Scenario(run)
+
+
+def _scenario_status(locales_dir: Path, work_dir: Path) -> Scenario:
+    import check_translation_status
+    from i18n_locales import LocaleTree
+    tree = LocaleTree.load(locales_dir)
+
+    return Scenario(lambda: {"translatable": sum(check_translation_status.count_translatable_values(doc)[1]
+                                                 for doc in tree.docs.values())})
+
+
+def _scenario_sync(locales_dir: Path, work_dir: Path) -> Scenario:
+    from i18n_locales import LocaleTree
+    from i18n_sync import sync_tree
+
+    def run(tree):
+        results, _moves = sync_tree(tree)
+        return {"changed": sum(1 for r in results if r.changed), "verified": all(r.verified for r in results)}
+    # sync_tree edits the documents in memory, so every round gets a freshly loaded tree
+    return Scenario(run, setup=lambda: (LocaleTree.load(locales_dir),))
+
+
+def _translate_units(locales_dir: Path, out: Path) -> List[Any]:
+    from i18n_pipeline import WorkUnit
+
+    shutil.rmtree(out, ignore_errors=True)
+    sources = sorted((locales_dir / SOURCE_LANG).glob("*.json"))
+    return [WorkUnit(src, lang, out / lang / src.name) for src in sources for lang in TRANSLATE_LANGS]
+
+
+def _translated_keys(locales_dir: Path) -> int:
+    from i18n_locales import flatten
+    from translate_locales import load_json
+
+    sources = sorted((locales_dir / SOURCE_LANG).glob("*.json"))
+    return sum(len(flatten(load_json(src))) for src in sources) * len(TRANSLATE_LANGS)
+
+
+def _scenario_translate(locales_dir: Path, work_dir: Path) -> Scenario:
+    from i18n_pipeline import Pipeline
+    from i18n_synth import StandInTranslator
+
+    keys = _translated_keys(locales_dir)
+
+    def run(units):
+        backend = StandInTranslator()
+        pipeline = Pipeline(backend, workers=4)
+        pipeline.run(units)
+        return {
+            "api_calls_per_1k_keys": round(backend.calls * 1000 / keys, 3) if keys else 0.0,
+            "backend_calls": backend.calls,
+            "failed": len(pipeline.failed),
+        }
+    return Scenario(run, setup=lambda: (_translate_units(locales_dir, work_dir / "translate"),))
+
+
+def _scenario_translate_hedged(locales_dir: Path, work_dir: Path) -> Scenario:
+    from i18n_backends import BackendChain, CacheOnlyBackend
+    from i18n_pipeline import Pipeline
+    from i18n_synth import StandInTranslator
+
+    def run(units):
+        # 10% of requests stall for 200 ms; hedging at p90 should hide most of them
+        backend = StandInTranslator(latency=0.005, tail_rate=0.1, tail_latency=0.2, seed=7)
+        chain = BackendChain([backend, CacheOnlyBackend()], timeout=1.0, hedge_percentile=90, workers=4)
+        pipeline = Pipeline(chain, workers=4)
+        try:
+            pipeline.run(units)
+        finally:
+            chain.close()
+        stats = chain.to_json()[StandInTranslator.name]
+        return {"failed": len(pipeline.failed), "hedges": stats["hedges"], "hedge_wins": stats["hedge_wins"]}
+    return Scenario(run, setup=lambda: (_translate_units(locales_dir, work_dir / "translate-hedged"),))
+
+
+SCENARIOS = {
+    "load": _scenario_load,
+    "flatten": _scenario_flatten,
+    "compare": _scenario_compare,
+    "status": _scenario_status,
+    "sync": _scenario_sync,
+    "translate": _scenario_translate,
+    "translate_hedged": _scenario_translate_hedged,
+}
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_worker(name: str, locales_dir: Path, work_dir: Path, repeat: int) -> Dict[str, Any]:
+    scenario = SCENARIOS[name](locales_dir, work_dir)
+    times = []
+    facts: Dict[str, Any] = {}
+    # One untimed warm-up round (imports, caches, first-touch allocations), then the best of ``repeat``
+    for i in range(repeat + 1):
+        args = scenario.setup() if scenario.setup else ()
+        start = time.perf_counter()
+        facts = scenario.run(*args)
+        if i:
+            times.append(time.perf_counter() - start)
+    extra = {k: v for k, v in facts.items() if k in METRICS}
+    return {"time_ms": round(min(times) * 1000, 1), "peak_rss_mb": round(peak_rss_mb(), 1), **extra}
+
+
+def measure(name: str, locales_dir: Path, work_dir: Path, repeat: int) -> Dict[str, Any]:
+    """Run one scenario in a fresh interpreter so its peak RSS is its own."""
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--worker", name,
+           "--locales-dir", str(locales_dir), "--work-dir", str(work_dir), "--repeat", str(repeat)]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Scenario {name} failed:\n{proc.stderr.strip()}")
+    # Tools print progress; the measurement is the last stdout line
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+# -- history and comparison -------------------------------------------------
+
+def load_history(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {"version": HISTORY_VERSION, "runs": []}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != HISTORY_VERSION:
+        raise RuntimeError(f"{path}: unsupported history version {data.get('version')} (expected {HISTORY_VERSION})")
+    return data
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def rolling_baseline(history: Dict[str, Any], config: Dict[str, Any], window: int) -> Dict[str, Dict[str, float]]:
+    """Median of each metric over the last ``window`` passing runs with the same config."""
+    runs = [r for r in history["runs"] if r.get("passed") and r.get("config") == config][-window:]
+    baseline: Dict[str, Dict[str, float]] = {}
+    for scenario in {name for r in runs for name in r["results"]}:
+        for metric in METRICS:
+            values = [r["results"][scenario][metric] for r in runs
+                      if metric in r["results"].get(scenario, {})]
+            if values:
+                baseline.setdefault(scenario, {})[metric] = statistics.median(values)
+    return baseline
+
+
+class Regression:
+    def __init__(self, scenario: str, metric: str, baseline: float, current: float, limit: float,
+                 floor: float = 0.0):
+        self.scenario = scenario
+        self.metric = metric
+        self.baseline = baseline
+        self.current = current
+        self.limit = limit
+        # Absolute slack: a change no bigger than this is noise, whatever its percentage
+        self.floor = floor
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline * 100 if self.baseline else 0.0
+
+    @property
+    def failed(self) -> bool:
+        return self.change > self.limit and self.current - self.baseline > self.floor
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "scenario": self.scenario,
+            "metric": self.metric,
+            "baseline": self.baseline,
+            "current": self.current,
+            "change_pct": round(self.change, 1),
+            "limit_pct": self.limit,
+            "failed": self.failed,
+        }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, float]],
+            thresholds: Dict[str, float], floors: Optional[Dict[str, float]] = None) -> List[Regression]:
+    floors = floors or {}
+    rows = []
+    for scenario, metrics in results.items():
+        for metric, kind in METRICS.items():
+            if metric in metrics and metric in baseline.get(scenario, {}):
+                rows.append(Regression(scenario, metric, baseline[scenario][metric], metrics[metric],
+                                       thresholds[kind], floors.get(kind, 0.0)))
+    return rows
+
+
+def print_diff(rows: List[Regression], results: Dict[str, Dict[str, Any]], baseline_runs: int):
+    print("\n" + "=" * 60)
+    print(f"I18N PERFORMANCE GATE (baseline: median of {baseline_runs} run(s))")
+    print("=" * 60)
+    if not rows:
+        for scenario, metrics in results.items():
+            values = ", ".join(f"{m} {metrics[m]}" for m in METRICS if m in metrics)
+            print(f"  {scenario:<16} {values}")
+        print("\nNo baseline yet for this configuration; this run becomes the first one.")
+        return
+    print(f"{'Scenario':<16} {'Metric':<22} {'Baseline':>10} {'Current':>10} {'Change':>9}")
+    print("-" * 72)
+    for row in rows:
+        status = f"❌ (limit +{row.limit:g}%)" if row.failed else "✅"
+        print(f"{row.scenario:<16} {row.metric:<22} {row.baseline:>10.1f} {row.current:>10.1f} {row.change:>+8.1f}% {status}")
+    failed = [r for r in rows if r.failed]
+    if failed:
+        print(f"\n❌ {len(failed)} metric(s) regressed beyond the threshold:")
+        for row in failed:
+            print(f"   {row.scenario}.{row.metric}: {row.baseline:g} -> {row.current:g} ({row.change:+.1f}%, limit +{row.limit:g}%)")
+    else:
+        print("\n✅ No regressions beyond the thresholds")
+
+
+def run(args):
+    from i18n_synth import SynthConfig, generate_tree
+
+    scenarios = args.scenarios or list(SCENARIOS)
+    unknown = sorted(set(scenarios) - set(SCENARIOS))
+    if unknown:
+        print(f"Unknown scenario(s): {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})", file=sys.stderr)
+        sys.exit(2)
+
+    config = {"keys": args.keys, "seed": args.seed, "repeat": args.repeat,
+              "python": platform.python_version(), "machine": platform.machine()}
+    history_path = Path(args.history)
+    history = load_history(history_path)
+    baseline_runs = len([r for r in history["runs"] if r.get("passed") and r.get("config") == config][-args.window:])
+    if args.require_baseline and not baseline_runs:
+        print(f"❌ {history_path} has no passing run for this configuration ({config}); "
+              f"record one on this machine first", file=sys.stderr)
+        sys.exit(1)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="i18n-perf-"))
+    try:
+        locales_dir = work_dir / "locales"
+        stats = generate_tree(locales_dir, SynthConfig(keys=args.keys, seed=args.seed))
+        print(f"Synthetic tree: {stats['files']} files, {stats['source_keys']:,} keys x {stats['languages']} languages")
+        results = {}
+        for name in scenarios:
+            print(f"  running {name} ...", flush=True)
+            results[name] = measure(name, locales_dir, work_dir, args.repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    base = args.threshold if args.threshold is not None else DEFAULT_THRESHOLD
+    time_base = args.threshold if args.threshold is not None else DEFAULT_TIME_THRESHOLD
+    thresholds = {
+        "time": args.time_threshold if args.time_threshold is not None else time_base,
+        "rss": args.rss_threshold if args.rss_threshold is not None else base,
+        "calls": args.calls_threshold if args.calls_threshold is not None else base,
+    }
+    baseline = rolling_baseline(history, config, args.window)
+    rows = compare(results, baseline, thresholds, {"time": args.min_time_delta})
+    passed = not any(r.failed for r in rows)
+    print_diff(rows, results, baseline_runs)
+
+    if not args.no_record:
+        history["runs"].append({
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "config": config,
+            "passed": passed,
+            "results": results,
+            "comparison": [r.to_json() for r in rows],
+        })
+        write_json(history_path, history)
+        print(f"\nHistory: {history_path} ({len(history['runs'])} runs)")
+    if not passed:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the i18n tools and fail on regressions against stored history")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY_PATH), help="History JSON to compare with and append to")
+    parser.add_argument("--scenarios", nargs="*", help=f"Scenarios to run (default: {' '.join(SCENARIOS)})")
+    parser.add_argument("--keys", type=int, default=6000, help="English keys in the synthetic tree (default: 6000)")
+    parser.add_argument("--seed", type=int, default=1234, help="Synthetic tree seed (default: 1234)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per scenario; the best time counts (default: 5)")
+    parser.add_argument("--window", type=int, default=5, help="Passing runs in the rolling baseline (default: 5)")
+    parser.add_argument("--threshold", type=float,
+                        help=f"Allowed regression in percent for every metric (default: {DEFAULT_THRESHOLD:g}, "
+                             f"and {DEFAULT_TIME_THRESHOLD:g} for time_ms)")
+    parser.add_argument("--time-threshold", type=float,
+                        help=f"Override --threshold for time_ms (default: --threshold if given, else {DEFAULT_TIME_THRESHOLD:g})")
+    parser.add_argument("--min-time-delta", type=float, default=20.0,
+                        help="Slowdowns of at most this many ms never fail (default: 20)")
+    parser.add_argument("--rss-threshold", type=float, help="Override --threshold for peak_rss_mb")
+    parser.add_argument("--calls-threshold", type=float, help="Override --threshold for api_calls_per_1k_keys")
+    parser.add_argument("--no-record", action="store_true", help="Compare only; do not append this run to the history")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="Fail when the history has no passing run with this configuration (use in CI)")
+    # Internal: measure one scenario in this process
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--locales-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--work-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_worker(args.worker, Path(args.locales_dir), Path(args.work_dir), args.repeat)
+        print(json.dumps(result))
+        return
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
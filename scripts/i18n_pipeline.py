@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""Staged streaming pipeline for translate_locales.py.
+
+    reader -> masker -> batcher -> translator workers -> rebuilder -> writer
+
+Each arrow is a bounded queue, so a slow stage pushes back on the ones
+before it instead of letting work pile up.  Disk reads, placeholder masking
+and rebuilding/writing overlap with the network-bound translator workers.
+The reader additionally holds a slot per in-flight (file, language) unit,
+released by the writer, which bounds peak memory regardless of tree size.
+
+The masker answers what it can from the translation memory; the batcher
+packs the remaining strings of several units of the same language into one
+request (up to ``batch_size`` unique strings) and sends identical masked
+strings only once, so small namespaces do not each pay for a round trip.
+With a ``key_filter`` (``--only-used``), leaves outside the filter are never
+sent: they keep the target file's existing translation, or the English
+text when there is none.  ``missing_only`` likewise keeps every existing
+non-marker translation and sends only missing and ``[TRANSLATE]`` leaves.
+``plan=True`` runs everything up to the backend call (load, diff, cache
+lookup, dedup, batching) against a recording backend and writes nothing;
+see i18n_plan.py.  With a ``deadline`` (seconds from the start of ``run``),
+units not yet read when it passes are deferred rather than started, so a
+time-boxed run over a prioritized unit order (i18n_schedule.py) finishes
+the most valuable work first.  With a ``validator`` (i18n_validate.py), every
+translation is checked against its source as it arrives; a failing string
+is not learned, its leaves are written as ``[TRANSLATE]`` markers and go to
+the ``retry`` queue, and the rest of the file is written as usual.  A leaf
+that only gets a marker (failed check, or a ``cache`` fallback when the API
+is down) keeps the translation the target file already has, if any.
+Per-stage item counts, busy/blocked time and utilization are collected in
+``Pipeline.stats``.
+"""
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from i18n_io import DEFAULT_WRITER
+from i18n_locales import is_marker, leaf_at
+from i18n_metrics import RunMetrics
+from i18n_tm import TranslationMemory
+from i18n_trace import profile_thread, span
+from i18n_validate import RetryItem, RetryQueue, Validator, marker_for
+from translate_locales import (
+    BATCH_SIZE,
+    load_json,
+    mask_leaves,
+    rebuild_translations,
+    restore_placeholders,
+    save_json,
+)
+
+TranslateFn = Callable[[List[str], str], List[str]]
+KeyFilter = Callable[[str, Tuple[str, ...]], bool]
+
+# Trace-span name of each stage's work
+PHASES = {
+    "reader": "load",
+    "masker": "mask",
+    "batcher": "batch",
+    "translator": "translate batch",
+    "rebuilder": "rebuild",
+    "writer": "write",
+}
+
+_DONE = object()
+_POLL = 0.05  # seconds; how often blocked stages re-check for abort / idle flush
+SOURCE_CACHE_SIZE = 16  # parsed source files kept by the reader
+
+
+class WorkUnit:
+    """One (source file, target language) pair."""
+
+    def __init__(self, src_path: Path, lang: str, out_path: Path):
+        self.src_path = src_path
+        self.lang = lang
+        self.out_path = out_path
+        # Target read for diffs when outputs go elsewhere (shard output directories)
+        self.existing_path: Optional[Path] = None
+        self.src_data: Any = None
+        self.existing: Any = None
+        self.protected: List[Tuple[Tuple[str, ...], str, Dict[str, str]]] = []
+        self.translated: List[Optional[str]] = []
+        self.todo: List[int] = []
+        self.pending = 0
+        self.error: Optional[BaseException] = None
+        self.deferred = False
+        self.result: Any = None
+
+
+class Batch:
+    """Unique masked strings of one language, each mapped to the leaves that need it."""
+
+    def __init__(self, lang: str):
+        self.lang = lang
+        self.groups: Dict[str, List[Tuple[WorkUnit, int]]] = {}
+        self.dup_strings = 0
+        self.dup_chars = 0
+
+    def add(self, text: str, unit: WorkUnit, index: int):
+        refs = self.groups.get(text)
+        if refs is None:
+            self.groups[text] = [(unit, index)]
+        else:
+            # Same masked text: translated once, fanned out to every leaf
+            refs.append((unit, index))
+            self.dup_strings += 1
+            self.dup_chars += len(text)
+
+
+class StageStats:
+    def __init__(self, name: str, workers: int = 1):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, busy: float = 0.0, blocked: float = 0.0, items: int = 0):
+        with self._lock:
+            self.busy += busy
+            self.blocked += blocked
+            self.items += items
+
+    def utilization(self, wall: float) -> float:
+        return self.busy / (wall * self.workers) if wall > 0 else 0.0
+
+    def to_json(self, wall: float) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "workers": self.workers,
+            "busy_s": round(self.busy, 3),
+            "blocked_s": round(self.blocked, 3),
+            "utilization": round(self.utilization(wall), 3),
+        }
+
+
+class Pipeline:
+    STAGES = ("reader", "masker", "batcher", "translator", "rebuilder", "writer")
+
+    def __init__(
+        self,
+        translate_fn: TranslateFn,
+        workers: int = 4,
+        queue_size: int = 8,
+        max_units: Optional[int] = None,
+        batch_size: int = BATCH_SIZE,
+        dry_run: bool = False,
+        continue_on_error: bool = False,
+        metrics: Optional[RunMetrics] = None,
+        tm: Optional[TranslationMemory] = None,
+        key_filter: Optional[KeyFilter] = None,
+        missing_only: bool = False,
+        plan: bool = False,
+        deadline: Optional[float] = None,
+        validator: Optional[Validator] = None,
+        retry: Optional[RetryQueue] = None,
+    ):
+        self.translate_fn = translate_fn
+        self.validator = validator
+        self.retry = retry
+        self.key_filter = key_filter
+        self.missing_only = missing_only
+        self.plan = plan
+        self.deadline = deadline
+        self.metrics = metrics
+        self.tm = tm
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.dry_run = dry_run or plan
+        self.continue_on_error = continue_on_error
+
+        self.q_mask: queue.Queue = queue.Queue(queue_size)
+        self.q_batch: queue.Queue = queue.Queue(queue_size)
+        self.q_translate: queue.Queue = queue.Queue(queue_size)
+        self.q_rebuild: queue.Queue = queue.Queue(queue_size)
+        self.q_write: queue.Queue = queue.Queue(queue_size)
+        self.slots = threading.BoundedSemaphore(max_units or self.workers * 4)
+
+        self.stats = {name: StageStats(name, self.workers if name == "translator" else 1) for name in self.STAGES}
+        self.wall = 0.0
+        self.inflight = 0
+        self.peak_inflight = 0
+        self.out_of_scope = 0
+        self.kept_existing = 0
+        self.kept_on_fallback = 0
+        self.written: List[Path] = []
+        self.unchanged: List[Path] = []
+        self.failed: List[Tuple[Path, BaseException]] = []
+        self.deferred: List[Path] = []
+        self._lock = threading.Lock()
+        self._abort = threading.Event()
+        self._fatal: Optional[BaseException] = None
+        self._started = 0.0
+
+    # -- plumbing ---------------------------------------------------------
+
+    def _put(self, q: queue.Queue, item: Any, stage: str):
+        start = time.perf_counter()
+        while not self._abort.is_set():
+            try:
+                q.put(item, timeout=_POLL)
+                break
+            except queue.Full:
+                continue
+        self.stats[stage].add(blocked=time.perf_counter() - start)
+
+    def _get(self, q: queue.Queue, stage: str, timeout: Optional[float] = None) -> Any:
+        """Next item, ``_DONE`` on abort, or ``None`` if ``timeout`` elapsed."""
+        start = time.perf_counter()
+        try:
+            while not self._abort.is_set():
+                try:
+                    return q.get(timeout=_POLL)
+                except queue.Empty:
+                    if timeout is not None and time.perf_counter() - start >= timeout:
+                        return None
+            return _DONE
+        finally:
+            self.stats[stage].add(blocked=time.perf_counter() - start)
+
+    @contextmanager
+    def _busy(self, stage: str, items: int = 1, **trace_args: Any):
+        start = time.perf_counter()
+        try:
+            with span(PHASES[stage], **trace_args):
+                yield
+        finally:
+            self.stats[stage].add(busy=time.perf_counter() - start, items=items)
+
+    def _fail(self, unit: WorkUnit, exc: BaseException):
+        with self._lock:
+            if unit.error is None:
+                unit.error = exc
+            if not self.continue_on_error and self._fatal is None:
+                self._fatal = exc
+                self._abort.set()
+
+    # -- stages -----------------------------------------------------------
+
+    def _reader(self, units: List[WorkUnit]):
+        cache: "OrderedDict[Path, Any]" = OrderedDict()
+        for unit in units:
+            start = time.perf_counter()
+            while not self.slots.acquire(timeout=_POLL):
+                if self._abort.is_set():
+                    break
+            self.stats["reader"].add(blocked=time.perf_counter() - start)
+            if self._abort.is_set():
+                break
+            with self._lock:
+                self.inflight += 1
+                self.peak_inflight = max(self.peak_inflight, self.inflight)
+            if self.deadline is not None and time.perf_counter() - self._started > self.deadline:
+                # Past the deadline: the unit still flows through so every stage sees it
+                unit.deferred = True
+                self._put(self.q_mask, unit, "reader")
+                continue
+            with self._busy("reader", file=unit.src_path.name):
+                # Units usually arrive grouped by source file; a scheduled order
+                # interleaves them, so keep a few recent sources parsed
+                if unit.src_path in cache:
+                    cache.move_to_end(unit.src_path)
+                else:
+                    try:
+                        cache[unit.src_path] = load_json(unit.src_path)
+                    except Exception as e:
+                        cache[unit.src_path] = e
+                    if len(cache) > SOURCE_CACHE_SIZE:
+                        cache.popitem(last=False)
+                data = cache[unit.src_path]
+                existing_path = unit.existing_path or unit.out_path
+                if self._needs_existing and not isinstance(data, Exception) and existing_path.exists():
+                    # Out-of-scope leaves keep what the target file already has
+                    try:
+                        unit.existing = load_json(existing_path)
+                    except Exception as e:
+                        print(f"[warn] Ignoring unreadable {existing_path}: {e}", file=sys.stderr)
+            if isinstance(data, Exception):
+                self._fail(unit, data)
+            else:
+                unit.src_data = data
+            self._put(self.q_mask, unit, "reader")
+        self._put(self.q_mask, _DONE, "reader")
+
+    def _masker(self):
+        while True:
+            unit = self._get(self.q_mask, "masker")
+            if unit is _DONE:
+                break
+            if unit.error is not None or unit.deferred:
+                self._put(self.q_rebuild, unit, "masker")
+                continue
+            with self._busy("masker", file=unit.src_path.name, lang=unit.lang):
+                unit.protected = mask_leaves(unit.src_data)
+                unit.translated = [None] * len(unit.protected)
+                unit.todo = list(range(len(unit.protected)))
+                if self._needs_existing:
+                    self._resolve_locally(unit)
+                if self.tm is not None and unit.todo:
+                    with span("classify", file=unit.src_path.name, lang=unit.lang):
+                        # Answer what the translation memory already knows; leaves
+                        # resolved locally above are not looked up again
+                        sources = {i: restore_placeholders(*unit.protected[i][1:]) for i in unit.todo}
+                        known = self.tm.lookup(unit.lang, sources.values())
+                        unit.todo = [i for i, src in sources.items() if src not in known]
+                        for i, src in sources.items():
+                            if src in known:
+                                unit.translated[i] = known[src]
+                    if self.metrics:
+                        self.metrics.record_cache(unit.lang, len(sources) - len(unit.todo), len(unit.todo))
+            unit.pending = len(unit.todo)
+            # Nothing to translate still has to be rebuilt and written
+            self._put(self.q_batch if unit.pending else self.q_rebuild, unit, "masker")
+        self._put(self.q_batch, _DONE, "masker")
+
+    @property
+    def _needs_existing(self) -> bool:
+        return self.key_filter is not None or self.missing_only
+
+    def _resolve_locally(self, unit: WorkUnit):
+        """Fill leaves that need no translation (out of scope, or already translated)."""
+        namespace = unit.src_path.stem
+        todo = []
+        out_of_scope = kept = 0
+        for i in unit.todo:
+            path, tmp, _repls = unit.protected[i]
+            current = leaf_at(unit.existing, path)
+            translated = isinstance(current, str) and current and not is_marker(current)
+            in_scope = self.key_filter is None or self.key_filter(namespace, path)
+            if in_scope and not (self.missing_only and translated):
+                todo.append(i)
+                continue
+            if in_scope:
+                kept += 1
+            else:
+                out_of_scope += 1
+            # rebuild_translations restores placeholders; plain text passes through
+            unit.translated[i] = current if translated else tmp
+        with self._lock:
+            self.out_of_scope += out_of_scope
+            self.kept_existing += kept
+        unit.todo = todo
+        unit.existing = None
+
+    def _keep_existing(self, unit: WorkUnit):
+        """Put back the target's translations where only a marker came back (fallback or failed check)."""
+        markers = [i for i, text in enumerate(unit.translated) if is_marker(text)]
+        existing_path = unit.existing_path or unit.out_path
+        if not markers or not existing_path.exists():
+            return
+        try:
+            existing = load_json(existing_path)
+        except Exception as e:
+            print(f"[warn] Ignoring unreadable {existing_path}: {e}", file=sys.stderr)
+            return
+        kept = 0
+        for i in markers:
+            current = leaf_at(existing, unit.protected[i][0])
+            if isinstance(current, str) and current and not is_marker(current):
+                unit.translated[i] = current
+                kept += 1
+        with self._lock:
+            self.kept_on_fallback += kept
+
+    def _batcher(self):
+        pending: Dict[str, Batch] = {}
+
+        def emit(batch: Batch):
+            if self.metrics and batch.dup_strings:
+                self.metrics.record_dedup(batch.lang, batch.dup_strings, batch.dup_chars)
+            self._put(self.q_translate, batch, "batcher")
+
+        while True:
+            # Flush partial batches when input goes idle, so the reader (blocked on
+            # unit slots) never waits on strings the batcher is still holding
+            unit = self._get(self.q_batch, "batcher", timeout=_POLL)
+            if unit is None:
+                for lang in list(pending):
+                    emit(pending.pop(lang))
+                continue
+            if unit is _DONE:
+                break
+            full = []
+            with self._busy("batcher"):
+                for i in unit.todo:
+                    batch = pending.get(unit.lang)
+                    if batch is None:
+                        batch = pending[unit.lang] = Batch(unit.lang)
+                    batch.add(unit.protected[i][1], unit, i)
+                    if len(batch.groups) >= self.batch_size:
+                        full.append(pending.pop(unit.lang))
+            for batch in full:
+                emit(batch)
+        for lang in list(pending):
+            emit(pending.pop(lang))
+        for _ in range(self.workers):
+            self._put(self.q_translate, _DONE, "batcher")
+
+    def _translator(self):
+        while True:
+            batch = self._get(self.q_translate, "translator")
+            if batch is _DONE:
+                break
+            strings = list(batch.groups)
+            error: Optional[BaseException] = None
+            with self._busy("translator", lang=batch.lang, strings=len(strings)):
+                start = time.perf_counter()
+                try:
+                    result = self.translate_fn(strings, batch.lang)
+                    if len(result) != len(strings):
+                        raise RuntimeError(f"Backend returned {len(result)} translations for {len(strings)} strings")
+                except Exception as e:
+                    error = e
+                    result = []
+                if self.metrics:
+                    files = [refs[0][0].src_path.name for refs in batch.groups.values()]
+                    self.metrics.record_request(batch.lang, strings, time.perf_counter() - start,
+                                                files=files, error=error is not None)
+            learned = []
+            finished = []
+            with self._lock:
+                for n, refs in enumerate(batch.groups.values()):
+                    issues: List[str] = []
+                    for k, (unit, i) in enumerate(refs):
+                        if error is None:
+                            path, tmp, repls = unit.protected[i]
+                            if k == 0:
+                                source = restore_placeholders(tmp, repls)
+                                text = restore_placeholders(result[n], repls)
+                                # A plan's recording backend echoes the masked input
+                                if self.validator is not None and not self.plan:
+                                    issues = self.validator.check(source, text)
+                                # A fallback backend's [TRANSLATE] markers are not translations
+                                if not issues and not is_marker(result[n]):
+                                    learned.append((source, text))
+                            if issues:
+                                unit.translated[i] = marker_for(source)
+                                if self.retry is not None:
+                                    self.retry.add(RetryItem(unit.src_path, unit.out_path, batch.lang, path,
+                                                             source, issues))
+                            else:
+                                unit.translated[i] = result[n]
+                        elif unit.error is None:
+                            unit.error = error
+                        unit.pending -= 1
+                        if unit.pending == 0:
+                            finished.append(unit)
+            # A plan's recording backend returns no real translations
+            if self.tm is not None and learned and not self.plan:
+                self.tm.store(batch.lang, learned)
+            for unit in finished:
+                if unit.error is not None:
+                    self._fail(unit, unit.error)
+                self._put(self.q_rebuild, unit, "translator")
+
+    def _rebuilder(self, expected: int):
+        for _ in range(expected):
+            unit = self._get(self.q_rebuild, "rebuilder")
+            if unit is _DONE:
+                return
+            if unit.error is None and not unit.deferred and not self.plan:
+                with self._busy("rebuilder", file=unit.src_path.name, lang=unit.lang):
+                    try:
+                        self._keep_existing(unit)
+                        unit.result = rebuild_translations(unit.src_data, unit.protected, unit.translated)
+                    except Exception as e:
+                        self._fail(unit, e)
+            # Drop the heavy intermediates before the unit waits in the write queue
+            unit.protected, unit.translated, unit.src_data = [], [], None
+            self._put(self.q_write, unit, "rebuilder")
+
+    def _writer(self, expected: int):
+        for _ in range(expected):
+            unit = self._get(self.q_write, "writer")
+            if unit is _DONE:
+                return
+            try:
+                if unit.deferred:
+                    self.deferred.append(unit.out_path)
+                    continue
+                if unit.error is not None:
+                    self.failed.append((unit.out_path, unit.error))
+                    print(f"[warn] Skipping {unit.out_path} due to error: {unit.error}", file=sys.stderr)
+                    continue
+                with self._busy("writer", file=str(unit.out_path)):
+                    if self.dry_run:
+                        if not self.plan:
+                            print(f"[dry-run] Would write {unit.out_path}")
+                        continue
+                    before = DEFAULT_WRITER.bytes_written
+                    written = save_json(unit.out_path, unit.result)
+                    if self.metrics:
+                        self.metrics.record_write(DEFAULT_WRITER.bytes_written - before, written)
+                    if written:
+                        self.written.append(unit.out_path)
+                        print(f"Wrote {unit.out_path}")
+                    else:
+                        self.unchanged.append(unit.out_path)
+                        print(f"Unchanged {unit.out_path}")
+            except Exception as e:
+                self._fail(unit, e)
+                self.failed.append((unit.out_path, e))
+                print(f"[warn] Failed to write {unit.out_path}: {e}", file=sys.stderr)
+            finally:
+                unit.result = None
+                with self._lock:
+                    self.inflight -= 1
+                self.slots.release()
+
+    # -- driver -----------------------------------------------------------
+
+    def run(self, units: List[WorkUnit]):
+        """Process all units; re-raises the first error unless ``continue_on_error``."""
+        start = self._started = time.perf_counter()
+        # Every unit reaches the rebuilder and writer exactly once (failed ones
+        # included), so both know when to stop; on abort they stop early.
+        targets = [
+            ("reader", self._reader, (units,)),
+            ("masker", self._masker, ()),
+            ("batcher", self._batcher, ()),
+        ]
+        targets += [(f"translator-{i}", self._translator, ()) for i in range(self.workers)]
+        targets += [
+            ("rebuilder", self._rebuilder, (len(units),)),
+            ("writer", self._writer, (len(units),)),
+        ]
+        threads = [
+            threading.Thread(target=self._stage, args=(fn, args), name=name)
+            for name, fn, args in targets
+        ]
+        for t in threads:
+            t.daemon = True
+            t.start()
+        for t in threads:
+            t.join()
+        self.wall = time.perf_counter() - start
+        if self._fatal is not None:
+            raise self._fatal
+
+    @staticmethod
+    def _stage(fn, args):
+        with profile_thread():
+            fn(*args)
+
+    def print_stats(self):
+        print(f"\nPipeline: {self.wall:.2f}s wall, peak {self.peak_inflight} units in flight")
+        if self.key_filter is not None:
+            print(f"  {self.out_of_scope:,} leaves outside --only-used scope were not translated")
+        if self.missing_only:
+            print(f"  {self.kept_existing:,} existing translations kept (--missing-only)")
+        if self.kept_on_fallback:
+            print(f"  {self.kept_on_fallback:,} existing translations kept instead of [TRANSLATE] markers")
+        if self.deferred:
+            print(f"  {len(self.deferred):,} units deferred by the deadline")
+        print(f"  {'stage':<13} {'items':>7} {'busy s':>9} {'blocked s':>10} {'util':>6}")
+        for name in self.STAGES:
+            st = self.stats[name]
+            label = f"{name} x{st.workers}" if st.workers > 1 else name
+            print(f"  {label:<13} {st.items:>7} {st.busy:>9.2f} {st.blocked:>10.2f} {st.utilization(self.wall):>6.0%}")
+
+
+def build_units(mapping: Dict[str, Dict[str, str]], targets: List[str]) -> List[WorkUnit]:
+    units = []
+    for src_path_str, per_lang in mapping.items():
+        src_path = Path(src_path_str)
+        for lang in targets:
+            out_path = per_lang.get(lang) or src_path.parent.parent / lang / src_path.name
+            units.append(WorkUnit(src_path, lang, Path(out_path)))
+    return units
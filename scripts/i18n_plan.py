@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Cost and time estimate for a translate_locales.py run (``--plan``).
+
+The plan runs the real pipeline front (load, diff against existing targets
+with ``--missing-only``/``--only-used``, translation-memory lookup, dedup and
+batching) but hands each batch to a recording backend instead of the API.
+The result is the exact characters that would be billed and the request
+count per language and per file, plus the cost at ``--price-per-million``
+and the wall time at the configured ``--workers``.
+
+Latency per request is modelled as ``request_latency + chars /
+chars_per_second``; without explicit flags the fixed part is calibrated
+from the newest translate_locales metrics file, if there is one.
+"""
+import heapq
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from i18n_metrics import DEFAULT_METRICS_DIR, RunMetrics
+from i18n_pipeline import KeyFilter, Pipeline, WorkUnit
+from i18n_tm import TranslationMemory
+
+DEFAULT_PRICE_PER_MILLION = 20.0  # USD per million characters, Cloud Translation v3 NMT
+DEFAULT_REQUEST_LATENCY = 0.5  # seconds per request when there is no history
+DEFAULT_CHARS_PER_SECOND = 20000.0
+
+
+class RecordingBackend:
+    """Stands in for the API during a plan: records each request, translates nothing."""
+
+    def __init__(self):
+        self.requests: List[Tuple[str, int]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, strings: List[str], lang: str) -> List[str]:
+        with self._lock:
+            self.requests.append((lang, sum(len(s) for s in strings)))
+        return list(strings)
+
+
+class LatencyModel:
+    def __init__(self, request_latency: float = DEFAULT_REQUEST_LATENCY,
+                 chars_per_second: float = DEFAULT_CHARS_PER_SECOND, source: str = "defaults"):
+        self.request_latency = request_latency
+        self.chars_per_second = chars_per_second
+        self.source = source
+
+    @classmethod
+    def calibrated(cls, request_latency: Optional[float] = None,
+                   chars_per_second: Optional[float] = None,
+                   metrics_dir: Path = DEFAULT_METRICS_DIR) -> "LatencyModel":
+        """Explicit values win; otherwise derive the fixed latency from the last real run."""
+        cps = chars_per_second or DEFAULT_CHARS_PER_SECOND
+        if request_latency is not None:
+            return cls(request_latency, cps, source="flags")
+        runs = sorted(Path(metrics_dir).glob("translate_locales-*.json"))
+        for path in reversed(runs):
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                continue
+            requests = data.get("totals", {}).get("requests", 0)
+            if not requests:
+                continue
+            mean_s = data["latency_ms"]["mean"] / 1000
+            mean_chars = data["totals"]["chars_billed"] / requests
+            return cls(max(0.05, mean_s - mean_chars / cps), cps, source=path.name)
+        return cls(DEFAULT_REQUEST_LATENCY, cps)
+
+    def seconds(self, chars: int) -> float:
+        return self.request_latency + chars / self.chars_per_second
+
+    def wall(self, request_chars: List[int], workers: int) -> float:
+        """Requests taken in order by the first free of ``workers`` translators."""
+        if not request_chars:
+            return 0.0
+        free_at = [0.0] * max(1, workers)
+        for chars in request_chars:
+            start = heapq.heappop(free_at)
+            heapq.heappush(free_at, start + self.seconds(chars))
+        return max(free_at)
+
+
+def plan_units(units: List[WorkUnit], workers: int, queue_size: int, batch_size: int,
+               tm: Optional[TranslationMemory], key_filter: Optional[KeyFilter], missing_only: bool,
+               model: LatencyModel, price_per_million: float) -> Dict[str, Any]:
+    backend = RecordingBackend()
+    metrics = RunMetrics("plan")
+    pipeline = Pipeline(backend, workers=workers, queue_size=queue_size, batch_size=batch_size,
+                        metrics=metrics, tm=tm, key_filter=key_filter, missing_only=missing_only, plan=True)
+    pipeline.run(units)
+
+    def cost(chars: int) -> float:
+        return round(chars * price_per_million / 1e6, 2)
+
+    per_lang: Dict[str, List[int]] = {}
+    for lang, chars in backend.requests:
+        per_lang.setdefault(lang, []).append(chars)
+
+    languages = {}
+    for lang, counters in sorted(metrics.languages.items()):
+        c = counters.to_json()
+        languages[lang] = {
+            "strings": c["strings"],
+            "chars": c["chars_billed"],
+            "requests": c["requests"],
+            "cache_hits": c["cache_hits"],
+            "dedup_chars": c["dedup_chars"],
+            "cost": cost(c["chars_billed"]),
+            "eta_s": round(model.wall(per_lang.get(lang, []), workers), 1),
+        }
+    files = {
+        name: {**entry, "cost": cost(entry["chars_billed"])}
+        for name, entry in sorted(metrics.files.items(), key=lambda kv: -kv[1]["chars_billed"])
+    }
+    all_chars = [chars for _lang, chars in backend.requests]
+    t = metrics.total
+    return {
+        "units": len(units),
+        "workers": workers,
+        "batch_size": batch_size,
+        "price_per_million": price_per_million,
+        "latency_model": {
+            "request_latency_s": round(model.request_latency, 3),
+            "chars_per_second": model.chars_per_second,
+            "source": model.source,
+        },
+        "totals": {
+            "strings": t.strings,
+            "chars": t.chars_billed,
+            "requests": t.requests,
+            "cache_hits": t.cache_hits,
+            "dedup_chars": t.dedup_chars,
+            "out_of_scope": pipeline.out_of_scope,
+            "kept_existing": pipeline.kept_existing,
+            "cost": cost(t.chars_billed),
+            "eta_s": round(model.wall(all_chars, workers), 1),
+        },
+        "languages": languages,
+        "files": files,
+    }
+
+
+def _duration(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{secs:02d}s"
+
+
+def print_plan(plan: Dict[str, Any], top_files: int = 20):
+    t = plan["totals"]
+    model = plan["latency_model"]
+    print("\n" + "=" * 60)
+    print("TRANSLATION PLAN (no API calls made)")
+    print("=" * 60)
+    print(f"{'Language':<10} {'Strings':>8} {'Chars':>10} {'Requests':>9} {'Cost':>9} {'ETA':>9}")
+    print("-" * 60)
+    for lang, row in plan["languages"].items():
+        print(f"{lang.upper():<10} {row['strings']:>8,} {row['chars']:>10,} {row['requests']:>9,} "
+              f"${row['cost']:>8,.2f} {_duration(row['eta_s']):>9}")
+    print("-" * 60)
+    print(f"{'TOTAL':<10} {t['strings']:>8,} {t['chars']:>10,} {t['requests']:>9,} "
+          f"${t['cost']:>8,.2f} {_duration(t['eta_s']):>9}")
+
+    if plan["files"]:
+        shown = list(plan["files"].items())[:top_files]
+        print(f"\nTop {len(shown)} of {len(plan['files'])} source files by billed characters:")
+        for name, row in shown:
+            print(f"  {name:<32} {row['chars_billed']:>10,} chars {row['requests']:>6,} requests  ${row['cost']:,.2f}")
+
+    print(f"\nSaved before billing: {t['cache_hits']:,} translation-memory hits, {t['dedup_chars']:,} chars deduplicated")
+    if t["out_of_scope"]:
+        print(f"  {t['out_of_scope']:,} leaves skipped as unreferenced (--only-used)")
+    if t["kept_existing"]:
+        print(f"  {t['kept_existing']:,} leaves already translated (--missing-only)")
+    print(f"Cost at ${plan['price_per_million']:g}/1M chars; ETA with {plan['workers']} workers at "
+          f"{model['request_latency_s']}s + chars/{model['chars_per_second']:,.0f} per request ({model['source']})")
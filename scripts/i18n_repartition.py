@@ -0,0 +1,617 @@
+#!/usr/bin/env python3
+"""Repartition locale namespaces by which keys each route loads together.
+
+i18next loads whole namespaces.  The current namespaces were split and merged
+by hand (merge-small-files.js, split-ui-misc.js, reorganize-common.cjs), so a
+page often downloads a large namespace to use a handful of its keys.  This
+tool:
+
+1. Finds the routes: ``<Route path=... element={...}>`` in src/App.tsx, or
+   one route per file under src/pages when there are none.  The import graph
+   from the usage index (i18n_usage.py) gives the files each route renders,
+   plus the shell that every route renders.
+2. Splits each namespace into blocks, one per top-level key (the unit the
+   hand-made splits moved), and records which routes use each block.
+3. Puts blocks used by exactly the same routes into one group.  It then
+   merges groups greedily, always the pair that saves most.  The cost is the
+   bytes each route loads plus ``--request-overhead`` bytes for each
+   namespace it fetches, summed over routes.  Merges stop when none saves
+   anything, or once ``--max-namespaces`` is reached.  Blocks that no route
+   uses stay in their namespace.
+4. Reports the bytes each route loads before and after.
+
+``--apply`` rewrites every language in one transaction.  The new files are
+staged next to their targets, and the tool checks that every leaf of every
+language appears exactly once in the new layout.  Only then are the files
+swapped in; the originals are backed up and restored if anything fails.
+Moves are recorded in the key-move map (src/i18n/key-moves.json) as
+``"old-ns:key" -> "new-ns:key"`` and composed with earlier moves.  Use the
+map to update ``useTranslation``/``t()`` references.
+
+    python3 scripts/i18n_repartition.py                  # proposal only
+    python3 scripts/i18n_repartition.py --apply
+"""
+import argparse
+import heapq
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from i18n_io import dumps_json, write_json
+from i18n_locales import LocaleTree, flatten
+from i18n_sizes import key_sizes
+from i18n_trace import add_profile_arguments, profiling, span
+from i18n_usage import DEFAULT_INDEX_PATH, DEFAULT_SRC_DIR, KeyScope, UsageIndex, load_index
+from translate_locales import DEFAULT_LOCALES_DIR, SOURCE_LANG
+
+DEFAULT_ROUTES_FILE = Path("src/App.tsx")
+DEFAULT_PAGES_DIR = Path("src/pages")
+DEFAULT_MOVES_PATH = Path("src/i18n/key-moves.json")
+DEFAULT_BACKUP_DIR = Path(".i18n-cache/repartition-backup")
+# Bytes a route pays per extra namespace it fetches (request and header overhead)
+DEFAULT_REQUEST_OVERHEAD = 1500
+MOVES_VERSION = 1
+RESOLVE_SUFFIXES = ("", ".ts", ".tsx", ".js", ".jsx", "/index.ts", "/index.tsx", "/index.js", "/index.jsx")
+
+BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+LINE_COMMENT = re.compile(r"(?m)^\s*//.*$")
+DEFAULT_IMPORT = re.compile(r"import\s+([A-Za-z_$][\w$]*)\s*(?:,\s*\{[^}]*\})?\s*from\s*['\"]([^'\"]+)['\"]")
+NAMED_IMPORT = re.compile(r"import\s+(?:[A-Za-z_$][\w$]*\s*,\s*)?\{([^}]*)\}\s*from\s*['\"]([^'\"]+)['\"]")
+LAZY_IMPORT = re.compile(
+    r"(?:const|let)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:React\.)?lazy\(\s*\(\)\s*=>\s*import\(\s*['\"]([^'\"]+)['\"]"
+)
+ROUTE_TAG = re.compile(r"<Route\b")
+ROUTE_PATH = re.compile(r"\bpath=(?:\{\s*)?['\"]([^'\"]*)['\"]")
+JSX_COMPONENT = re.compile(r"<([A-Z][\w$]*)")
+
+
+class RepartitionError(RuntimeError):
+    pass
+
+
+# -- routes and the import graph ----------------------------------------------
+
+
+class ImportGraph:
+    def __init__(self, index: UsageIndex, src_dir: Path):
+        self.src_dir = Path(src_dir)
+        self.files = set(index.files)
+        self.edges: Dict[str, List[str]] = {}
+        for name, entry in index.files.items():
+            resolved = (self.resolve(spec, name) for spec in entry.get("imports", []))
+            self.edges[name] = sorted({r for r in resolved if r is not None})
+
+    def resolve(self, spec: str, importer: str) -> Optional[str]:
+        """Index file for an ``@/`` or relative specifier; None for packages and assets."""
+        if spec.startswith("@/"):
+            base = self.src_dir / spec[2:]
+        elif spec.startswith("."):
+            base = Path(importer).parent / spec
+        else:
+            return None
+        base_str = Path(os.path.normpath(base)).as_posix()
+        for suffix in RESOLVE_SUFFIXES:
+            if base_str + suffix in self.files:
+                return base_str + suffix
+        return None
+
+    def closure(self, roots: Iterable[str]) -> Set[str]:
+        seen: Set[str] = set()
+        stack = [r for r in roots if r in self.files]
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            stack.extend(self.edges.get(name, ()))
+        return seen
+
+
+class Route:
+    def __init__(self, path: str, files: Set[str]):
+        self.path = path
+        self.files = files
+        self.scope: Optional[KeyScope] = None
+        self.declared: Set[str] = set()
+
+    @property
+    def slug(self) -> str:
+        return re.sub(r"[^a-z0-9]+", "-", self.path.lower()).strip("-") or "home"
+
+
+def _strip_comments(text: str) -> str:
+    return LINE_COMMENT.sub("", BLOCK_COMMENT.sub("", text))
+
+
+def _braced(text: str, start: int) -> str:
+    """Contents of the ``{...}`` opening at ``text[start]``."""
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == "{":
+            depth += 1
+        elif text[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start + 1:i]
+    return text[start + 1:]
+
+
+def _component_imports(text: str) -> Dict[str, str]:
+    imports: Dict[str, str] = {}
+    for m in DEFAULT_IMPORT.finditer(text):
+        imports[m.group(1)] = m.group(2)
+    for m in NAMED_IMPORT.finditer(text):
+        for name in m.group(1).split(","):
+            local = name.split(" as ")[-1].strip()
+            if local:
+                imports[local] = m.group(2)
+    for m in LAZY_IMPORT.finditer(text):
+        imports[m.group(1)] = m.group(2)
+    return imports
+
+
+def parse_routes(routes_file: Path, graph: ImportGraph) -> List[Route]:
+    """Routes declared with ``<Route path=... element={...}>``; each includes the shell's files."""
+    name = Path(routes_file).as_posix()
+    text = _strip_comments(Path(routes_file).read_text(encoding="utf-8"))
+    imports = _component_imports(text)
+    routes: Dict[str, Set[str]] = {}
+    element_specs: Set[str] = set()
+    tags = [m.end() for m in ROUTE_TAG.finditer(text)] + [len(text)]
+    for start, end in zip(tags, tags[1:]):
+        # Attributes of a <Route> are searched up to the next <Route> (nested routes included)
+        segment = text[start:end]
+        path_m = ROUTE_PATH.search(segment)
+        element_at = segment.find("element={")
+        if path_m is None or element_at == -1:
+            continue
+        roots = set()
+        for component in JSX_COMPONENT.findall(_braced(segment, element_at + len("element="))):
+            spec = imports.get(component)
+            target = graph.resolve(spec, name) if spec else None
+            if target:
+                roots.add(target)
+                element_specs.add(spec)
+        if roots:
+            routes.setdefault(path_m.group(1), set()).update(roots)
+    # The routes file and everything it imports besides the pages render on every route
+    shell_roots = [graph.resolve(spec, name) for spec in set(imports.values()) - element_specs]
+    shell = {name} | graph.closure(r for r in shell_roots if r)
+    return [Route(path, graph.closure(roots) | shell) for path, roots in sorted(routes.items())]
+
+
+def page_routes(pages_dir: Path, graph: ImportGraph) -> List[Route]:
+    """Fallback grouping: one route per page file."""
+    prefix = Path(pages_dir).as_posix().rstrip("/") + "/"
+    pages = sorted(f for f in graph.files if f.startswith(prefix))
+    return [Route("/" + re.sub(r"\.[jt]sx?$", "", p[len(prefix):]), graph.closure([p])) for p in pages]
+
+
+def attach_usage(routes: List[Route], index: UsageIndex):
+    for route in routes:
+        route.scope = index.scope(route.files)
+        for name in route.files:
+            entry = index.files.get(name, {})
+            # Files without any lookup default to "common" in the index; they load nothing
+            if entry.get("keys") or entry.get("patterns") or entry.get("computed"):
+                route.declared.update(entry.get("namespaces", []))
+
+
+# -- blocks, groups and the partition -----------------------------------------
+
+
+class Block:
+    """One top-level key of a namespace, moved as a unit."""
+
+    def __init__(self, namespace: str, key: str, size: float, order: int):
+        self.namespace = namespace
+        self.key = key
+        self.size = size
+        self.order = order
+        self.routes: FrozenSet[int] = frozenset()
+
+    @property
+    def ref(self) -> str:
+        return f"{self.namespace}:{self.key}"
+
+
+class Group:
+    def __init__(self, blocks: List[Block]):
+        self.blocks = sorted(blocks, key=lambda b: b.order)
+        self.routes: FrozenSet[int] = frozenset().union(*(b.routes for b in blocks))
+        self.size = sum(b.size for b in blocks)
+        self.keys = {b.key for b in blocks}
+        self.name = ""
+
+    def merged(self, other: "Group") -> "Group":
+        return Group(self.blocks + other.blocks)
+
+
+def build_blocks(tree: LocaleTree) -> List[Block]:
+    """Blocks of the source language's namespaces, sized by the mean minified bytes across languages."""
+    blocks = []
+    for ns in tree.namespaces:
+        en = tree.get(tree.source_lang, ns)
+        if not isinstance(en, dict):
+            continue
+        per_lang = [key_sizes(tree.get(lang, ns)) for lang in tree.languages]
+        for key in en:
+            sizes = [s[key] for s in per_lang if key in s]
+            blocks.append(Block(ns, key, sum(sizes) / len(sizes), len(blocks)))
+    return blocks
+
+
+def mark_usage(blocks: List[Block], tree: LocaleTree, routes: List[Route]):
+    by_ns: Dict[str, Dict[str, Block]] = {}
+    for block in blocks:
+        by_ns.setdefault(block.namespace, {})[block.key] = block
+    used: Dict[Tuple[str, str], Set[int]] = {}
+    for r, route in enumerate(routes):
+        assert route.scope is not None
+        for ns, ns_blocks in by_ns.items():
+            for path in flatten(tree.get(tree.source_lang, ns)):
+                if path[0] in ns_blocks and route.scope.is_used(ns, path):
+                    used.setdefault((ns, path[0]), set()).add(r)
+    for block in blocks:
+        block.routes = frozenset(used.get((block.namespace, block.key), ()))
+
+
+def _cost(group: Group, overhead: float) -> float:
+    return len(group.routes) * (group.size + overhead)
+
+
+def partition(blocks: List[Block], overhead: float = DEFAULT_REQUEST_OVERHEAD,
+              max_namespaces: Optional[int] = None) -> List[Group]:
+    """Groups of co-used blocks, merged greedily by cost saving."""
+    by_signature: Dict[FrozenSet[int], List[List[Block]]] = {}
+    unused: Dict[str, List[Block]] = {}
+    for block in blocks:
+        if not block.routes:
+            unused.setdefault(block.namespace, []).append(block)
+            continue
+        # Same top-level key from two namespaces cannot share a namespace
+        bins = by_signature.setdefault(block.routes, [])
+        for members in bins:
+            if all(b.key != block.key for b in members):
+                members.append(block)
+                break
+        else:
+            bins.append([block])
+
+    groups: Dict[int, Group] = {}
+    for bins in by_signature.values():
+        for members in bins:
+            groups[len(groups)] = Group(members)
+    fixed = [Group(members) for members in unused.values()]
+
+    def delta(a: Group, b: Group) -> Optional[float]:
+        if a.keys & b.keys:
+            return None
+        return len(a.routes | b.routes) * (a.size + b.size + overhead) - _cost(a, overhead) - _cost(b, overhead)
+
+    heap: List[Tuple[float, int, int]] = []
+    ids = sorted(groups)
+    for i, a in enumerate(ids):
+        for b in ids[i + 1:]:
+            d = delta(groups[a], groups[b])
+            if d is not None:
+                heap.append((d, a, b))
+    heapq.heapify(heap)
+    next_id = len(groups)
+    with span("merge groups", groups=len(groups)):
+        while heap:
+            d, a, b = heapq.heappop(heap)
+            if a not in groups or b not in groups:
+                continue
+            over_limit = max_namespaces is not None and len(groups) + len(fixed) > max_namespaces
+            if d >= 0 and not over_limit:
+                break
+            merged = groups.pop(a).merged(groups.pop(b))
+            for other_id, other in groups.items():
+                nd = delta(merged, other)
+                if nd is not None:
+                    heapq.heappush(heap, (nd, next_id, other_id) if next_id < other_id else (nd, other_id, next_id))
+            groups[next_id] = merged
+            next_id += 1
+    return list(groups.values()) + fixed
+
+
+def name_groups(groups: List[Group], routes: List[Route]):
+    """Name each group after the namespace holding most of it, suffixed when that name is taken.
+
+    Unused blocks keep their namespace's name: the usage scan may have missed
+    their callers (computed keys, files it does not read), and those callers
+    still ask for the old namespace.  Used groups, largest first, take the
+    names left over and get suffixed after their routes otherwise; their
+    keys are all in the move map.
+    """
+    taken: Set[str] = set()
+
+    def dominant(group: Group) -> str:
+        share: Dict[str, float] = {}
+        for b in group.blocks:
+            share[b.namespace] = share.get(b.namespace, 0.0) + b.size
+        return max(share.items(), key=lambda kv: (kv[1], kv[0]))[0]
+
+    for group in sorted(groups, key=lambda g: (bool(g.routes), -g.size, g.blocks[0].order)):
+        base = dominant(group)
+        if base in taken:
+            if len(group.routes) == len(routes):
+                suffix = "shared"
+            elif len(group.routes) == 1:
+                suffix = routes[next(iter(group.routes))].slug
+            else:
+                suffix = "part"
+            base = f"{base}-{suffix}"
+        name, n = base, 2
+        while name in taken:
+            name, n = f"{base}-{n}", n + 1
+        group.name = name
+        taken.add(name)
+
+
+def route_loads(routes: List[Route], blocks: List[Block], groups: List[Group],
+                overhead: float) -> List[Dict[str, Any]]:
+    ns_size: Dict[str, float] = {}
+    for b in blocks:
+        ns_size[b.namespace] = ns_size.get(b.namespace, 0.0) + b.size
+    rows = []
+    for r, route in enumerate(routes):
+        before = {b.namespace for b in blocks if r in b.routes} | (route.declared & set(ns_size))
+        after = [g for g in groups if r in g.routes]
+        rows.append({
+            "route": route.path,
+            "files": len(route.files),
+            "before_namespaces": len(before),
+            "before_bytes": round(sum(ns_size[ns] for ns in before)),
+            "after_namespaces": len(after),
+            "after_bytes": round(sum(g.size for g in after)),
+            "before_cost": round(sum(ns_size[ns] for ns in before) + overhead * len(before)),
+            "after_cost": round(sum(g.size for g in after) + overhead * len(after)),
+        })
+    return rows
+
+
+# -- applying a partition -----------------------------------------------------
+
+
+def block_moves(groups: List[Group]) -> Dict[Tuple[str, str], str]:
+    return {(b.namespace, b.key): g.name for g in groups for b in g.blocks}
+
+
+def relayout(tree: LocaleTree, groups: List[Group]) -> Dict[str, Dict[str, Any]]:
+    """``{lang: {new namespace: document}}``, verified to hold every leaf exactly once."""
+    moves = block_moves(groups)
+    old_namespaces = sorted({ns for (lang, ns) in tree.docs})
+    # Keys a target language has but English lacks stay in their namespace if it is kept,
+    # otherwise they follow the bulk of it
+    kept = {g.name for g in groups}
+    home: Dict[str, str] = {}
+    for ns in old_namespaces:
+        if ns in kept:
+            home[ns] = ns
+            continue
+        share: Dict[str, float] = {}
+        for g in groups:
+            for b in g.blocks:
+                if b.namespace == ns:
+                    share[g.name] = share.get(g.name, 0.0) + b.size
+        home[ns] = max(share.items(), key=lambda kv: kv[1])[0] if share else ns
+
+    out: Dict[str, Dict[str, Any]] = {}
+    for lang in tree.languages:
+        docs: Dict[str, Dict[str, Any]] = {g.name: {} for g in groups}
+        for g in groups:
+            for b in g.blocks:
+                data = tree.get(lang, b.namespace)
+                if isinstance(data, dict) and b.key in data:
+                    docs[g.name][b.key] = data[b.key]
+        expected: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+        for ns in old_namespaces:
+            data = tree.get(lang, ns)
+            if data is None:
+                continue
+            if not isinstance(data, dict):
+                raise RepartitionError(f"{lang}/{ns}.json is not an object")
+            for key, value in data.items():
+                target = moves.get((ns, key))
+                if target is None:
+                    target = home[ns]
+                    if key in docs.setdefault(target, {}):
+                        raise RepartitionError(f"{lang}/{ns}.json: extra key {key!r} collides in {target}")
+                    docs[target][key] = value
+            for path, value in flatten(data).items():
+                expected[(moves.get((ns, path[0]), home[ns]), path)] = value
+        actual = {(ns, path): value for ns, doc in docs.items() for path, value in flatten(doc).items()}
+        if actual != expected:
+            lost = len(set(expected) - set(actual))
+            raise RepartitionError(f"{lang}: new layout does not preserve every leaf ({lost} missing)")
+        out[lang] = {ns: doc for ns, doc in docs.items() if doc}
+    return out
+
+
+def commit_files(changes: Dict[Path, Optional[bytes]], backup_dir: Path):
+    """Write (bytes) or delete (None) every path, all or nothing."""
+    staged: Dict[Path, str] = {}
+    try:
+        for path, payload in changes.items():
+            if payload is None:
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            staged[path] = tmp
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        existed = {}
+        for path in changes:
+            existed[path] = path.exists()
+            if existed[path]:
+                target = backup_dir / path.parent.name / path.name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(path, target)
+    except BaseException:
+        for tmp in staged.values():
+            Path(tmp).unlink(missing_ok=True)
+        raise
+
+    done: List[Path] = []
+    try:
+        for path, payload in changes.items():
+            if payload is None:
+                path.unlink(missing_ok=True)
+            else:
+                os.replace(staged[path], path)
+                del staged[path]
+            done.append(path)
+    except BaseException:
+        for path in done:
+            if existed[path]:
+                shutil.copy2(backup_dir / path.parent.name / path.name, path)
+            else:
+                path.unlink(missing_ok=True)
+        for tmp in staged.values():
+            Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def load_moves(path: Path) -> Dict[str, str]:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return dict(data.get("moves", {})) if data.get("version") == MOVES_VERSION else {}
+
+
+def update_moves(existing: Dict[str, str], groups: List[Group]) -> Tuple[Dict[str, str], int]:
+    """Compose ``old -> new`` top-level moves with the map; returns (map, moves added)."""
+    new = {b.ref: f"{g.name}:{b.key}" for g in groups for b in g.blocks if g.name != b.namespace}
+    composed = {old: new.get(target, target) for old, target in existing.items()}
+    composed.update(new)
+    # A key moved back to where it started needs no entry
+    composed = {old: target for old, target in composed.items() if old != target}
+    return dict(sorted(composed.items())), len(new)
+
+
+# -- CLI ----------------------------------------------------------------------
+
+
+def print_proposal(groups: List[Group], rows: List[Dict[str, Any]], routes: List[Route], moved: int):
+    print("\n" + "=" * 60)
+    print(f"NAMESPACE PARTITION ({len(routes)} routes)")
+    print("=" * 60)
+    print(f"{'Route':<28} {'Before KB':>9} {'ns':>4} {'After KB':>9} {'ns':>4} {'Saved':>6}")
+    for row in sorted(rows, key=lambda r: -r["before_bytes"]):
+        saved = 1 - row["after_cost"] / row["before_cost"] if row["before_cost"] else 0.0
+        print(f"{row['route'][:28]:<28} {row['before_bytes'] / 1024:>9,.1f} {row['before_namespaces']:>4} "
+              f"{row['after_bytes'] / 1024:>9,.1f} {row['after_namespaces']:>4} {saved:>6.0%}")
+    before = sum(r["before_cost"] for r in rows)
+    after = sum(r["after_cost"] for r in rows)
+    print("-" * 60)
+    if rows:
+        print(f"Mean per route: {before / len(rows) / 1024:,.1f} KB -> {after / len(rows) / 1024:,.1f} KB "
+              f"(including request overhead)")
+    print(f"\n{len(groups)} namespaces; {moved} top-level keys change namespace")
+    for g in sorted(groups, key=lambda g: -g.size):
+        sources = sorted({b.namespace for b in g.blocks})
+        routes_label = "unused" if not g.routes else f"{len(g.routes)} routes"
+        print(f"  {g.name:<28} {g.size / 1024:>7,.1f} KB  {len(g.blocks):>4} keys  {routes_label:<10} "
+              f"from {', '.join(sources)}")
+
+
+def run(args):
+    src_dir = Path(args.src_dir)
+    index = load_index(src_dir, Path(args.usage_index))
+    graph = ImportGraph(index, src_dir)
+    routes: List[Route] = []
+    if Path(args.routes_file).exists():
+        routes = parse_routes(Path(args.routes_file), graph)
+    if not routes:
+        print(f"[warn] No <Route> elements found in {args.routes_file}; grouping by files in {args.pages_dir}",
+              file=sys.stderr)
+        routes = page_routes(Path(args.pages_dir), graph)
+    if not routes:
+        print("No routes or pages found; nothing to partition", file=sys.stderr)
+        sys.exit(1)
+    attach_usage(routes, index)
+
+    tree = LocaleTree.load(Path(args.locales_dir), args.source_lang)
+    blocks = build_blocks(tree)
+    with span("usage per route", routes=len(routes)):
+        mark_usage(blocks, tree, routes)
+    groups = partition(blocks, args.request_overhead, args.max_namespaces)
+    name_groups(groups, routes)
+    rows = route_loads(routes, blocks, groups, args.request_overhead)
+    moves, moved = update_moves(load_moves(Path(args.moves)), groups)
+    print_proposal(groups, rows, routes, moved)
+
+    if args.output:
+        write_json(Path(args.output), {
+            "routes": rows,
+            "namespaces": {g.name: {"keys": [b.ref for b in g.blocks], "bytes": round(g.size),
+                                    "routes": sorted(routes[r].path for r in g.routes)} for g in groups},
+            "moves": {b.ref: f"{g.name}:{b.key}" for g in groups for b in g.blocks if g.name != b.namespace},
+        })
+        print(f"Proposal: {args.output}")
+    if not args.apply:
+        print("\nDry run: re-run with --apply to rewrite the locale tree")
+        return
+    if not moved:
+        print("\n✅ Current namespaces already match the proposal; nothing to apply")
+        return
+
+    with span("relayout"):
+        layout = relayout(tree, groups)
+    changes: Dict[Path, Optional[bytes]] = {}
+    for lang, docs in layout.items():
+        for ns, doc in docs.items():
+            changes[tree.root / lang / f"{ns}.json"] = dumps_json(doc)
+        for (doc_lang, ns) in tree.docs:
+            if doc_lang == lang and ns not in docs:
+                changes[tree.root / lang / f"{ns}.json"] = None
+    # Unchanged files stay untouched
+    changes = {p: b for p, b in changes.items() if b is None or not p.exists() or p.read_bytes() != b}
+    backup = Path(args.backup_dir) / datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    with span("commit", files=len(changes)):
+        commit_files(changes, backup)
+    write_json(Path(args.moves), {
+        "version": MOVES_VERSION,
+        "updated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "moves": moves,
+    })
+    deleted = sum(1 for b in changes.values() if b is None)
+    print(f"\n✅ Rewrote {len(changes) - deleted} files and removed {deleted} across {len(layout)} languages "
+          f"(backup: {backup})")
+    print(f"Key-move map: {args.moves} ({len(moves)} entries); update useTranslation/t() references from it")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Propose and apply a namespace partition from route key co-usage")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    parser.add_argument("--src-dir", default=str(DEFAULT_SRC_DIR), help="Application source root (default: src)")
+    parser.add_argument("--usage-index", default=str(DEFAULT_INDEX_PATH), help="Cached usage index")
+    parser.add_argument("--routes-file", default=str(DEFAULT_ROUTES_FILE), help="File declaring <Route> elements")
+    parser.add_argument("--pages-dir", default=str(DEFAULT_PAGES_DIR), help="Page files used as routes when there are no <Route> elements")
+    parser.add_argument("--request-overhead", type=float, default=DEFAULT_REQUEST_OVERHEAD,
+                        help=f"Bytes charged per namespace a route fetches (default: {DEFAULT_REQUEST_OVERHEAD})")
+    parser.add_argument("--max-namespaces", type=int, help="Keep merging until at most this many namespaces remain")
+    parser.add_argument("--output", help="Write the proposal (routes, namespaces, moves) as JSON")
+    parser.add_argument("--apply", action="store_true", help="Rewrite every language in one transaction")
+    parser.add_argument("--moves", default=str(DEFAULT_MOVES_PATH), help="Key-move map to update (default: src/i18n/key-moves.json)")
+    parser.add_argument("--backup-dir", default=str(DEFAULT_BACKUP_DIR), help="Where --apply keeps the original files")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "i18n_repartition"):
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
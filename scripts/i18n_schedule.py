@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Priority order for (namespace, language) translation units.
+
+build_units() yields units alphabetically by file and language, so a long
+run can leave high-traffic markets waiting behind rarely used namespaces.
+Each unit is scored from three factors, each normalized to 0..1 by its
+maximum over the run:
+
+* ``market`` - the language's weight in the domain language matrix (i18n_markets.py)
+* ``usage``  - how many source files reference the namespace (i18n_usage.py)
+* ``stale``  - leaves missing from the target or still ``[TRANSLATE]`` markers
+
+``priority = sum(weight * factor)``; weights are configurable, e.g.
+``--priority-weights market=0.6,usage=0.2,stale=0.2``.  Without a deadline
+units run by descending priority.  With one, they run by priority per unit
+of cost (characters to send, plus a fixed overhead) so a time-boxed run
+delivers the most value before the pipeline stops starting new units.
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from i18n_locales import is_marker, leaf_at
+from i18n_pipeline import WorkUnit
+from translate_locales import iter_json_leaves, load_json
+
+DEFAULT_WEIGHTS = {"market": 0.5, "usage": 0.3, "stale": 0.2}
+# Characters of cost added to every unit: even a tiny file pays a round trip
+UNIT_OVERHEAD_CHARS = 200
+
+
+def parse_weights(spec: Optional[str]) -> Dict[str, float]:
+    """``market=0.5,usage=0.3,stale=0.2``; unnamed factors keep their defaults."""
+    weights = dict(DEFAULT_WEIGHTS)
+    if not spec:
+        return weights
+    for part in spec.split(","):
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_WEIGHTS or not value:
+            raise ValueError(f"Invalid priority weight {part!r}; expected one of {', '.join(DEFAULT_WEIGHTS)}=<number>")
+        weights[name] = float(value)
+    return weights
+
+
+def stale_leaves(src_data: Any, target_data: Any) -> Tuple[int, int, int]:
+    """(stale leaves, their characters, all source characters) for one unit."""
+    stale = stale_chars = total_chars = 0
+    for path, text in iter_json_leaves(src_data):
+        total_chars += len(text)
+        current = leaf_at(target_data, path)
+        if not isinstance(current, str) or not current or is_marker(current):
+            stale += 1
+            stale_chars += len(text)
+    return stale, stale_chars, total_chars
+
+
+def _normalize(values: Dict[Any, float]) -> Dict[Any, float]:
+    top = max(values.values(), default=0.0)
+    return {k: (v / top if top > 0 else 0.0) for k, v in values.items()}
+
+
+def schedule_units(units: List[WorkUnit], language_weights: Dict[str, float],
+                   namespace_usage: Dict[str, int], weights: Optional[Dict[str, float]] = None,
+                   by_value_density: bool = False,
+                   missing_only: bool = False) -> Tuple[List[WorkUnit], List[Dict[str, Any]]]:
+    """Units in priority order, plus one score row per unit (same order)."""
+    weights = weights or DEFAULT_WEIGHTS
+    sources: Dict[Path, Any] = {}
+    raw = []
+    for unit in units:
+        if unit.src_path not in sources:
+            try:
+                sources[unit.src_path] = load_json(unit.src_path)
+            except RuntimeError:
+                sources[unit.src_path] = {}
+        try:
+            target = load_json(unit.out_path) if unit.out_path.exists() else None
+        except RuntimeError:
+            target = None
+        stale, stale_chars, total_chars = stale_leaves(sources[unit.src_path], target)
+        raw.append((unit, stale, stale_chars, total_chars))
+
+    market = _normalize({i: language_weights.get(u.lang, 0.0) for i, (u, *_r) in enumerate(raw)})
+    usage = _normalize({i: float(namespace_usage.get(u.src_path.stem, 0)) for i, (u, *_r) in enumerate(raw)})
+    stale = _normalize({i: float(r[1]) for i, r in enumerate(raw)})
+
+    rows = []
+    for i, (unit, stale_keys, stale_chars, total_chars) in enumerate(raw):
+        priority = weights["market"] * market[i] + weights["usage"] * usage[i] + weights["stale"] * stale[i]
+        cost = (stale_chars if missing_only else total_chars) + UNIT_OVERHEAD_CHARS
+        rows.append({
+            "unit": unit,
+            "lang": unit.lang,
+            "namespace": unit.src_path.stem,
+            "market": round(market[i], 3),
+            "usage": round(usage[i], 3),
+            "stale_keys": stale_keys,
+            "cost_chars": cost,
+            "priority": round(priority, 4),
+            "density": priority / cost,
+        })
+    key = "density" if by_value_density else "priority"
+    # Ties keep the alphabetical build_units order (sort is stable)
+    rows.sort(key=lambda r: -r[key])
+    return [r["unit"] for r in rows], rows
+
+
+def print_schedule(rows: List[Dict[str, Any]], top: int = 15):
+    print("\n" + "=" * 60)
+    print(f"SCHEDULE (first {min(top, len(rows))} of {len(rows)} units)")
+    print("=" * 60)
+    print(f"{'#':>4} {'Lang':<5} {'Namespace':<24} {'Market':>6} {'Usage':>6} {'Stale':>6} {'Prio':>6}")
+    for n, row in enumerate(rows[:top], 1):
+        print(f"{n:>4} {row['lang']:<5} {row['namespace'][:24]:<24} {row['market']:>6.2f} {row['usage']:>6.2f} "
+              f"{row['stale_keys']:>6} {row['priority']:>6.3f}")
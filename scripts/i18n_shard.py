@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""Deterministic sharding of translate_locales.py runs, and merging the results.
+
+``translate_locales.py --shard i/N`` (1-based, as CI node indexes usually
+are) processes only the i-th of N partitions of the (file, language) work
+units.  Partitions are balanced by estimated characters, not unit count,
+using longest-processing-time-first: units sorted by cost (ties by path and
+language) go one by one to the currently lightest shard.  Every runner on
+the same checkout computes the same partition.
+
+With ``--shard-output DIR`` a shard writes into DIR instead of the tree,
+plus DIR/manifest.json recording each output's SHA-256 and the SHA-256 of
+the English source it was translated from.  Merging checks that
+
+* all N shards of one run are present and agree on N,
+* no target file is claimed by two shards,
+* every output still matches its manifest hash, and
+* the English sources have not changed since the shard ran (``--force`` overrides),
+
+then writes the outputs into the locale tree.
+
+    python3 scripts/i18n_shard.py show 4                    # partition balance
+    python3 scripts/i18n_shard.py merge out/shard-*         # assemble shard outputs
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from i18n_io import DEFAULT_WRITER, write_json
+from i18n_pipeline import WorkUnit, build_units
+from i18n_schedule import UNIT_OVERHEAD_CHARS, stale_leaves
+from translate_locales import (
+    DEFAULT_LOCALES_DIR,
+    SOURCE_LANG,
+    build_map,
+    list_target_languages,
+    load_json,
+)
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """``"2/8"`` -> (2, 8); the index is 1-based."""
+    index, sep, count = spec.partition("/")
+    try:
+        i, n = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Invalid shard {spec!r}; expected i/N, e.g. 1/4")
+    if not sep or n < 1 or not 1 <= i <= n:
+        raise ValueError(f"Invalid shard {spec!r}; need 1 <= i <= N")
+    return i, n
+
+
+def unit_costs(units: List[WorkUnit], missing_only: bool = False) -> List[int]:
+    """Estimated characters per unit (stale ones only with ``missing_only``)."""
+    sources: Dict[Path, Any] = {}
+    costs = []
+    for unit in units:
+        if unit.src_path not in sources:
+            sources[unit.src_path] = load_json(unit.src_path)
+        target = None
+        if missing_only and unit.out_path.exists():
+            target = load_json(unit.out_path)
+        _stale, stale_chars, total_chars = stale_leaves(sources[unit.src_path], target)
+        costs.append((stale_chars if missing_only else total_chars) + UNIT_OVERHEAD_CHARS)
+    return costs
+
+
+def partition(units: List[WorkUnit], costs: List[int], count: int) -> List[List[WorkUnit]]:
+    """Longest-processing-time-first split into ``count`` shards, deterministic for equal input."""
+    order = sorted(range(len(units)), key=lambda k: (-costs[k], str(units[k].src_path), units[k].lang))
+    loads = [(0, s) for s in range(count)]
+    shards: List[List[int]] = [[] for _ in range(count)]
+    for k in order:
+        load, s = heapq.heappop(loads)
+        shards[s].append(k)
+        heapq.heappush(loads, (load + costs[k], s))
+    # Keep each shard in the original (or scheduled) unit order
+    return [[units[k] for k in sorted(members)] for members in shards]
+
+
+def select_shard(units: List[WorkUnit], spec: str, missing_only: bool = False) -> List[WorkUnit]:
+    index, count = parse_shard(spec)
+    return partition(units, unit_costs(units, missing_only), count)[index - 1]
+
+
+def sha256_file(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def redirect_units(units: List[WorkUnit], locales_dir: Path, output_dir: Path):
+    """Send outputs to ``output_dir`` while diffs still read the tree's targets."""
+    for unit in units:
+        unit.existing_path = unit.out_path
+        unit.out_path = output_dir / Path(unit.out_path).relative_to(locales_dir)
+
+
+def write_manifest(output_dir: Path, spec: str, units: List[WorkUnit], locales_dir: Path,
+                   skipped: List[Path]) -> Path:
+    index, count = parse_shard(spec)
+    skipped_set = {Path(p) for p in skipped}
+    files = []
+    for unit in units:
+        if Path(unit.out_path) in skipped_set or not Path(unit.out_path).exists():
+            continue
+        files.append({
+            "path": Path(unit.out_path).relative_to(output_dir).as_posix(),
+            "sha256": sha256_file(unit.out_path),
+            "source": Path(unit.src_path).relative_to(locales_dir).as_posix(),
+            "source_sha256": sha256_file(unit.src_path),
+        })
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "shard": index,
+        "of": count,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "units": len(units),
+        "files": sorted(files, key=lambda f: f["path"]),
+    }
+    path = output_dir / MANIFEST_NAME
+    write_json(path, manifest)
+    return path
+
+
+def load_manifest(shard_dir: Path) -> Dict[str, Any]:
+    path = Path(shard_dir) / MANIFEST_NAME
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != MANIFEST_VERSION:
+        raise RuntimeError(f"{path}: unsupported manifest version {data.get('version')}")
+    return data
+
+
+def merge_shards(shard_dirs: List[Path], locales_dir: Path, dry_run: bool = False,
+                 force: bool = False) -> Tuple[List[str], List[str], int]:
+    """Returns (problems, written paths, unchanged count). Nothing is written if there are problems."""
+    problems: List[str] = []
+    manifests = []
+    for d in shard_dirs:
+        try:
+            manifests.append((Path(d), load_manifest(Path(d))))
+        except (OSError, json.JSONDecodeError, RuntimeError) as e:
+            problems.append(f"{d}: cannot read manifest ({e})")
+
+    counts = {m["of"] for _d, m in manifests}
+    if len(counts) > 1:
+        problems.append(f"Shards disagree on N: {sorted(counts)}")
+    seen_shards: Dict[int, Path] = {}
+    for d, m in manifests:
+        if m["shard"] in seen_shards:
+            problems.append(f"Shard {m['shard']} appears twice: {seen_shards[m['shard']]} and {d}")
+        seen_shards[m["shard"]] = d
+    if len(counts) == 1:
+        missing = sorted(set(range(1, counts.pop() + 1)) - set(seen_shards))
+        if missing:
+            problems.append(f"Missing shard(s): {', '.join(map(str, missing))}")
+
+    owners: Dict[str, Path] = {}
+    plan: List[Tuple[Path, Path]] = []
+    for d, m in manifests:
+        for entry in m["files"]:
+            rel = entry["path"]
+            if rel in owners:
+                problems.append(f"Conflict: {rel} produced by both {owners[rel]} and {d}")
+                continue
+            owners[rel] = d
+            out = d / rel
+            if not out.exists():
+                problems.append(f"{out}: listed in manifest but missing")
+                continue
+            if sha256_file(out) != entry["sha256"]:
+                problems.append(f"{out}: content does not match its manifest hash")
+            source = locales_dir / entry["source"]
+            if not force and (not source.exists() or sha256_file(source) != entry["source_sha256"]):
+                problems.append(f"{rel}: English source {entry['source']} changed since the shard ran (use --force)")
+            plan.append((out, locales_dir / rel))
+
+    if problems:
+        return problems, [], 0
+    written: List[str] = []
+    unchanged = 0
+    for out, dest in sorted(plan, key=lambda p: str(p[1])):
+        if dry_run:
+            written.append(str(dest))
+            continue
+        if DEFAULT_WRITER.write_bytes(dest, out.read_bytes()):
+            written.append(str(dest))
+        else:
+            unchanged += 1
+    return [], written, unchanged
+
+
+def show(args):
+    if args.count < 1:
+        print("Shard count must be at least 1", file=sys.stderr)
+        sys.exit(2)
+    locales_dir = Path(args.locales_dir)
+    mapping = build_map(locales_dir, args.source_lang)
+    units = build_units(mapping, args.target_langs or list_target_languages(locales_dir, args.source_lang))
+    costs = unit_costs(units, args.missing_only)
+    cost_of = {id(u): c for u, c in zip(units, costs)}
+    shards = partition(units, costs, args.count)
+    total = sum(costs)
+    print(f"{len(units)} units, {total:,} estimated chars over {args.count} shards")
+    print("=" * 60)
+    for i, shard in enumerate(shards, 1):
+        chars = sum(cost_of[id(u)] for u in shard)
+        share = chars / total if total else 0.0
+        print(f"  shard {i}/{args.count}: {len(shard):>5} units {chars:>12,} chars ({share:.1%})")
+
+
+def merge(args):
+    problems, written, unchanged = merge_shards([Path(d) for d in args.shard_dirs], Path(args.locales_dir),
+                                                dry_run=args.dry_run, force=args.force)
+    if problems:
+        print("❌ Merge refused:", file=sys.stderr)
+        for problem in problems:
+            print(f"   {problem}", file=sys.stderr)
+        sys.exit(1)
+    verb = "Would write" if args.dry_run else "Wrote"
+    print(f"✅ Merged {len(args.shard_dirs)} shards: {verb.lower()} {len(written)} files, {unchanged} unchanged")
+    for path in written:
+        print(f"  {verb} {path}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Inspect translate_locales.py shards and merge their outputs")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_show = sub.add_parser("show", help="Print how units would be split into N shards")
+    p_show.add_argument("count", type=int, help="Number of shards")
+    p_show.add_argument("--target-langs", nargs="*", help="Explicit list of target language codes")
+    p_show.add_argument("--missing-only", action="store_true", help="Balance by missing/[TRANSLATE] characters only")
+    p_show.set_defaults(func=show)
+
+    p_merge = sub.add_parser("merge", help="Check shard manifests and write their outputs into the tree")
+    p_merge.add_argument("shard_dirs", nargs="+", help="--shard-output directories of every shard")
+    p_merge.add_argument("--dry-run", action="store_true", help="Check and list files without writing")
+    p_merge.add_argument("--force", action="store_true", help="Merge even if English sources changed since the shards ran")
+    p_merge.set_defaults(func=merge)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""What the browser downloads per locale file: minified, gzip and brotli sizes.
+
+Used by i18n_bundles.py (``--compress``, ``--report``, ``--budget``).  Every
+(language, namespace) payload is measured raw, gzip-compressed (level 9,
+``mtime=0`` so the bytes are reproducible) and brotli-compressed (quality
+11; skipped with a warning when the optional ``brotli`` package is not
+installed).  The report breaks the sizes down by language, by namespace
+and, per namespace, by top-level key, so the keys that make a namespace
+heavy are easy to spot.
+
+Budgets are per namespace and apply to the largest language of that
+namespace, in bytes of the chosen metric (``gzip`` by default)::
+
+    {"metric": "gzip", "default": 20000, "namespaces": {"common": 40000}}
+"""
+import gzip
+import html
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: .br variants and sizes are skipped
+    brotli = None
+
+METRICS = ("raw", "gzip", "br")
+DEFAULT_TOP_KEYS = 10
+
+_warned_brotli = False
+
+
+def minify(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def gzip_bytes(payload: bytes) -> bytes:
+    return gzip.compress(payload, compresslevel=9, mtime=0)
+
+
+def brotli_bytes(payload: bytes) -> Optional[bytes]:
+    """Brotli-compressed payload, or None when the ``brotli`` package is missing."""
+    global _warned_brotli
+    if brotli is None:
+        if not _warned_brotli:
+            print("[warn] brotli is not installed; skipping .br sizes and variants (pip install brotli)", file=sys.stderr)
+            _warned_brotli = True
+        return None
+    return brotli.compress(payload, quality=11)
+
+
+class Sizes:
+    def __init__(self, raw: int, gzip: int, br: Optional[int]):
+        self.raw = raw
+        self.gzip = gzip
+        self.br = br
+
+    @classmethod
+    def measure(cls, payload: bytes, gz: Optional[bytes] = None, br: Optional[bytes] = None) -> "Sizes":
+        gz = gz if gz is not None else gzip_bytes(payload)
+        br = br if br is not None else brotli_bytes(payload)
+        return cls(len(payload), len(gz), len(br) if br is not None else None)
+
+    def get(self, metric: str) -> Optional[int]:
+        return getattr(self, metric)
+
+    def to_json(self) -> Dict[str, Optional[int]]:
+        return {"raw": self.raw, "gzip": self.gzip, "br": self.br}
+
+
+def key_sizes(data: Any) -> Dict[str, int]:
+    """Minified bytes each top-level key contributes (``"key":value``)."""
+    if not isinstance(data, dict):
+        return {}
+    return {k: len(minify({k: v})) - 2 for k, v in data.items()}
+
+
+def _add(total: Dict[str, Any], sizes: Sizes):
+    for metric in METRICS:
+        value = sizes.get(metric)
+        current = total.get(metric)
+        total[metric] = current if value is None else (current or 0) + value
+
+
+def size_report(files: Dict[Tuple[str, str], Tuple[bytes, Sizes]],
+                top_keys: int = DEFAULT_TOP_KEYS) -> Dict[str, Any]:
+    """Report over ``{(lang, namespace): (minified payload, sizes)}``."""
+    rows = []
+    languages: Dict[str, Dict[str, Any]] = {}
+    namespaces: Dict[str, Dict[str, Any]] = {}
+    keys: Dict[str, Dict[str, int]] = {}
+    for (lang, ns), (payload, sizes) in sorted(files.items()):
+        rows.append({"lang": lang, "namespace": ns, **sizes.to_json()})
+        _add(languages.setdefault(lang, {"files": 0}), sizes)
+        languages[lang]["files"] += 1
+        entry = namespaces.setdefault(ns, {"files": 0, "largest": {}})
+        _add(entry, sizes)
+        entry["files"] += 1
+        for metric in METRICS:
+            value = sizes.get(metric)
+            if value is not None and value > entry["largest"].get(metric, (None, -1))[1]:
+                entry["largest"][metric] = (lang, value)
+        per_key = keys.setdefault(ns, {})
+        for key, size in key_sizes(json.loads(payload)).items():
+            per_key[key] = per_key.get(key, 0) + size
+
+    for ns, entry in namespaces.items():
+        entry["largest"] = {m: {"lang": lang, "bytes": value} for m, (lang, value) in entry["largest"].items()}
+        ranked = sorted(keys.get(ns, {}).items(), key=lambda kv: -kv[1])
+        total_raw = entry["raw"] or 0
+        entry["top_keys"] = [
+            {"key": key, "raw": size, "share": round(size / total_raw, 4) if total_raw else 0.0}
+            for key, size in ranked[:top_keys]
+        ]
+    totals: Dict[str, Any] = {"files": len(rows)}
+    for _key, (_payload, sizes) in files.items():
+        _add(totals, sizes)
+    return {
+        "totals": totals,
+        "languages": dict(sorted(languages.items())),
+        "namespaces": dict(sorted(namespaces.items(), key=lambda kv: -(kv[1]["raw"] or 0))),
+        "files": rows,
+    }
+
+
+class Budgets:
+    def __init__(self, default: Optional[int] = None, namespaces: Optional[Dict[str, int]] = None,
+                 metric: str = "gzip"):
+        if metric not in METRICS:
+            raise ValueError(f"Budget metric must be one of {', '.join(METRICS)}, got {metric!r}")
+        self.default = default
+        self.namespaces = namespaces or {}
+        self.metric = metric
+
+    @classmethod
+    def load(cls, path: Path, default: Optional[int] = None, metric: Optional[str] = None) -> "Budgets":
+        """Budgets file; an explicit ``default``/``metric`` overrides the file's."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(default if default is not None else data.get("default"),
+                   {ns: int(v) for ns, v in data.get("namespaces", {}).items()},
+                   metric or data.get("metric", "gzip"))
+
+    def for_namespace(self, ns: str) -> Optional[int]:
+        return self.namespaces.get(ns, self.default)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"metric": self.metric, "default": self.default, "namespaces": self.namespaces}
+
+
+def check_budgets(report: Dict[str, Any], budgets: Budgets) -> List[Dict[str, Any]]:
+    """Namespaces whose largest file exceeds its budget."""
+    over = []
+    for ns, entry in report["namespaces"].items():
+        budget = budgets.for_namespace(ns)
+        largest = entry["largest"].get(budgets.metric)
+        if budget is None or largest is None:
+            continue
+        if largest["bytes"] > budget:
+            over.append({"namespace": ns, "lang": largest["lang"], "bytes": largest["bytes"],
+                         "budget": budget, "metric": budgets.metric})
+    return over
+
+
+def _kb(value: Optional[int]) -> str:
+    return f"{value / 1024:,.1f}" if value is not None else "n/a"
+
+
+def print_size_report(report: Dict[str, Any], budgets: Optional[Budgets] = None,
+                      over: Optional[List[Dict[str, Any]]] = None, top_keys: int = 3):
+    print("\n" + "=" * 60)
+    print("LOCALE PAYLOAD SIZES (KB)")
+    print("=" * 60)
+    print(f"{'Namespace':<24} {'raw':>9} {'gzip':>8} {'br':>8} {'max gzip':>9} {'budget':>7}")
+    for ns, entry in report["namespaces"].items():
+        largest = entry["largest"].get("gzip", {})
+        budget = budgets.for_namespace(ns) if budgets else None
+        print(f"{ns[:24]:<24} {_kb(entry['raw']):>9} {_kb(entry['gzip']):>8} {_kb(entry['br']):>8} "
+              f"{_kb(largest.get('bytes')):>9} {_kb(budget) if budget else '-':>7}")
+        keys = ", ".join(f"{k['key']} {k['share']:.0%}" for k in entry["top_keys"][:top_keys])
+        if keys:
+            print(f"  {'':<22} top keys: {keys}")
+    print("-" * 60)
+    print(f"{'Language':<24} {'raw':>9} {'gzip':>8} {'br':>8}")
+    for lang, entry in report["languages"].items():
+        print(f"{lang:<24} {_kb(entry['raw']):>9} {_kb(entry['gzip']):>8} {_kb(entry['br']):>8}")
+    t = report["totals"]
+    print("-" * 60)
+    print(f"{'TOTAL (' + str(t['files']) + ' files)':<24} {_kb(t['raw']):>9} {_kb(t['gzip']):>8} {_kb(t['br']):>8}")
+    if budgets is None:
+        return
+    if over:
+        print(f"\n❌ {len(over)} namespace(s) over budget ({budgets.metric}):")
+        for o in over:
+            print(f"   {o['namespace']}: {o['lang']} is {o['bytes']:,} bytes > {o['budget']:,}")
+    else:
+        print(f"\n✅ All namespaces within budget ({budgets.metric})")
+
+
+def write_html(report: Dict[str, Any], path: Path, over: Optional[List[Dict[str, Any]]] = None):
+    """Static, dependency-free page in the spirit of bundle-stats.html."""
+    over_ns = {o["namespace"] for o in over or []}
+    esc = html.escape
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Locale payload sizes</title>",
+        "<style>body{font:14px system-ui,sans-serif;margin:2em}table{border-collapse:collapse;margin:1em 0}"
+        "td,th{padding:2px 10px;border-bottom:1px solid #ddd;text-align:right}td:first-child,th:first-child"
+        "{text-align:left}.over{color:#b00020;font-weight:bold}.bar{background:#4a90d9;height:10px}</style>",
+        "</head><body><h1>Locale payload sizes</h1>",
+    ]
+    t = report["totals"]
+    parts.append(f"<p>{t['files']} files: {_kb(t['raw'])} KB minified, {_kb(t['gzip'])} KB gzip, "
+                 f"{_kb(t['br'])} KB brotli</p>")
+    parts.append("<h2>Namespaces</h2><table><tr><th>Namespace</th><th>raw KB</th><th>gzip KB</th><th>br KB</th>"
+                 "<th>largest gzip</th><th>top-level keys</th></tr>")
+    for ns, entry in report["namespaces"].items():
+        largest = entry["largest"].get("gzip", {})
+        keys = "<br>".join(
+            f"{esc(k['key'])} {k['share']:.0%}<div class='bar' style='width:{max(1, int(k['share'] * 200))}px'></div>"
+            for k in entry["top_keys"]
+        )
+        cls = " class='over'" if ns in over_ns else ""
+        parts.append(f"<tr{cls}><td>{esc(ns)}</td><td>{_kb(entry['raw'])}</td><td>{_kb(entry['gzip'])}</td>"
+                     f"<td>{_kb(entry['br'])}</td><td>{esc(str(largest.get('lang', '')))} {_kb(largest.get('bytes'))}</td>"
+                     f"<td>{keys}</td></tr>")
+    parts.append("</table><h2>Languages</h2><table><tr><th>Language</th><th>files</th><th>raw KB</th>"
+                 "<th>gzip KB</th><th>br KB</th></tr>")
+    for lang, entry in report["languages"].items():
+        parts.append(f"<tr><td>{esc(lang)}</td><td>{entry['files']}</td><td>{_kb(entry['raw'])}</td>"
+                     f"<td>{_kb(entry['gzip'])}</td><td>{_kb(entry['br'])}</td></tr>")
+    parts.append("</table></body></html>\n")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(parts), encoding="utf-8")
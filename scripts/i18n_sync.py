@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""One-pass structural sync of every locale namespace against English.
+
+Replaces the separate add (fix_all_translations.py) and remove
+(remove_extra_keys.py) passes: the whole tree is loaded once, the add/remove
+diff is computed per (namespace, language) from flat leaf views, applied and
+verified in memory, and each changed file is written at most once.
+
+Missing string leaves are added as ``[TRANSLATE] <English>`` markers;
+non-string leaves are copied verbatim.  When keys are reorganized, a removed
+path whose previous English value (known from the content-hash state saved
+by the last run, or from ``--baseline-ref``) matches the English value of an
+added path is treated as a move and its existing translation is carried
+over instead of being re-queued.
+
+The state only advances after a run that adds keys for every language.  A
+run limited with ``--langs`` or a remove-only run (``--no-add``, as in
+remove_extra_keys.py) leaves it as is, so the languages it skipped still
+find their moves.  A remove-only run also keeps removed leaves that are
+moves, for the next add pass to carry over.
+
+    python3 scripts/i18n_sync.py             # add + remove
+    python3 scripts/i18n_sync.py --dry-run   # report only
+"""
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from i18n_io import write_json
+from i18n_locales import LocaleTree, KeyPath, TRANSLATE_MARKER, delete_path, dotted, flatten, is_marker, set_path
+from i18n_trace import add_profile_arguments, profiling, span
+from translate_locales import DEFAULT_LOCALES_DIR, SOURCE_LANG
+
+DEFAULT_STATE_PATH = Path(".i18n-cache/sync-state.json")
+STATE_VERSION = 1
+
+# (namespace, key path) -> content hash of the English value
+SourceHashes = Dict[Tuple[str, KeyPath], str]
+
+
+class FileSync:
+    """Diff applied to one target document."""
+
+    def __init__(self, lang: str, namespace: str, created: bool):
+        self.lang = lang
+        self.namespace = namespace
+        self.created = created
+        self.added: List[KeyPath] = []
+        self.removed: List[KeyPath] = []
+        self.carried: Dict[KeyPath, Any] = {}
+        # Removed leaves a remove-only run keeps because they moved (the add pass carries them)
+        self.kept: List[KeyPath] = []
+        self.verified = True
+
+    @property
+    def changed(self) -> bool:
+        return self.created or bool(self.added or self.removed)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "lang": self.lang,
+            "namespace": self.namespace,
+            "created": self.created,
+            "added": [dotted(p) for p in self.added],
+            "removed": [dotted(p) for p in self.removed],
+            "verified": self.verified,
+        }
+
+
+class Move:
+    """A translation carried from a removed path to an added one."""
+
+    def __init__(self, lang: str, source: Tuple[str, KeyPath], dest: Tuple[str, KeyPath], chars: int):
+        self.lang = lang
+        self.source = source
+        self.dest = dest
+        self.chars = chars
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "lang": self.lang,
+            "from": f"{self.source[0]}:{dotted(self.source[1])}",
+            "to": f"{self.dest[0]}:{dotted(self.dest[1])}",
+            "chars": self.chars,
+        }
+
+
+def content_hash(value: Any) -> str:
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(text.strip().encode("utf-8")).hexdigest()[:16]
+
+
+def source_hashes(tree: LocaleTree) -> SourceHashes:
+    return {
+        (ns, path): content_hash(value)
+        for ns in tree.namespaces
+        for path, value in flatten(tree.get(tree.source_lang, ns)).items()
+    }
+
+
+def load_state(path: Path) -> SourceHashes:
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != STATE_VERSION:
+        return {}
+    return {
+        (ns, tuple(key.split("."))): h
+        for ns, keys in data["source"].items()
+        for key, h in keys.items()
+    }
+
+
+def save_state(path: Path, hashes: SourceHashes, namespaces: List[str], partial: bool):
+    # A run limited with --namespaces must not forget the others
+    previous = load_state(path) if partial else {}
+    merged = {k: h for k, h in previous.items() if k[0] not in namespaces}
+    merged.update(hashes)
+    source: Dict[str, Dict[str, str]] = {}
+    for (ns, key_path), h in sorted(merged.items()):
+        source.setdefault(ns, {})[dotted(key_path)] = h
+    write_json(path, {"version": STATE_VERSION, "source": source})
+
+
+def git_source_hashes(tree: LocaleTree, ref: str) -> SourceHashes:
+    """Hashes of the English tree as of a git ref (e.g. HEAD before a reorganization)."""
+    hashes: SourceHashes = {}
+    listing = subprocess.run(
+        ["git", "ls-tree", "--name-only", f"{ref}:{(tree.root / tree.source_lang).as_posix()}"],
+        capture_output=True, text=True,
+    )
+    if listing.returncode != 0:
+        print(f"[warn] Cannot read {tree.root / tree.source_lang} at {ref}: {listing.stderr.strip()}", file=sys.stderr)
+        return hashes
+    for name in listing.stdout.split():
+        if not name.endswith(".json"):
+            continue
+        blob = subprocess.run(
+            ["git", "show", f"{ref}:{(tree.root / tree.source_lang / name).as_posix()}"],
+            capture_output=True, text=True,
+        )
+        try:
+            data = json.loads(blob.stdout)
+        except json.JSONDecodeError:
+            continue
+        ns = name[:-len(".json")]
+        hashes.update({(ns, path): content_hash(value) for path, value in flatten(data).items()})
+    return hashes
+
+
+def missing_value(value: Any) -> Any:
+    return f"{TRANSLATE_MARKER} {value}" if isinstance(value, str) else value
+
+
+def diff_document(source_flat: Dict[KeyPath, Any], target: Dict[str, Any], result: FileSync):
+    target_flat = flatten(target)
+    result.removed = [p for p in target_flat if p not in source_flat]
+    result.added = [p for p in source_flat if p not in target_flat]
+
+
+def detect_moves(tree: LocaleTree, lang: str, results: List[FileSync],
+                 old_hashes: SourceHashes) -> List[Move]:
+    """Match removed leaves (by previous English hash) to added leaves (by current English hash)."""
+    removed: List[Tuple[str, KeyPath, Any]] = []
+    for r in results:
+        if r.removed:
+            target_flat = flatten(tree.get(lang, r.namespace))
+            removed.extend((r.namespace, path, target_flat[path]) for path in r.removed)
+    # Whole namespaces dropped from English (split/merge) are removed paths too
+    for (doc_lang, ns), data in sorted(tree.docs.items()):
+        if doc_lang == lang and ns not in tree.namespaces:
+            removed.extend((ns, path, value) for path, value in flatten(data).items())
+
+    pool: Dict[str, List[Tuple[str, KeyPath, Any]]] = {}
+    for ns, path, value in removed:
+        h = old_hashes.get((ns, path))
+        # Only real translations are worth carrying; a marker would be re-added anyway
+        if h is None or is_marker(value):
+            continue
+        pool.setdefault(h, []).append((ns, path, value))
+
+    moves = []
+    if not pool:
+        return moves
+    for r in results:
+        source_flat = flatten(tree.get(tree.source_lang, r.namespace))
+        for path in r.added:
+            en_value = source_flat[path]
+            candidates = pool.get(content_hash(en_value))
+            if not candidates:
+                continue
+            # Prefer the same leaf name, then the same namespace
+            ns, old_path, value = min(
+                candidates,
+                key=lambda c: (c[1][-1] != path[-1], c[0] != r.namespace, c[0], c[1]),
+            )
+            r.carried[path] = value
+            chars = len(en_value) if isinstance(en_value, str) else 0
+            moves.append(Move(lang, (ns, old_path), (r.namespace, path), chars))
+    return moves
+
+
+def apply_document(source_flat: Dict[KeyPath, Any], target: Dict[str, Any], result: FileSync):
+    """Apply the computed diff to ``target`` in place."""
+    # Removals first: a leaf replacing a former subtree (or vice versa) then lands cleanly
+    for path in result.removed:
+        delete_path(target, path)
+    for path in result.added:
+        value = result.carried[path] if path in result.carried else missing_value(source_flat[path])
+        set_path(target, path, value)
+
+
+def verify_document(source_flat: Dict[KeyPath, Any], target: Dict[str, Any], result: FileSync,
+                    add: bool = True, remove: bool = True):
+    keys = flatten(target).keys()
+    if add and remove:
+        result.verified = keys == source_flat.keys()
+    elif add:
+        result.verified = source_flat.keys() <= keys
+    elif remove:
+        result.verified = keys - set(result.kept) <= source_flat.keys()
+
+
+def sync_tree(tree: LocaleTree, languages: Optional[List[str]] = None,
+              add: bool = True, remove: bool = True,
+              old_hashes: Optional[SourceHashes] = None) -> Tuple[List[FileSync], List[Move]]:
+    results = []
+    moves: List[Move] = []
+    with span("flatten", lang=tree.source_lang):
+        source_flats = {ns: flatten(tree.get(tree.source_lang, ns)) for ns in tree.namespaces}
+    for lang in languages or tree.target_languages:
+        lang_results = []
+        # Namespaces a remove-only run does not create, diffed only as move destinations
+        uncreated = []
+        for ns, source_flat in source_flats.items():
+            target = tree.get(lang, ns)
+            result = FileSync(lang, ns, created=target is None and add)
+            if target is None:
+                if not add:
+                    if old_hashes:
+                        diff_document(source_flat, {}, result)
+                        uncreated.append(result)
+                    continue
+                target = {}
+                tree.set(lang, ns, target)
+            with span("flatten", file=f"{lang}/{ns}.json"):
+                diff_document(source_flat, target, result)
+            lang_results.append(result)
+
+        # Moves may cross namespaces, so match over the whole language before applying
+        if old_hashes:
+            with span("classify", lang=lang):
+                lang_moves = detect_moves(tree, lang, lang_results + uncreated, old_hashes)
+            if add:
+                moves.extend(lang_moves)
+            else:
+                # Deleting a moved leaf here would lose its translation before the add pass sees it
+                sources = {m.source for m in lang_moves}
+                for result in lang_results:
+                    result.carried = {}
+                    result.kept = [p for p in result.removed if (result.namespace, p) in sources]
+                    result.removed = [p for p in result.removed if (result.namespace, p) not in sources]
+
+        for result in lang_results:
+            if not add:
+                result.added = []
+            if not remove:
+                result.removed = []
+            target = tree.get(lang, result.namespace)
+            source_flat = source_flats[result.namespace]
+            apply_document(source_flat, target, result)
+            verify_document(source_flat, target, result, add=add, remove=remove)
+            if result.changed:
+                tree.mark_dirty(lang, result.namespace)
+        results.extend(lang_results)
+    return results, moves
+
+
+def print_report(results: List[FileSync], moves: List[Move], tree: LocaleTree):
+    by_lang: Dict[str, List[FileSync]] = {}
+    for r in results:
+        by_lang.setdefault(r.lang, []).append(r)
+
+    for lang, rows in sorted(by_lang.items()):
+        added = sum(len(r.added) for r in rows)
+        removed = sum(len(r.removed) for r in rows)
+        if not (added or removed or any(r.created for r in rows)):
+            continue
+        print(f"Language: {lang.upper()}")
+        for r in rows:
+            if not r.changed:
+                continue
+            created = " (new file)" if r.created else ""
+            carried = f" ({len(r.carried)} carried)" if r.carried else ""
+            print(f"  - {r.namespace}.json{created}: +{len(r.added)} -{len(r.removed)}{carried}")
+        print()
+
+    if moves:
+        print("Detected moves (translations carried over):")
+        langs_per_move: Dict[Tuple[str, str], int] = {}
+        for m in moves:
+            row = m.to_json()
+            key = (row["from"], row["to"])
+            langs_per_move[key] = langs_per_move.get(key, 0) + 1
+        for (src, dest), n in sorted(langs_per_move.items()):
+            print(f"  {src} -> {dest} [{n} languages]")
+        print()
+
+    print("=" * 60)
+    print("SUMMARY")
+    print("=" * 60)
+    print(f"Namespaces: {len(tree.namespaces)}, languages: {len(by_lang)}")
+    print(f"Total keys added: {sum(len(r.added) for r in results)}")
+    print(f"Total keys removed: {sum(len(r.removed) for r in results)}")
+    print(f"Files changed: {sum(1 for r in results if r.changed)}")
+    kept = sum(len(r.kept) for r in results)
+    if kept:
+        print(f"Moved keys kept for the add pass: {kept} (run fix_all_translations.py or i18n_sync.py)")
+    if moves:
+        print(f"Moves detected: {len(moves)} (API characters saved: {sum(m.chars for m in moves):,})")
+
+    orphans = sorted(f"{lang}/{ns}.json" for lang, ns in tree.docs
+                     if lang != tree.source_lang and ns not in tree.namespaces)
+    if orphans:
+        print(f"\nNamespaces with no English source (left untouched): {', '.join(orphans)}")
+
+    failed = [r for r in results if not r.verified]
+    if failed:
+        print("\n⚠️  Verification failed for:")
+        for r in failed:
+            print(f"  ❌ {r.lang}/{r.namespace}.json")
+    else:
+        print("\n✅ All languages are synchronized with English (verified in memory)")
+
+    if any(r.added for r in results):
+        print("\nNote: Keys marked with [TRANSLATE] need to be translated from English.")
+
+
+def run(args):
+    locales_dir = Path(args.locales_dir)
+    if not (locales_dir / args.source_lang).is_dir():
+        print(f"Source locale directory not found: {locales_dir / args.source_lang}", file=sys.stderr)
+        sys.exit(1)
+
+    tree = LocaleTree.load(locales_dir, args.source_lang, namespaces=args.namespaces)
+    state_path = Path(args.state)
+    old_hashes: SourceHashes = {}
+    if not args.no_moves:
+        old_hashes = load_state(state_path)
+        if args.baseline_ref:
+            old_hashes.update(git_source_hashes(tree, args.baseline_ref))
+    results, moves = sync_tree(tree, args.langs, add=not args.no_add, remove=not args.no_remove,
+                               old_hashes=old_hashes)
+    print_report(results, moves, tree)
+
+    if args.report:
+        report = {
+            "files": [r.to_json() for r in results if r.changed],
+            "moves": [m.to_json() for m in moves],
+            "api_chars_saved": sum(m.chars for m in moves),
+        }
+        Path(args.report).write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.report}")
+
+    if args.dry_run:
+        print(f"\n[dry-run] Would write {len(tree.dirty)} files")
+    else:
+        written = tree.save()
+        print(f"\nWrote {len(written)} files")
+        if args.no_add or args.langs:
+            # Languages this run did not add keys to still need the old hashes to find their moves
+            print(f"Move-detection state left as is ({'remove-only' if args.no_add else '--langs'} run)")
+        else:
+            save_state(state_path, source_hashes(tree), tree.namespaces, partial=bool(args.namespaces))
+
+    if not all(r.verified for r in results):
+        sys.exit(1)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Sync all locale namespaces with the English structure in one pass")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    parser.add_argument("--langs", nargs="*", help="Only sync these target languages")
+    parser.add_argument("--namespaces", nargs="*", help="Only sync these namespaces (e.g. common)")
+    parser.add_argument("--no-add", action="store_true", help="Do not add keys missing from target languages")
+    parser.add_argument("--no-remove", action="store_true", help="Do not remove keys that English does not have")
+    parser.add_argument("--dry-run", action="store_true", help="Compute and verify the diff without writing files")
+    parser.add_argument("--report", help="Write the full diff as JSON to this path")
+    parser.add_argument("--state", default=str(DEFAULT_STATE_PATH), help="English content-hash state used for move detection")
+    parser.add_argument("--baseline-ref", help="Also detect moves against the English tree at this git ref (e.g. HEAD)")
+    parser.add_argument("--no-moves", action="store_true", help="Disable move detection")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "i18n_sync"):
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
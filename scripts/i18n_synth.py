@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""Synthetic locale trees for benchmarking and exercising the i18n tools.
+
+src/i18n/locales is not populated in every checkout, so this generates a
+tree with the same shape as the real one: an English source namespace per
+JSON file plus one directory per target language, nested keys, i18next
+placeholders, repeated strings, and the usual imperfections of a live tree
+(missing keys, stale keys, ``[TRANSLATE]`` markers and values left in
+English).  Target values are deterministic pseudo-translations, so langid,
+sync and status runs see realistic distributions.  Output is fully
+determined by the options and ``--seed``.
+
+    python3 scripts/i18n_synth.py --out /tmp/locales --keys 6000
+    python3 scripts/i18n_synth.py --out /tmp/small --keys 500 --langs en de cs sk
+
+``StandInTranslator`` is a local replacement for the translation backend
+(``translate_fn`` of the pipeline) with optional injected latency.
+"""
+import argparse
+import random
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from i18n_io import JsonWriter
+from i18n_locales import TRANSLATE_MARKER, set_path
+from translate_locales import PLACEHOLDER_PATTERNS, SOURCE_LANG
+
+# Languages of src/config/countries.ts plus the Montenegrin variant
+LANGUAGES = [
+    "en", "bg", "bs", "cs", "cy", "da", "de", "el", "es", "et", "fi", "fr", "ga",
+    "hr", "hu", "is", "it", "lt", "lv", "me", "mk", "mt", "nl", "no", "pl", "pt",
+    "ro", "ru", "sk", "sl", "sq", "sr", "sv", "tr", "uk",
+]
+
+NAMESPACES = [
+    "common", "dashboard", "auth", "family", "documents", "will", "vault",
+    "settings", "errors", "onboarding", "legal", "notifications", "billing",
+    "guardians", "emergency", "assets", "timeline", "sharing", "profile", "help",
+]
+
+SECTIONS = [
+    "header", "footer", "form", "modal", "table", "card", "list", "menu", "tabs",
+    "wizard", "summary", "details", "actions", "filters", "banner", "dialog",
+    "sidebar", "toolbar", "steps", "sections", "fields", "messages", "tooltips",
+]
+
+LEAVES = [
+    "title", "subtitle", "label", "description", "placeholder", "hint", "button",
+    "confirm", "cancel", "save", "error", "success", "warning", "info", "heading",
+    "caption", "link", "cta", "body", "note", "status", "empty", "loading",
+]
+
+WORDS = (
+    "your family will document guardian account secure vault access share "
+    "upload review update save delete create manage protect legacy plan "
+    "important contact emergency trusted person asset property insurance "
+    "bank digital password reminder notification settings profile privacy "
+    "data storage encrypted file folder time capsule message letter video "
+    "health medical record identity card passport certificate contract "
+    "please enter select choose confirm continue back next finish start "
+    "your information has been successfully saved could not be loaded try "
+    "again later this action cannot undone are you sure want to remove the "
+    "new all none more less today yesterday week month year status pending "
+    "active expired completed draft shared private with for of and in on"
+).split()
+
+PLACEHOLDERS = ["{{name}}", "{{count}}", "{{date}}", "{{email}}", "{amount}", "{days}", "%(user)s"]
+
+# Masked placeholders (translate_locales.protect_placeholders) must pass through untouched
+_PROTECTED = re.compile("|".join([r"__PH_\d+__"] + [p.pattern for p in PLACEHOLDER_PATTERNS]))
+
+
+def _cased(mapping: Dict[str, str]) -> Dict[int, str]:
+    return str.maketrans({**mapping, **{k.upper(): v.upper() for k, v in mapping.items()}})
+
+
+CYRILLIC = _cased({
+    "a": "а", "b": "б", "c": "ц", "d": "д", "e": "е", "f": "ф", "g": "г", "h": "х",
+    "i": "и", "j": "ј", "k": "к", "l": "л", "m": "м", "n": "н", "o": "о", "p": "п",
+    "r": "р", "s": "с", "t": "т", "u": "у", "v": "в", "y": "ы", "z": "з", "w": "в",
+})
+GREEK = _cased({
+    "a": "α", "b": "β", "c": "κ", "d": "δ", "e": "ε", "f": "φ", "g": "γ", "h": "η",
+    "i": "ι", "k": "κ", "l": "λ", "m": "μ", "n": "ν", "o": "ο", "p": "π", "r": "ρ",
+    "s": "σ", "t": "τ", "u": "υ", "v": "β", "x": "ξ", "y": "υ", "z": "ζ", "w": "ω",
+})
+SCRIPTS = {"bg": CYRILLIC, "mk": CYRILLIC, "ru": CYRILLIC, "sr": CYRILLIC, "uk": CYRILLIC, "el": GREEK}
+
+
+def _accent_table(lang: str) -> Dict[int, str]:
+    """Per-language vowel shifts and diacritics, stable across runs."""
+    rng = random.Random(f"accents:{lang}")
+    pool = "áàâäãåāăąéèêëēėęěíìîïīįóòôöõøōőúùûüūůűýÿçčćđğłńňñřšśşțťžźż"
+    return _cased({c: rng.choice(pool) for c in rng.sample("aeiouycnszrtl", 5)})
+
+
+_TABLES: Dict[str, Any] = {}
+_SUFFIXES = ["en", "ur", "ek", "ai", "os", "ta", "ij", "um", "ov", "ul", "as", "ie"]
+
+
+def pseudo_translate(text: str, lang: str) -> str:
+    """Deterministic stand-in translation that keeps placeholders and masks intact."""
+    table = _TABLES.get(lang)
+    if table is None:
+        table = _TABLES[lang] = SCRIPTS.get(lang) or _accent_table(lang)
+    suffix = _SUFFIXES[sum(map(ord, lang)) % len(_SUFFIXES)]
+    out = []
+    pos = 0
+    for m in _PROTECTED.finditer(text):
+        out.append(_pseudo_words(text[pos:m.start()], table, suffix))
+        out.append(m.group(0))
+        pos = m.end()
+    out.append(_pseudo_words(text[pos:], table, suffix))
+    return "".join(out)
+
+
+def _pseudo_words(segment: str, table: Dict[int, str], suffix: str) -> str:
+    if not segment:
+        return segment
+    words = segment.split(" ")
+    return " ".join(w.translate(table) + suffix if len(w) > 3 and w.isalpha() else w.translate(table) for w in words)
+
+
+class SynthConfig:
+    def __init__(
+        self,
+        languages: Optional[List[str]] = None,
+        namespaces: int = 12,
+        keys: int = 6000,
+        depth: int = 3,
+        placeholder_rate: float = 0.15,
+        dup_rate: float = 0.1,
+        missing_rate: float = 0.02,
+        stale_rate: float = 0.01,
+        marker_rate: float = 0.03,
+        english_rate: float = 0.02,
+        seed: int = 1234,
+    ):
+        self.languages = list(languages or LANGUAGES)
+        self.namespaces = namespaces
+        self.keys = keys
+        self.depth = depth
+        self.placeholder_rate = placeholder_rate
+        self.dup_rate = dup_rate
+        self.missing_rate = missing_rate
+        self.stale_rate = stale_rate
+        self.marker_rate = marker_rate
+        self.english_rate = english_rate
+        self.seed = seed
+
+    def to_json(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+
+def namespace_names(count: int) -> List[str]:
+    names = NAMESPACES[:count]
+    names += [f"module-{i}" for i in range(len(names), count)]
+    return names
+
+
+def _sentence(rng: random.Random, cfg: SynthConfig) -> str:
+    # Mostly short UI labels with a long tail of sentences
+    n = min(int(rng.paretovariate(1.2)) + rng.randint(0, 2), 24)
+    words = [rng.choice(WORDS) for _ in range(max(1, n))]
+    if rng.random() < cfg.placeholder_rate:
+        for _ in range(rng.choice((1, 1, 1, 2))):
+            words.insert(rng.randint(0, len(words)), rng.choice(PLACEHOLDERS))
+    text = " ".join(words)
+    return text[0].upper() + text[1:] + ("." if n > 5 else "")
+
+
+def generate_source(cfg: SynthConfig) -> Dict[str, Dict[str, Any]]:
+    """English documents per namespace; key counts follow a Zipf-like skew."""
+    rng = random.Random(cfg.seed)
+    names = namespace_names(cfg.namespaces)
+    weights = [1 / (i + 1) for i in range(len(names))]
+    counts = [max(1, int(cfg.keys * w / sum(weights))) for w in weights]
+    counts[0] += cfg.keys - sum(counts)
+
+    docs: Dict[str, Dict[str, Any]] = {}
+    seen: List[str] = []
+    for ns, count in zip(names, counts):
+        doc: Dict[str, Any] = {}
+        used = set()
+        for i in range(count):
+            levels = rng.randint(0, cfg.depth - 1) if cfg.depth > 1 else 0
+            prefix = tuple(rng.choice(SECTIONS) for _ in range(levels))
+            leaf = rng.choice(LEAVES)
+            path = prefix + (leaf,)
+            if path in used:
+                path = prefix + (f"{leaf}_{i}",)
+            used.add(path)
+            if seen and rng.random() < cfg.dup_rate:
+                value = rng.choice(seen)
+            else:
+                value = _sentence(rng, cfg)
+                seen.append(value)
+            set_path(doc, path, value)
+        docs[ns] = doc
+    return docs
+
+
+def _target_doc(source: Any, lang: str, rng: random.Random, cfg: SynthConfig) -> Any:
+    if isinstance(source, dict):
+        out = {}
+        for key, value in source.items():
+            if rng.random() < cfg.missing_rate:
+                continue
+            out[key] = _target_doc(value, lang, rng, cfg)
+        if rng.random() < cfg.stale_rate:
+            out[f"legacy_{rng.choice(LEAVES)}"] = pseudo_translate(_sentence(rng, cfg), lang)
+        return out
+    if not isinstance(source, str):
+        return source
+    roll = rng.random()
+    if roll < cfg.marker_rate:
+        return f"{TRANSLATE_MARKER} {source}"
+    if roll < cfg.marker_rate + cfg.english_rate:
+        return source
+    return pseudo_translate(source, lang)
+
+
+def generate_tree(root: Path, cfg: SynthConfig) -> Dict[str, int]:
+    """Write a full locale tree under ``root``. Returns file/leaf/char counts."""
+    root = Path(root)
+    source = generate_source(cfg)
+    writer = JsonWriter(fsync="none")
+    stats = {"languages": len(cfg.languages), "namespaces": len(source), "files": 0, "source_keys": 0, "source_chars": 0}
+    for ns, doc in source.items():
+        leaves = _leaf_values(doc)
+        stats["source_keys"] += len(leaves)
+        stats["source_chars"] += sum(len(v) for v in leaves)
+    for lang in cfg.languages:
+        rng = random.Random(f"{cfg.seed}:{lang}")
+        for ns, doc in source.items():
+            data = doc if lang == SOURCE_LANG else _target_doc(doc, lang, rng, cfg)
+            writer.write(root / lang / f"{ns}.json", data)
+            stats["files"] += 1
+    return stats
+
+
+def _leaf_values(obj: Any) -> List[str]:
+    if isinstance(obj, dict):
+        return [leaf for value in obj.values() for leaf in _leaf_values(value)]
+    return [obj] if isinstance(obj, str) else []
+
+
+class StandInTranslator:
+    """Local translation backend: pseudo-translates each batch, optionally sleeping.
+
+    Usable anywhere a ``translate_fn(strings, lang)`` is expected, and as an
+    i18n_backends.py backend.  ``latency`` is added per call and ``per_char``
+    per character, to mimic a remote API; a ``tail_rate`` fraction of calls
+    takes ``tail_latency`` longer and a ``fail_rate`` fraction raises.  A set
+    ``cancel`` event stops the wait early, as the chain does for hedge losers.
+    """
+
+    name = "stand-in"
+
+    def __init__(self, latency: float = 0.0, per_char: float = 0.0, tail_rate: float = 0.0,
+                 tail_latency: float = 0.0, fail_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.per_char = per_char
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.fail_rate = fail_rate
+        self.calls = 0
+        self.strings = 0
+        self.chars = 0
+        self.cancelled = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, strings: List[str], lang: str, timeout: Optional[float] = None,
+                 cancel: Optional[threading.Event] = None) -> List[str]:
+        chars = sum(len(s) for s in strings)
+        with self._lock:
+            self.calls += 1
+            self.strings += len(strings)
+            self.chars += chars
+            slow = self._rng.random() < self.tail_rate
+            fail = self._rng.random() < self.fail_rate
+        delay = self.latency + self.per_char * chars + (self.tail_latency if slow else 0.0)
+        timed_out = timeout is not None and delay > timeout
+        if timed_out:
+            delay = timeout
+        if delay > 0:
+            if cancel is not None and cancel.wait(delay):
+                with self._lock:
+                    self.cancelled += 1
+                raise RuntimeError("Request cancelled")
+            if cancel is None:
+                time.sleep(delay)
+        if timed_out:
+            raise TimeoutError(f"No answer within {timeout:g}s")
+        if fail:
+            raise RuntimeError(f"Injected failure translating {len(strings)} strings to {lang}")
+        return [pseudo_translate(s, lang) for s in strings]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic locale tree for benchmarks and tests")
+    parser.add_argument("--out", required=True, help="Locales root to create (one directory per language)")
+    parser.add_argument("--langs", nargs="*", help=f"Languages to generate (default: all {len(LANGUAGES)})")
+    parser.add_argument("--namespaces", type=int, default=12, help="Number of namespace files per language (default: 12)")
+    parser.add_argument("--keys", type=int, default=6000, help="Total English keys across namespaces (default: 6000)")
+    parser.add_argument("--depth", type=int, default=3, help="Maximum nesting depth of keys (default: 3)")
+    parser.add_argument("--placeholder-rate", type=float, default=0.15, help="Share of strings with placeholders (default: 0.15)")
+    parser.add_argument("--dup-rate", type=float, default=0.1, help="Share of strings repeating an earlier one (default: 0.1)")
+    parser.add_argument("--missing-rate", type=float, default=0.02, help="Share of target keys left out (default: 0.02)")
+    parser.add_argument("--stale-rate", type=float, default=0.01, help="Chance per object of an extra stale key (default: 0.01)")
+    parser.add_argument("--marker-rate", type=float, default=0.03, help="Share of target values left as [TRANSLATE] markers (default: 0.03)")
+    parser.add_argument("--english-rate", type=float, default=0.02, help="Share of target values left in English (default: 0.02)")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed (default: 1234)")
+    args = parser.parse_args()
+
+    if args.langs and SOURCE_LANG not in args.langs:
+        print(f"[warn] --langs does not include the source language '{SOURCE_LANG}'", file=sys.stderr)
+    cfg = SynthConfig(
+        languages=args.langs,
+        namespaces=args.namespaces,
+        keys=args.keys,
+        depth=args.depth,
+        placeholder_rate=args.placeholder_rate,
+        dup_rate=args.dup_rate,
+        missing_rate=args.missing_rate,
+        stale_rate=args.stale_rate,
+        marker_rate=args.marker_rate,
+        english_rate=args.english_rate,
+        seed=args.seed,
+    )
+    start = time.perf_counter()
+    stats = generate_tree(Path(args.out), cfg)
+    print(f"Generated {stats['files']} files in {args.out} ({stats['languages']} languages x {stats['namespaces']} namespaces, "
+          f"{stats['source_keys']:,} keys, {stats['source_chars']:,} source chars) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Translation memory shared by the i18n tools.
+
+A small SQLite database mapping (target language, English source string) to
+a translation.  translate_locales.py consults it before sending a string to
+the backend and stores every machine translation it receives, so repeated
+strings and re-runs are free.
+
+Each entry records its ``origin``: ``mt`` for backend output, ``harvest``
+for pairs aligned from the existing locale tree (i18n_harvest.py) and
+``tmx`` for imports.  ``export_tmx``/``read_tmx`` exchange the memory with
+CAT tools as TMX 1.4.
+"""
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_TM_PATH = Path(".i18n-cache/tm.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tm (
+    lang TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (lang, source)
+)
+"""
+
+# Keep well below SQLite's bound-parameter limit
+_CHUNK = 500
+
+
+class TranslationMemory:
+    def __init__(self, path: Path = DEFAULT_TM_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by the pipeline's worker threads; access is serialized by the lock
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def __enter__(self) -> "TranslationMemory":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, lang: str, sources: Iterable[str]) -> Dict[str, str]:
+        """Translations known for ``sources`` (misses are simply absent)."""
+        unique = list(dict.fromkeys(sources))
+        found: Dict[str, str] = {}
+        with self._lock:
+            for i in range(0, len(unique), _CHUNK):
+                chunk = unique[i:i + _CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT source, target FROM tm WHERE lang = ? AND source IN ({marks})",
+                    [lang, *chunk],
+                )
+                found.update(rows)
+        return found
+
+    def store(self, lang: str, pairs: Iterable[Tuple[str, str]], origin: str = "mt",
+              overwrite: bool = True, replace_origins: Optional[Iterable[str]] = None) -> int:
+        """Record (source, translation) pairs; returns how many rows were added or changed.
+
+        ``overwrite=False`` keeps existing entries; ``replace_origins`` replaces
+        only existing entries of those origins (e.g. machine translations).
+        """
+        now = time.time()
+        rows = [(lang, src, tgt, origin, now) for src, tgt in pairs]
+        if not rows:
+            return 0
+        sql = "INSERT INTO tm (lang, source, target, origin, updated) VALUES (?, ?, ?, ?, ?)"
+        if replace_origins is not None:
+            origins = list(replace_origins)
+            marks = ",".join("?" * len(origins)) or "NULL"
+            sql += (" ON CONFLICT(lang, source) DO UPDATE SET target = excluded.target,"
+                    " origin = excluded.origin, updated = excluded.updated"
+                    f" WHERE tm.origin IN ({marks}) AND tm.target != excluded.target")
+            rows = [row + tuple(origins) for row in rows]
+        elif overwrite:
+            sql = sql.replace("INSERT", "INSERT OR REPLACE", 1)
+        else:
+            sql = sql.replace("INSERT", "INSERT OR IGNORE", 1)
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def entries(self, lang: Optional[str] = None) -> List[Tuple[str, str, str, str]]:
+        """All (lang, source, target, origin) rows, optionally for one language."""
+        sql = "SELECT lang, source, target, origin FROM tm"
+        params: Tuple[str, ...] = ()
+        if lang is not None:
+            sql += " WHERE lang = ?"
+            params = (lang,)
+        with self._lock:
+            return list(self._conn.execute(sql + " ORDER BY source, lang", params))
+
+    def origins(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT origin, COUNT(*) FROM tm GROUP BY origin ORDER BY origin"))
+
+    def count(self, lang: Optional[str] = None) -> int:
+        with self._lock:
+            if lang is None:
+                return self._conn.execute("SELECT COUNT(*) FROM tm").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM tm WHERE lang = ?", (lang,)).fetchone()[0]
+
+    def languages(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT lang FROM tm ORDER BY lang")]
+
+
+# -- TMX 1.4 interchange -------------------------------------------------------
+
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+
+def tmx_lang(code: str) -> str:
+    """``de-DE`` / ``de_DE`` -> ``de``; the locale tree uses bare language codes."""
+    return code.replace("_", "-").split("-")[0].lower()
+
+
+def export_tmx(tm: TranslationMemory, path: Path, source_lang: str = "en",
+               languages: Optional[Iterable[str]] = None) -> int:
+    """Write one ``<tu>`` per source string with a ``<tuv>`` per language; returns the unit count."""
+    wanted = set(languages) if languages else None
+    units: Dict[str, List[Tuple[str, str, str]]] = {}
+    for lang, source, target, origin in tm.entries():
+        if wanted is None or lang in wanted:
+            units.setdefault(source, []).append((lang, target, origin))
+
+    root = ET.Element("tmx", version="1.4")
+    ET.SubElement(root, "header", {
+        "creationtool": "i18n_tm", "creationtoolversion": "1", "segtype": "sentence",
+        "o-tmf": "sqlite", "adminlang": "en", "srclang": source_lang, "datatype": "plaintext",
+    })
+    body = ET.SubElement(root, "body")
+    for source, targets in units.items():
+        tu = ET.SubElement(body, "tu")
+        tuv = ET.SubElement(tu, "tuv", {XML_LANG: source_lang})
+        ET.SubElement(tuv, "seg").text = source
+        for lang, target, origin in targets:
+            tuv = ET.SubElement(tu, "tuv", {XML_LANG: lang})
+            ET.SubElement(tuv, "prop", type="x-origin").text = origin
+            ET.SubElement(tuv, "seg").text = target
+    ET.indent(root)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+    return len(units)
+
+
+def _seg_text(seg: ET.Element) -> str:
+    # Inline markup (<ph>, <bpt>, ...) is flattened to its text
+    return "".join(seg.itertext())
+
+
+def read_tmx(path: Path, source_lang: str = "en") -> Dict[str, List[Tuple[str, str]]]:
+    """``{lang: [(source, target), ...]}`` from a TMX file, streamed unit by unit."""
+    pairs: Dict[str, List[Tuple[str, str]]] = {}
+    src = tmx_lang(source_lang)
+    for _event, elem in ET.iterparse(str(path), events=("end",)):
+        if elem.tag == "header":
+            declared = elem.get("srclang")
+            if declared and declared != "*all*":
+                src = tmx_lang(declared)
+            continue
+        if elem.tag != "tu":
+            continue
+        segs: Dict[str, str] = {}
+        for tuv in elem.iter("tuv"):
+            lang = tuv.get(XML_LANG) or tuv.get("lang")
+            seg = tuv.find("seg")
+            if lang and seg is not None:
+                segs.setdefault(tmx_lang(lang), _seg_text(seg))
+        source = segs.pop(src, None)
+        if source:
+            for lang, target in segs.items():
+                if target:
+                    pairs.setdefault(lang, []).append((source, target))
+        elem.clear()
+    return pairs
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Profiling and trace-timeline support shared by the i18n tools.
+
+Every tool accepts the same options (see ``add_profile_arguments``):
+
+    --trace out.json     phase spans in Chrome trace-event format
+                         (open in chrome://tracing or https://ui.perfetto.dev)
+    --profile [out.prof] cProfile the run; prints the hottest functions
+    --tracemalloc        print peak memory and the top allocation sites
+
+Code marks phases with ``with span("load", file=...):``.  Spans cost a
+single attribute check while tracing is off.
+"""
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+TOP_N = 25
+# Python 3.12+ profiles through sys.monitoring, which is process-wide: the
+# run's profiler already covers worker threads and a second one cannot start
+PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer._complete(self.name, self.start, time.perf_counter(), self.args)
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects complete ("X") trace events from any thread."""
+
+    def __init__(self):
+        self.enabled = False
+        self.events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._pid = os.getpid()
+
+    def start(self):
+        self._t0 = time.perf_counter()
+        self.enabled = True
+
+    def span(self, name: str, **args: Any):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def _complete(self, name: str, start: float, end: float, args: Dict[str, Any]):
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": "i18n",
+            "ph": "X",
+            "ts": round((start - self._t0) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": self._pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = {k: v if isinstance(v, (int, float, bool)) else str(v) for k, v in args.items()}
+        with self._lock:
+            self.events.append(event)
+            self._threads.setdefault(thread.ident, thread.name)
+
+    def write(self, path: Path):
+        meta = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+            for tid, name in sorted(self._threads.items())
+        ]
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {"traceEvents": meta + self.events, "displayTimeUnit": "ms"}
+        path.write_text(json.dumps(data) + "\n", encoding="utf-8")
+
+
+TRACER = Tracer()
+
+# cProfile only sees the thread that enabled it; worker threads register their own
+_thread_profiling = False
+_thread_profiles: List[cProfile.Profile] = []
+_thread_profiles_lock = threading.Lock()
+
+
+def span(name: str, **args: Any):
+    """Phase span on the shared tracer (a no-op unless ``--trace`` is active)."""
+    return TRACER.span(name, **args)
+
+
+@contextmanager
+def profile_thread() -> Iterator[None]:
+    """Wrap a worker thread's body so ``--profile`` covers it too."""
+    if not _thread_profiling or not PER_THREAD_PROFILES:
+        yield
+        return
+    profiler: Optional[cProfile.Profile] = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler is active process-wide and already sees this thread
+        profiler = None
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            with _thread_profiles_lock:
+                _thread_profiles.append(profiler)
+
+
+def add_profile_arguments(parser):
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--trace", metavar="OUT.json", help="Write phase spans as a Chrome trace-event timeline")
+    group.add_argument("--profile", nargs="?", const="", metavar="OUT.prof",
+                       help=f"Run under cProfile and print the top {TOP_N} functions (optionally dump stats)")
+    group.add_argument("--tracemalloc", action="store_true", help="Report peak memory and top allocation sites")
+    return group
+
+
+@contextmanager
+def profiling(args, tool: str) -> Iterator[None]:
+    """Enable whatever ``add_profile_arguments`` options were given around the run."""
+    trace_path: Optional[str] = getattr(args, "trace", None)
+    profile_path: Optional[str] = getattr(args, "profile", None)
+    memory = getattr(args, "tracemalloc", False)
+
+    if trace_path:
+        TRACER.start()
+    if memory:
+        tracemalloc.start(10)
+    global _thread_profiling
+    profiler = cProfile.Profile() if profile_path is not None else None
+    if profiler is not None:
+        _thread_profiling = True
+        profiler.enable()
+    try:
+        with span(tool):
+            yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if memory:
+            # Snapshot before the reporting below allocates anything
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        if profiler is not None:
+            _thread_profiling = False
+            stats = pstats.Stats(profiler, stream=sys.stderr)
+            with _thread_profiles_lock:
+                for thread_profiler in _thread_profiles:
+                    stats.add(thread_profiler)
+                _thread_profiles.clear()
+            stats.sort_stats("cumulative")
+            print(f"\n[profile] {tool}: top {TOP_N} by cumulative time", file=sys.stderr)
+            stats.print_stats(TOP_N)
+            if profile_path:
+                Path(profile_path).parent.mkdir(parents=True, exist_ok=True)
+                stats.dump_stats(profile_path)
+                print(f"[profile] Wrote {profile_path}", file=sys.stderr)
+        if memory:
+            print(f"\n[tracemalloc] {tool}: current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB", file=sys.stderr)
+            for stat in snapshot.statistics("lineno")[:TOP_N]:
+                print(f"  {stat}", file=sys.stderr)
+        if trace_path:
+            TRACER.enabled = False
+            TRACER.write(Path(trace_path))
+            print(f"[trace] Wrote {trace_path} ({len(TRACER.events)} spans)", file=sys.stderr)
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Index of translation keys referenced from the application source.
+
+Most locale keys are never looked up by the app (see
+namespace-verification-report.json), yet the translators send every leaf
+to the API.  This scans ``src/**/*.{ts,tsx,js,jsx,mjs,cjs}`` for
+
+    useTranslation('ns') / useTranslation(['ns', 'other'])
+    t('key'), t('ns:key'), t('key', { ns: 'ns' }), i18n.t(...)
+    <Trans i18nKey="key" />
+
+and keeps the per-file results in ``.i18n-cache/usage-index.json``, keyed by
+mtime and size, so only changed files are rescanned (in parallel worker
+processes when there are many).  Template-literal keys such as
+``t(`steps.${n}.title`)`` become wildcard patterns, and a namespace whose
+keys are computed (``t(field.label)``) is kept whole.
+
+``KeyScope.is_used`` answers whether a locale leaf is referenced;
+``--only-used`` in translate_locales.py and translate_common.py uses it to
+translate only those leaves.  Each entry also lists the file's import
+specifiers, from which i18n_repartition.py builds the import graph.
+
+    python3 scripts/i18n_usage.py              # update the index, print a summary
+    python3 scripts/i18n_usage.py --unused     # also list unreferenced locale keys
+"""
+import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from i18n_io import write_json
+from i18n_locales import KeyPath, LocaleTree, dotted, flatten
+from i18n_trace import add_profile_arguments, profiling, span
+from translate_locales import DEFAULT_LOCALES_DIR, SOURCE_LANG
+
+DEFAULT_SRC_DIR = Path("src")
+DEFAULT_INDEX_PATH = Path(".i18n-cache/usage-index.json")
+INDEX_VERSION = 2
+# Plain JS is scanned too: a key used only there must not look unused
+SOURCE_SUFFIXES = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+
+# Namespace for t() calls in files that never call useTranslation
+DEFAULT_NAMESPACE = "common"
+# Below this many changed files, worker processes cost more than they save
+PARALLEL_MIN_FILES = 64
+
+USE_TRANSLATION = re.compile(r"useTranslation\(\s*(\[[^\]]*\]|(['\"`])[^'\"`]*\2)?")
+STRING_LITERAL = re.compile(r"(['\"`])([^'\"`]+)\1")
+T_CALL = re.compile(r"(?<![\w$])t\(\s*(['\"`])((?:\\.|(?!\1).)*?)\1\s*(,\s*\{[^}]*\})?", re.S)
+COMPUTED_T_CALL = re.compile(r"(?<![\w$.])t\(\s*[A-Za-z_$][\w$.\[\]]*\s*[,)]")
+TRANS_KEY = re.compile(r"i18nKey=\{?\s*(['\"`])([^'\"`]+)\1")
+NS_OPTION = re.compile(r"\bns:\s*['\"]([^'\"]+)['\"]")
+NS_PREFIX = re.compile(r"^([\w-]+):(.+)$", re.S)
+INTERPOLATION = re.compile(r"\$\{[^}]*\}")
+PLURAL_SUFFIX = re.compile(r"_(zero|one|two|few|many|other|plural|\d+)$")
+# Static and dynamic module specifiers, for the import graph (i18n_repartition.py)
+IMPORT_FROM = re.compile(r"(?:^|[;\s])(?:import|export)\s[^'\";]*?\bfrom\s*(['\"])([^'\"]+)\1")
+IMPORT_BARE = re.compile(r"(?:^|[;\s])import\s*(['\"])([^'\"]+)\1")
+IMPORT_DYNAMIC = re.compile(r"\bimport\(\s*(['\"`])([^'\"`]+)\1\s*\)")
+
+
+def _add_key(out: Dict[str, Any], raw: str, namespaces: List[str], option_ns: Optional[str]):
+    m = NS_PREFIX.match(raw)
+    if m:
+        targets, key = [m.group(1)], m.group(2)
+    else:
+        # Unprefixed keys may resolve in any namespace the component loaded;
+        # attributing them to all of them errs on the side of translating
+        targets, key = [option_ns] if option_ns else namespaces, raw
+    if INTERPOLATION.search(key):
+        pattern = INTERPOLATION.sub("*", key)
+        out["patterns"].extend([ns, pattern] for ns in targets)
+    else:
+        out["keys"].extend([ns, key] for ns in targets)
+
+
+def scan_file(path: str) -> Dict[str, Any]:
+    """Usage found in one source file (picklable, runs in worker processes)."""
+    try:
+        text = Path(path).read_text(encoding="utf-8", errors="replace")
+    except OSError as e:
+        return {"error": str(e), "namespaces": [], "keys": [], "patterns": [], "computed": [], "imports": []}
+    namespaces: List[str] = []
+    for m in USE_TRANSLATION.finditer(text):
+        if m.group(1):
+            namespaces.extend(s for _q, s in STRING_LITERAL.findall(m.group(1)))
+    namespaces = list(dict.fromkeys(namespaces)) or [DEFAULT_NAMESPACE]
+
+    out: Dict[str, Any] = {"namespaces": namespaces, "keys": [], "patterns": [], "computed": []}
+    for m in T_CALL.finditer(text):
+        options = m.group(3) or ""
+        ns_opt = NS_OPTION.search(options)
+        _add_key(out, m.group(2), namespaces, ns_opt.group(1) if ns_opt else None)
+    for m in TRANS_KEY.finditer(text):
+        _add_key(out, m.group(2), namespaces, None)
+    if COMPUTED_T_CALL.search(text):
+        out["computed"] = namespaces
+    out["keys"] = sorted(set(map(tuple, out["keys"])))
+    out["patterns"] = sorted(set(map(tuple, out["patterns"])))
+    out["imports"] = sorted({m.group(2) for rx in (IMPORT_FROM, IMPORT_BARE, IMPORT_DYNAMIC) for m in rx.finditer(text)})
+    return out
+
+
+def iter_source_files(src_dir: Path) -> Iterable[Path]:
+    for dirpath, dirnames, filenames in os.walk(src_dir):
+        dirnames[:] = [d for d in dirnames if d != "node_modules" and not d.startswith(".")]
+        for name in filenames:
+            if name.endswith(SOURCE_SUFFIXES) and not name.endswith(".d.ts"):
+                yield Path(dirpath) / name
+
+
+class KeyScope:
+    """Which locale leaves the source references."""
+
+    def __init__(self, keys: Dict[str, Set[str]], patterns: Dict[str, List[str]], whole: Set[str]):
+        self.keys = keys
+        self.whole = whole
+        self.patterns = {
+            ns: re.compile("|".join(fnmatch.translate(p) for p in pats))
+            for ns, pats in patterns.items() if pats
+        }
+
+    def is_used(self, namespace: str, path: KeyPath) -> bool:
+        if namespace in self.whole:
+            return True
+        used = self.keys.get(namespace, set())
+        key = dotted(path)
+        # Plural forms (count_one, count_other) are looked up through their base key
+        base = PLURAL_SUFFIX.sub("", key)
+        if key in used or base in used:
+            return True
+        # A parent key fetched with returnObjects uses everything below it
+        if any(dotted(path[:i]) in used for i in range(1, len(path))):
+            return True
+        pattern = self.patterns.get(namespace)
+        return bool(pattern and (pattern.match(key) or pattern.match(base)))
+
+
+class UsageIndex:
+    def __init__(self, files: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.files: Dict[str, Dict[str, Any]] = files or {}
+        self.rescanned = 0
+        self.reused = 0
+        self.removed = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "UsageIndex":
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return cls()
+        if data.get("version") != INDEX_VERSION:
+            return cls()
+        return cls(data.get("files", {}))
+
+    def save(self, path: Path) -> bool:
+        return write_json(path, {"version": INDEX_VERSION, "files": dict(sorted(self.files.items()))})
+
+    def update(self, src_dir: Path, workers: Optional[int] = None):
+        """Rescan files whose mtime or size changed; drop files that are gone."""
+        current: Dict[str, Tuple[int, int]] = {}
+        for p in iter_source_files(src_dir):
+            st = p.stat()
+            current[p.as_posix()] = (st.st_mtime_ns, st.st_size)
+
+        stale = [name for name, stamp in current.items()
+                 if (self.files.get(name, {}).get("mtime_ns"), self.files.get(name, {}).get("size")) != stamp]
+        gone = set(self.files) - set(current)
+        for name in gone:
+            del self.files[name]
+        self.removed = len(gone)
+        self.reused = len(current) - len(stale)
+        self.rescanned = len(stale)
+
+        with span("scan", files=len(stale)):
+            if len(stale) >= PARALLEL_MIN_FILES and workers != 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(scan_file, stale, chunksize=16))
+            else:
+                results = [scan_file(name) for name in stale]
+        for name, result in zip(stale, results):
+            if "error" in result:
+                print(f"[warn] Could not read {name}: {result['error']}", file=sys.stderr)
+            mtime_ns, size = current[name]
+            self.files[name] = {"mtime_ns": mtime_ns, "size": size, **result}
+
+    def scope(self, files: Optional[Iterable[str]] = None) -> KeyScope:
+        """Keys referenced by all files, or only by ``files``."""
+        keys: Dict[str, Set[str]] = {}
+        patterns: Dict[str, List[str]] = {}
+        whole: Set[str] = set()
+        entries = self.files.values() if files is None else [self.files[f] for f in files if f in self.files]
+        for entry in entries:
+            for ns, key in entry["keys"]:
+                keys.setdefault(ns, set()).add(key)
+            for ns, pattern in entry["patterns"]:
+                patterns.setdefault(ns, []).append(pattern)
+            whole.update(entry["computed"])
+        return KeyScope(keys, patterns, whole)
+
+    def namespace_counts(self) -> Dict[str, int]:
+        """Number of source files referencing each namespace."""
+        counts: Dict[str, int] = {}
+        for entry in self.files.values():
+            used = {ns for ns, _k in entry["keys"]} | {ns for ns, _p in entry["patterns"]} | set(entry["computed"])
+            for ns in used:
+                counts[ns] = counts.get(ns, 0) + 1
+        return counts
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "files": len(self.files),
+            "files_with_keys": sum(1 for e in self.files.values() if e["keys"] or e["patterns"]),
+            "keys": len({(ns, k) for e in self.files.values() for ns, k in e["keys"]}),
+            "patterns": len({(ns, p) for e in self.files.values() for ns, p in e["patterns"]}),
+        }
+
+
+def load_index(src_dir: Path = DEFAULT_SRC_DIR, index_path: Path = DEFAULT_INDEX_PATH,
+               workers: Optional[int] = None) -> UsageIndex:
+    """The cached index, brought up to date with the sources."""
+    index = UsageIndex.load(index_path)
+    index.update(src_dir, workers=workers)
+    index.save(index_path)
+    return index
+
+
+def load_scope(src_dir: Path = DEFAULT_SRC_DIR, index_path: Path = DEFAULT_INDEX_PATH,
+               workers: Optional[int] = None) -> KeyScope:
+    return load_index(src_dir, index_path, workers).scope()
+
+
+def run(args):
+    src_dir = Path(args.src_dir)
+    if not src_dir.is_dir():
+        print(f"Source directory not found: {src_dir}", file=sys.stderr)
+        sys.exit(1)
+    index_path = Path(args.index)
+    start = time.perf_counter()
+    index = load_index(src_dir, index_path, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    summary = index.summary()
+    scope = index.scope()
+
+    print(f"Usage index: {summary['files']} source files ({index.rescanned} scanned, {index.reused} cached, "
+          f"{index.removed} removed) in {elapsed:.2f}s -> {index_path}")
+    print(f"  {summary['keys']} literal keys and {summary['patterns']} template patterns "
+          f"in {summary['files_with_keys']} files")
+    if scope.whole:
+        print(f"  kept whole (computed keys): {', '.join(sorted(scope.whole))}")
+
+    locales_dir = Path(args.locales_dir)
+    if not (locales_dir / args.source_lang).is_dir():
+        return
+    tree = LocaleTree.load(locales_dir, args.source_lang, languages=[args.source_lang])
+    print("\n" + "=" * 60)
+    print("REFERENCED KEYS PER NAMESPACE")
+    print("=" * 60)
+    total = used_total = 0
+    unused: List[str] = []
+    for ns in tree.namespaces:
+        paths = list(flatten(tree.get(args.source_lang, ns)))
+        used = [p for p in paths if scope.is_used(ns, p)]
+        total += len(paths)
+        used_total += len(used)
+        print(f"  {ns:<28} {len(used):>6} / {len(paths):<6}")
+        if args.unused:
+            used_set = set(used)
+            unused.extend(f"{ns}:{dotted(p)}" for p in paths if p not in used_set)
+    share = used_total / total if total else 0.0
+    print(f"\nReferenced: {used_total:,} of {total:,} keys ({share:.1%}); "
+          f"--only-used would skip {total - used_total:,} keys per language")
+    if args.unused:
+        print("\nUnreferenced keys:")
+        for key in unused:
+            print(f"  {key}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index translation-key usage in the TypeScript sources")
+    parser.add_argument("--src-dir", default=str(DEFAULT_SRC_DIR), help="Source root to scan (default: src)")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX_PATH), help="Cached usage index (default: .i18n-cache/usage-index.json)")
+    parser.add_argument("--workers", type=int, help="Scanner processes for large rescans (default: CPU count)")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Locales root, for the per-namespace report")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    parser.add_argument("--unused", action="store_true", help="List locale keys that no source file references")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling(args, "i18n_usage"):
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
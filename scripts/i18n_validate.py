@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""Post-translation checks and the retry queue for leaves that fail them.
+
+Backends occasionally mangle the masked tokens: ``__PH_0__`` comes back
+translated, split or dropped, and ``restore_placeholders`` then silently
+leaves garbage behind.  Every translated leaf is checked against its English
+source:
+
+* ``mask``: a masking token (or what is left of one) survived;
+* ``placeholders``: the ``{{var}}`` / ``{var}`` / ``%(name)s`` sets differ;
+* ``markup``: the tags (``<b>``, ``<1>``, ``<br/>``) differ or do not nest;
+* ``length``: the translation is under ``MIN_LENGTH_RATIO`` or over
+  ``MAX_LENGTH_RATIO`` times the source's length (sources of at least
+  ``LENGTH_CHECK_MIN_CHARS`` characters only).
+
+A failing leaf is written as a ``[TRANSLATE]`` marker, never learned by the
+translation memory, and queued.  The rest of its file is written as usual.
+The queue then re-sends only the failing strings, once for each alternate
+masking style in ``MASK_STYLES``, and patches every fixed leaf into its
+file.  Whatever still fails is saved to ``.i18n-cache/retry-queue.json``;
+``translate_locales.py --retry-failed`` retries only those leaves.
+
+Run as a script, it checks the whole tree.  Each English leaf is tokenized
+once into a placeholder signature, and every language is then compared
+against those signatures in parallel worker processes.  The exit status is
+1 when any value lacks or adds a placeholder, so the check can run as a
+pre-commit hook::
+
+    python3 scripts/i18n_validate.py                    # all languages
+    python3 scripts/i18n_validate.py --langs de cs --markup --output placeholder-report.json
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from i18n_io import write_json
+from i18n_locales import TRANSLATE_MARKER, KeyPath, dotted, is_marker, leaf_at, list_languages
+from i18n_trace import add_profile_arguments, profiling, span
+from translate_locales import (
+    BATCH_SIZE,
+    DEFAULT_LOCALES_DIR,
+    PLACEHOLDER_PATTERNS,
+    SOURCE_LANG,
+    iter_json_leaves,
+    load_json,
+    protect_placeholders,
+    restore_placeholders,
+    save_json,
+)
+
+DEFAULT_QUEUE_PATH = Path(".i18n-cache/retry-queue.json")
+QUEUE_VERSION = 1
+# First style is the pipeline's; retries use the others, one round each
+MASK_STYLES = ("__PH_{}__", "⟦{}⟧", "[[{}]]")
+LEFTOVER_MASK = re.compile(r"_{0,2}PH_\d+_{0,2}|⟦\s*\d+\s*⟧|\[\[\s*\d+\s*\]\]", re.I)
+TAG = re.compile(r"<\s*(/?)\s*([A-Za-z][\w-]*|\d+)\b[^<>]*?(/?)\s*>")
+MIN_LENGTH_RATIO = 0.3
+MAX_LENGTH_RATIO = 3.0
+LENGTH_CHECK_MIN_CHARS = 20
+
+# Below this many languages, worker processes cost more than they save
+PARALLEL_MIN_LANGUAGES = 4
+DEFAULT_SHOW = 20
+
+TranslateFn = Callable[[List[str], str], List[str]]
+# One alternation so each leaf is scanned once; leftmost match prefers {{var}} over {var}
+PLACEHOLDER = re.compile("|".join(p.pattern for p in PLACEHOLDER_PATTERNS))
+WHITESPACE = re.compile(r"\s+")
+
+
+def _placeholders(text: str) -> List[str]:
+    """Sorted placeholders, normalized like ``placeholder_signature`` (``{{ count }}`` == ``{{count}}``)."""
+    return sorted(WHITESPACE.sub("", m) for m in protect_placeholders(text)[1].values())
+
+
+def _tags(text: str) -> List[Tuple[str, str, str]]:
+    return [(m.group(1), m.group(2).lower(), m.group(3)) for m in TAG.finditer(text)]
+
+
+def _balanced(tags: List[Tuple[str, str, str]]) -> bool:
+    stack: List[str] = []
+    for closing, name, self_closing in tags:
+        if self_closing or name == "br":
+            continue
+        if not closing:
+            stack.append(name)
+        elif not stack or stack.pop() != name:
+            return False
+    return not stack
+
+
+class Validator:
+    def __init__(self, min_ratio: float = MIN_LENGTH_RATIO, max_ratio: float = MAX_LENGTH_RATIO,
+                 min_chars: int = LENGTH_CHECK_MIN_CHARS):
+        self.min_ratio = min_ratio
+        self.max_ratio = max_ratio
+        self.min_chars = min_chars
+
+    def check(self, source: str, translated: str) -> List[str]:
+        """Issue codes for a restored translation; empty when it passes."""
+        if is_marker(translated):
+            return []
+        issues = []
+        if LEFTOVER_MASK.search(translated) and not LEFTOVER_MASK.search(source):
+            issues.append("mask")
+        if _placeholders(source) != _placeholders(translated):
+            issues.append("placeholders")
+        src_tags, out_tags = _tags(source), _tags(translated)
+        if sorted(src_tags) != sorted(out_tags) or (_balanced(src_tags) and not _balanced(out_tags)):
+            issues.append("markup")
+        if len(source) >= self.min_chars:
+            ratio = len(translated) / len(source)
+            if ratio < self.min_ratio or ratio > self.max_ratio:
+                issues.append("length")
+        return issues
+
+
+def marker_for(source: str) -> str:
+    return f"{TRANSLATE_MARKER} {source}"
+
+
+def retry_strings(sources: List[str], translate_fn: TranslateFn, lang: str, validator: Validator,
+                  styles: Tuple[str, ...] = MASK_STYLES[1:],
+                  batch_size: int = BATCH_SIZE) -> Tuple[List[Optional[str]], List[List[str]]]:
+    """Re-send ``sources`` with each alternate masking style until they pass.
+
+    Returns the translations (None where every style failed) and the issues of
+    the last attempt per source.
+    """
+    results: List[Optional[str]] = [None] * len(sources)
+    issues: List[List[str]] = [["untried"] for _ in sources]
+    for style in styles:
+        todo = [i for i, r in enumerate(results) if r is None]
+        if not todo:
+            break
+        masked = [protect_placeholders(sources[i], style) for i in todo]
+        for start in range(0, len(todo), batch_size):
+            chunk = todo[start:start + batch_size]
+            chunk_masked = masked[start:start + batch_size]
+            try:
+                out = translate_fn([tmp for tmp, _repls in chunk_masked], lang)
+            except Exception as e:
+                print(f"[warn] Retry of {len(chunk)} {lang} strings failed: {e}", file=sys.stderr)
+                continue
+            for i, (_tmp, repls), text in zip(chunk, chunk_masked, out):
+                restored = restore_placeholders(text, repls)
+                found = ["marker"] if is_marker(restored) else validator.check(sources[i], restored)
+                issues[i] = found
+                if not found:
+                    results[i] = restored
+    return results, issues
+
+
+def _set_leaf(data: Any, path: KeyPath, value: str) -> bool:
+    """Replace an existing leaf (list indices as strings); False if the path is gone."""
+    cur = data
+    for key in path[:-1]:
+        cur = cur.get(key) if isinstance(cur, dict) else (
+            cur[int(key)] if isinstance(cur, list) and key.isdigit() and int(key) < len(cur) else None)
+        if cur is None:
+            return False
+    leaf = path[-1]
+    if isinstance(cur, dict) and leaf in cur:
+        cur[leaf] = value
+        return True
+    if isinstance(cur, list) and leaf.isdigit() and int(leaf) < len(cur):
+        cur[int(leaf)] = value
+        return True
+    return False
+
+
+class RetryItem:
+    """One leaf whose translation failed validation."""
+
+    def __init__(self, src_path: Path, out_path: Path, lang: str, path: KeyPath, source: str,
+                 issues: List[str], attempts: int = 1):
+        self.src_path = Path(src_path)
+        self.out_path = Path(out_path)
+        self.lang = lang
+        self.path = tuple(path)
+        self.source = source
+        self.issues = issues
+        self.attempts = attempts
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "src": str(self.src_path),
+            "out": str(self.out_path),
+            "lang": self.lang,
+            "path": list(self.path),
+            "source": self.source,
+            "issues": self.issues,
+            "attempts": self.attempts,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "RetryItem":
+        return cls(Path(data["src"]), Path(data["out"]), data["lang"], tuple(data["path"]), data["source"],
+                   data.get("issues", []), data.get("attempts", 1))
+
+
+class RetryQueue:
+    def __init__(self, path: Path = DEFAULT_QUEUE_PATH):
+        self.path = Path(path)
+        self.items: Dict[Tuple[Path, KeyPath], RetryItem] = {}
+        self.issue_counts: Dict[str, int] = {}
+        self.failed = 0
+        self.fixed = 0
+        self.stale = 0
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_QUEUE_PATH) -> "RetryQueue":
+        queue = cls(path)
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return queue
+        if data.get("version") == QUEUE_VERSION:
+            for raw in data.get("items", []):
+                item = RetryItem.from_json(raw)
+                queue.items[(item.out_path, item.path)] = item
+        return queue
+
+    def save(self) -> bool:
+        if not self.items and not self.path.exists():
+            return False
+        return write_json(self.path, {
+            "version": QUEUE_VERSION,
+            "items": [item.to_json() for item in self.items.values()],
+        })
+
+    def add(self, item: RetryItem):
+        self.items[(item.out_path, item.path)] = item
+        self.failed += 1
+        for issue in item.issues:
+            self.issue_counts[issue] = self.issue_counts.get(issue, 0) + 1
+
+    def discard_files(self, out_paths: List[Path]):
+        """Forget earlier failures in files this run rewrites anyway."""
+        rewritten = {Path(p) for p in out_paths}
+        self.items = {k: v for k, v in self.items.items() if v.out_path not in rewritten}
+
+    def drain(self, translate_fn: TranslateFn, validator: Validator, tm: Any = None,
+              batch_size: int = BATCH_SIZE) -> int:
+        """Retry every queued leaf with the alternate masks and patch fixed ones into their files."""
+        by_lang: Dict[str, Dict[str, List[RetryItem]]] = {}
+        for item in self.items.values():
+            by_lang.setdefault(item.lang, {}).setdefault(item.source, []).append(item)
+        fixed: List[Tuple[RetryItem, str]] = []
+        for lang, groups in sorted(by_lang.items()):
+            sources = list(groups)
+            results, issues = retry_strings(sources, translate_fn, lang, validator, batch_size=batch_size)
+            learned = []
+            for source, result, found in zip(sources, results, issues):
+                for item in groups[source]:
+                    item.attempts += 1
+                    if result is None:
+                        item.issues = found
+                    else:
+                        fixed.append((item, result))
+                if result is not None:
+                    learned.append((source, result))
+            if tm is not None and learned:
+                tm.store(lang, learned)
+
+        by_file: Dict[Path, List[Tuple[RetryItem, str]]] = {}
+        for item, text in fixed:
+            by_file.setdefault(item.out_path, []).append((item, text))
+        for out_path, patches in sorted(by_file.items()):
+            try:
+                data = load_json(out_path)
+                src_data = load_json(patches[0][0].src_path)
+            except Exception as e:
+                print(f"[warn] Cannot patch {out_path}: {e}", file=sys.stderr)
+                continue
+            for item, text in patches:
+                # The English text or the leaf changed since the failure: a new run handles it
+                if leaf_at(src_data, item.path) != item.source or not _set_leaf(data, item.path, text):
+                    self.stale += 1
+                else:
+                    self.fixed += 1
+                del self.items[(item.out_path, item.path)]
+            save_json(out_path, data)
+        return len(fixed)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "failed": self.failed,
+            "fixed_on_retry": self.fixed,
+            "stale": self.stale,
+            "still_queued": len(self.items),
+            "issues": dict(sorted(self.issue_counts.items())),
+        }
+
+    def print_summary(self):
+        if not (self.failed or self.items or self.fixed):
+            return
+        issues = ", ".join(f"{k} {v}" for k, v in sorted(self.issue_counts.items())) or "none new"
+        print(f"\nValidation: {self.failed} leaves failed ({issues}); {self.fixed} fixed by retrying "
+              f"with alternate masking, {len(self.items)} still queued in {self.path}")
+        if self.items:
+            print("  Retry only those with: translate_locales.py --retry-failed")
+
+
+# -- whole-tree placeholder check ----------------------------------------------
+
+Signature = Tuple[str, ...]
+# Set in each worker process by _init_worker, so the signatures are sent once per process
+_signatures: Dict[str, Dict[KeyPath, Tuple[Signature, Tuple]]] = {}
+
+
+def placeholder_signature(text: str) -> Signature:
+    """Sorted placeholders of ``text``; ``{{ count }}`` and ``{{count}}`` are the same to i18next."""
+    if "{" not in text and "%(" not in text:
+        return ()
+    return tuple(sorted(m if " " not in m else WHITESPACE.sub("", m) for m in PLACEHOLDER.findall(text)))
+
+
+def source_signatures(locales_dir: Path, source_lang: str, namespaces: Optional[List[str]] = None,
+                      markup: bool = False) -> Dict[str, Dict[KeyPath, Tuple[Signature, Tuple]]]:
+    """``{namespace: {key path: (placeholder signature, tag signature)}}`` of every English string leaf."""
+    out: Dict[str, Dict[KeyPath, Tuple[Signature, Tuple]]] = {}
+    for path in sorted((Path(locales_dir) / source_lang).glob("*.json")):
+        if namespaces and path.stem not in namespaces:
+            continue
+        out[path.stem] = {
+            key: (placeholder_signature(text), tuple(sorted(_tags(text))) if markup else ())
+            for key, text in iter_json_leaves(load_json(path))
+        }
+    return out
+
+
+def _init_worker(signatures: Dict[str, Dict[KeyPath, Tuple[Signature, Tuple]]]):
+    global _signatures
+    _signatures = signatures
+
+
+def placeholder_diff(expected: Signature, actual: Signature) -> Tuple[List[str], List[str]]:
+    missing = list(expected)
+    extra = []
+    for token in actual:
+        if token in missing:
+            missing.remove(token)
+        else:
+            extra.append(token)
+    return missing, extra
+
+
+def check_language(locales_dir: str, lang: str, markup: bool = False) -> Dict[str, Any]:
+    """Mismatches of one language against the signatures set by ``_init_worker``."""
+    leaves = 0
+    mismatches: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    for ns, expected in _signatures.items():
+        path = Path(locales_dir) / lang / f"{ns}.json"
+        if not path.exists():
+            continue
+        try:
+            data = load_json(path)
+        except Exception as e:
+            errors.append(f"{lang}/{ns}.json: {e}")
+            continue
+        for key, text in iter_json_leaves(data):
+            signature = expected.get(key)
+            if signature is None or is_marker(text):
+                continue
+            leaves += 1
+            missing, extra = placeholder_diff(signature[0], placeholder_signature(text))
+            issue: Dict[str, Any] = {}
+            if missing or extra:
+                issue = {"missing": missing, "extra": extra}
+            if markup and not issue and tuple(sorted(_tags(text))) != signature[1]:
+                issue = {"markup": True}
+            if issue:
+                mismatches.append({"namespace": ns, "key": dotted(key), "value": text, **issue})
+    return {"lang": lang, "leaves": leaves, "mismatches": mismatches, "errors": errors}
+
+
+def check_tree(locales_dir: Path, source_lang: str = SOURCE_LANG, languages: Optional[List[str]] = None,
+               namespaces: Optional[List[str]] = None, markup: bool = False,
+               workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    with span("signatures", lang=source_lang):
+        signatures = source_signatures(locales_dir, source_lang, namespaces, markup)
+    langs = [lang for lang in (languages or list_languages(Path(locales_dir))) if lang != source_lang]
+    with span("check", languages=len(langs)):
+        workers = workers or os.cpu_count() or 1
+        if len(langs) >= PARALLEL_MIN_LANGUAGES and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(signatures,)) as pool:
+                futures = [pool.submit(check_language, str(locales_dir), lang, markup) for lang in langs]
+                return [f.result() for f in futures]
+        _init_worker(signatures)
+        return [check_language(str(locales_dir), lang, markup) for lang in langs]
+
+
+def print_tree_report(results: List[Dict[str, Any]], elapsed: float, show: int = DEFAULT_SHOW):
+    print("\n" + "=" * 60)
+    print("PLACEHOLDER INTEGRITY")
+    print("=" * 60)
+    leaves = sum(r["leaves"] for r in results)
+    bad = sum(len(r["mismatches"]) for r in results)
+    for r in results:
+        if not r["mismatches"] and not r["errors"]:
+            continue
+        print(f"{r['lang'].upper()}: {len(r['mismatches'])} mismatches")
+        for m in r["mismatches"][:show]:
+            if m.get("markup"):
+                detail = "tags differ"
+            else:
+                detail = ", ".join([f"missing {t}" for t in m["missing"]] + [f"extra {t}" for t in m["extra"]])
+            print(f"  {m['namespace']}:{m['key']}  {detail}")
+        if len(r["mismatches"]) > show:
+            print(f"  … {len(r['mismatches']) - show} more")
+        for e in r["errors"]:
+            print(f"  ❌ {e}")
+    print("-" * 60)
+    status = "❌" if bad else "✅"
+    print(f"{status} {bad:,} mismatches in {leaves:,} translated leaves across {len(results)} languages ({elapsed:.2f}s)")
+
+
+def run(args):
+    locales_dir = Path(args.locales_dir)
+    if not (locales_dir / args.source_lang).is_dir():
+        print(f"Source locale not found: {locales_dir / args.source_lang}", file=sys.stderr)
+        sys.exit(1)
+    start = time.perf_counter()
+    results = check_tree(locales_dir, args.source_lang, args.langs, args.namespaces, args.markup, args.workers)
+    print_tree_report(results, time.perf_counter() - start, args.show)
+    if args.output:
+        write_json(Path(args.output), {r["lang"]: {k: r[k] for k in ("leaves", "mismatches", "errors")} for r in results})
+        print(f"Report: {args.output}")
+    if any(r["mismatches"] or r["errors"] for r in results):
+        sys.exit(1)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Check every translation keeps its English placeholders")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    parser.add_argument("--langs", nargs="*", help="Languages to check (default: all)")
+    parser.add_argument("--namespaces", nargs="*", help="Only check these namespaces")
+    parser.add_argument("--markup", action="store_true", help="Also require the same tags (<b>, <1>, <br/>) as English")
+    parser.add_argument("--workers", type=int, help=f"Worker processes (default: CPU count; 1 = in-process; "
+                                                   f"in-process below {PARALLEL_MIN_LANGUAGES} languages)")
+    parser.add_argument("--show", type=int, default=DEFAULT_SHOW, help=f"Mismatches printed per language (default: {DEFAULT_SHOW})")
+    parser.add_argument("--output", help="Write every mismatch as JSON")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "i18n_validate"):
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Variant locales stored as a base locale plus a sparse override delta.
+
+Montenegrin (``me``) used to be a full copy of the tree.  It was translated
+again through Serbian (``LANGUAGE_OVERRIDES`` maps it to sr-Latn for the
+API), which doubled storage and API cost and let it drift from ``sr``.
+A variant is now registered in ``src/i18n/variants/variants.json``::
+
+    {"version": 1, "variants": {"me": {"base": "sr"}}}
+
+It stores only the leaves that differ from its base, in
+``src/i18n/variants/<variant>/<namespace>.json``.  The full locale is
+materialized (base deep-merged with the delta) at build time.
+i18n_bundles.py does this in memory; ``materialize`` writes it to disk for
+the dev server.  translate_locales.py skips registered variants, so only
+the delta is ever sent to the API (``translate``).
+
+    python3 scripts/i18n_variants.py extract me --base sr   # full copy -> delta
+    python3 scripts/i18n_variants.py status
+    python3 scripts/i18n_variants.py diff me
+    python3 scripts/i18n_variants.py translate me --backends google,cache
+    python3 scripts/i18n_variants.py materialize --out dist/locales-full
+"""
+import argparse
+import copy
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from i18n_io import write_json
+from i18n_locales import LocaleTree, dotted, flatten, is_marker, leaf_at, set_path
+from i18n_sizes import minify
+from i18n_tm import DEFAULT_TM_PATH, TranslationMemory
+from i18n_trace import add_profile_arguments, profiling, span
+from translate_locales import (
+    DEFAULT_LOCALES_DIR,
+    SOURCE_LANG,
+    find_project_id_from_credentials,
+    load_json,
+    protect_placeholders,
+    restore_placeholders,
+)
+
+DEFAULT_VARIANTS_DIR = Path("src/i18n/variants")
+REGISTRY_NAME = "variants.json"
+REGISTRY_VERSION = 1
+
+
+class Variant:
+    def __init__(self, name: str, base: str):
+        self.name = name
+        self.base = base
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"base": self.base}
+
+
+def load_registry(variants_dir: Path = DEFAULT_VARIANTS_DIR) -> Dict[str, Variant]:
+    path = Path(variants_dir) / REGISTRY_NAME
+    if not path.exists():
+        return {}
+    data = load_json(path)
+    return {name: Variant(name, spec["base"]) for name, spec in sorted(data.get("variants", {}).items())}
+
+
+def save_registry(variants_dir: Path, registry: Dict[str, Variant]) -> bool:
+    return write_json(Path(variants_dir) / REGISTRY_NAME, {
+        "version": REGISTRY_VERSION,
+        "variants": {name: v.to_json() for name, v in sorted(registry.items())},
+    })
+
+
+def load_delta(variants_dir: Path, name: str) -> Dict[str, Any]:
+    """``{namespace: sparse document}`` of one variant."""
+    lang_dir = Path(variants_dir) / name
+    return {p.stem: load_json(p) for p in sorted(lang_dir.glob("*.json"))} if lang_dir.is_dir() else {}
+
+
+def merge(base: Any, delta: Any) -> Any:
+    """``base`` with every leaf of ``delta`` laid over it (nested dicts merge, anything else replaces)."""
+    if not isinstance(base, dict) or not isinstance(delta, dict):
+        return copy.deepcopy(delta)
+    out = copy.deepcopy(base)
+    for key, value in delta.items():
+        out[key] = merge(out[key], value) if isinstance(out.get(key), dict) else copy.deepcopy(value)
+    return out
+
+
+def compute_delta(variant: Any, base: Any) -> Dict[str, Any]:
+    """Leaves of ``variant`` that its base lacks or has differently.
+
+    ``[TRANSLATE]`` markers are dropped, so the base's translation shows
+    through instead of the marker.
+    """
+    delta: Dict[str, Any] = {}
+    base_leaves = flatten(base) if isinstance(base, dict) else {}
+    for path, value in flatten(variant).items():
+        if is_marker(value) or (path in base_leaves and base_leaves[path] == value):
+            continue
+        set_path(delta, path, value)
+    return delta
+
+
+def materialize(base_docs: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Full documents of a variant: every base namespace, merged with the delta's."""
+    return {ns: merge(base_docs.get(ns, {}), delta.get(ns, {})) for ns in sorted(set(base_docs) | set(delta))}
+
+
+def materialize_tree(tree: LocaleTree, variants_dir: Path = DEFAULT_VARIANTS_DIR,
+                     names: Optional[List[str]] = None) -> List[str]:
+    """Add the resolved documents of registered variants to ``tree`` (in memory); returns their names."""
+    done = []
+    for name, variant in load_registry(variants_dir).items():
+        if names is not None and name not in names:
+            continue
+        base_docs = {ns: doc for (lang, ns), doc in tree.docs.items() if lang == variant.base}
+        if not base_docs:
+            print(f"[warn] Variant {name}: base locale {variant.base} is not loaded; skipping", file=sys.stderr)
+            continue
+        with span("materialize", lang=name):
+            docs = materialize(base_docs, load_delta(variants_dir, name))
+        for ns, doc in docs.items():
+            tree.docs[(name, ns)] = doc
+        done.append(name)
+    return done
+
+
+def delta_report(tree: LocaleTree, variant: Variant, delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Override counts, what the delta stores versus a full copy, and overrides needing attention."""
+    overrides = markers = 0
+    redundant: List[str] = []
+    orphaned: List[str] = []
+    for ns, doc in delta.items():
+        en = tree.get(tree.source_lang, ns)
+        base = tree.get(variant.base, ns)
+        for path, value in flatten(doc).items():
+            overrides += 1
+            ref = f"{ns}:{dotted(path)}"
+            if is_marker(value):
+                markers += 1
+            elif leaf_at(base, path) == value:
+                redundant.append(ref)
+            if leaf_at(en, path) is None:
+                orphaned.append(ref)
+    base_docs = {ns: doc for (lang, ns), doc in tree.docs.items() if lang == variant.base}
+    full = materialize(base_docs, delta)
+    full_bytes = sum(len(minify(doc)) for doc in full.values())
+    delta_bytes = sum(len(minify(doc)) for doc in delta.values())
+    return {
+        "base": variant.base,
+        "leaves": sum(len(flatten(doc)) for doc in full.values()),
+        "overrides": overrides,
+        "pending_translation": markers,
+        "redundant": redundant,
+        "orphaned": orphaned,
+        "delta_bytes": delta_bytes,
+        "full_bytes": full_bytes,
+    }
+
+
+# -- subcommands ---------------------------------------------------------------
+
+
+def extract(args):
+    locales_dir = Path(args.locales_dir)
+    variants_dir = Path(args.variants_dir)
+    tree = LocaleTree.load(locales_dir, args.source_lang, languages=[args.base, args.variant])
+    variant_docs = {ns: doc for (lang, ns), doc in tree.docs.items() if lang == args.variant}
+    if not variant_docs:
+        print(f"No locale files for {args.variant} in {locales_dir}", file=sys.stderr)
+        sys.exit(1)
+    if args.base not in tree.languages:
+        print(f"No locale files for base {args.base} in {locales_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    delta = {}
+    for ns, doc in variant_docs.items():
+        ns_delta = compute_delta(doc, tree.get(args.base, ns))
+        if ns_delta:
+            delta[ns] = ns_delta
+    # Round trip: base + delta must reproduce the variant, markers aside
+    base_docs = {ns: doc for (lang, ns), doc in tree.docs.items() if lang == args.base}
+    rebuilt = materialize(base_docs, delta)
+    for ns, doc in variant_docs.items():
+        for path, value in flatten(doc).items():
+            if not is_marker(value) and leaf_at(rebuilt.get(ns), path) != value:
+                print(f"Delta for {args.variant} does not reproduce {ns}:{dotted(path)}", file=sys.stderr)
+                sys.exit(1)
+
+    out_dir = variants_dir / args.variant
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    for ns, doc in delta.items():
+        write_json(out_dir / f"{ns}.json", doc)
+    registry = load_registry(variants_dir)
+    registry[args.variant] = Variant(args.variant, args.base)
+    save_registry(variants_dir, registry)
+
+    full_leaves = sum(len(flatten(doc)) for doc in variant_docs.values())
+    full_bytes = sum(len(minify(doc)) for doc in variant_docs.values())
+    delta_leaves = sum(len(flatten(doc)) for doc in delta.values())
+    delta_bytes = sum(len(minify(doc)) for doc in delta.values())
+    print(f"✅ {args.variant} = {args.base} + {delta_leaves:,} overrides in {len(delta)} namespaces "
+          f"({delta_leaves:,} of {full_leaves:,} leaves, {delta_bytes / 1024:,.1f} of {full_bytes / 1024:,.1f} KB)")
+    print(f"   Delta: {out_dir}")
+    if args.remove_full:
+        shutil.rmtree(locales_dir / args.variant)
+        print(f"   Removed the full copy in {locales_dir / args.variant}")
+    else:
+        print(f"   The full copy in {locales_dir / args.variant} is kept; re-run with --remove-full to drop it")
+
+
+def status(args):
+    registry = load_registry(Path(args.variants_dir))
+    if not registry:
+        print(f"No variants registered in {Path(args.variants_dir) / REGISTRY_NAME}")
+        return
+    tree = LocaleTree.load(Path(args.locales_dir), args.source_lang,
+                           languages=sorted({v.base for v in registry.values()}))
+    print("\n" + "=" * 60)
+    print("VARIANT LOCALES")
+    print("=" * 60)
+    print(f"{'Variant':<8} {'Base':<6} {'Overrides':>9} {'Pending':>8} {'Redund.':>8} {'Orphan':>7} {'Stored':>14}")
+    problems = 0
+    for name, variant in registry.items():
+        report = delta_report(tree, variant, load_delta(Path(args.variants_dir), name))
+        share = report["delta_bytes"] / report["full_bytes"] if report["full_bytes"] else 0.0
+        print(f"{name:<8} {variant.base:<6} {report['overrides']:>9,} {report['pending_translation']:>8,} "
+              f"{len(report['redundant']):>8,} {len(report['orphaned']):>7,} "
+              f"{report['delta_bytes'] / 1024:>7,.1f} KB {share:>4.0%}")
+        problems += len(report["redundant"]) + len(report["orphaned"])
+        for label, refs in (("same as base", report["redundant"]), ("not in English", report["orphaned"])):
+            if refs:
+                print(f"  {label}: {', '.join(refs[:5])}{' …' if len(refs) > 5 else ''}")
+    if problems:
+        print("\n⚠️  Redundant and orphaned overrides can be dropped (re-run extract on a materialized copy)")
+
+
+def diff(args):
+    registry = load_registry(Path(args.variants_dir))
+    if args.variant not in registry:
+        print(f"{args.variant} is not a registered variant", file=sys.stderr)
+        sys.exit(2)
+    variant = registry[args.variant]
+    tree = LocaleTree.load(Path(args.locales_dir), args.source_lang, languages=[variant.base])
+    for ns, doc in load_delta(Path(args.variants_dir), args.variant).items():
+        for path, value in flatten(doc).items():
+            base = leaf_at(tree.get(variant.base, ns), path)
+            print(f"{ns}:{dotted(path)}\n  {variant.base}: {base!r}\n  {args.variant}: {value!r}")
+
+
+def translate(args):
+    variants_dir = Path(args.variants_dir)
+    registry = load_registry(variants_dir)
+    if args.variant not in registry:
+        print(f"{args.variant} is not a registered variant", file=sys.stderr)
+        sys.exit(2)
+    tree = LocaleTree.load(Path(args.locales_dir), args.source_lang, languages=[args.source_lang])
+    delta = load_delta(variants_dir, args.variant)
+
+    # Only [TRANSLATE] leaves of the delta are sent; everything else comes from the base
+    todo = []
+    for ns, doc in delta.items():
+        for path, value in flatten(doc).items():
+            if not is_marker(value):
+                continue
+            source = leaf_at(tree.get(tree.source_lang, ns), path)
+            if isinstance(source, str):
+                todo.append((ns, path, *protect_placeholders(source)))
+            else:
+                print(f"[warn] {args.variant}:{ns}:{dotted(path)} has no English source; left as a marker", file=sys.stderr)
+    if not todo:
+        print(f"✅ No pending overrides in {args.variant}")
+        return
+
+    from i18n_backends import build_chain, parse_backends
+
+    names = parse_backends(args.backends)
+    project_id = None
+    if "google" in names:
+        creds = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+        if not creds:
+            print("GOOGLE_APPLICATION_CREDENTIALS is not set. Please export it to your JSON key path.", file=sys.stderr)
+            sys.exit(1)
+        project_id = find_project_id_from_credentials(Path(creds))
+    with TranslationMemory(Path(args.tm)) as tm:
+        chain = build_chain(names, project_id, tm=tm)
+        try:
+            # The API language comes from LANGUAGE_OVERRIDES (me -> sr-Latn)
+            results = chain([tmp for _ns, _path, tmp, _repls in todo], args.variant)
+        finally:
+            chain.close()
+        pairs = []
+        for (ns, path, tmp, repls), result in zip(todo, results):
+            text = restore_placeholders(result, repls)
+            set_path(delta[ns], path, text)
+            if not is_marker(text):
+                pairs.append((restore_placeholders(tmp, repls), text))
+        tm.store(args.variant, pairs)
+    for ns, doc in delta.items():
+        write_json(variants_dir / args.variant / f"{ns}.json", doc)
+    chain.print_summary()
+    print(f"✅ Translated {len(pairs):,} of {len(todo):,} pending overrides in {args.variant}")
+
+
+def materialize_cmd(args):
+    locales_dir = Path(args.locales_dir)
+    out_dir = Path(args.out) if args.out else locales_dir
+    tree = LocaleTree.load(locales_dir, args.source_lang)
+    done = materialize_tree(tree, Path(args.variants_dir), args.variants or None)
+    # A separate output root is a full build, so it also receives the other languages
+    written = 0
+    for (lang, ns), doc in sorted(tree.docs.items()):
+        if (lang in done or out_dir != locales_dir) and write_json(out_dir / lang / f"{ns}.json", doc):
+            written += 1
+    print(f"✅ Materialized {', '.join(done) or 'no variants'} into {out_dir} ({written} files written)")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Variant locales as a base locale plus an override delta")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    parser.add_argument("--variants-dir", default=str(DEFAULT_VARIANTS_DIR), help="Variant registry and deltas (default: src/i18n/variants)")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_extract = sub.add_parser("extract", help="Turn a full locale copy into a delta over its base")
+    p_extract.add_argument("variant", help="Variant language code (e.g. me)")
+    p_extract.add_argument("--base", required=True, help="Base language code (e.g. sr)")
+    p_extract.add_argument("--remove-full", action="store_true", help="Delete the full copy from the locales directory")
+    p_extract.set_defaults(func=extract)
+
+    p_status = sub.add_parser("status", help="Overrides, pending translations and storage per variant")
+    p_status.set_defaults(func=status)
+
+    p_diff = sub.add_parser("diff", help="Every override next to the base value it replaces")
+    p_diff.add_argument("variant", help="Variant language code")
+    p_diff.set_defaults(func=diff)
+
+    p_translate = sub.add_parser("translate", help="Translate the [TRANSLATE] leaves of a delta")
+    p_translate.add_argument("variant", help="Variant language code")
+    p_translate.add_argument("--backends", default="google", help="Fallback chain (see i18n_backends.py)")
+    p_translate.add_argument("--tm", default=str(DEFAULT_TM_PATH), help="Translation memory consulted and updated")
+    p_translate.set_defaults(func=translate)
+
+    p_mat = sub.add_parser("materialize", help="Write the fully resolved variant locales")
+    p_mat.add_argument("variants", nargs="*", help="Variants to materialize (default: all registered)")
+    p_mat.add_argument("--out", help="Output root; also receives every other language (default: the locales directory)")
+    p_mat.set_defaults(func=materialize_cmd)
+
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "i18n_variants"):
+        args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""Watch the English locale files and translate new keys within seconds.
+
+Adding a key used to mean running i18n_sync.py (which inserts a
+``[TRANSLATE]`` marker) and, later, a full translation run.  This watcher
+polls ``src/i18n/locales/en/*.json`` (mtime and size, every ``--interval``
+seconds) and waits until a file has been quiet for ``--debounce`` seconds,
+so an editor's save is only picked up once.  It then diffs the namespace
+leaf by leaf against the previous English content hashes:
+
+* added or changed string leaves are translated into every target language,
+  through the translation memory first and the ``--backends`` chain for the
+  rest (one request per language, languages in parallel);
+* an added leaf whose English text matches a leaf removed in the same save
+  is a move, and its existing translation is carried over;
+* removed leaves are deleted, and non-string leaves are copied as they are.
+
+Translations are checked like translate_locales.py does (i18n_validate.py):
+a leaf that still fails after the alternate masking styles is written as a
+``[TRANSLATE]`` marker and queued for ``translate_locales.py
+--retry-failed``.  Each affected target file is rewritten once, atomically.
+The English hashes are saved to i18n_sync.py's state after each change, so
+``--catch-up`` (and ``--once``) first handle edits made while the watcher
+was not running.  Variant locales (i18n_variants.py) are skipped.
+
+    python3 scripts/i18n_watch.py --backends google,cache
+    python3 scripts/i18n_watch.py --once --backends google,cache   # catch up and exit
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from i18n_io import write_json
+from i18n_locales import KeyPath, delete_path, flatten, is_marker, leaf_at, list_languages, set_path
+from i18n_sync import DEFAULT_STATE_PATH, content_hash, load_state, save_state
+from i18n_tm import DEFAULT_TM_PATH, TranslationMemory
+from i18n_trace import add_profile_arguments, profiling, span
+from i18n_validate import DEFAULT_QUEUE_PATH, MASK_STYLES, RetryItem, RetryQueue, Validator, marker_for, retry_strings
+from translate_locales import DEFAULT_LOCALES_DIR, SOURCE_LANG, find_project_id_from_credentials, load_json
+
+DEFAULT_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 0.3
+
+# namespace -> (mtime_ns, size) of the English file
+Stamps = Dict[str, Tuple[int, int]]
+# key path -> content hash of the English value
+LeafHashes = Dict[KeyPath, str]
+
+
+def file_stamps(source_dir: Path) -> Stamps:
+    stamps: Stamps = {}
+    try:
+        entries = list(os.scandir(source_dir))
+    except FileNotFoundError:
+        return stamps
+    for entry in entries:
+        if entry.name.endswith(".json") and entry.is_file():
+            st = entry.stat()
+            stamps[entry.name[:-len(".json")]] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+def leaf_hashes(data: Any) -> LeafHashes:
+    return {path: content_hash(value) for path, value in flatten(data).items()}
+
+
+class SourceChange:
+    """Leaf-level diff of one English namespace against the previous save."""
+
+    def __init__(self, namespace: str, data: Dict[str, Any], created: bool = False):
+        self.namespace = namespace
+        self.data = data
+        self.created = created
+        self.added: List[KeyPath] = []
+        self.changed: List[KeyPath] = []
+        # removed path -> its previous English hash (to recognize moves)
+        self.removed: Dict[KeyPath, str] = {}
+        # added path -> (namespace, path) it moved from
+        self.moved: Dict[KeyPath, Tuple[str, KeyPath]] = {}
+        self.hashes: LeafHashes = {}
+
+    @property
+    def empty(self) -> bool:
+        return not (self.created or self.added or self.changed or self.removed)
+
+    def value(self, path: KeyPath) -> Any:
+        return leaf_at(self.data, path)
+
+    def summary(self) -> str:
+        parts = [f"+{len(self.added)}", f"~{len(self.changed)}", f"-{len(self.removed)}"]
+        if self.moved:
+            parts.append(f"{len(self.moved)} moved")
+        return f"{self.namespace}{' (new)' if self.created else ''}: {' '.join(parts)}"
+
+
+def diff_source(namespace: str, old: Optional[LeafHashes], data: Dict[str, Any]) -> SourceChange:
+    change = SourceChange(namespace, data, created=old is None)
+    old = old or {}
+    change.hashes = leaf_hashes(data)
+    for path, h in change.hashes.items():
+        before = old.get(path)
+        if before is None:
+            change.added.append(path)
+        elif before != h:
+            change.changed.append(path)
+    change.removed = {path: h for path, h in old.items() if path not in change.hashes}
+    return change
+
+
+def match_moves(changes: List[SourceChange]):
+    """Pair added leaves with removed leaves of the same English text, across the changed namespaces."""
+    pool: Dict[str, List[Tuple[str, KeyPath]]] = {}
+    for change in changes:
+        for path, h in change.removed.items():
+            pool.setdefault(h, []).append((change.namespace, path))
+    if not pool:
+        return
+    for change in changes:
+        for path in change.added:
+            candidates = pool.get(change.hashes[path])
+            if candidates:
+                # Prefer the same leaf name, then the same namespace
+                change.moved[path] = min(candidates, key=lambda c: (c[1][-1] != path[-1], c[0] != change.namespace, c))
+
+
+class LanguageResult:
+    def __init__(self, lang: str):
+        self.lang = lang
+        self.files = 0
+        self.from_tm = 0
+        self.translated = 0
+        self.carried = 0
+        self.failed: List[RetryItem] = []
+        self.skipped: List[str] = []
+        self.error: Optional[str] = None
+
+
+class Watcher:
+    def __init__(self, locales_dir: Path, translate_fn: Any, source_lang: str = SOURCE_LANG,
+                 tm: Optional[TranslationMemory] = None, validator: Optional[Validator] = None,
+                 retry: Optional[RetryQueue] = None, languages: Optional[List[str]] = None,
+                 exclude: Optional[Set[str]] = None, workers: int = 4,
+                 state_path: Optional[Path] = DEFAULT_STATE_PATH, dry_run: bool = False):
+        self.locales_dir = Path(locales_dir)
+        self.source_dir = self.locales_dir / source_lang
+        self.source_lang = source_lang
+        self.translate_fn = translate_fn
+        self.tm = tm
+        self.validator = validator or Validator()
+        self.retry = retry
+        self.languages = languages
+        self.exclude = exclude or set()
+        self.workers = workers
+        self.state_path = state_path
+        self.dry_run = dry_run
+        self.stamps: Stamps = {}
+        self.baseline: Dict[str, LeafHashes] = {}
+
+    def target_languages(self) -> List[str]:
+        # Listed on every change, so a language added while watching is picked up
+        langs = self.languages or list_languages(self.locales_dir)
+        return [lang for lang in langs if lang != self.source_lang and lang not in self.exclude]
+
+    def start(self, catch_up: bool = False) -> Set[str]:
+        """Record the current English tree; returns the namespaces that changed since the saved state."""
+        self.stamps = file_stamps(self.source_dir)
+        pending: Set[str] = set()
+        state: Dict[str, LeafHashes] = {}
+        if catch_up and self.state_path is not None:
+            for (ns, path), h in load_state(self.state_path).items():
+                state.setdefault(ns, {})[path] = h
+            if not state:
+                print(f"[warn] No saved English state in {self.state_path}; nothing to catch up", file=sys.stderr)
+        for ns in sorted(self.stamps):
+            try:
+                current = leaf_hashes(load_json(self.source_dir / f"{ns}.json"))
+            except ValueError as e:
+                print(f"[warn] Cannot read {self.source_dir / ns}.json: {e}", file=sys.stderr)
+                continue
+            # Namespaces the state does not know are taken as they are now
+            self.baseline[ns] = state.get(ns, current)
+            if self.baseline[ns] != current:
+                pending.add(ns)
+        return pending
+
+    def poll(self) -> Set[str]:
+        stamps = file_stamps(self.source_dir)
+        changed = {ns for ns in stamps.keys() | self.stamps.keys() if stamps.get(ns) != self.stamps.get(ns)}
+        self.stamps = stamps
+        return changed
+
+    def wait(self, interval: float = DEFAULT_INTERVAL, debounce: float = DEFAULT_DEBOUNCE) -> Set[str]:
+        """Block until some English files changed and then stayed untouched for ``debounce`` seconds."""
+        pending: Set[str] = set()
+        last = 0.0
+        while True:
+            changed = self.poll()
+            now = time.monotonic()
+            if changed:
+                pending |= changed
+                last = now
+            elif pending and now - last >= debounce:
+                return pending
+            time.sleep(min(interval, debounce) if pending else interval)
+
+    def collect(self, namespaces: Set[str]) -> List[SourceChange]:
+        changes = []
+        for ns in sorted(namespaces):
+            path = self.source_dir / f"{ns}.json"
+            if not path.exists():
+                if self.baseline.pop(ns, None) is not None:
+                    print(f"[warn] {path} was deleted; run i18n_sync.py to remove it from the other languages",
+                          file=sys.stderr)
+                continue
+            try:
+                data = load_json(path)
+            except ValueError as e:
+                # Usually a save in progress; the next save changes the stamp again
+                print(f"[warn] Skipping {path} until it parses: {e}", file=sys.stderr)
+                continue
+            if not isinstance(data, dict):
+                print(f"[warn] Skipping {path}: not a JSON object", file=sys.stderr)
+                continue
+            change = diff_source(ns, self.baseline.get(ns), data)
+            if change.empty:
+                continue
+            changes.append(change)
+        match_moves(changes)
+        return changes
+
+    def _translate(self, lang: str, sources: List[str],
+                   result: LanguageResult) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+        """Translations for ``sources`` and the validation issues of those that kept failing."""
+        known = self.tm.lookup(lang, sources) if self.tm is not None else {}
+        result.from_tm = len(known)
+        failed: Dict[str, List[str]] = {}
+        todo = [s for s in sources if s not in known]
+        if not todo:
+            return known, failed
+        texts, issues = retry_strings(todo, self.translate_fn, lang, self.validator, styles=MASK_STYLES)
+        learned = []
+        for source, text, found in zip(todo, texts, issues):
+            if text is None:
+                known[source] = marker_for(source)
+                failed[source] = found
+            else:
+                known[source] = text
+                learned.append((source, text))
+        result.translated = len(learned)
+        if self.tm is not None and learned and not self.dry_run:
+            self.tm.store(lang, learned)
+        return known, failed
+
+    def apply_language(self, lang: str, changes: List[SourceChange]) -> LanguageResult:
+        """Translate the changed leaves into ``lang`` and rewrite each affected file once."""
+        result = LanguageResult(lang)
+        docs: Dict[str, Dict[str, Any]] = {}
+        for change in changes:
+            path = self.locales_dir / lang / f"{change.namespace}.json"
+            if path.exists():
+                try:
+                    docs[change.namespace] = load_json(path)
+                except ValueError as e:
+                    result.skipped.append(f"{path}: {e}")
+            elif change.created:
+                docs[change.namespace] = {}
+            else:
+                result.skipped.append(f"{path}: missing (run i18n_sync.py)")
+
+        carried: Dict[Tuple[str, KeyPath], Any] = {}
+        sources: Dict[str, None] = {}
+        for change in changes:
+            if change.namespace not in docs:
+                continue
+            for path in change.added + change.changed:
+                source = change.value(path)
+                old = change.moved.get(path)
+                value = leaf_at(docs[old[0]], old[1]) if old and old[0] in docs else None
+                if value is not None and not is_marker(value):
+                    carried[(change.namespace, path)] = value
+                elif isinstance(source, str) and not is_marker(source):
+                    sources[source] = None
+
+        translations: Dict[str, str] = {}
+        failed: Dict[str, List[str]] = {}
+        if sources:
+            with span("translate", lang=lang, strings=len(sources)):
+                translations, failed = self._translate(lang, list(sources), result)
+        result.carried = len(carried)
+
+        for change in changes:
+            doc = docs.get(change.namespace)
+            if doc is None:
+                continue
+            out_path = self.locales_dir / lang / f"{change.namespace}.json"
+            # Removals first: a leaf replacing a former subtree (or vice versa) then lands cleanly
+            for path in change.removed:
+                delete_path(doc, path)
+            for path in change.added + change.changed:
+                source = change.value(path)
+                value = carried.get((change.namespace, path))
+                if value is None:
+                    value = translations.get(source, source) if isinstance(source, str) else source
+                    if source in failed:
+                        result.failed.append(RetryItem(self.source_dir / f"{change.namespace}.json", out_path,
+                                                       lang, path, source, failed[source]))
+                set_path(doc, path, value)
+            if not self.dry_run and write_json(out_path, doc):
+                result.files += 1
+        return result
+
+    def apply(self, changes: List[SourceChange]) -> List[LanguageResult]:
+        langs = self.target_languages()
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            futures = {lang: pool.submit(self.apply_language, lang, changes) for lang in langs}
+            results = []
+            for lang, future in futures.items():
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    result = LanguageResult(lang)
+                    result.error = str(e)
+                    results.append(result)
+
+        for change in changes:
+            self.baseline[change.namespace] = change.hashes
+        if self.retry is not None:
+            for result in results:
+                for item in result.failed:
+                    self.retry.add(item)
+            if not self.dry_run:
+                self.retry.save()
+        if self.state_path is not None and not self.dry_run:
+            hashes = {(c.namespace, path): h for c in changes for path, h in c.hashes.items()}
+            save_state(self.state_path, hashes, [c.namespace for c in changes], partial=True)
+        return results
+
+    def process(self, namespaces: Set[str]) -> bool:
+        """Diff, translate and write one batch of changed namespaces; False if nothing changed."""
+        start = time.perf_counter()
+        changes = self.collect(namespaces)
+        if not changes:
+            return False
+        results = self.apply(changes)
+        print_cycle(changes, results, time.perf_counter() - start, self.dry_run)
+        return True
+
+    def run(self, interval: float = DEFAULT_INTERVAL, debounce: float = DEFAULT_DEBOUNCE,
+            catch_up: bool = False, once: bool = False):
+        pending = self.start(catch_up or once)
+        if pending:
+            print(f"Catching up on {len(pending)} namespaces changed since the last sync")
+            self.process(pending)
+        if once:
+            return
+        print(f"Watching {self.source_dir} ({len(self.stamps)} namespaces, "
+              f"{len(self.target_languages())} languages); Ctrl-C to stop")
+        while True:
+            self.process(self.wait(interval, debounce))
+
+
+def print_cycle(changes: List[SourceChange], results: List[LanguageResult], seconds: float, dry_run: bool):
+    stamp = time.strftime("%H:%M:%S")
+    print(f"[{stamp}] {', '.join(c.summary() for c in changes)}")
+    files = sum(r.files for r in results)
+    translated = sum(r.translated for r in results)
+    from_tm = sum(r.from_tm for r in results)
+    carried = sum(r.carried for r in results)
+    failed = sum(len(r.failed) for r in results)
+    written = "would write" if dry_run else "wrote"
+    print(f"   {len(results)} languages: {translated} translated, {from_tm} from memory, {carried} carried over; "
+          f"{written} {files} files in {seconds:.2f}s")
+    if failed:
+        print(f"   ⚠️  {failed} leaves failed validation and were queued as [TRANSLATE] markers")
+    for r in results:
+        if r.error:
+            print(f"   ❌ {r.lang}: {r.error}")
+        for skipped in r.skipped:
+            print(f"   ⚠️  {r.lang}: skipped {skipped}")
+
+
+def run(args):
+    locales_dir = Path(args.locales_dir)
+    if not (locales_dir / args.source_lang).is_dir():
+        print(f"Source locale directory not found: {locales_dir / args.source_lang}", file=sys.stderr)
+        sys.exit(1)
+
+    from i18n_backends import build_chain, parse_backends
+    from i18n_variants import load_registry
+
+    try:
+        names = parse_backends(args.backends)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(2)
+    project_id = None
+    if "google" in names:
+        creds = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+        if not creds:
+            print("GOOGLE_APPLICATION_CREDENTIALS is not set. Please export it to your JSON key path.", file=sys.stderr)
+            sys.exit(1)
+        project_id = find_project_id_from_credentials(Path(creds))
+
+    tm = None if args.no_cache else TranslationMemory(Path(args.tm))
+    chain = build_chain(names, project_id, location=args.location, tm=tm,
+                        timeout=args.request_timeout, workers=args.workers)
+    # Variant locales (me = sr + overrides) get their delta from i18n_variants.py translate
+    variants = set(load_registry(Path(args.variants_dir)))
+    watcher = Watcher(locales_dir, chain, args.source_lang, tm=tm, retry=RetryQueue.load(Path(args.retry_queue)),
+                      languages=args.langs, exclude=variants, workers=args.workers,
+                      state_path=None if args.no_state else Path(args.state), dry_run=args.dry_run)
+    try:
+        watcher.run(args.interval, args.debounce, catch_up=args.catch_up, once=args.once)
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        chain.close()
+        if tm is not None:
+            tm.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Translate new and changed English keys as they are saved")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    parser.add_argument("--langs", nargs="*", help="Target languages (default: every language directory)")
+    parser.add_argument("--backends", default="google", help="Fallback chain, e.g. google,cache (see i18n_backends.py)")
+    parser.add_argument("--location", default="global", help="Translation location (e.g., global or us-central1)")
+    parser.add_argument("--request-timeout", type=float, help="Seconds per request before falling back to the next backend")
+    parser.add_argument("--workers", type=int, default=8, help="Languages translated and written concurrently (default: 8)")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help=f"Seconds between polls (default: {DEFAULT_INTERVAL})")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help=f"Quiet seconds after the last save before translating (default: {DEFAULT_DEBOUNCE})")
+    parser.add_argument("--catch-up", action="store_true", help="First handle English edits made since the saved sync state")
+    parser.add_argument("--once", action="store_true", help="Catch up and exit instead of watching")
+    parser.add_argument("--dry-run", action="store_true", help="Translate and report but do not write files")
+    parser.add_argument("--tm", default=str(DEFAULT_TM_PATH), help="Translation memory consulted before calling the API")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or update the translation memory")
+    parser.add_argument("--state", default=str(DEFAULT_STATE_PATH), help="English content hashes shared with i18n_sync.py")
+    parser.add_argument("--no-state", action="store_true", help="Do not read or update the sync state")
+    parser.add_argument("--retry-queue", default=str(DEFAULT_QUEUE_PATH), help="Leaves that failed validation and await a retry")
+    parser.add_argument("--variants-dir", default="src/i18n/variants", help="Variant locale registry; registered variants are skipped")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "i18n_watch"):
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
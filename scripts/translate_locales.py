@@ -6,7 +6,12 @@ import re
 import sys
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from i18n_io import write_json
+from i18n_metrics import RunMetrics, default_metrics_path
+from i18n_tm import DEFAULT_TM_PATH, TranslationMemory
+from i18n_trace import add_profile_arguments, profiling
 
 # Constants
 DEFAULT_LOCALES_DIR = Path("src/i18n/locales")
@@ -55,12 +60,12 @@ def iter_json_leaves(obj: Any, path: Tuple[str, ...] = ()):
             yield path, obj
 
 
-def protect_placeholders(text: str) -> Tuple[str, Dict[str, str]]:
+def protect_placeholders(text: str, token_format: str = "__PH_{}__") -> Tuple[str, Dict[str, str]]:
     replacements: Dict[str, str] = {}
     idx = 0
     def repl(m):
         nonlocal idx
-        token = f"__PH_{idx}__"
+        token = token_format.format(idx)
         replacements[token] = m.group(0)
         idx += 1
         return token
@@ -107,16 +112,19 @@ def normalize_lang(code: str) -> str:
     return LANGUAGE_OVERRIDES.get(code, code)
 
 
-def translate_batch(strings: List[str], target_language_code: str, project_id: str, location: str = "global") -> List[str]:
+def translate_batch(strings: List[str], target_language_code: str, project_id: str, location: str = "global",
+                    on_retry=None, timeout: Optional[float] = None, attempts: int = 3) -> List[str]:
     # Lazy import to avoid dependency in map-only runs
     from google.cloud import translate
     from google.api_core import exceptions as gax_exceptions
 
     client = translate.TranslationServiceClient()
     parent = f"projects/{project_id}/locations/{location}"
+    # Without an explicit timeout the client's default deadline applies
+    call_kwargs = {"timeout": timeout} if timeout is not None else {}
 
-    # Retry up to 3 times with exponential backoff on transient errors
-    attempts = 0
+    # Retry up to ``attempts`` times with exponential backoff on transient errors
+    tries = 0
     while True:
         try:
             response = client.translate_text(
@@ -126,14 +134,17 @@ def translate_batch(strings: List[str], target_language_code: str, project_id: s
                     "mime_type": "text/plain",
                     "source_language_code": "en",
                     "target_language_code": normalize_lang(target_language_code),
-                }
+                },
+                **call_kwargs,
             )
             return [t.translated_text for t in response.translations]
         except (gax_exceptions.ServiceUnavailable, gax_exceptions.DeadlineExceeded) as e:
-            attempts += 1
-            if attempts >= 3:
+            tries += 1
+            if tries >= attempts:
                 raise
-            sleep_s = 2 ** attempts
+            sleep_s = 2 ** tries
+            if on_retry is not None:
+                on_retry()
             print(f"Transient error translating to {target_language_code}: {e}; retrying in {sleep_s}s...", file=sys.stderr)
             time.sleep(sleep_s)
 
@@ -145,31 +156,22 @@ def load_json(path: Path) -> Any:
         raise RuntimeError(f"Invalid JSON in {path}: {e}")
 
 
-def save_json(path: Path, data: Any):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    # Do not sort keys to avoid issues when mixed numeric-like keys appear
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+def save_json(path: Path, data: Any) -> bool:
+    # Atomic, and skipped when the file already holds identical output
+    return write_json(path, data)
 
 
-def apply_translations(src_data: Any, translate_fn, target_lang: str) -> Any:
-    # Gather strings preserving traversal order
-    leaves: List[Tuple[Tuple[str, ...], str]] = list(iter_json_leaves(src_data))
+def mask_leaves(src_data: Any) -> List[Tuple[Tuple[str, ...], str, Dict[str, str]]]:
+    """Extract string leaves in traversal order with placeholders protected."""
     protected: List[Tuple[Tuple[str, ...], str, Dict[str, str]]] = []
-    contents: List[str] = []
-
-    for path, text in leaves:
+    for path, text in iter_json_leaves(src_data):
         tmp, repls = protect_placeholders(text)
         protected.append((path, tmp, repls))
-        contents.append(tmp)
+    return protected
 
-    # Translate in chunks
-    translated: List[str] = []
-    BATCH = 200
-    for i in range(0, len(contents), BATCH):
-        chunk = contents[i:i+BATCH]
-        translated.extend(translate_fn(chunk, target_lang))
 
-    # Rebuild structure
+def rebuild_translations(src_data: Any, protected: List[Tuple[Tuple[str, ...], str, Dict[str, str]]],
+                         translated: List[str]) -> Any:
     out = json.loads(json.dumps(src_data))  # deep copy via JSON
     for (path, _tmp, repls), t in zip(protected, translated):
         t_final = restore_placeholders(t, repls)
@@ -188,18 +190,36 @@ def apply_translations(src_data: Any, translate_fn, target_lang: str) -> Any:
     return out
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Batch translate i18n JSON files using Google Cloud Translation API (v3)")
-    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
-    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
-    parser.add_argument("--target-langs", nargs="*", help="Explicit list of target language codes (overrides auto-detect)")
-    parser.add_argument("--location", default="global", help="Translation location (e.g., global or us-central1)")
-    parser.add_argument("--map-only", action="store_true", help="Only print the export mapping without translating")
-    parser.add_argument("--dry-run", action="store_true", help="Translate but do not write files; just report actions")
-    parser.add_argument("--continue-on-error", action="store_true", help="Skip languages/files that fail and continue processing others")
-    parser.add_argument("--include-files", nargs="*", help="Only process source JSON basenames (e.g., ui-components.json)")
-    args = parser.parse_args()
+BATCH_SIZE = 200
+
+
+def apply_translations(src_data: Any, translate_fn, target_lang: str, validate: bool = True) -> Any:
+    protected = mask_leaves(src_data)
+    contents = [tmp for _path, tmp, _repls in protected]
+
+    # Translate in chunks
+    translated: List[str] = []
+    for i in range(0, len(contents), BATCH_SIZE):
+        chunk = contents[i:i+BATCH_SIZE]
+        translated.extend(translate_fn(chunk, target_lang))
+
+    if validate:
+        from i18n_validate import Validator, marker_for, retry_strings
 
+        # Re-send only the leaves whose placeholders, markup or length look wrong
+        validator = Validator()
+        sources = [restore_placeholders(tmp, repls) for _path, tmp, repls in protected]
+        failing = [i for i, (t, (_p, _tmp, repls)) in enumerate(zip(translated, protected))
+                   if validator.check(sources[i], restore_placeholders(t, repls))]
+        if failing:
+            retried, _issues = retry_strings([sources[i] for i in failing], translate_fn, target_lang, validator)
+            for i, text in zip(failing, retried):
+                translated[i] = text if text is not None else marker_for(sources[i])
+
+    return rebuild_translations(src_data, protected, translated)
+
+
+def run(args):
     locales_dir = Path(args.locales_dir)
     if not locales_dir.exists():
         print(f"Locales directory not found: {locales_dir}", file=sys.stderr)
@@ -219,42 +239,212 @@ def main():
         pretty_print_map(mapping)
         return
 
-    creds = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
-    if not creds:
-        print("GOOGLE_APPLICATION_CREDENTIALS is not set. Please export it to your JSON key path.", file=sys.stderr)
-        sys.exit(1)
-
-    project_id = find_project_id_from_credentials(Path(creds))
-
     # Determine target languages
     if args.target_langs:
         targets = args.target_langs
     else:
         targets = list_target_languages(locales_dir, args.source_lang)
 
-    # Process each source file
-    for src_path_str, per_lang in mapping.items():
-        src_path = Path(src_path_str)
-        src_data = load_json(src_path)
+    # The i18n_* modules below import this one, so they are imported locally
+    from i18n_pipeline import Pipeline, build_units
+    from i18n_variants import load_registry
+
+    # Variant locales (me = sr + overrides) are resolved at build time; only their delta is translated
+    variants = [lang for lang in targets if lang in load_registry(Path(args.variants_dir))]
+    if variants:
+        print(f"Skipping variant locale(s) {', '.join(variants)}: translate their delta with i18n_variants.py translate")
+        targets = [lang for lang in targets if lang not in variants]
+
+    key_filter = None
+    usage_index = None
+    if args.only_used or args.schedule or args.deadline:
+        from i18n_usage import load_index
+        usage_index = load_index(Path(args.src_dir), Path(args.usage_index))
+    if args.only_used:
+        key_filter = usage_index.scope().is_used
+
+    units = build_units(mapping, targets)
+    if args.schedule or args.deadline:
+        from i18n_markets import load_language_weights
+        from i18n_schedule import parse_weights, print_schedule, schedule_units
+
+        weights = load_language_weights(Path(args.markets))
+        if not weights:
+            print(f"[warn] No market weights from {args.markets}; scheduling by usage and staleness only", file=sys.stderr)
+        units, rows = schedule_units(units, weights, usage_index.namespace_counts(),
+                                     parse_weights(args.priority_weights),
+                                     by_value_density=bool(args.deadline), missing_only=args.missing_only)
+        print_schedule(rows)
+
+    if args.shard:
+        from i18n_shard import redirect_units, select_shard
+
+        try:
+            shard = select_shard(units, args.shard, missing_only=args.missing_only)
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            sys.exit(2)
+        print(f"Shard {args.shard}: {len(shard)} of {len(units)} units")
+        units = shard
+        if args.shard_output:
+            redirect_units(units, locales_dir, Path(args.shard_output))
+
+    if args.plan:
+        from i18n_plan import LatencyModel, plan_units, print_plan
+
+        tm = None if args.no_cache else TranslationMemory(Path(args.tm))
+        model = LatencyModel.calibrated(args.request_latency, args.chars_per_second)
+        try:
+            plan = plan_units(units, args.workers, args.queue_size, BATCH_SIZE,
+                              tm, key_filter, args.missing_only, model, args.price_per_million)
+        finally:
+            if tm is not None:
+                tm.close()
+        print_plan(plan)
+        if args.plan_output:
+            save_json(Path(args.plan_output), plan)
+            print(f"Plan: {args.plan_output}")
+        return
+
+    chain = None
+    use_chain = args.backends != "google" or args.request_timeout or args.hedge_percentile is not None
+    if use_chain:
+        from i18n_backends import build_chain, parse_backends
+        try:
+            backend_names = parse_backends(args.backends)
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            sys.exit(2)
+    else:
+        backend_names = ["google"]
+
+    project_id = None
+    if "google" in backend_names:
+        creds = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+        if not creds:
+            print("GOOGLE_APPLICATION_CREDENTIALS is not set. Please export it to your JSON key path.", file=sys.stderr)
+            sys.exit(1)
+        project_id = find_project_id_from_credentials(Path(creds))
 
+    metrics = RunMetrics("translate_locales")
+    tm = None if args.no_cache else TranslationMemory(Path(args.tm))
+
+    from i18n_validate import RetryQueue, Validator
+
+    validator = None if args.no_validate else Validator()
+    retry = RetryQueue.load(Path(args.retry_queue))
+    if args.retry_failed:
+        # Only the leaves that failed validation earlier are re-sent
+        print(f"Retrying {len(retry.items)} queued leaves from {args.retry_queue}")
+        units = []
+    else:
+        retry.discard_files([u.out_path for u in units])
+
+    if use_chain:
+        try:
+            tfn = chain = build_chain(backend_names, project_id, location=args.location, tm=tm,
+                                      timeout=args.request_timeout, hedge_percentile=args.hedge_percentile,
+                                      max_hedges=args.max_hedges, workers=args.workers)
+        except ImportError as e:
+            print(f"Backend unavailable for --backends {args.backends}: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
         def tfn(batch: List[str], lang: str) -> List[str]:
-            return translate_batch(batch, lang, project_id, location=args.location)
+            return translate_batch(batch, lang, project_id, location=args.location,
+                                   on_retry=lambda: metrics.record_retry(lang))
+
+    # Stream (file, language) units through the staged pipeline
+    pipeline = Pipeline(
+        tfn,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        max_units=args.max_inflight,
+        dry_run=args.dry_run,
+        continue_on_error=args.continue_on_error,
+        metrics=metrics,
+        tm=tm,
+        key_filter=key_filter,
+        missing_only=args.missing_only,
+        deadline=args.deadline * 60 if args.deadline else None,
+        validator=validator,
+        retry=retry,
+    )
+    try:
+        pipeline.run(units)
+        if retry.items and not args.dry_run:
+            retry.drain(tfn, validator or Validator(), tm=tm)
+    finally:
+        if not args.dry_run:
+            retry.save()
+        if chain is not None:
+            chain.close()
+        if tm is not None:
+            tm.close()
+        metrics.finish()
+        if chain is not None:
+            metrics.extra["backends"] = chain.to_json()
+        if key_filter is not None:
+            metrics.extra["out_of_scope_strings"] = pipeline.out_of_scope
+        if pipeline.deferred:
+            metrics.extra["deferred_files"] = [str(p) for p in pipeline.deferred]
+        metrics.extra["stages"] = {name: st.to_json(pipeline.wall) for name, st in pipeline.stats.items()}
+        metrics.extra["validation"] = retry.to_json()
+        pipeline.print_stats()
+        retry.print_summary()
+        if chain is not None:
+            chain.print_summary()
+        if args.shard and args.shard_output and not args.dry_run:
+            from i18n_shard import write_manifest
+            skipped = [p for p, _e in pipeline.failed] + pipeline.deferred
+            print(f"Shard manifest: {write_manifest(Path(args.shard_output), args.shard, units, locales_dir, skipped)}")
+        metrics.print_summary()
+        print(f"Metrics: {metrics.write(Path(args.metrics) if args.metrics else default_metrics_path('translate_locales'))}")
 
-        for lang in targets:
-            out_path = Path(per_lang[lang])
-            try:
-                translated_data = apply_translations(src_data, tfn, lang)
-                if args.dry_run:
-                    print(f"[dry-run] Would write {out_path}")
-                else:
-                    save_json(out_path, translated_data)
-                    print(f"Wrote {out_path}")
-            except Exception as e:
-                if args.continue_on_error:
-                    print(f"[warn] Skipping {out_path} due to error: {e}", file=sys.stderr)
-                    continue
-                else:
-                    raise
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch translate i18n JSON files using Google Cloud Translation API (v3)")
+    parser.add_argument("--locales-dir", default=str(DEFAULT_LOCALES_DIR), help="Path to locales root directory")
+    parser.add_argument("--source-lang", default=SOURCE_LANG, help="Source language code (default: en)")
+    parser.add_argument("--target-langs", nargs="*", help="Explicit list of target language codes (overrides auto-detect)")
+    parser.add_argument("--location", default="global", help="Translation location (e.g., global or us-central1)")
+    parser.add_argument("--map-only", action="store_true", help="Only print the export mapping without translating")
+    parser.add_argument("--dry-run", action="store_true", help="Translate but do not write files; just report actions")
+    parser.add_argument("--continue-on-error", action="store_true", help="Skip languages/files that fail and continue processing others")
+    parser.add_argument("--include-files", nargs="*", help="Only process source JSON basenames (e.g., ui-components.json)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent translation requests (default: 4)")
+    parser.add_argument("--queue-size", type=int, default=8, help="Capacity of each pipeline stage queue (default: 8)")
+    parser.add_argument("--max-inflight", type=int, help="Max (file, language) units held in memory (default: 4 x workers)")
+    parser.add_argument("--tm", default=str(DEFAULT_TM_PATH), help="Translation memory consulted before calling the API")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or update the translation memory")
+    parser.add_argument("--metrics", help="Metrics JSON output (default: .i18n-cache/metrics/translate_locales-<timestamp>.json)")
+    parser.add_argument("--missing-only", action="store_true", help="Keep existing translations; send only missing and [TRANSLATE] leaves")
+    parser.add_argument("--plan", action="store_true", help="Estimate characters, requests, cost and ETA without calling the API")
+    parser.add_argument("--plan-output", help="Also write the --plan estimate as JSON")
+    parser.add_argument("--price-per-million", type=float, default=20.0, help="USD per million characters for --plan (default: 20)")
+    parser.add_argument("--request-latency", type=float, help="Seconds per request for the --plan ETA (default: calibrated from the last run)")
+    parser.add_argument("--chars-per-second", type=float, help="Backend throughput for the --plan ETA (default: 20000)")
+    parser.add_argument("--schedule", action="store_true", help="Order units by market weight, namespace usage and stale keys (see i18n_schedule.py)")
+    parser.add_argument("--priority-weights", help="Scheduling weights, e.g. market=0.5,usage=0.3,stale=0.2")
+    parser.add_argument("--deadline", type=float, help="Minutes after which no new units are started (implies --schedule)")
+    parser.add_argument("--markets", default="docs/LANGUAGE MATRIX PER DOMAIN (39 COUNTRIES, 33+ LANGUAGES).md", help="Domain language matrix used for market weights")
+    parser.add_argument("--backends", default="google", help="Fallback chain, e.g. google,deep-translator,cache (see i18n_backends.py)")
+    parser.add_argument("--request-timeout", type=float, help="Seconds per request (hedges included) before falling back to the next backend")
+    parser.add_argument("--hedge-percentile", type=float, help="Send a duplicate request once a call outlasts this latency percentile, e.g. 95")
+    parser.add_argument("--max-hedges", type=int, default=1, help="Duplicate requests allowed per batch with --hedge-percentile (default: 1)")
+    parser.add_argument("--shard", metavar="I/N", help="Process only shard I of N (1-based), balanced by estimated characters")
+    parser.add_argument("--shard-output", help="Write this shard's files and manifest here instead of the tree (merge with i18n_shard.py)")
+    parser.add_argument("--only-used", action="store_true", help="Translate only keys referenced from the source code (see i18n_usage.py)")
+    parser.add_argument("--src-dir", default="src", help="Source root scanned for key usage with --only-used (default: src)")
+    parser.add_argument("--usage-index", default=".i18n-cache/usage-index.json", help="Cached usage index for --only-used")
+    parser.add_argument("--no-validate", action="store_true", help="Write translations without the placeholder/markup/length checks (see i18n_validate.py)")
+    parser.add_argument("--retry-failed", action="store_true", help="Only re-send the leaves queued after failing validation")
+    parser.add_argument("--retry-queue", default=".i18n-cache/retry-queue.json", help="Leaves that failed validation and await a retry")
+    parser.add_argument("--variants-dir", default="src/i18n/variants", help="Variant locale registry; registered variants are skipped (see i18n_variants.py)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling(args, "translate_locales"):
+        run(args)
 
 
 if __name__ == "__main__":
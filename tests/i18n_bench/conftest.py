@@ -0,0 +1,29 @@
+"""Fixtures for the i18n tool benchmarks (see test_i18n_bench.py)."""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT))
+
+from i18n_synth import SynthConfig, generate_tree  # noqa: E402
+
+# Tree size; override for quick local runs, e.g. I18N_BENCH_KEYS=500
+BENCH_KEYS = int(os.environ.get("I18N_BENCH_KEYS", "6000"))
+BENCH_SEED = int(os.environ.get("I18N_BENCH_SEED", "1234"))
+
+
+@pytest.fixture(scope="session")
+def synth_config() -> SynthConfig:
+    return SynthConfig(keys=BENCH_KEYS, seed=BENCH_SEED)
+
+
+@pytest.fixture(scope="session")
+def locales_dir(tmp_path_factory, synth_config) -> Path:
+    """Generated once per session; benchmarks must not modify it."""
+    root = tmp_path_factory.mktemp("locales")
+    generate_tree(root, synth_config)
+    return root
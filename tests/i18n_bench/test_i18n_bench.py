@@ -0,0 +1,80 @@
+"""Benchmarks for the Python i18n tools on a synthetic locale tree.
+
+    pip install -r scripts/requirements-dev.txt
+    python -m pytest tests/i18n_bench --benchmark-autosave
+    python -m pytest tests/i18n_bench --benchmark-compare --benchmark-compare-fail=mean:10%
+
+The workloads are the scenarios of scripts/i18n_perf_gate.py, which runs
+them as a CI regression gate.  The tree comes from scripts/i18n_synth.py (35 languages, ``I18N_BENCH_KEYS``
+English keys, default 6000).  Each benchmark also records the peak Python
+heap of one extra traced run as ``extra_info["peak_mb"]``, which is saved
+with the timings, so autosaved runs double as time and memory baselines.
+"""
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from i18n_perf_gate import SCENARIOS, TRANSLATE_LANGS  # noqa: E402
+from translate_locales import SOURCE_LANG  # noqa: E402
+
+ROUNDS = 3
+
+
+def run_benchmark(benchmark, fn, setup=None, rounds=ROUNDS):
+    """Time ``fn`` (with fresh ``setup()`` args per round) and record its peak memory."""
+    args = setup() if setup else ()
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_mb"] = round(peak / 1e6, 2)
+    pedantic_setup = (lambda: (setup(), {})) if setup else None
+    return benchmark.pedantic(fn, setup=pedantic_setup, rounds=rounds, iterations=1)
+
+
+def run_scenario(benchmark, name, locales_dir, work_dir):
+    """Benchmark one of the perf gate's scenarios, so both measure the same workloads."""
+    scenario = SCENARIOS[name](locales_dir, work_dir)
+    return run_benchmark(benchmark, scenario.run, scenario.setup)
+
+
+def test_load(benchmark, locales_dir, tmp_path):
+    assert run_scenario(benchmark, "load", locales_dir, tmp_path)["languages"] == 35
+
+
+def test_flatten(benchmark, locales_dir, tmp_path):
+    assert run_scenario(benchmark, "flatten", locales_dir, tmp_path)["leaves"] > 0
+
+
+def test_compare(benchmark, locales_dir, tmp_path):
+    facts = run_scenario(benchmark, "compare", locales_dir, tmp_path)
+    assert facts["missing"] > 0 and facts["untranslated"] > 0
+
+
+def test_status(benchmark, locales_dir, tmp_path):
+    assert run_scenario(benchmark, "status", locales_dir, tmp_path)["translatable"] > 0
+
+
+def test_sync(benchmark, locales_dir, tmp_path):
+    facts = run_scenario(benchmark, "sync", locales_dir, tmp_path)
+    assert facts["changed"] > 0
+    assert facts["verified"]
+
+
+def test_translate(benchmark, locales_dir, tmp_path):
+    facts = run_scenario(benchmark, "translate", locales_dir, tmp_path)
+    benchmark.extra_info["backend_calls"] = facts["backend_calls"]
+    assert not facts["failed"]
+    sources = list((locales_dir / SOURCE_LANG).glob("*.json"))
+    assert len(list((tmp_path / "translate").rglob("*.json"))) == len(sources) * len(TRANSLATE_LANGS)
+
+
+def test_translate_hedged(benchmark, locales_dir, tmp_path):
+    facts = run_scenario(benchmark, "translate_hedged", locales_dir, tmp_path)
+    benchmark.extra_info.update(hedges=facts["hedges"], hedge_wins=facts["hedge_wins"])
+    assert not facts["failed"]
+    assert facts["hedges"] > 0
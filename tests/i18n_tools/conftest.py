@@ -0,0 +1,34 @@
+"""Fixtures for the i18n tool behaviour tests: small locale trees per test."""
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def make_tree(tmp_path):
+    """``make_tree({lang: {namespace: data}})`` writes the files and returns the locales root."""
+    root = tmp_path / "locales"
+
+    def make(docs: Dict[str, Dict[str, Any]]) -> Path:
+        for lang, namespaces in docs.items():
+            for ns, data in namespaces.items():
+                path = root / lang / f"{ns}.json"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        return root
+    return make
+
+
+@pytest.fixture
+def read_doc():
+    """``read_doc(root, lang, namespace)`` -> parsed document."""
+    def read(root: Path, lang: str, ns: str) -> Any:
+        return json.loads((root / lang / f"{ns}.json").read_text(encoding="utf-8"))
+    return read
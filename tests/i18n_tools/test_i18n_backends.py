@@ -0,0 +1,131 @@
+"""i18n_backends.py: falling back through the chain, hedging and the cache backend."""
+import time
+
+import pytest
+
+from i18n_backends import MIN_SAMPLES, BackendChain, CacheOnlyBackend, FunctionBackend, parse_backends
+from i18n_tm import TranslationMemory
+
+
+class Backend:
+    """Scripted backend: each call pops the next behaviour (a delay, or an exception to raise)."""
+
+    def __init__(self, name, script=(), prefix=""):
+        self.name = name
+        self.script = list(script)
+        self.prefix = prefix or f"{name}:"
+        self.calls = 0
+
+    def __call__(self, strings, lang, timeout=None, cancel=None):
+        self.calls += 1
+        step = self.script.pop(0) if self.script else 0.0
+        if isinstance(step, Exception):
+            raise step
+        if cancel is not None:
+            cancel.wait(step)
+        else:
+            time.sleep(step)
+        return [self.prefix + s for s in strings]
+
+
+@pytest.fixture
+def chain_of():
+    chains = []
+
+    def make(*backends, **kwargs):
+        chain = BackendChain(list(backends), **kwargs)
+        chains.append(chain)
+        return chain
+    yield make
+    for chain in chains:
+        chain.close()
+
+
+def test_falls_back_to_the_next_backend(chain_of, capsys):
+    first = Backend("first", [RuntimeError("quota")])
+    chain = chain_of(first, Backend("second"))
+    assert chain(["a", "b"], "de") == ["second:a", "second:b"]
+    stats = chain.to_json()
+    assert stats["first"]["errors"] == 1 and stats["first"]["fallbacks"] == 1
+    assert stats["second"]["requests"] == 1
+    assert "falling back to second" in capsys.readouterr().err
+
+
+def test_wrong_number_of_translations_counts_as_failure(chain_of, capsys):
+    chain = chain_of(FunctionBackend(lambda strings, lang: strings[:1], "short"), Backend("second"))
+    assert chain(["a", "b"], "de") == ["second:a", "second:b"]
+
+
+def test_timeout_moves_on(chain_of, capsys):
+    chain = chain_of(Backend("slow", [2.0]), Backend("fast"), timeout=0.05)
+    start = time.perf_counter()
+    assert chain(["a"], "de") == ["fast:a"]
+    assert time.perf_counter() - start < 1.0
+    assert chain.to_json()["slow"]["timeouts"] == 1
+
+
+def test_last_error_is_raised_when_every_backend_fails(chain_of, capsys):
+    chain = chain_of(Backend("a", [RuntimeError("one")]), Backend("b", [ValueError("two")]))
+    with pytest.raises(ValueError, match="two"):
+        chain(["x"], "de")
+
+
+def test_slow_request_is_hedged_and_the_hedge_wins(chain_of):
+    backend = Backend("primary", [2.0, 0.0])
+    chain = chain_of(backend, hedge_percentile=50, max_hedges=1)
+    chain.stats["primary"].latencies.extend([0.01] * MIN_SAMPLES)
+    start = time.perf_counter()
+    assert chain(["a"], "de") == ["primary:a"]
+    assert time.perf_counter() - start < 1.0
+    stats = chain.to_json()["primary"]
+    assert (stats["attempts"], stats["hedges"], stats["hedge_wins"], stats["cancelled"]) == (2, 1, 1, 1)
+
+
+def test_no_hedging_before_enough_samples(chain_of):
+    backend = Backend("primary", [0.05])
+    chain = chain_of(backend, hedge_percentile=50, max_hedges=1)
+    chain(["a"], "de")
+    assert backend.calls == 1
+
+
+def test_failed_attempt_is_resent_while_hedges_remain(chain_of):
+    backend = Backend("primary", [RuntimeError("flaky")])
+    chain = chain_of(backend, Backend("second"), hedge_percentile=95, max_hedges=1)
+    assert chain(["a"], "de") == ["primary:a"]
+    assert chain.to_json()["primary"]["fallbacks"] == 0
+
+
+@pytest.mark.parametrize("spec, names", [
+    ("google", ["google"]),
+    ("google, deep-translator ,cache", ["google", "deep-translator", "cache"]),
+])
+def test_parse_backends(spec, names):
+    assert parse_backends(spec) == names
+
+
+@pytest.mark.parametrize("spec", ["", "google,bing", "cache,google"])
+def test_parse_backends_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_backends(spec)
+
+
+@pytest.fixture
+def tm(tmp_path):
+    with TranslationMemory(tmp_path / "tm.sqlite") as memory:
+        memory.store("de", [("Save", "Speichern"), ("Hello {{name}}, {{count}} new", "{{count}} neu, Hallo {{name}}")])
+        yield memory
+
+
+def test_cache_backend_answers_from_memory_and_marks_the_rest(tm):
+    backend = CacheOnlyBackend(tm)
+    assert backend(["Save", "Cancel"], "de") == ["Speichern", "[TRANSLATE] Cancel"]
+    assert CacheOnlyBackend()(["Save"], "de") == ["[TRANSLATE] Save"]
+
+
+def test_cache_backend_matches_masked_text(tm):
+    backend = CacheOnlyBackend(tm)
+    # The chain sees masked text; the translation comes back with the same tokens, reordered
+    assert backend(["Hello __PH_0__, __PH_1__ new"], "de") == ["__PH_1__ neu, Hallo __PH_0__"]
+    # A new memory entry invalidates the masked index
+    tm.store("de", [("Bye {{name}}", "Tschüss {{name}}")])
+    assert backend(["Bye __PH_0__"], "de") == ["Tschüss __PH_0__"]
@@ -0,0 +1,94 @@
+"""i18n_bundles.py: per-domain bundles, the domain index and size budgets."""
+import json
+
+import pytest
+
+import i18n_bundles
+
+MATRIX = """# Matrix
+
+## TIER 1
+
+**Germany** (legacyguard.de)
+- German (DE)
+- English (EN)
+
+**Czech Republic** (legacyguard.cz)
+- Czech (CS)
+
+## Notes
+"""
+
+
+@pytest.fixture
+def build(make_tree, tmp_path):
+    """``build(*args)`` runs the builder on a small three-language tree; returns the output dir."""
+    root = make_tree({
+        "en": {"common": {"title": "Title " * 40}},
+        "de": {"common": {"title": "Titel " * 40}},
+        "cs": {"common": {"title": "Název " * 40}},
+    })
+    matrix = tmp_path / "matrix.md"
+    matrix.write_text(MATRIX, encoding="utf-8")
+    out = tmp_path / "dist"
+
+    def run(*args: str):
+        i18n_bundles.main(["--locales-dir", str(root), "--matrix", str(matrix), "--out", str(out),
+                           "--variants-dir", str(tmp_path / "variants"), *args])
+        return out
+    return run
+
+
+def test_budget_failure_exits_1(build, tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        build("--budget", "50", "--budget-metric", "raw", "--report", str(tmp_path / "sizes.json"))
+    assert exit_info.value.code == 1
+    report = json.loads((tmp_path / "sizes.json").read_text(encoding="utf-8"))
+    assert [(o["namespace"], o["metric"], o["budget"]) for o in report["over_budget"]] == [("common", "raw", 50)]
+    assert report["over_budget"][0]["lang"] == "cs"  # the largest file, multi-byte UTF-8
+
+
+def test_budget_within_limit_passes(build, capsys):
+    build("--budget", "100000")
+    assert "All namespaces within budget (gzip)" in capsys.readouterr().out
+
+
+def test_brotli_budget_without_brotli_fails_before_building(build, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(i18n_bundles, "brotli", None)
+    with pytest.raises(SystemExit) as exit_info:
+        build("--budget", "100000", "--budget-metric", "br")
+    assert exit_info.value.code == 2
+    assert "brotli" in capsys.readouterr().err
+    assert not (tmp_path / "dist").exists()
+
+
+def test_domains_get_their_languages_plus_the_fallback(build):
+    out = build()
+    de = json.loads((out / "legacyguard.de" / "manifest.json").read_text(encoding="utf-8"))
+    cz = json.loads((out / "legacyguard.cz" / "manifest.json").read_text(encoding="utf-8"))
+    assert list(de["bundles"]) == ["de", "en"]
+    assert list(cz["bundles"]) == ["cs", "en"] and cz["languages"] == ["cs"]
+    # The same content gets the same hashed file name on every domain
+    assert de["bundles"]["en"]["common"] == cz["bundles"]["en"]["common"]
+    assert (out / "legacyguard.cz" / cz["bundles"]["cs"]["common"]).is_file()
+
+
+def test_domains_subset_keeps_the_other_index_entries(build, make_tree):
+    out = build()
+    make_tree({"cs": {"common": {"title": "Jiný název"}}})
+    build("--domains", "legacyguard.cz")
+    index = json.loads((out / "index.json").read_text(encoding="utf-8"))
+    assert sorted(index["domains"]) == ["legacyguard.cz", "legacyguard.de"]
+    cz = json.loads((out / "legacyguard.cz" / "manifest.json").read_text(encoding="utf-8"))
+    assert index["domains"]["legacyguard.cz"]["total_bytes"] == cz["total_bytes"]
+    # The rebuilt domain's old cs bundle is pruned
+    assert len(list((out / "legacyguard.cz" / "cs").iterdir())) == 1
+
+
+def test_markers_are_dropped_from_bundles(build, make_tree):
+    make_tree({"de": {"common": {"title": "Titel", "new": "[TRANSLATE] New"}}})
+    out = build()
+    de = json.loads((out / "legacyguard.de" / "manifest.json").read_text(encoding="utf-8"))
+    bundle = json.loads((out / "legacyguard.de" / de["bundles"]["de"]["common"]).read_text(encoding="utf-8"))
+    assert bundle == {"title": "Titel"}
+    assert de["markers_dropped"] == 1
@@ -0,0 +1,117 @@
+"""i18n_check.py: which files a change affects, and what each document check finds."""
+import subprocess
+
+import pytest
+
+import i18n_check
+from i18n_check import affected_files, check_document
+
+EN = {
+    "title": "Title",
+    "greet": "Hello {{name}}",
+    "nav": {"home": "Home", "back": "Back"},
+    "count": 3,
+}
+
+
+def test_affected_files_expands_english_changes(tmp_path):
+    root = tmp_path / "locales"
+    paths = [str(root / "de" / "common.json"), str(root / "en" / "auth.json"), "src/App.tsx",
+             str(root / "de" / "nested" / "x.json")]
+    assert affected_files(paths, root, "en") == {"common": {"de"}, "auth": {"*"}}
+
+
+def test_clean_document():
+    result = check_document("de", "common", EN, {
+        "title": "Titel", "greet": "Hallo {{name}}", "nav": {"home": "Start", "back": "Zurück"}, "count": 3,
+    })
+    assert result.errors() == 0
+    assert (result.missing, result.extra, result.types, result.placeholders, result.markers) == ([], [], [], [], [])
+
+
+def test_structure_placeholder_and_marker_problems():
+    result = check_document("de", "common", EN, {
+        "title": {"oops": "Titel"},
+        "greet": "Hallo {{user}}",
+        "nav": {"home": "[TRANSLATE] Home", "extra": {"a": "A", "b": "B"}},
+    })
+    assert result.missing == [("nav", "back"), ("count",)]
+    assert result.extra == [("nav", "extra", "a"), ("nav", "extra", "b")]
+    assert result.types == [("title",)]
+    assert result.placeholders == [(("greet",), ["{{name}}"], ["{{user}}"])]
+    assert result.markers == [("nav", "home")]
+    # Markers only count as errors with --strict
+    assert result.errors() == 6
+    assert result.errors(strict=True) == 7
+
+
+def test_not_an_object():
+    assert check_document("de", "common", EN, ["x"]).error == "not a JSON object"
+
+
+def test_main_checks_every_language_of_a_changed_english_file(make_tree, capsys):
+    root = make_tree({
+        "en": {"common": {"a": "A {{n}}"}},
+        "de": {"common": {"a": "A-de {{n}}"}},
+        "cs": {"common": {"a": "A-cs"}},
+        "pl": {"auth": {}},
+    })
+    with pytest.raises(SystemExit) as exit_info:
+        i18n_check.main(["--locales-dir", str(root), str(root / "en" / "common.json")])
+    assert exit_info.value.code == 1
+    out = capsys.readouterr().out
+    assert "cs/common.json" in out and "de/common.json" not in out
+    assert "pl/common.json" in out  # English changed, so a missing target is reported too
+
+
+def test_main_passes_on_unrelated_changes(make_tree):
+    root = make_tree({"en": {"common": {"a": "A"}}, "de": {"common": {}}})
+    with pytest.raises(SystemExit) as exit_info:
+        i18n_check.main(["--locales-dir", str(root), "README.md"])
+    assert exit_info.value.code == 0
+
+
+@pytest.fixture
+def staged_repo(make_tree, tmp_path, monkeypatch):
+    """A git repo holding the tree; ``stage()`` adds everything under the locales root."""
+    root = make_tree({"en": {"common": {"a": "A {{n}}"}}, "de": {"common": {"a": "A-de {{n}}"}}})
+    monkeypatch.chdir(tmp_path)
+    subprocess.run(["git", "init", "-q"], check=True)
+
+    def stage():
+        subprocess.run(["git", "add", "locales"], check=True)
+    stage()
+    return root, stage
+
+
+def run_changed(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        i18n_check.main(["--changed", "--locales-dir", "locales"])
+    return exit_info.value.code, capsys.readouterr().out
+
+
+def test_changed_checks_the_staged_content(staged_repo, make_tree, capsys):
+    root, stage = staged_repo
+    make_tree({"de": {"common": {"a": "A-de"}}})
+    stage()
+    make_tree({"de": {"common": {"a": "A-de {{n}}"}}})  # fixed, but not staged
+    code, out = run_changed(capsys)
+    assert code == 1
+    assert "de/common.json" in out and "missing {{n}}" in out
+
+
+def test_changed_ignores_unstaged_breakage(staged_repo, make_tree, capsys):
+    root, stage = staged_repo
+    make_tree({"en": {"common": {"a": "A {{n}}", "b": "B"}}, "de": {"common": {"a": "A-de {{n}}", "b": "B-de"}}})
+    stage()
+    (root / "de" / "common.json").write_text("{ broken", encoding="utf-8")
+    code, out = run_changed(capsys)
+    assert code == 0, out
+    assert "2 files loaded" in out
+
+
+def test_staged_files_keeps_spaces_in_names(staged_repo, make_tree):
+    root, stage = staged_repo
+    make_tree({"de": {"my ns": {"a": "A"}}})
+    stage()
+    assert "locales/de/my ns.json" in i18n_check.staged_files()
@@ -0,0 +1,148 @@
+"""i18n_daemon.py: routes, refreshing changed files, write-through and refused requests."""
+import http.client
+import json
+import os
+import threading
+
+import pytest
+
+from i18n_daemon import Daemon, LocaleStore, RequestError, make_server
+
+EN = {"nav": {"home": "Home"}, "greet": "Hello {{name}}", "items": [{"label": "Label"}], "count": 2}
+
+
+def fake_backend(texts, lang):
+    return [f"{lang}:{t}" for t in texts]
+
+
+@pytest.fixture
+def daemon(make_tree, tmp_path):
+    root = make_tree({
+        "en": {"common": EN, "auth": {"login": "Log in"}},
+        "de": {"common": {"nav": {"home": "Start"}, "greet": "[TRANSLATE] Hello {{name}}"}},
+    })
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "App.tsx").write_text("const { t } = useTranslation('common');\nt('nav.home');\n", encoding="utf-8")
+    store = LocaleStore(root)
+    store.refresh()
+    return Daemon(store, translate_fn=fake_backend, src_dir=src, usage_index=tmp_path / "usage-index.json")
+
+
+def call(daemon, method, path, **params):
+    return daemon.handle(method, path, params)
+
+
+def test_read_routes(daemon):
+    assert call(daemon, "GET", "/health")["languages"] == 2
+    status = call(daemon, "GET", "/status", langs="de")["languages"]["de"]
+    assert (status["leaves"], status["translated"], status["markers"], status["missing_files"]) == (5, 1, 1, ["auth"])
+    missing = call(daemon, "GET", "/missing", lang="de", ns="common")["namespaces"]["common"]
+    assert missing == {"missing": ["items", "count"], "markers": ["greet"]}
+    assert call(daemon, "GET", "/get", lang="de", key="common:nav.home")["value"] == "Start"
+    assert call(daemon, "POST", "/lookup", lang="de", keys=["common:nav.home", "common:nope"])["values"] == {
+        "common:nav.home": "Start", "common:nope": None}
+    assert call(daemon, "GET", "/usage", key="common:nav.home")["used"] is True
+    assert call(daemon, "GET", "/unused", ns="common")["unused"]["common"] == ["greet", "items", "count"]
+    translated = call(daemon, "POST", "/translate", lang="de", strings=["Save", "Save"])
+    assert (translated["translations"], translated["failed"]) == (["de:Save", "de:Save"], {})
+
+
+def test_changed_files_are_reparsed_before_each_request(daemon):
+    path = daemon.store.tree.path_for("de", "common")
+    path.write_text(json.dumps({"nav": {"home": "Startseite"}}), encoding="utf-8")
+    reloads = daemon.store.reloads
+    assert call(daemon, "GET", "/get", lang="de", key="common:nav.home")["value"] == "Startseite"
+    assert daemon.store.reloads == reloads + 1
+    path.unlink()
+    # de had no other file, so it is gone as a language
+    with pytest.raises(RequestError) as error:
+        call(daemon, "GET", "/get", lang="de", key="common:nav.home")
+    assert error.value.status == 404
+
+
+def test_set_writes_through_and_creates_languages(daemon):
+    result = call(daemon, "POST", "/set", lang="cs", values={"common:greet": "Ahoj {{name}}", "auth:login": "Přihlásit"})
+    assert result == {"lang": "cs", "updated": 2, "files": ["auth", "common"]}
+    tree = daemon.store.tree
+    assert json.loads(tree.path_for("cs", "common").read_text(encoding="utf-8")) == {"greet": "Ahoj {{name}}"}
+    # The write updated the stamps, so the next request does not reparse the file
+    reloads = daemon.store.reloads
+    assert call(daemon, "GET", "/get", lang="cs", key="auth:login")["value"] == "Přihlásit"
+    assert daemon.store.reloads == reloads
+
+    assert call(daemon, "POST", "/delete", lang="cs", keys=["auth:login"])["deleted"] == 1
+    assert json.loads(tree.path_for("cs", "auth").read_text(encoding="utf-8")) == {}
+
+
+@pytest.mark.parametrize("values, status", [
+    ({"common:nav.home.x": "bad"}, 400),       # below a string leaf
+    ({"common:nav": "bad"}, 400),              # an object in English
+    ({"common:count": "3"}, 400),              # not a string in English
+    ({"common:items.0.label": "Etikett"}, 400),  # through a list
+    ({"common:nav.home": 3}, 400),
+    ({"common:greet": "Hallo"}, 422),          # drops {{name}}
+    ({"other:x": "y"}, 404),
+    ({"common:nav.home": "Heim", "common:greet": "Hallo"}, 422),  # one bad value: nothing is written
+])
+def test_set_refuses_bad_keys_and_values(daemon, values, status):
+    path = daemon.store.tree.path_for("de", "common")
+    before = path.read_bytes()
+    with pytest.raises(RequestError) as error:
+        call(daemon, "POST", "/set", lang="de", values=values)
+    assert error.value.status == status
+    assert path.read_bytes() == before
+    assert call(daemon, "GET", "/get", lang="de", key="common:nav.home")["value"] == "Start"
+
+
+def test_language_codes_are_checked(daemon):
+    with pytest.raises(RequestError) as error:
+        call(daemon, "POST", "/set", lang="../../tmp", values={"common:nav.home": "x"})
+    assert error.value.status == 400
+    with pytest.raises(RequestError) as error:
+        call(daemon, "GET", "/get", lang="fr", key="common:nav.home")
+    assert error.value.status == 404
+
+
+@pytest.fixture
+def server(daemon):
+    server = make_server(daemon, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+
+def test_http_serves_local_json_requests(server):
+    status, payload = request(server, "GET", "/get?lang=de&key=common:nav.home")
+    assert (status, payload["value"]) == (200, "Start")
+    status, payload = request(server, "POST", "/lookup", json.dumps({"lang": "de", "keys": ["common:nav.home"]}),
+                              {"Content-Type": "application/json; charset=utf-8"})
+    assert (status, payload["values"]) == (200, {"common:nav.home": "Start"})
+    assert request(server, "GET", "/nope")[0] == 404
+
+
+@pytest.mark.parametrize("method, headers, status", [
+    ("GET", {"Host": "evil.example:8765"}, 403),
+    ("GET", {"Origin": "http://evil.example"}, 403),
+    ("POST", {"Content-Type": "text/plain"}, 415),
+    ("POST", {"Content-Type": "application/x-www-form-urlencoded"}, 415),
+])
+def test_http_refuses_non_local_or_non_json_requests(server, method, headers, status):
+    body = json.dumps({"lang": "de", "values": {"common:nav.home": "Hacked"}}) if method == "POST" else None
+    code, payload = request(server, method, "/set" if method == "POST" else "/health", body, headers)
+    assert code == status and "error" in payload
+    assert json.loads(server.daemon.store.tree.path_for("de", "common").read_text(encoding="utf-8"))["nav"] == {
+        "home": "Start"}
+    assert not os.path.exists(server.daemon.store.tree.root / "evil.example")
@@ -0,0 +1,62 @@
+"""i18n_duplicates.py: grouping identical English strings and spotting inconsistent translations."""
+import json
+
+from i18n_duplicates import find_duplicates, main, summarize
+from i18n_locales import LocaleTree
+
+
+def load(make_tree):
+    return LocaleTree.load(make_tree({
+        "en": {
+            "auth": {"cancel": "Cancel", "title": "Sign in", "ok": "OK"},
+            "billing": {"form": {"cancel": "Cancel  "}, "abort": "cancel", "ok": "OK"},
+            "common": {"cancel": "Cancel", "x": "X"},
+        },
+        "de": {
+            "auth": {"cancel": "Abbrechen", "title": "Anmelden", "ok": "OK"},
+            "billing": {"form": {"cancel": "Stornieren"}, "abort": "abbrechen", "ok": "[TRANSLATE] OK"},
+            "common": {"cancel": "Abbrechen", "x": "X"},
+        },
+    }))
+
+
+def test_groups_normalize_whitespace_and_prefer_common(make_tree):
+    groups = {g.text: g for g in find_duplicates(load(make_tree))}
+    assert sorted(groups) == ["Cancel", "OK"]
+    cancel = groups["Cancel"]
+    assert cancel.locations == [("auth", ("cancel",)), ("billing", ("form", "cancel")), ("common", ("cancel",))]
+    assert cancel.keep == ("common", ("cancel",))
+    assert cancel.api_chars_saved == len("Cancel") * 2 * 1
+
+
+def test_ignore_case_and_min_copies(make_tree):
+    tree = load(make_tree)
+    groups = find_duplicates(tree, ignore_case=True, min_copies=3)
+    assert [(g.text, g.copies) for g in groups] == [("Cancel", 4)]
+    # Strings shorter than --min-length are never grouped
+    assert [g.text for g in find_duplicates(tree, min_length=3)] == ["Cancel"]
+
+
+def test_inconsistent_translations_ignore_markers(make_tree):
+    groups = {g.text: g for g in find_duplicates(load(make_tree))}
+    assert groups["Cancel"].inconsistent == {
+        "de": {"Abbrechen": [("auth", ("cancel",)), ("common", ("cancel",))],
+               "Stornieren": [("billing", ("form", "cancel"))]},
+    }
+    assert groups["OK"].inconsistent == {}
+    summary = summarize(list(groups.values()), ["de"])
+    assert (summary["groups"], summary["redundant_keys"], summary["inconsistent_groups"]) == (2, 3, 1)
+
+
+def test_bytes_saved_counts_every_copy_but_the_kept_one(make_tree):
+    groups = {g.text: g for g in find_duplicates(load(make_tree))}
+    # en: "ok":"OK", once; de: "ok":"[TRANSLATE] OK", the billing copy (auth is kept)
+    assert groups["OK"].bytes_saved == len('"ok":"OK",') + len('"ok":"[TRANSLATE] OK",')
+
+
+def test_output(make_tree, tmp_path, capsys):
+    root = make_tree({"en": {"a": {"k": "Save"}, "b": {"k": "Save"}}, "de": {"a": {"k": "Speichern"}}})
+    main(["--locales-dir", str(root), "--output", str(tmp_path / "dup.json")])
+    data = json.loads((tmp_path / "dup.json").read_text(encoding="utf-8"))
+    assert data["groups"][0]["keys"] == ["a:k", "b:k"] and data["groups"][0]["keep"] == "a:k"
+    assert "translated consistently" in capsys.readouterr().out
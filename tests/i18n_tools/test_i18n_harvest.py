@@ -0,0 +1,80 @@
+"""i18n_harvest.py: aligning target leaves with English and loading them into the memory."""
+from i18n_harvest import harvest_tree, main
+from i18n_locales import LocaleTree
+from i18n_tm import TranslationMemory
+
+EN = {
+    "save": "Save",
+    "greet": "Hello {{name}}",
+    "title": "Title",
+    "new": "New",
+    "ok": "OK",
+    "steps": ["Open", "Close"],
+    "menu": {"save": "Save", "copy": "Save"},
+}
+DE = {
+    "save": "Speichern",
+    "greet": "Hallo {{user}}",
+    "title": "[TRANSLATE] Title",
+    "ok": "OK",
+    "steps": ["Öffnen", "Schließen"],
+    "menu": {"save": "Sichern", "copy": "Speichern"},
+}
+
+
+def test_alignment_and_skips(make_tree):
+    tree = LocaleTree.load(make_tree({"en": {"common": EN}, "de": {"common": DE}}))
+    result = harvest_tree(tree)["de"]
+    # "Save" is translated three times; the most frequent translation wins
+    assert dict(result.pairs()) == {"Save": "Speichern", "Open": "Öffnen", "Close": "Schließen"}
+    assert result.to_json() == {
+        "leaves": 9, "pairs": 3, "conflicts": 1, "missing": 1, "markers": 1, "identical": 1,
+        "placeholder_mismatch": 1,
+    }
+
+
+def test_ties_go_to_the_first_translation(make_tree):
+    tree = LocaleTree.load(make_tree({
+        "en": {"a": {"k": "Save"}, "b": {"k": "Save"}},
+        "de": {"a": {"k": "Sichern"}, "b": {"k": "Speichern"}},
+    }))
+    assert harvest_tree(tree)["de"].pairs() == [("Save", "Sichern")]
+
+
+def test_harvest_keeps_tmx_entries(make_tree, tmp_path, capsys):
+    root = make_tree({"en": {"common": {"save": "Save", "open": "Open"}},
+                      "de": {"common": {"save": "Speichern", "open": "Öffnen"}}})
+    tm_path = tmp_path / "tm.sqlite"
+    with TranslationMemory(tm_path) as tm:
+        tm.store("de", [("Save", "Sichern")], origin="tmx")
+        tm.store("de", [("Open", "Aufmachen")], origin="mt")
+    main(["--tm", str(tm_path), "harvest", "--locales-dir", str(root)])
+    with TranslationMemory(tm_path) as tm:
+        assert tm.lookup("de", ["Save", "Open"]) == {"Save": "Sichern", "Open": "Öffnen"}
+    main(["--tm", str(tm_path), "harvest", "--locales-dir", str(root), "--overwrite"])
+    with TranslationMemory(tm_path) as tm:
+        assert tm.lookup("de", ["Save"]) == {"Save": "Speichern"}
+
+
+def test_tmx_round_trip(tmp_path, capsys):
+    first, second = tmp_path / "a.sqlite", tmp_path / "b.sqlite"
+    with TranslationMemory(first) as tm:
+        tm.store("de", [("Hello {{name}} & <b>you</b>", "Hallo {{name}} & <b>du</b>")])
+        tm.store("cs", [("Save", "Uložit")])
+    main(["--tm", str(first), "export-tmx", str(tmp_path / "memory.tmx")])
+    main(["--tm", str(second), "import-tmx", str(tmp_path / "memory.tmx")])
+    with TranslationMemory(second) as tm:
+        assert tm.lookup("de", ["Hello {{name}} & <b>you</b>"]) == {"Hello {{name}} & <b>you</b>": "Hallo {{name}} & <b>du</b>"}
+        assert tm.lookup("cs", ["Save"]) == {"Save": "Uložit"}
+        assert tm.origins() == {"tmx": 2}
+
+
+def test_vendor_tmx_region_codes_map_to_tree_languages(tmp_path, capsys):
+    (tmp_path / "vendor.tmx").write_text(
+        '<?xml version="1.0" encoding="utf-8"?><tmx version="1.4"><header srclang="en-US"/><body>'
+        '<tu><tuv xml:lang="en-US"><seg>Save <ph>{{n}}</ph></seg></tuv>'
+        '<tuv xml:lang="de_DE"><seg>Speichern <ph>{{n}}</ph></seg></tuv></tu>'
+        '</body></tmx>', encoding="utf-8")
+    main(["--tm", str(tmp_path / "tm.sqlite"), "import-tmx", str(tmp_path / "vendor.tmx")])
+    with TranslationMemory(tmp_path / "tm.sqlite") as tm:
+        assert tm.entries() == [("de", "Save {{n}}", "Speichern {{n}}", "tmx")]
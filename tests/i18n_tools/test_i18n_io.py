@@ -0,0 +1,76 @@
+"""i18n_io.py: atomic writes that skip unchanged files and keep the file mode."""
+import os
+import stat
+
+import pytest
+
+from i18n_io import JsonWriter, dumps_json
+
+
+@pytest.fixture
+def writer():
+    with JsonWriter(fsync="none") as w:
+        yield w
+
+
+def test_unchanged_output_is_not_rewritten(writer, tmp_path):
+    path = tmp_path / "de" / "common.json"
+    assert writer.write(path, {"a": "Ä"})
+    assert path.read_bytes() == dumps_json({"a": "Ä"})
+    os.utime(path, (1, 1))
+    assert not writer.write(path, {"a": "Ä"})
+    assert path.stat().st_mtime == 1
+    assert writer.written == [path] and writer.skipped == [path]
+
+
+def test_same_size_different_content_is_written(writer, tmp_path):
+    path = tmp_path / "common.json"
+    writer.write(path, {"a": "x"})
+    assert writer.write(path, {"a": "y"})
+    assert path.read_bytes() == dumps_json({"a": "y"})
+
+
+def test_existing_mode_is_kept(writer, tmp_path):
+    path = tmp_path / "common.json"
+    path.write_text("{}\n", encoding="utf-8")
+    path.chmod(0o640)
+    writer.write(path, {"a": 1})
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+def test_new_files_get_the_umask_mode_not_mkstemps(writer, tmp_path):
+    old = os.umask(0o022)
+    try:
+        writer.write(tmp_path / "new.json", {})
+    finally:
+        os.umask(old)
+    assert stat.S_IMODE((tmp_path / "new.json").stat().st_mode) == 0o644
+
+
+def test_no_temp_file_left_behind_on_failure(writer, tmp_path, monkeypatch):
+    def fail(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        writer.write(tmp_path / "common.json", {"a": 1})
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("mode", ["each", "batch"])
+def test_fsync_modes(tmp_path, mode):
+    with JsonWriter(fsync=mode) as w:
+        w.write(tmp_path / "a.json", {"a": 1})
+        assert bool(w._unsynced) == (mode == "batch")
+    assert not w._unsynced
+
+
+def test_batch_flush_skips_files_deleted_since(tmp_path):
+    with JsonWriter(fsync="batch") as w:
+        w.write(tmp_path / "stale.json", {"a": 1})
+        (tmp_path / "stale.json").unlink()
+    assert not w._unsynced
+
+
+def test_unknown_fsync_mode():
+    with pytest.raises(ValueError):
+        JsonWriter(fsync="sometimes")
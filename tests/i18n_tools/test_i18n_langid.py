@@ -0,0 +1,67 @@
+"""i18n_langid.py: scoring target leaves against per-language n-gram profiles."""
+from i18n_langid import (
+    Profile,
+    load_profiles,
+    mark_for_retranslation,
+    rank_english_leftovers,
+    save_profiles,
+    train_profiles,
+)
+from i18n_locales import LocaleTree
+
+PAIRS = {
+    "welcome": ("Welcome back to your account", "Willkommen zurück in Ihrem Konto"),
+    "save": ("Save the changes before you leave", "Speichern Sie die Änderungen, bevor Sie gehen"),
+    "delete": ("Are you sure you want to delete this document?", "Möchten Sie dieses Dokument wirklich löschen?"),
+    "share": ("Share the document with your family", "Teilen Sie das Dokument mit Ihrer Familie"),
+    "upload": ("Upload a new file from your computer", "Laden Sie eine neue Datei von Ihrem Computer hoch"),
+    "error": ("Something went wrong, please try again", "Etwas ist schiefgelaufen, bitte versuchen Sie es erneut"),
+    "profile": ("Update your profile information", "Aktualisieren Sie Ihre Profilinformationen"),
+    "password": ("The password must contain at least eight characters",
+                 "Das Passwort muss mindestens acht Zeichen enthalten"),
+    "guardian": ("Choose a guardian for your children", "Wählen Sie einen Vormund für Ihre Kinder"),
+    "will": ("Your will has been saved", "Ihr Testament wurde gespeichert"),
+    "ok": ("OK", "OK"),
+}
+EN = {key: en for key, (en, _de) in PAIRS.items()}
+DE = {key: de for key, (_en, de) in PAIRS.items()}
+
+
+def load(make_tree, **de_overrides):
+    return LocaleTree.load(make_tree({"en": {"common": EN}, "de": {"common": {**DE, **de_overrides}}}))
+
+
+def test_identical_leftovers_rank_first_and_short_values_are_skipped(make_tree):
+    tree = load(make_tree, will="Your will has been saved")
+    findings = rank_english_leftovers(tree, train_profiles(tree))
+    assert (findings[0]["key"], findings[0]["reason"]) == ("will", "identical")
+    assert "ok" not in {f["key"] for f in findings}
+
+
+def test_english_text_that_differs_from_the_source_is_found(make_tree):
+    tree = load(make_tree, guardian="Please choose who will look after the children")
+    findings = rank_english_leftovers(tree, train_profiles(tree))
+    assert findings[0]["key"] == "guardian" and findings[0]["reason"] == "ngram"
+    assert findings[0]["margin"] > 0
+
+
+def test_leftovers_are_not_learned_into_the_target_profile(make_tree):
+    tree = load(make_tree, will="Your will has been saved")
+    expected = Profile.train("de", [text for key, text in DE.items() if key not in ("will", "ok")])
+    assert train_profiles(tree)["de"].logprobs == expected.logprobs
+
+
+def test_mark_requeues_with_the_english_source(make_tree, read_doc):
+    tree = load(make_tree, will="Your will has been saved")
+    findings = [f for f in rank_english_leftovers(tree, train_profiles(tree)) if f["reason"] == "identical"]
+    assert mark_for_retranslation(tree, findings) == {"de/common.json": 1}
+    assert read_doc(tree.root, "de", "common")["will"] == "[TRANSLATE] Your will has been saved"
+
+
+def test_profiles_round_trip(make_tree, tmp_path):
+    tree = load(make_tree)
+    profiles = train_profiles(tree)
+    save_profiles(tmp_path / "profiles.json", profiles)
+    loaded = load_profiles(tmp_path / "profiles.json")
+    assert {lang: (p.floor, p.logprobs) for lang, p in loaded.items()} == \
+        {lang: (p.floor, p.logprobs) for lang, p in profiles.items()}
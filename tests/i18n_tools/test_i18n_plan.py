@@ -0,0 +1,69 @@
+"""i18n_plan.py: the exact characters and requests a run would bill, and its ETA."""
+import json
+
+import pytest
+
+from i18n_pipeline import Pipeline, build_units
+from i18n_plan import LatencyModel, plan_units
+from i18n_tm import TranslationMemory
+
+EN = {"save": "Save", "again": "Save", "cancel": "Cancel", "title": "Dashboard"}
+DE = {"save": "Speichern", "again": "Speichern", "cancel": "Abbrechen"}
+
+
+@pytest.fixture
+def setup(make_tree, tmp_path):
+    root = make_tree({"en": {"common": EN}, "de": {"common": DE}})
+    with TranslationMemory(tmp_path / "tm.sqlite") as tm:
+        tm.store("cs", [("Cancel", "Zrušit")])
+        yield root, build_units({str(root / "en" / "common.json"): {}}, ["de", "cs"]), tm
+
+
+def test_plan_counts_what_would_be_billed(setup, read_doc):
+    root, units, tm = setup
+    plan = plan_units(units, workers=2, queue_size=4, batch_size=50, tm=tm, key_filter=None, missing_only=True,
+                      model=LatencyModel(1.0, 10.0), price_per_million=20.0)
+    # de: only the missing "Dashboard"; cs: "Save" once (deduplicated) and "Dashboard", "Cancel" from memory
+    assert {lang: (row["chars"], row["requests"], row["cache_hits"], row["dedup_chars"])
+            for lang, row in plan["languages"].items()} == {"de": (9, 1, 0, 0), "cs": (13, 1, 1, 4)}
+    assert plan["totals"]["kept_existing"] == 3
+    assert plan["languages"]["cs"]["eta_s"] == 2.3  # 1 s + 13 chars / 10 per s
+    assert plan["totals"]["eta_s"] == 2.3  # two workers take the two requests in parallel
+    # Nothing is written
+    assert read_doc(root, "de", "common") == DE
+    assert not (root / "cs").exists()
+
+
+def test_missing_only_with_memory_keeps_existing_translations(setup, read_doc):
+    root, units, tm = setup
+    sent = []
+
+    def backend(strings, lang):
+        sent.extend(strings)
+        return [f"{lang}:{s}" for s in strings]
+    Pipeline(backend, workers=1, tm=tm, missing_only=True).run(units)
+    assert sorted(sent) == ["Dashboard", "Dashboard", "Save"]
+    assert read_doc(root, "de", "common") == {**DE, "title": "de:Dashboard"}
+    assert read_doc(root, "cs", "common") == {"save": "cs:Save", "again": "cs:Save", "cancel": "Zrušit",
+                                              "title": "cs:Dashboard"}
+
+
+def test_wall_time_fills_the_first_free_worker():
+    model = LatencyModel(1.0, 1000.0)
+    assert model.wall([], 4) == 0.0
+    assert model.wall([0, 0, 0], 2) == 2.0
+    assert model.wall([1000, 0, 0], 2) == 2.0
+
+
+def test_latency_is_calibrated_from_the_last_run(tmp_path):
+    metrics = tmp_path / "metrics"
+    metrics.mkdir()
+    (metrics / "translate_locales-20260101T000000.json").write_text(json.dumps(
+        {"totals": {"requests": 10, "chars_billed": 100000}, "latency_ms": {"mean": 1500}}))
+    (metrics / "translate_locales-20260102T000000.json").write_text("{ truncated")
+    model = LatencyModel.calibrated(chars_per_second=20000.0, metrics_dir=metrics)
+    # 1.5 s mean minus 10,000 chars at 20,000 chars/s
+    assert model.request_latency == pytest.approx(1.0)
+    assert model.source == "translate_locales-20260101T000000.json"
+    assert LatencyModel.calibrated(request_latency=0.2, metrics_dir=metrics).source == "flags"
+    assert LatencyModel.calibrated(metrics_dir=tmp_path / "none").source == "defaults"
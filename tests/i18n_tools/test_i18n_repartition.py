@@ -0,0 +1,112 @@
+"""i18n_repartition.py: naming the new namespaces, the relayout and the all-or-nothing commit."""
+import pytest
+
+import i18n_repartition
+from i18n_locales import LocaleTree
+from i18n_repartition import (
+    Block,
+    RepartitionError,
+    Route,
+    build_blocks,
+    commit_files,
+    name_groups,
+    partition,
+    relayout,
+    update_moves,
+)
+
+ROUTES = [Route("/vault", set()), Route("/will", set())]
+
+
+def partitioned(tree, usage):
+    """Blocks of ``tree`` with ``usage[(ns, key)]`` route indexes, partitioned and named."""
+    blocks = build_blocks(tree)
+    for block in blocks:
+        block.routes = frozenset(usage.get((block.namespace, block.key), ()))
+    groups = partition(blocks, overhead=1500)
+    name_groups(groups, ROUTES)
+    return groups
+
+
+def names(groups):
+    return {g.name: [b.ref for b in g.blocks] for g in groups}
+
+
+def test_unused_blocks_keep_the_namespace_name():
+    blocks = [Block("common", "a", 500, 0), Block("common", "b", 400, 1), Block("common", "c", 100, 2)]
+    blocks[0].routes, blocks[1].routes = frozenset({0}), frozenset({1})
+    groups = partition(blocks, overhead=1500)
+    name_groups(groups, ROUTES)
+    assert names(groups) == {"common-vault": ["common:a"], "common-will": ["common:b"], "common": ["common:c"]}
+
+
+def test_fully_used_namespace_keeps_its_name_on_the_largest_group():
+    blocks = [Block("auth", "login", 900, 0), Block("auth", "reset", 100, 1), Block("common", "x", 50, 2)]
+    blocks[0].routes, blocks[1].routes, blocks[2].routes = frozenset({0}), frozenset({1}), frozenset({0, 1})
+    groups = partition(blocks, overhead=0)
+    name_groups(groups, ROUTES)
+    assert names(groups) == {"auth": ["auth:login"], "auth-will": ["auth:reset"], "common": ["common:x"]}
+
+
+def test_relayout_moves_blocks_in_every_language(make_tree):
+    root = make_tree({
+        "en": {"common": {"a": {"x": "A"}, "b": "B", "c": "C"}},
+        "de": {"common": {"a": {"x": "A-de"}, "b": "B-de", "c": "C-de", "stale": "S"}},
+    })
+    tree = LocaleTree.load(root)
+    groups = partitioned(tree, {("common", "a"): {0}, ("common", "b"): {1}})
+    layout = relayout(tree, groups)
+
+    assert layout["en"] == {"common-vault": {"a": {"x": "A"}}, "common-will": {"b": "B"}, "common": {"c": "C"}}
+    de = layout["de"]
+    assert (de["common-vault"], de["common-will"]) == ({"a": {"x": "A-de"}}, {"b": "B-de"})
+    # Keys English lacks stay under the kept namespace name
+    assert de["common"] == {"c": "C-de", "stale": "S"}
+
+    moves, added = update_moves({"old:a": "common:a"}, groups)
+    assert moves == {"common:a": "common-vault:a", "common:b": "common-will:b", "old:a": "common-vault:a"}
+    assert added == 2
+
+
+def test_relayout_rejects_non_object_documents(make_tree):
+    root = make_tree({"en": {"common": {"a": "A"}}, "de": {"common": ["A"]}})
+    tree = LocaleTree.load(root)
+    with pytest.raises(RepartitionError, match="de/common.json is not an object"):
+        relayout(tree, partitioned(tree, {("common", "a"): {0}}))
+
+
+def test_commit_files_writes_deletes_and_backs_up(tmp_path):
+    keep, gone, new = tmp_path / "de" / "common.json", tmp_path / "de" / "old.json", tmp_path / "de" / "new.json"
+    keep.parent.mkdir()
+    keep.write_bytes(b"before")
+    gone.write_bytes(b"old")
+    backup = tmp_path / "backup"
+
+    commit_files({keep: b"after", gone: None, new: b"fresh"}, backup)
+
+    assert (keep.read_bytes(), gone.exists(), new.read_bytes()) == (b"after", False, b"fresh")
+    assert (backup / "de" / "common.json").read_bytes() == b"before"
+    assert (backup / "de" / "old.json").read_bytes() == b"old"
+    assert sorted(p.name for p in keep.parent.iterdir()) == ["common.json", "new.json"]
+
+
+def test_commit_files_rolls_back_when_a_swap_fails(tmp_path, monkeypatch):
+    first, second = tmp_path / "de" / "a.json", tmp_path / "de" / "b.json"
+    first.parent.mkdir()
+    first.write_bytes(b"a-before")
+    real_replace = i18n_repartition.os.replace
+    calls = []
+
+    def failing_replace(src, dst):
+        calls.append(dst)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(i18n_repartition.os, "replace", failing_replace)
+    with pytest.raises(OSError, match="disk full"):
+        commit_files({first: b"a-after", second: b"b-new"}, tmp_path / "backup")
+
+    assert first.read_bytes() == b"a-before"
+    assert not second.exists()
+    assert [p.name for p in first.parent.iterdir()] == ["a.json"]
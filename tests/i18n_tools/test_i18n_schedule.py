@@ -0,0 +1,81 @@
+"""i18n_schedule.py: priority order of translation units, and the deadline that defers the rest."""
+import pytest
+
+from i18n_markets import Market, language_weights
+from i18n_pipeline import Pipeline, build_units
+from i18n_schedule import UNIT_OVERHEAD_CHARS, parse_weights, schedule_units, stale_leaves
+
+
+def test_parse_weights():
+    assert parse_weights(None) == {"market": 0.5, "usage": 0.3, "stale": 0.2}
+    assert parse_weights("market=1, stale=0") == {"market": 1.0, "usage": 0.3, "stale": 0.0}
+    for spec in ("traffic=1", "market"):
+        with pytest.raises(ValueError):
+            parse_weights(spec)
+
+
+def test_stale_leaves_counts_missing_empty_and_markers():
+    src = {"a": "Alpha", "b": "Beta", "c": "Gamma", "d": ["One", "Two"]}
+    target = {"a": "Alfa", "b": "", "c": "[TRANSLATE] Gamma", "d": ["Eins"]}
+    assert stale_leaves(src, target) == (3, len("Beta") + len("Gamma") + len("Two"), 20)
+    assert stale_leaves(src, None) == (5, 20, 20)
+
+
+def test_language_weights_sum_tier_and_rank():
+    de = Market("Germany", "legacyguard.de", 1)
+    de.languages = ["de", "en"]
+    at = Market("Austria", "legacyguard.at", 2)
+    at.languages = ["de"]
+    weights = language_weights([de, at])
+    assert weights == pytest.approx({"de": 1.6, "en": 0.5})
+    assert list(weights) == ["de", "en"]
+
+
+@pytest.fixture
+def units(make_tree):
+    root = make_tree({
+        "en": {"auth": {"a": "A" * 100}, "legal": {"a": "B" * 5000}},
+        "de": {"auth": {}, "legal": {}},
+        "cs": {"auth": {"a": "Přeloženo"}, "legal": {}},
+    })
+    mapping = {str(root / "en" / f"{ns}.json"): {} for ns in ("auth", "legal")}
+    return build_units(mapping, ["cs", "de"])
+
+
+def order(units):
+    return [(u.src_path.stem, u.lang) for u in units]
+
+
+def test_priority_order(units):
+    ordered, rows = schedule_units(units, {"de": 1.0, "cs": 0.5}, {"auth": 10, "legal": 1})
+    assert order(ordered) == [("auth", "de"), ("legal", "de"), ("auth", "cs"), ("legal", "cs")]
+    auth_de = rows[0]
+    assert (auth_de["market"], auth_de["usage"], auth_de["stale_keys"]) == (1.0, 1.0, 1)
+    assert auth_de["priority"] == pytest.approx(1.0)
+    # cs/auth is already translated, so it has no staleness
+    assert rows[2]["stale_keys"] == 0
+
+
+def test_deadline_order_prefers_value_per_character(units):
+    weights = {"market": 1.0, "usage": 0.0, "stale": 0.0}
+    ordered, rows = schedule_units(units, {"de": 1.0, "cs": 0.5}, {}, weights, by_value_density=True)
+    # The large legal file costs 50 times the characters for the same market value
+    assert order(ordered)[:2] == [("auth", "de"), ("auth", "cs")]
+    assert rows[0]["cost_chars"] == 100 + UNIT_OVERHEAD_CHARS
+    _ordered, rows = schedule_units(units, {"cs": 1.0}, {}, weights, by_value_density=True, missing_only=True)
+    # With --missing-only the translated cs/auth costs only the overhead
+    assert [(r["namespace"], r["cost_chars"]) for r in rows if r["lang"] == "cs"] == \
+        [("auth", UNIT_OVERHEAD_CHARS), ("legal", 5000 + UNIT_OVERHEAD_CHARS)]
+
+
+def test_units_after_the_deadline_are_deferred(units, capsys):
+    sent = []
+
+    def backend(strings, lang):
+        sent.append(lang)
+        return strings
+    pipeline = Pipeline(backend, workers=1, deadline=0.0)
+    pipeline.run(units)
+    assert sent == []
+    assert sorted(p.as_posix() for p in pipeline.deferred) == sorted(u.out_path.as_posix() for u in units)
+    assert pipeline.written == []
@@ -0,0 +1,76 @@
+"""i18n_shard.py: merging shard output directories back into the tree."""
+import json
+
+import i18n_shard
+from i18n_pipeline import WorkUnit
+
+
+def run_shard(locales_dir, shard_dir, spec, outputs):
+    """Fake one ``--shard-output`` run: write ``{(lang, ns): data}`` and its manifest."""
+    units = []
+    for (lang, ns), data in outputs.items():
+        unit = WorkUnit(locales_dir / "en" / f"{ns}.json", lang, locales_dir / lang / f"{ns}.json")
+        units.append(unit)
+    i18n_shard.redirect_units(units, locales_dir, shard_dir)
+    for unit, data in zip(units, outputs.values()):
+        unit.out_path.parent.mkdir(parents=True, exist_ok=True)
+        unit.out_path.write_text(json.dumps(data), encoding="utf-8")
+    i18n_shard.write_manifest(shard_dir, spec, units, locales_dir, skipped=[])
+
+
+def two_shards(make_tree, tmp_path):
+    root = make_tree({"en": {"common": {"a": "A"}, "auth": {"b": "B"}}, "de": {"common": {"a": "[TRANSLATE] A"}}})
+    run_shard(root, tmp_path / "s1", "1/2", {("de", "common"): {"a": "A-de"}})
+    run_shard(root, tmp_path / "s2", "2/2", {("de", "auth"): {"b": "B-de"}})
+    return root
+
+
+def test_merge_writes_every_shard(make_tree, read_doc, tmp_path):
+    root = two_shards(make_tree, tmp_path)
+    problems, written, unchanged = i18n_shard.merge_shards([tmp_path / "s1", tmp_path / "s2"], root)
+    assert problems == []
+    assert sorted(written) == [str(root / "de" / "auth.json"), str(root / "de" / "common.json")]
+    assert unchanged == 0
+    assert read_doc(root, "de", "common") == {"a": "A-de"}
+    assert read_doc(root, "de", "auth") == {"b": "B-de"}
+
+
+def test_missing_shard_writes_nothing(make_tree, read_doc, tmp_path):
+    root = two_shards(make_tree, tmp_path)
+    problems, written, _ = i18n_shard.merge_shards([tmp_path / "s1"], root)
+    assert problems == ["Missing shard(s): 2"]
+    assert written == []
+    assert read_doc(root, "de", "common") == {"a": "[TRANSLATE] A"}
+
+
+def test_conflicting_and_tampered_outputs_are_rejected(make_tree, tmp_path):
+    root = make_tree({"en": {"common": {"a": "A"}}})
+    run_shard(root, tmp_path / "s1", "1/2", {("de", "common"): {"a": "A-de"}})
+    run_shard(root, tmp_path / "s2", "2/2", {("de", "common"): {"a": "A-de2"}})
+    (tmp_path / "s1" / "de" / "common.json").write_text('{"a": "edited"}', encoding="utf-8")
+    problems, written, _ = i18n_shard.merge_shards([tmp_path / "s1", tmp_path / "s2"], root)
+    assert written == []
+    assert any("does not match its manifest hash" in p for p in problems)
+    assert any(p.startswith("Conflict: de/common.json") for p in problems)
+
+
+def test_changed_english_source_needs_force(make_tree, read_doc, tmp_path):
+    root = two_shards(make_tree, tmp_path)
+    make_tree({"en": {"common": {"a": "A changed"}}})
+    shards = [tmp_path / "s1", tmp_path / "s2"]
+    problems, _, _ = i18n_shard.merge_shards(shards, root)
+    assert problems == ["de/common.json: English source en/common.json changed since the shard ran (use --force)"]
+    problems, written, _ = i18n_shard.merge_shards(shards, root, force=True)
+    assert problems == [] and len(written) == 2
+    assert read_doc(root, "de", "common") == {"a": "A-de"}
+
+
+def test_partition_is_balanced_and_independent_of_input_order():
+    units = [WorkUnit(f"en/ns{i}.json", "de", f"de/ns{i}.json") for i in range(7)]
+    costs = [70, 10, 40, 30, 20, 60, 50]
+    shards = i18n_shard.partition(units, costs, 3)
+    reordered = i18n_shard.partition(list(reversed(units)), list(reversed(costs)), 3)
+    assert [{u.src_path for u in shard} for shard in shards] == [{u.src_path for u in shard} for shard in reordered]
+    assert sorted(u.src_path for shard in shards for u in shard) == sorted(u.src_path for u in units)
+    loads = [sum(costs[units.index(u)] for u in shard) for shard in shards]
+    assert max(loads) - min(loads) <= 10
@@ -0,0 +1,97 @@
+"""i18n_sync.py: adding and removing keys in one pass."""
+import i18n_sync
+from i18n_locales import LocaleTree
+
+
+def test_adds_markers_and_removes_extra_keys(make_tree, read_doc, tmp_path):
+    root = make_tree({
+        "en": {"common": {"save": "Save", "nav": {"home": "Home", "count": 3}}},
+        "de": {"common": {"save": "Speichern", "old": "Alt", "nav": {"gone": "Weg"}}},
+    })
+    i18n_sync.main(["--locales-dir", str(root), "--state", str(tmp_path / "state.json")])
+    assert read_doc(root, "de", "common") == {
+        "save": "Speichern",
+        "nav": {"home": "[TRANSLATE] Home", "count": 3},
+    }
+
+
+def test_creates_missing_namespace(make_tree, read_doc):
+    root = make_tree({"en": {"common": {"a": "A"}, "auth": {"b": "B"}}, "de": {"common": {"a": "A-de"}}})
+    tree = LocaleTree.load(root)
+    results, _moves = i18n_sync.sync_tree(tree)
+    tree.save()
+    assert {(r.namespace, r.created) for r in results} == {("common", False), ("auth", True)}
+    assert all(r.verified for r in results)
+    assert read_doc(root, "de", "auth") == {"b": "[TRANSLATE] B"}
+
+
+def test_dry_run_writes_nothing(make_tree, read_doc, tmp_path):
+    root = make_tree({"en": {"common": {"a": "A"}}, "de": {"common": {"x": "X"}}})
+    i18n_sync.main(["--locales-dir", str(root), "--state", str(tmp_path / "state.json"), "--dry-run"])
+    assert read_doc(root, "de", "common") == {"x": "X"}
+    assert not (tmp_path / "state.json").exists()
+
+
+MOVED_EN = {"common": {"bye": "Bye"}, "home": {"hero": {"greeting": "Hello there"}}}
+
+
+def synced_then_moved(make_tree, state, langs=("de",)):
+    """A fully synced tree (state saved), whose English then moves ``greeting`` into home."""
+    root = make_tree({
+        "en": {"common": {"greeting": "Hello there", "bye": "Bye"}},
+        **{lang: {"common": {"greeting": f"Hello-{lang}", "bye": f"Bye-{lang}"}} for lang in langs},
+    })
+    i18n_sync.main(["--locales-dir", str(root), "--state", str(state)])
+    make_tree({"en": MOVED_EN})
+    (root / "en" / "common.json").write_text('{"bye": "Bye"}\n', encoding="utf-8")
+    return root
+
+
+def test_moved_key_keeps_its_translation(make_tree, read_doc, tmp_path):
+    state = tmp_path / "state.json"
+    root = synced_then_moved(make_tree, state)
+    tree = LocaleTree.load(root)
+    results, moves = i18n_sync.sync_tree(tree, old_hashes=i18n_sync.load_state(state))
+    tree.save()
+
+    assert [(m.source, m.dest) for m in moves] == [(("common", ("greeting",)), ("home", ("hero", "greeting")))]
+    assert read_doc(root, "de", "home") == {"hero": {"greeting": "Hello-de"}}
+    assert read_doc(root, "de", "common") == {"bye": "Bye-de"}
+    assert all(r.verified for r in results)
+
+
+def test_markers_are_not_carried_as_moves(make_tree, read_doc):
+    root = make_tree({
+        "en": {"common": {"new": "Hello"}},
+        "de": {"common": {"old": "[TRANSLATE] Hello"}},
+    })
+    tree = LocaleTree.load(root)
+    old_hashes = {("common", ("old",)): i18n_sync.content_hash("Hello")}
+    _results, moves = i18n_sync.sync_tree(tree, old_hashes=old_hashes)
+    tree.save()
+    assert moves == []
+    assert read_doc(root, "de", "common") == {"new": "[TRANSLATE] Hello"}
+
+
+def test_langs_runs_leave_the_state_for_the_other_languages(make_tree, read_doc, tmp_path):
+    state = tmp_path / "state.json"
+    root = synced_then_moved(make_tree, state, langs=("de", "fr"))
+    for lang in ("de", "fr"):
+        i18n_sync.main(["--locales-dir", str(root), "--state", str(state), "--langs", lang])
+    assert read_doc(root, "de", "home") == {"hero": {"greeting": "Hello-de"}}
+    assert read_doc(root, "fr", "home") == {"hero": {"greeting": "Hello-fr"}}
+
+
+def test_remove_then_add_passes_keep_moved_translations(make_tree, read_doc, tmp_path):
+    state = tmp_path / "state.json"
+    root = synced_then_moved(make_tree, state)
+    args = ["--locales-dir", str(root), "--state", str(state)]
+
+    i18n_sync.main(["--no-add"] + args)  # remove_extra_keys.py
+    assert read_doc(root, "de", "common") == {"greeting": "Hello-de", "bye": "Bye-de"}
+    i18n_sync.main(["--no-remove"] + args)  # fix_all_translations.py
+    assert read_doc(root, "de", "home") == {"hero": {"greeting": "Hello-de"}}
+
+    # The add pass advanced the state, so the next remove pass drops the old key
+    i18n_sync.main(["--no-add"] + args)
+    assert read_doc(root, "de", "common") == {"bye": "Bye-de"}
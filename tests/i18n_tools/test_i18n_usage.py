@@ -0,0 +1,90 @@
+"""i18n_usage.py: which locale keys the sources reference, and the incremental index."""
+import os
+
+import pytest
+
+from i18n_usage import UsageIndex, scan_file
+
+COMPONENT = """
+import { useTranslation } from 'react-i18next';
+import Card from './Card';
+
+export function Vault({ step, field }) {
+  const { t } = useTranslation(['vault', 'common']);
+  const lazy = import('./Heavy');
+  return <>
+    {t('title')}
+    {t('common:actions.save')}
+    {t('hint', { ns: 'help' })}
+    {t(`steps.${step}.label`)}
+    <Trans i18nKey="footer.note" />
+  </>;
+}
+"""
+
+
+def test_scan_file(tmp_path):
+    path = tmp_path / "Vault.tsx"
+    path.write_text(COMPONENT, encoding="utf-8")
+    result = scan_file(str(path))
+    assert result["namespaces"] == ["vault", "common"]
+    assert result["keys"] == [
+        ("common", "actions.save"), ("common", "footer.note"), ("common", "title"),
+        ("help", "hint"), ("vault", "footer.note"), ("vault", "title"),
+    ]
+    assert result["patterns"] == [("common", "steps.*.label"), ("vault", "steps.*.label")]
+    assert result["computed"] == []
+    assert result["imports"] == ["./Card", "./Heavy", "react-i18next"]
+
+
+def test_computed_keys_keep_the_namespace_whole(tmp_path):
+    path = tmp_path / "Form.tsx"
+    path.write_text("const { t } = useTranslation('forms');\nt(field.label);\n", encoding="utf-8")
+    assert scan_file(str(path))["computed"] == ["forms"]
+
+
+@pytest.fixture
+def index(tmp_path):
+    src = tmp_path / "src"
+    (src / "node_modules" / "lib").mkdir(parents=True)
+    (src / "node_modules" / "lib" / "x.js").write_text("t('ignored')", encoding="utf-8")
+    (src / "Vault.tsx").write_text(COMPONENT, encoding="utf-8")
+    (src / "Form.tsx").write_text("useTranslation('forms'); t(name)", encoding="utf-8")
+    idx = UsageIndex()
+    idx.update(src, workers=1)
+    return idx, src
+
+
+@pytest.mark.parametrize("namespace, path, used", [
+    ("vault", ("title",), True),
+    ("vault", ("steps", "2", "label"), True),
+    ("vault", ("steps", "2", "hint"), False),
+    ("common", ("actions", "save"), True),
+    ("common", ("actions", "delete"), False),
+    ("help", ("hint_other",), True),  # plural forms resolve through their base key
+    ("footer", ("note",), False),
+    ("forms", ("anything",), True),  # computed keys
+    ("vault", ("footer", "note", "extra"), True),  # below a referenced parent
+])
+def test_scope(index, namespace, path, used):
+    idx, _src = index
+    assert idx.scope().is_used(namespace, path) is used
+
+
+def test_only_changed_files_are_rescanned(index, tmp_path):
+    idx, src = index
+    assert (idx.rescanned, sorted(idx.files)) == (2, [(src / "Form.tsx").as_posix(), (src / "Vault.tsx").as_posix()])
+    idx.save(tmp_path / "usage.json")
+
+    again = UsageIndex.load(tmp_path / "usage.json")
+    (src / "Form.tsx").write_text("useTranslation('forms'); t('label')", encoding="utf-8")
+    os.utime(src / "Form.tsx", ns=(1, 1))
+    (src / "New.ts").write_text("t('common:new')", encoding="utf-8")
+    again.update(src, workers=1)
+    assert (again.rescanned, again.reused, again.removed) == (2, 1, 0)
+    assert not again.scope().is_used("forms", ("anything",))
+    assert again.scope().is_used("common", ("new",))
+
+    (src / "New.ts").unlink()
+    again.update(src, workers=1)
+    assert (again.rescanned, again.removed) == (0, 1)
@@ -0,0 +1,99 @@
+"""i18n_validate.py: the per-leaf checks and draining the retry queue."""
+import re
+
+import pytest
+
+from i18n_validate import RetryItem, RetryQueue, Validator, retry_strings
+
+MASKS = re.compile(r"__PH_\d+__|⟦\d+⟧|\[\[\d+\]\]")
+
+
+def translate_all(texts, lang):
+    return [t.replace("Hello", "Hallo").replace("Bye", "Tschüss") for t in texts]
+
+
+def drop_masks(texts, lang):
+    return [MASKS.sub("", t).replace("Hello", "Hallo") for t in texts]
+
+
+@pytest.mark.parametrize("source, translated, issues", [
+    ("Hello {{name}}", "Hallo {{name}}", []),
+    ("Hello {{name}}", "Hallo __PH_0__", ["mask", "placeholders"]),
+    ("Hello {{name}}", "Hallo {{nom}}", ["placeholders"]),
+    ("{{ count }} items", "{{count}} Elemente", []),
+    ("<b>Bold</b> text", "<b>Fett</b> Text", []),
+    ("<b>Bold</b> text", "<b>Fett Text", ["markup"]),
+    ("A sentence that is long enough", "Kurz", ["length"]),
+    ("Short", "Ein viel viel längerer Satz", []),
+    ("Hello {{name}}", "[TRANSLATE] Hello {{name}}", []),
+])
+def test_validator(source, translated, issues):
+    assert Validator().check(source, translated) == issues
+
+
+def test_retry_strings_tries_the_next_mask_style():
+    calls = []
+
+    def mangle_first_style(texts, lang):
+        calls.append(texts)
+        if "⟦0⟧" in texts[0]:
+            return drop_masks(texts, lang)
+        return translate_all(texts, lang)
+
+    results, issues = retry_strings(["Hello {{name}}"], mangle_first_style, "de", Validator())
+    assert results == ["Hallo {{name}}"]
+    assert issues == [[]]
+    assert [t[0] for t in calls] == ["Hello ⟦0⟧", "Hello [[0]]"]
+
+
+@pytest.fixture
+def queued(make_tree, tmp_path):
+    root = make_tree({
+        "en": {"common": {"greet": "Hello {{name}}", "bye": "Bye {{name}}"}},
+        "de": {"common": {"greet": "[TRANSLATE] Hello {{name}}", "bye": "[TRANSLATE] Bye {{name}}"}},
+    })
+    queue = RetryQueue(tmp_path / "retry-queue.json")
+    for key, source in (("greet", "Hello {{name}}"), ("bye", "Bye {{name}}")):
+        queue.add(RetryItem(root / "en" / "common.json", root / "de" / "common.json", "de", (key,), source, ["mask"]))
+    return root, queue
+
+
+class RecordingTM:
+    def __init__(self):
+        self.stored = []
+
+    def store(self, lang, pairs):
+        self.stored.extend((lang, source, target) for source, target in pairs)
+
+
+def test_drain_patches_fixed_leaves_and_teaches_the_tm(queued, read_doc):
+    root, queue = queued
+    tm = RecordingTM()
+    assert queue.drain(translate_all, Validator(), tm=tm) == 2
+    assert read_doc(root, "de", "common") == {"greet": "Hallo {{name}}", "bye": "Tschüss {{name}}"}
+    assert queue.items == {}
+    assert queue.to_json()["fixed_on_retry"] == 2
+    assert sorted(tm.stored) == [("de", "Bye {{name}}", "Tschüss {{name}}"), ("de", "Hello {{name}}", "Hallo {{name}}")]
+
+
+def test_drain_keeps_failures_queued_across_save_and_load(queued, read_doc):
+    root, queue = queued
+    assert queue.drain(drop_masks, Validator()) == 0
+    assert read_doc(root, "de", "common")["greet"] == "[TRANSLATE] Hello {{name}}"
+    queue.save()
+
+    reloaded = RetryQueue.load(queue.path)
+    item = reloaded.items[(root / "de" / "common.json", ("greet",))]
+    assert item.attempts == 2
+    assert item.issues == ["placeholders"]
+    assert len(reloaded.items) == 2
+
+
+def test_drain_skips_leaves_whose_english_changed(queued, make_tree, read_doc):
+    root, queue = queued
+    make_tree({"en": {"common": {"greet": "Hello again {{name}}", "bye": "Bye {{name}}"}}})
+    assert queue.drain(translate_all, Validator()) == 2
+    doc = read_doc(root, "de", "common")
+    assert doc["greet"] == "[TRANSLATE] Hello {{name}}"
+    assert doc["bye"] == "Tschüss {{name}}"
+    assert (queue.stale, queue.fixed, queue.items) == (1, 1, {})
@@ -0,0 +1,64 @@
+"""i18n_variants.py: variant locales as a base plus a delta, and materializing them back."""
+import json
+
+from i18n_locales import LocaleTree
+from i18n_tm import TranslationMemory
+from i18n_variants import compute_delta, load_registry, main, materialize_tree, merge
+
+EN = {"save": "Save", "greet": "Hello {{name}}", "nav": {"home": "Home", "back": "Back"}}
+SR = {"save": "Sačuvaj", "greet": "Zdravo {{name}}", "nav": {"home": "Početna", "back": "Nazad"}}
+ME = {"save": "Sačuvaj", "greet": "Zdravo {{name}}", "nav": {"home": "Početna stranica", "back": "[TRANSLATE] Back"},
+      "extra": ["a", "b"]}
+
+
+def test_compute_delta_and_merge():
+    delta = compute_delta(ME, SR)
+    assert delta == {"nav": {"home": "Početna stranica"}, "extra": ["a", "b"]}
+    assert merge(SR, delta) == {**SR, "nav": {"home": "Početna stranica", "back": "Nazad"}, "extra": ["a", "b"]}
+    # merge copies; the base is untouched
+    assert SR["nav"]["home"] == "Početna"
+
+
+def test_extract_then_materialize_round_trip(make_tree, read_doc, tmp_path, capsys):
+    root = make_tree({"en": {"common": EN}, "sr": {"common": SR}, "me": {"common": ME}})
+    variants = tmp_path / "variants"
+    main(["--locales-dir", str(root), "--variants-dir", str(variants), "extract", "me", "--base", "sr", "--remove-full"])
+    assert not (root / "me").exists()
+    assert {name: v.base for name, v in load_registry(variants).items()} == {"me": "sr"}
+    assert json.loads((variants / "me" / "common.json").read_text(encoding="utf-8")) == compute_delta(ME, SR)
+
+    main(["--locales-dir", str(root), "--variants-dir", str(variants), "materialize"])
+    # The marker is gone, so the base's translation shows through
+    assert read_doc(root, "me", "common") == {**ME, "nav": {"home": "Početna stranica", "back": "Nazad"}}
+    assert "Materialized me" in capsys.readouterr().out
+
+
+def test_materialize_tree_in_memory(make_tree, tmp_path, capsys):
+    root = make_tree({"en": {"common": EN}, "sr": {"common": SR, "auth": {"login": "Prijava"}}})
+    variants = tmp_path / "variants"
+    (variants / "me").mkdir(parents=True)
+    (variants / "variants.json").write_text(json.dumps({"version": 1, "variants": {"me": {"base": "sr"},
+                                                                                   "bs": {"base": "hr"}}}))
+    (variants / "me" / "common.json").write_text(json.dumps({"save": "Sačuvajte"}), encoding="utf-8")
+    tree = LocaleTree.load(root)
+    assert materialize_tree(tree, variants) == ["me"]
+    assert tree.get("me", "common")["save"] == "Sačuvajte"
+    assert tree.get("me", "auth") == {"login": "Prijava"}
+    assert "base locale hr is not loaded" in capsys.readouterr().err
+
+
+def test_translate_only_sends_pending_overrides(make_tree, tmp_path, capsys):
+    root = make_tree({"en": {"common": EN}, "sr": {"common": SR}})
+    variants = tmp_path / "variants"
+    (variants / "me").mkdir(parents=True)
+    (variants / "variants.json").write_text(json.dumps({"version": 1, "variants": {"me": {"base": "sr"}}}))
+    (variants / "me" / "common.json").write_text(
+        json.dumps({"greet": "[TRANSLATE] Hello {{name}}", "nav": {"home": "Početna stranica"}}), encoding="utf-8")
+    tm_path = tmp_path / "tm.sqlite"
+    with TranslationMemory(tm_path) as tm:
+        tm.store("me", [("Hello {{name}}", "Zdravo, {{name}}")])
+    main(["--locales-dir", str(root), "--variants-dir", str(variants),
+          "translate", "me", "--backends", "cache", "--tm", str(tm_path)])
+    delta = json.loads((variants / "me" / "common.json").read_text(encoding="utf-8"))
+    assert delta == {"greet": "Zdravo, {{name}}", "nav": {"home": "Početna stranica"}}
+    assert "Translated 1 of 1" in capsys.readouterr().out
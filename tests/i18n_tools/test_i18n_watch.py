@@ -0,0 +1,109 @@
+"""i18n_watch.py: turning English edits into targeted per-language updates."""
+import re
+
+from i18n_watch import Watcher
+
+MASKS = re.compile(r"__PH_\d+__|⟦\d+⟧|\[\[\d+\]\]")
+
+
+class FakeBackend:
+    def __init__(self, keep_masks=True):
+        self.keep_masks = keep_masks
+        self.sent = []
+
+    def __call__(self, texts, lang):
+        self.sent.extend(texts)
+        return [f"{lang}:{t if self.keep_masks else MASKS.sub('', t)}" for t in texts]
+
+
+class FakeTM:
+    def __init__(self, known):
+        self.known = known
+        self.stored = []
+
+    def lookup(self, lang, sources):
+        return {s: self.known[s] for s in sources if s in self.known}
+
+    def store(self, lang, pairs):
+        self.stored.extend(pairs)
+
+
+def watch(root, backend, **kwargs):
+    watcher = Watcher(root, backend, state_path=None, **kwargs)
+    watcher.start()
+    return watcher
+
+
+def test_added_changed_and_removed_leaves(make_tree, read_doc):
+    root = make_tree({
+        "en": {"common": {"a": "Save", "b": "Cancel", "c": "Old"}},
+        "de": {"common": {"a": "Speichern", "b": "Abbrechen", "c": "Alt"}},
+    })
+    backend = FakeBackend()
+    watcher = watch(root, backend)
+    make_tree({"en": {"common": {"a": "Save", "b": "Cancel now", "nav": {"d": "New"}}}})
+
+    changes = watcher.collect({"common"})
+    result = watcher.apply_language("de", changes)
+
+    assert read_doc(root, "de", "common") == {"a": "Speichern", "b": "de:Cancel now", "nav": {"d": "de:New"}}
+    assert sorted(backend.sent) == ["Cancel now", "New"]
+    assert (result.files, result.translated, result.carried, result.failed) == (1, 2, 0, [])
+
+
+def test_moved_leaf_carries_its_translation_across_namespaces(make_tree, read_doc):
+    root = make_tree({
+        "en": {"common": {"hello": "Hello", "x": "X"}, "auth": {"y": "Y"}},
+        "de": {"common": {"hello": "Hallo", "x": "X-de"}, "auth": {"y": "Y-de"}},
+    })
+    backend = FakeBackend()
+    watcher = watch(root, backend)
+    make_tree({"en": {"common": {"x": "X"}, "auth": {"y": "Y", "greet": {"hello": "Hello"}}}})
+
+    changes = watcher.collect({"common", "auth"})
+    result = watcher.apply_language("de", changes)
+
+    assert read_doc(root, "de", "auth") == {"y": "Y-de", "greet": {"hello": "Hallo"}}
+    assert read_doc(root, "de", "common") == {"x": "X-de"}
+    assert backend.sent == []
+    assert result.carried == 1
+
+
+def test_tm_hits_skip_the_backend_and_new_translations_are_learned(make_tree, read_doc):
+    root = make_tree({"en": {"common": {}}, "de": {"common": {}}})
+    tm = FakeTM({"Save": "Sichern"})
+    backend = FakeBackend()
+    watcher = watch(root, backend, tm=tm)
+    make_tree({"en": {"common": {"a": "Save", "b": "Load"}}})
+
+    result = watcher.apply_language("de", watcher.collect({"common"}))
+
+    assert read_doc(root, "de", "common") == {"a": "Sichern", "b": "de:Load"}
+    assert backend.sent == ["Load"]
+    assert (result.from_tm, result.translated) == (1, 1)
+    assert tm.stored == [("Load", "de:Load")]
+
+
+def test_failed_validation_writes_a_marker_and_queues_the_leaf(make_tree, read_doc):
+    root = make_tree({"en": {"common": {}}, "de": {"common": {}}})
+    watcher = watch(root, FakeBackend(keep_masks=False))
+    make_tree({"en": {"common": {"greet": "Hi {{name}}"}}})
+
+    result = watcher.apply_language("de", watcher.collect({"common"}))
+
+    assert read_doc(root, "de", "common") == {"greet": "[TRANSLATE] Hi {{name}}"}
+    [item] = result.failed
+    assert (item.lang, item.path, item.source, item.issues) == ("de", ("greet",), "Hi {{name}}", ["placeholders"])
+    assert item.out_path == root / "de" / "common.json"
+
+
+def test_missing_target_is_skipped_and_dry_run_writes_nothing(make_tree, read_doc):
+    root = make_tree({"en": {"common": {"a": "A"}, "auth": {}}, "de": {"common": {"a": "A-de"}}})
+    watcher = watch(root, FakeBackend(), dry_run=True)
+    make_tree({"en": {"common": {"a": "A", "b": "B"}, "auth": {"c": "C"}}})
+
+    result = watcher.apply_language("de", watcher.collect({"common", "auth"}))
+
+    assert result.files == 0
+    assert read_doc(root, "de", "common") == {"a": "A-de"}
+    assert result.skipped == [f"{root / 'de' / 'auth.json'}: missing (run i18n_sync.py)"]
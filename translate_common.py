@@ -57,6 +57,7 @@ import argparse
 import json
 import os
 import re
+import sys
 from pathlib import Path
 from typing import Dict, Any, Iterable, Tuple
 import time
@@ -71,6 +72,16 @@ except ImportError as exc:  # pragma: no cover - runtime import error
         "Install it via 'pip install deep-translator' and try again."
     ) from exc
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+
+from i18n_io import DEFAULT_WRITER, write_json  # noqa: E402
+from i18n_metrics import RunMetrics, default_metrics_path  # noqa: E402
+from i18n_trace import add_profile_arguments, profiling, span  # noqa: E402
+from i18n_usage import load_scope  # noqa: E402
+from i18n_variants import load_registry  # noqa: E402
+
+METRICS = RunMetrics("translate_common")
+
 
 # List of target languages.  These are ISO 639-1 codes.  Feel free to
 # customise this list.  English ('en') is intentionally omitted because
@@ -156,7 +167,15 @@ def translate_string(translator: GoogleTranslator, s: str, dest: str) -> str:
                     time.sleep(0.1)
                     # Clean up problematic characters
                     clean_seg = seg.replace('-->', '→')
-                    translated = translator.translate(clean_seg)
+                    started = time.perf_counter()
+                    try:
+                        with span("translate batch", lang=dest, chars=len(clean_seg)):
+                            translated = translator.translate(clean_seg)
+                    except Exception:
+                        METRICS.record_request(dest, [clean_seg], time.perf_counter() - started,
+                                               files=["common.json"], error=True)
+                        raise
+                    METRICS.record_request(dest, [clean_seg], time.perf_counter() - started, files=["common.json"])
                     # Restore original characters if needed
                     if '→' in translated and '-->' in seg:
                         translated = translated.replace('→', '-->')
@@ -219,25 +238,26 @@ def merge_translations(
     return target, added
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Translate LegacyGuard common.json into multiple languages")
-    parser.add_argument(
-        "--dry-run",
-        action="store_true",
-        help="Perform translation but do not write any files; just print summary.",
-    )
-    args = parser.parse_args()
-
+def run(args: argparse.Namespace) -> None:
     base_dir = Path("src/i18n/locales")
     en_path = base_dir / "en" / "common.json"
     if not en_path.exists():
         raise FileNotFoundError(f"English translation file not found: {en_path}")
-    with en_path.open("r", encoding="utf-8") as f:
+    with span("load", file=str(en_path)), en_path.open("r", encoding="utf-8") as f:
         en_data = json.load(f)
 
+    scope = load_scope(Path(args.src_dir), Path(args.usage_index)) if args.only_used else None
+
+    # Variant locales (me = sr + overrides) are resolved at build time; only their delta is translated
+    registry = load_registry(Path(args.variants_dir))
+    variants = [lang for lang in TARGET_LANGS if lang in registry]
+    if variants:
+        print(f"Skipping variant locale(s) {', '.join(variants)}: translate their delta with scripts/i18n_variants.py translate")
+    targets = [lang for lang in TARGET_LANGS if lang not in variants]
+
     summary: Dict[str, Tuple[int, int]] = {}
-    for i, lang in enumerate(TARGET_LANGS, 1):
-        print(f"\nProcessing {lang.upper()} ({i}/{len(TARGET_LANGS)})...")
+    for i, lang in enumerate(targets, 1):
+        print(f"\nProcessing {lang.upper()} ({i}/{len(targets)})...")
         # Montenegrin (me) isn't supported by Google Translate, use Serbian (sr) instead
         translate_lang = 'sr' if lang == 'me' else lang
         translator = GoogleTranslator(source='en', target=translate_lang)
@@ -246,7 +266,7 @@ def main() -> None:
         dest_path = dest_dir / "common.json"
 
         if dest_path.exists():
-            with dest_path.open("r", encoding="utf-8") as f:
+            with span("load", file=str(dest_path)), dest_path.open("r", encoding="utf-8") as f:
                 existing_data = json.load(f)
         else:
             existing_data = {}
@@ -257,23 +277,27 @@ def main() -> None:
         translated_data = {}
         keys_translated = 0
 
-        def _translate_recursive(src_obj: Any, tgt_obj: Any) -> Any:
+        def _translate_recursive(src_obj: Any, tgt_obj: Any, path: Tuple[str, ...] = ()) -> Any:
             nonlocal keys_translated
             if isinstance(src_obj, dict):
                 result = {}
                 for k, v in src_obj.items():
                     existing = tgt_obj.get(k) if isinstance(tgt_obj, dict) else None
-                    result[k] = _translate_recursive(v, existing)
+                    result[k] = _translate_recursive(v, existing, path + (k,))
                 return result
             elif isinstance(src_obj, list):
                 return [
-                    _translate_recursive(v, tgt_obj[i] if isinstance(tgt_obj, list) and i < len(tgt_obj) else None)
+                    _translate_recursive(v, tgt_obj[i] if isinstance(tgt_obj, list) and i < len(tgt_obj) else None,
+                                         path + (str(i),))
                     for i, v in enumerate(src_obj)
                 ]
             elif isinstance(src_obj, str):
                 if tgt_obj and isinstance(tgt_obj, str) and not tgt_obj.startswith("[TRANSLATE]"):
                     # Preserve existing non-marker translation
                     return tgt_obj
+                if scope is not None and not scope.is_used("common", path):
+                    # Unreferenced key: keep the English text rather than paying for it
+                    return src_obj
                 # Translate from English
                 translated = translate_string(translator, src_obj, translate_lang)
                 keys_translated += 1
@@ -281,17 +305,59 @@ def main() -> None:
             else:
                 return tgt_obj if tgt_obj is not None else src_obj
 
-        translated_data = _translate_recursive(en_data, merged_data)
+        with span("translate", lang=lang):
+            translated_data = _translate_recursive(en_data, merged_data)
         summary[lang] = (added_count, keys_translated)
 
         if not args.dry_run:
-            with dest_path.open("w", encoding="utf-8") as f:
-                json.dump(translated_data, f, ensure_ascii=False, indent=2)
+            before = DEFAULT_WRITER.bytes_written
+            with span("write", file=str(dest_path)):
+                written = write_json(dest_path, translated_data)
+            METRICS.record_write(DEFAULT_WRITER.bytes_written - before, written)
 
     # Print summary
     for lang, (added, translated) in sorted(summary.items()):
         print(f"{lang.upper()}: added {added} keys, translated {translated} values")
 
+    METRICS.finish()
+    METRICS.print_summary()
+    metrics_path = Path(args.metrics) if args.metrics else default_metrics_path("translate_common")
+    print(f"Metrics: {METRICS.write(metrics_path)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Translate LegacyGuard common.json into multiple languages")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Perform translation but do not write any files; just print summary.",
+    )
+    parser.add_argument(
+        "--metrics",
+        help="Metrics JSON output (default: .i18n-cache/metrics/translate_common-<timestamp>.json)",
+    )
+    parser.add_argument(
+        "--only-used",
+        action="store_true",
+        help="Translate only keys referenced from the source code (see scripts/i18n_usage.py).",
+    )
+    parser.add_argument("--src-dir", default="src", help="Source root scanned for key usage with --only-used.")
+    parser.add_argument(
+        "--usage-index",
+        default=".i18n-cache/usage-index.json",
+        help="Cached usage index for --only-used.",
+    )
+    parser.add_argument(
+        "--variants-dir",
+        default="src/i18n/variants",
+        help="Variant locale registry; registered variants are skipped (see scripts/i18n_variants.py).",
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling(args, "translate_common"):
+        run(args)
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file